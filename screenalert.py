@@ -26,7 +26,6 @@ from screenalert_core.utils.constants import (
 )
 from screenalert_core.utils.log_setup import setup_logging, set_runtime_log_level  # noqa: F401
 from screenalert_core.screening_engine import ScreenAlertEngine
-from screenalert_core.ui.main_window import ScreenAlertMainWindow
 
 
 _SINGLE_INSTANCE_MUTEX = None
@@ -102,11 +101,34 @@ def teardown_thread_diagnostics() -> None:
 # setup_logging and set_runtime_log_level are imported from log_setup above.
 
 
+def build_replay_source(replay_dir: str, fps: float):
+    """Create a ReplayCaptureSource with one window per subdirectory of *replay_dir*.
+
+    Thumbnails in the config whose title matches a subdirectory name are
+    attached to it by the engine's normal reconnect logic.
+    """
+    from screenalert_core.core.capture_sources import ReplayCaptureSource
+
+    source = ReplayCaptureSource(fps=fps or None)
+    for window_dir in sorted(Path(replay_dir).iterdir()):
+        if window_dir.is_dir():
+            source.add_window(window_dir.name, window_dir)
+    return source
+
+
 def parse_args():
     """Parse CLI arguments for diagnostics/headless/config override."""
     parser = argparse.ArgumentParser(description="ScreenAlert")
     parser.add_argument("--config", type=str, default=None, help="Path to config JSON")
     parser.add_argument("--headless", action="store_true", help="Run monitoring without UI")
+    parser.add_argument("--replay-dir", type=str, default=None,
+                        help="Headless: capture from recorded PNG/NPZ frames instead of live "
+                             "windows (one subdirectory per window, named after its title)")
+    parser.add_argument("--replay-fps", type=float, default=0,
+                        help="Replay frame rate (default 0: as fast as the CPU allows)")
+    parser.add_argument("--record", type=str, default=None, metavar="DIR",
+                        help="Record captured frames and alerts to a session directory "
+                             "(replay with python -m screenalert_core.monitoring.session_replay)")
     parser.add_argument("--verbose", action="store_true",
                         help="Enable DEBUG logging (shorthand for --log-level DEBUG)")
     parser.add_argument("--log-level", type=str, default=None,
@@ -156,7 +178,13 @@ def main():
     try:
         # Create engine
         logger.info("Initializing ScreenAlert Engine...")
-        engine = ScreenAlertEngine(config_path=args.config)
+        capture_source = None
+        if args.replay_dir:
+            args.headless = True
+            capture_source = build_replay_source(args.replay_dir, args.replay_fps)
+        engine = ScreenAlertEngine(config_path=args.config, capture_source=capture_source)
+        if args.record:
+            engine.start_recording(args.record)
 
         # Apply final log level: CLI overrides config, otherwise use saved value
         final_level = cli_level or engine.config.get_log_level()
@@ -176,8 +204,10 @@ def main():
             logger.info("Starting in headless mode")
             engine.start()
             try:
-                while True:
+                while not getattr(capture_source, "finished", False):
                     time.sleep(0.5)
+                logger.info("Replay finished")
+                engine.stop()
             except KeyboardInterrupt:
                 logger.info("Headless mode interrupted by user")
                 engine.stop()
@@ -189,6 +219,7 @@ def main():
             log_path=EVENT_LOG_FILE,
             max_rows=engine.config.get_event_log_max_rows(),
             enabled=engine.config.get_event_log_enabled(),
+            backend=engine.config.get_event_log_backend(),
         )
         event_logger.start()
         event_logger.log("system", "app_started", "screenalert",
@@ -202,6 +233,7 @@ def main():
         mcp_server.start()
 
         # Create and run UI
+        from screenalert_core.ui.main_window import ScreenAlertMainWindow
         logger.info("Creating main window...")
         app = ScreenAlertMainWindow(engine)
         app.set_mcp_server(mcp_server)
@@ -0,0 +1,135 @@
+"""Background writer for alert artifacts (snapshots, diagnostics images).
+
+Alert snapshots and diagnostics used to be written on the alert path or
+on a fresh thread per alert; an alert storm then meant dozens of threads
+all competing for the disk.  ``ArtifactWriter`` is the one place those
+files are written: a bounded queue drained by a small worker pool.
+
+Each artifact is a write job plus an optional *merge key*.  Under
+pressure the queue applies its policy instead of growing:
+
+* a new artifact whose key is already queued replaces the queued one
+  (e.g. one pending diagnostics set per region – only the newest is
+  worth writing);
+* artifacts without a key (snapshots referenced by the event log) are
+  never merged;
+* a full queue drops its oldest artifact, except those submitted with
+  ``keep`` (capture store blobs, which the store has already indexed):
+  the queue grows past its bound rather than lose one of those.
+
+Counters report how many artifacts were queued, written, merged and
+dropped.  Until ``start()`` jobs run inline on the submitting thread.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional
+
+from PIL import Image
+
+from screenalert_core.core.pipeline import POLICY_COALESCE, PipelineStage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_PNG_COMPRESS_LEVEL = 1   # zlib level: 0 = none … 9 = smallest (PIL default 6)
+
+
+def save_png(image: Image.Image, path: str,
+             compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL) -> None:
+    """Save *image* as PNG at *compress_level* (clamped to 0-9)."""
+    image.save(path, format="PNG", compress_level=max(0, min(9, int(compress_level))))
+
+
+class _Artifact(NamedTuple):
+    kind: str
+    key: Hashable
+    write: Callable[[], Any]
+    keep: bool
+
+
+class ArtifactWriter:
+    """Bounded queue of artifact write jobs drained by a few workers."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, maxsize: int = DEFAULT_QUEUE_SIZE):
+        """Initialize writer
+
+        Args:
+            workers: Worker threads once started
+            maxsize: Artifacts queued before the oldest is dropped
+        """
+        self._unique = itertools.count()
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._written: Dict[str, int] = {}
+        self._failed = 0
+        self._stage = PipelineStage("artifacts", self._write, maxsize, POLICY_COALESCE,
+                                    key=lambda artifact: artifact.key, workers=workers,
+                                    keep=lambda artifact: artifact.keep)
+
+    @property
+    def running(self) -> bool:
+        return self._stage.running
+
+    def start(self) -> None:
+        self._stage.start()
+
+    def stop(self, drain: bool = True) -> None:
+        """Stop the workers, first writing queued artifacts when *drain*."""
+        self._stage.stop(drain=drain)
+
+    def submit(self, kind: str, write: Callable[[], Any],
+               key: Optional[Hashable] = None, keep: bool = False) -> None:
+        """Queue a write job.
+
+        Args:
+            kind: Artifact kind for the counters ("snapshot", "diagnostics")
+            write: Does the actual writing; exceptions are counted as failed
+            key: Merge key; a queued artifact with the same kind and key is
+                replaced by this one.  None never merges.
+            keep: Never drop this artifact when the queue is full (it
+                still merges by *key*)
+        """
+        merge_key = (kind, key) if key is not None else ("", next(self._unique))
+        with self._lock:
+            self._queued += 1
+        self._stage.submit(_Artifact(kind, merge_key, write, keep))
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        return self._stage.wait_idle(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queued, written, merged, dropped and failed artifact counts."""
+        stage = self._stage.stats()
+        with self._lock:
+            queued, written, failed = self._queued, dict(self._written), self._failed
+        return {
+            "queued": queued,
+            "written": sum(written.values()),
+            "written_by_kind": written,
+            "merged": stage["coalesced"],
+            "dropped": stage["dropped"],
+            "failed": failed,
+            "depth": stage["depth"],
+            "max_depth": stage["max_depth"],
+            "maxsize": stage["maxsize"],
+            "workers": stage["workers"],
+            "busy_ms": stage["busy_ms"],
+        }
+
+    # ── helpers ──────────────────────────────────────────────────────
+
+    def _write(self, artifact: _Artifact) -> None:
+        try:
+            artifact.write()
+        except Exception as error:
+            with self._lock:
+                self._failed += 1
+            logger.warning("Failed to write %s artifact: %s", artifact.kind, error)
+            return
+        with self._lock:
+            self._written[artifact.kind] = self._written.get(artifact.kind, 0) + 1
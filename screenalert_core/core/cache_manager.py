@@ -74,26 +74,32 @@ class CacheManager:
     def cleanup_temp_files(self, temp_dir: str, max_age_seconds: int = 86400) -> int:
         """Remove stale temporary files from runtime temp directory.
 
+        Only the top level is scanned.  With ``max_age_seconds`` 0 every
+        file goes and no file is stat'ed.
+
         Returns:
             Number of files removed.
         """
         removed = 0
-        if not temp_dir or not os.path.isdir(temp_dir):
+        if not temp_dir:
             return removed
 
         cutoff = time.time() - max_age_seconds
         try:
-            for name in os.listdir(temp_dir):
-                path = os.path.join(temp_dir, name)
-                if not os.path.isfile(path):
-                    continue
-                try:
-                    if os.path.getmtime(path) <= cutoff:
-                        os.remove(path)
+            with os.scandir(temp_dir) as entries:
+                for entry in entries:
+                    try:
+                        if not entry.is_file():
+                            continue
+                        if max_age_seconds > 0 and entry.stat().st_mtime > cutoff:
+                            continue
+                        os.remove(entry.path)
                         removed += 1
-                except Exception as file_error:
-                    logger.debug(f"Skipping temp cleanup for {path}: {file_error}")
-        except Exception as error:
+                    except OSError as file_error:
+                        logger.debug(f"Skipping temp cleanup for {entry.path}: {file_error}")
+        except FileNotFoundError:
+            return removed
+        except OSError as error:
             logger.warning(f"Error cleaning temp directory '{temp_dir}': {error}")
 
         if removed:
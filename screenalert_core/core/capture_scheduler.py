@@ -0,0 +1,211 @@
+"""Concurrent window capture with per-window deadlines.
+
+A live capture (``PrintWindow``) can stall for seconds when the target
+client hangs.  Captured one after another, a single stalled window would
+hold up monitoring of every other window, so the engine hands each tick's
+captures to a ``CaptureScheduler`` instead:
+
+* every due window is captured at once on a small, bounded thread pool;
+* ``collect()`` returns whatever frames finish before their window's
+  deadline, in the order the jobs were given;
+* a capture still running at its deadline is *carried over*: it keeps
+  running, no second capture of that window is issued while it does, and
+  its frame is delivered by the first ``collect()`` in which that window
+  is due again after it completes.  ``retain()`` drops finished frames of
+  windows that were removed or reconnected to another handle.
+
+With zero workers the scheduler captures inline, one window after another
+and without deadlines (the historical behaviour).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPTURE_WORKERS = 4
+MAX_CAPTURE_WORKERS = 16
+
+
+class CaptureJob(NamedTuple):
+    """One window to capture this tick."""
+    key: str            # thumbnail id
+    hwnd: int
+    deadline: float     # time.monotonic() by which the frame is wanted
+
+
+class CaptureResult(NamedTuple):
+    """A finished capture."""
+    key: str
+    hwnd: int
+    image: Optional[Image.Image]   # None when the capture failed
+    latency_ms: float              # issue → delivery
+    carried_over: bool             # issued on an earlier tick
+
+
+class CaptureScheduler:
+    """Issue window captures concurrently and gather them by deadline."""
+
+    def __init__(self, capture: Callable[[int], Optional[Image.Image]],
+                 workers: int = DEFAULT_CAPTURE_WORKERS):
+        """Initialize scheduler
+
+        Args:
+            capture: Function capturing one window handle (may block)
+            workers: Capture thread pool size; 0 captures inline
+        """
+        self._capture = capture
+        self._workers = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # key -> (future, hwnd, issued_at) of captures that missed a deadline
+        self._inflight: Dict[str, Tuple[Future, int, float]] = {}
+        self._stats = {
+            "issued": 0,
+            "completed": 0,
+            "failed": 0,
+            "late": 0,
+            "carried_over": 0,
+            "skipped_in_flight": 0,
+            "discarded": 0,
+        }
+        self.set_workers(workers)
+
+    @property
+    def workers(self) -> int:
+        """Capture thread pool size (0 = inline)."""
+        return self._workers
+
+    def set_workers(self, workers: int) -> None:
+        """Resize the capture pool; captures still in flight keep running."""
+        try:
+            workers = int(workers)
+        except (TypeError, ValueError):
+            workers = 0
+        workers = max(0, min(workers, MAX_CAPTURE_WORKERS))
+        if workers == self._workers:
+            return
+        old = self._executor
+        self._executor = (ThreadPoolExecutor(max_workers=workers, thread_name_prefix="window-capture")
+                          if workers else None)
+        self._workers = workers
+        if old is not None:
+            old.shutdown(wait=False)
+        logger.info("Window capture workers: %s", workers or "off (inline)")
+
+    def pending(self) -> List[str]:
+        """Keys whose capture missed its deadline and is still running."""
+        return [key for key, (future, _, _) in self._inflight.items() if not future.done()]
+
+    def stats(self) -> Dict[str, int]:
+        """Cumulative counters plus the current in-flight count."""
+        return {**self._stats, "workers": self._workers, "in_flight": len(self.pending())}
+
+    def collect(self, jobs: Sequence[CaptureJob]) -> List[CaptureResult]:
+        """Capture every job's window and return the frames that arrive in time.
+
+        Captures carried over from an earlier tick are delivered first if
+        they have finished (and still target the same window); a window
+        whose earlier capture is still running is not captured again.  A
+        finished carry-over of a window that is not in *jobs* is kept for
+        the next tick in which it is.
+
+        Returns:
+            CaptureResults in *jobs* order, omitting windows whose capture
+            is still running at its deadline
+        """
+        if self._executor is None:
+            return [self._capture_inline(job) for job in jobs]
+
+        wanted = {job.key: job for job in jobs}
+        results: Dict[str, CaptureResult] = {}
+
+        # Finished carry-overs from earlier ticks
+        for key, (future, hwnd, issued) in list(self._inflight.items()):
+            job = wanted.get(key)
+            if job is None or not future.done():
+                continue
+            del self._inflight[key]
+            if job.hwnd != hwnd:
+                self._stats["discarded"] += 1
+                continue
+            results[key] = self._finish(key, hwnd, future, issued, carried_over=True)
+            self._stats["carried_over"] += 1
+
+        # Issue the rest
+        waiting: Dict[Future, CaptureJob] = {}
+        issued = time.monotonic()
+        for job in jobs:
+            if job.key in results:
+                continue
+            if job.key in self._inflight:
+                self._stats["skipped_in_flight"] += 1
+                continue
+            future = self._executor.submit(self._capture, job.hwnd)
+            self._inflight[job.key] = (future, job.hwnd, issued)
+            self._stats["issued"] += 1
+            waiting[future] = job
+
+        # Gather until each job's own deadline
+        while waiting:
+            timeout = max(0.0, min(job.deadline for job in waiting.values()) - time.monotonic())
+            done, _ = wait(waiting, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = waiting.pop(future)
+                del self._inflight[job.key]
+                results[job.key] = self._finish(job.key, job.hwnd, future, issued)
+            now = time.monotonic()
+            for future, job in list(waiting.items()):
+                if job.deadline <= now and not future.done():
+                    del waiting[future]  # stays in flight for a later tick
+                    self._stats["late"] += 1
+                    logger.debug("Capture of %s (hwnd=%s) missed its deadline; carrying over",
+                                 job.key, job.hwnd)
+
+        return [results[job.key] for job in jobs if job.key in results]
+
+    def retain(self, windows: Mapping[str, int]) -> None:
+        """Drop finished carry-overs of windows no longer monitored.
+
+        Args:
+            windows: key → current hwnd of every monitored window; a
+                finished capture whose key is missing or whose hwnd
+                differs is discarded
+        """
+        for key, (future, hwnd, _) in list(self._inflight.items()):
+            if future.done() and windows.get(key) != hwnd:
+                del self._inflight[key]
+                self._stats["discarded"] += 1
+
+    def shutdown(self) -> None:
+        """Stop the pool without waiting for stalled captures."""
+        self.set_workers(0)
+        self._inflight.clear()
+
+    # ── helpers ──────────────────────────────────────────────────────
+
+    def _capture_inline(self, job: CaptureJob) -> CaptureResult:
+        start = time.monotonic()
+        try:
+            image = self._capture(job.hwnd)
+        except Exception as error:
+            logger.debug("Capture of hwnd=%s failed: %s", job.hwnd, error)
+            image = None
+        self._stats["issued"] += 1
+        self._stats["completed" if image is not None else "failed"] += 1
+        return CaptureResult(job.key, job.hwnd, image, (time.monotonic() - start) * 1000.0, False)
+
+    def _finish(self, key: str, hwnd: int, future: Future, issued: float,
+                carried_over: bool = False) -> CaptureResult:
+        try:
+            image = future.result()
+        except Exception as error:
+            logger.debug("Capture of hwnd=%s failed: %s", hwnd, error)
+            image = None
+        self._stats["completed" if image is not None else "failed"] += 1
+        return CaptureResult(key, hwnd, image, (time.monotonic() - issued) * 1000.0, carried_over)
@@ -0,0 +1,555 @@
+"""Pluggable window capture sources.
+
+``ScreenAlertEngine`` reads frames and window identity through a
+``CaptureSource`` instead of calling ``WindowManager`` directly:
+
+    Win32CaptureSource      – live windows via win32gui/PrintWindow (default)
+    SyntheticCaptureSource  – scripted frames: static screens, moving blobs
+                              and changing text
+    ReplayCaptureSource     – PNG or NPZ frame sequences from a directory
+
+The synthetic and replay sources need no desktop, so the whole
+capture → detect → alert loop runs headless (e.g. on Linux CI).  With
+``fps=None`` they are *free running*: every ``capture`` call advances one
+frame and the engine loop does not sleep between cycles, so it runs as
+fast as the CPU allows.  With an ``fps`` the frame shown follows the wall
+clock instead.
+
+Window handles for the simulated sources are plain integers handed out
+by ``add_window``; thumbnails are attached to them exactly as to real
+windows (``engine.add_thumbnail(title, hwnd)``).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+SYNTHETIC_SCENES = ("static", "blobs", "text")
+REPLAY_EXTENSIONS = (".png", ".npz")
+
+# Simulated handles start well away from 0 so they never look "unset"
+_FIRST_SIMULATED_HWND = 0x10000
+
+
+class CaptureSource(ABC):
+    """Abstract interface for window enumeration and capture."""
+
+    name = "base"
+    #: True when frames are produced on demand rather than by a live
+    #: desktop; the engine then skips its frame cache and refresh sleep.
+    free_running = False
+    #: True when frames come from a recording.  The engine then reads the
+    #: user's config but never writes it back (see ``ScreenAlertEngine``).
+    replay = False
+
+    @abstractmethod
+    def capture(self, hwnd: int) -> Optional[Image.Image]:
+        """Return the current RGB frame of *hwnd*, or None on failure."""
+
+    @abstractmethod
+    def get_window_list(self) -> List[Dict]:
+        """Return window dicts shaped like ``WindowManager.get_window_list``
+        (``hwnd``, ``title``, ``class``, ``rect``, ``size``) plus
+        ``monitor_id``."""
+
+    def get_window_metadata(self, hwnd: int) -> Optional[Dict]:
+        """Return metadata for *hwnd*, or None when it is unavailable."""
+        for window in self.get_window_list():
+            if window["hwnd"] == hwnd:
+                return dict(window)
+        return None
+
+    def is_window_valid(self, hwnd: int) -> bool:
+        return self.get_window_metadata(hwnd) is not None
+
+    def validate_window_identity(self, hwnd: int,
+                                 expected_title: str = None,
+                                 expected_class: str = None,
+                                 expected_monitor_id: int = None,
+                                 expected_size=None,
+                                 size_tolerance: int = 20) -> bool:
+        """Return True if *hwnd* exists and matches the expected identity.
+
+        Same rules as ``WindowManager.validate_window_identity``.
+        """
+        metadata = self.get_window_metadata(hwnd)
+        if metadata is None:
+            return False
+        if expected_title and metadata["title"].strip().lower() != expected_title.strip().lower():
+            return False
+        if expected_class and metadata["class"] != expected_class:
+            return False
+        if expected_monitor_id is not None and metadata.get("monitor_id") != expected_monitor_id:
+            return False
+        if expected_size:
+            live_w, live_h = metadata["size"]
+            if (abs(live_w - expected_size[0]) > size_tolerance or
+                    abs(live_h - expected_size[1]) > size_tolerance):
+                return False
+        return True
+
+    def find_window_by_title(self, title: str, exact: bool = False,
+                             expected_size=None, size_tolerance: int = 20,
+                             expected_monitor_id: int = None,
+                             expected_class_name: str = None) -> Optional[Dict]:
+        """Find a window by (case-insensitive) title.
+
+        As in ``WindowManager.find_window_by_title``, class and monitor only
+        rank candidates (a window recorded on another machine still matches
+        by title); *expected_size* is a hard filter.
+        """
+        wanted = title.strip().lower()
+        candidates = []
+        for window in self.get_window_list():
+            live = window["title"].strip().lower()
+            if live != wanted and (exact or wanted not in live):
+                continue
+            if expected_size and (abs(window["size"][0] - expected_size[0]) > size_tolerance or
+                                  abs(window["size"][1] - expected_size[1]) > size_tolerance):
+                continue
+            candidates.append(window)
+        if not candidates:
+            return None
+
+        def _rank(window: Dict) -> Tuple[bool, bool, bool]:
+            return (
+                window["title"].strip().lower() == wanted,
+                not expected_class_name or window["class"] == expected_class_name,
+                expected_monitor_id is None or window.get("monitor_id") == expected_monitor_id,
+            )
+
+        return max(candidates, key=_rank)
+
+    def get_foreground_window(self) -> Optional[int]:
+        return None
+
+    def is_foreground_fullscreen(self) -> bool:
+        return False
+
+    def close(self) -> None:
+        """Release any resources held by the source."""
+
+
+# ── Win32 ────────────────────────────────────────────────────────────────
+
+class Win32CaptureSource(CaptureSource):
+    """Live desktop windows through ``WindowManager`` (PrintWindow)."""
+
+    name = "win32"
+
+    def __init__(self, window_manager):
+        """Initialize source
+
+        Args:
+            window_manager: WindowManager used for enumeration and capture
+        """
+        self.window_manager = window_manager
+
+    def capture(self, hwnd: int) -> Optional[Image.Image]:
+        return self.window_manager.capture_window(hwnd)
+
+    def get_window_list(self) -> List[Dict]:
+        return self.window_manager.get_window_list(use_cache=False)
+
+    def get_window_metadata(self, hwnd: int) -> Optional[Dict]:
+        return self.window_manager.get_window_metadata(hwnd)
+
+    def is_window_valid(self, hwnd: int) -> bool:
+        return self.window_manager.is_window_valid(hwnd)
+
+    def validate_window_identity(self, hwnd: int, **kwargs) -> bool:
+        return self.window_manager.validate_window_identity(hwnd, **kwargs)
+
+    def find_window_by_title(self, title: str, exact: bool = False, **kwargs) -> Optional[Dict]:
+        return self.window_manager.find_window_by_title(title, exact=exact, **kwargs)
+
+    def get_foreground_window(self) -> Optional[int]:
+        return self.window_manager.get_foreground_window()
+
+    def is_foreground_fullscreen(self) -> bool:
+        return self.window_manager.is_foreground_fullscreen()
+
+
+# ── Simulated sources ────────────────────────────────────────────────────
+
+class _SimulatedWindow:
+    """Bookkeeping shared by the synthetic and replay sources."""
+
+    def __init__(self, hwnd: int, title: str, size: Tuple[int, int],
+                 window_class: str, monitor_id: int):
+        self.hwnd = hwnd
+        self.title = title
+        self.size = (int(size[0]), int(size[1]))
+        self.window_class = window_class
+        self.monitor_id = monitor_id
+        self.frames_served = 0
+        self.started_at: Optional[float] = None
+
+    def as_dict(self) -> Dict:
+        width, height = self.size
+        return {
+            "hwnd": self.hwnd,
+            "title": self.title,
+            "class": self.window_class,
+            "rect": (0, 0, width, height),
+            "size": self.size,
+            "monitor_id": self.monitor_id,
+        }
+
+
+class _SimulatedCaptureSource(CaptureSource):
+    """Window registry and frame clock for the synthetic/replay sources."""
+
+    def __init__(self, fps: Optional[float] = None):
+        """Initialize source
+
+        Args:
+            fps: Frames per second of wall-clock time, or None to advance
+                one frame per ``capture`` call (free running)
+        """
+        self.fps = float(fps) if fps else None
+        self.free_running = self.fps is None
+        self._windows: Dict[int, _SimulatedWindow] = {}
+        self._next_hwnd = _FIRST_SIMULATED_HWND
+        self._lock = threading.Lock()
+
+    def _register(self, window_cls, *args, hwnd: Optional[int] = None, **kwargs) -> int:
+        with self._lock:
+            if hwnd is None:
+                hwnd = self._next_hwnd
+                self._next_hwnd += 4
+            elif hwnd in self._windows:
+                raise ValueError(f"Window handle {hwnd} already registered")
+            self._windows[hwnd] = window_cls(hwnd, *args, **kwargs)
+        return hwnd
+
+    def remove_window(self, hwnd: int) -> bool:
+        """Remove a simulated window; later captures of it fail."""
+        with self._lock:
+            return self._windows.pop(hwnd, None) is not None
+
+    def get_window_list(self) -> List[Dict]:
+        with self._lock:
+            return [w.as_dict() for w in self._windows.values()]
+
+    def get_window_metadata(self, hwnd: int) -> Optional[Dict]:
+        with self._lock:
+            window = self._windows.get(hwnd)
+            return window.as_dict() if window else None
+
+    def frame_index(self, hwnd: int) -> Optional[int]:
+        """Return the index of the frame the next capture of *hwnd* returns."""
+        with self._lock:
+            window = self._windows.get(hwnd)
+            return self._peek_index(window) if window else None
+
+    def _peek_index(self, window: _SimulatedWindow) -> int:
+        if self.fps is None or window.started_at is None:
+            return window.frames_served
+        return int((time.monotonic() - window.started_at) * self.fps)
+
+    def capture(self, hwnd: int) -> Optional[Image.Image]:
+        with self._lock:
+            window = self._windows.get(hwnd)
+            if window is None:
+                return None
+            if window.started_at is None:
+                window.started_at = time.monotonic()
+            index = self._peek_index(window)
+            window.frames_served += 1
+        try:
+            frame = self._render(window, index)
+        except Exception as exc:
+            logger.error("%s capture failed for hwnd=%s frame=%s: %s",
+                         self.name, hwnd, index, exc)
+            return None
+        if frame is None:
+            return None
+        return Image.fromarray(frame)
+
+    @abstractmethod
+    def _render(self, window: _SimulatedWindow, index: int) -> Optional[np.ndarray]:
+        """Return frame *index* of *window* as an RGB uint8 array."""
+
+
+# ── Synthetic ────────────────────────────────────────────────────────────
+
+class SceneStep(NamedTuple):
+    """One step of a synthetic window script."""
+    scene: str                                    # one of SYNTHETIC_SCENES
+    frames: int = 0                               # 0 = hold forever
+    area: Optional[Tuple[int, int, int, int]] = None  # (x, y, w, h); None = whole window
+
+
+ScriptItem = Union[str, Tuple, Dict, SceneStep]
+
+
+def _normalize_step(item: ScriptItem) -> SceneStep:
+    if isinstance(item, SceneStep):
+        step = item
+    elif isinstance(item, str):
+        step = SceneStep(item)
+    elif isinstance(item, dict):
+        step = SceneStep(item.get("scene", "static"), int(item.get("frames", 0)),
+                         item.get("area"))
+    else:
+        step = SceneStep(*item)
+    if step.scene not in SYNTHETIC_SCENES:
+        raise ValueError(f"Unknown synthetic scene '{step.scene}' "
+                         f"(valid: {', '.join(SYNTHETIC_SCENES)})")
+    area = tuple(int(v) for v in step.area) if step.area else None
+    return SceneStep(step.scene, max(0, int(step.frames)), area)
+
+
+class _SyntheticWindow(_SimulatedWindow):
+
+    def __init__(self, hwnd: int, title: str, size: Tuple[int, int],
+                 window_class: str, monitor_id: int,
+                 script: Sequence[SceneStep], loop: bool, seed: int):
+        super().__init__(hwnd, title, size, window_class, monitor_id)
+        self.script = list(script)
+        self.loop = loop
+        self.background = _ui_background(self.size, seed)
+        self.rng_seed = seed
+
+    def step_at(self, index: int) -> Tuple[SceneStep, int]:
+        """Return the script step active at frame *index* and the frame
+        offset into that step."""
+        total = sum(s.frames for s in self.script)
+        if self.loop and total and all(s.frames for s in self.script):
+            index %= total
+        for step in self.script:
+            if not step.frames or index < step.frames:
+                return step, index
+            index -= step.frames
+        last = self.script[-1]
+        return last, last.frames + index
+
+
+def _ui_background(size: Tuple[int, int], seed: int) -> np.ndarray:
+    """Deterministic app-like frame: flat panels and rows of 'text'."""
+    width, height = size
+    rng = np.random.default_rng(seed)
+    frame = np.full((height, width, 3), 32, dtype=np.uint8)
+    for _ in range(6):
+        x, y = int(rng.integers(0, max(1, width - 20))), int(rng.integers(0, max(1, height - 20)))
+        w, h = int(rng.integers(20, max(21, width // 3))), int(rng.integers(20, max(21, height // 3)))
+        colour = tuple(int(c) for c in rng.integers(40, 120, 3))
+        cv2.rectangle(frame, (x, y), (x + w, y + h), colour, -1)
+    for row in range(14, height - 4, 18):
+        cv2.putText(frame, f"line {row:04d} status nominal", (6, row),
+                    cv2.FONT_HERSHEY_PLAIN, 0.9, (150, 150, 150), 1, cv2.LINE_8)
+    return frame
+
+
+def _bounce(position: float, lo: int, hi: int) -> int:
+    """Reflect *position* into [lo, hi] (triangle wave)."""
+    span = max(1, hi - lo)
+    offset = position % (2 * span)
+    return int(lo + (offset if offset <= span else 2 * span - offset))
+
+
+class SyntheticCaptureSource(_SimulatedCaptureSource):
+    """Scripted frames for load tests and headless runs.
+
+    Each window plays a script of ``SceneStep`` items:
+
+        static  – the window's fixed background
+        blobs   – bright discs moving across the step's area every frame
+        text    – a counter redrawn inside the area every frame
+
+    ``[("static", 30), ("blobs", 5), "static"]`` is quiet for 30 frames,
+    changes for 5, then stays quiet.  A step with ``frames=0`` holds
+    forever; otherwise the last step holds once the script runs out
+    (or the script repeats when *loop* is set).
+    """
+
+    name = "synthetic"
+
+    def __init__(self, fps: Optional[float] = None, seed: int = 0):
+        """Initialize source
+
+        Args:
+            fps: Wall-clock frame rate, or None for free running
+            seed: Base seed for window backgrounds
+        """
+        super().__init__(fps)
+        self.seed = int(seed)
+
+    def add_window(self, title: str, size: Tuple[int, int] = (640, 480),
+                   script: Sequence[ScriptItem] = ("static",), loop: bool = False,
+                   hwnd: Optional[int] = None, window_class: str = "SyntheticWindow",
+                   monitor_id: int = 0) -> int:
+        """Register a synthetic window and return its handle.
+
+        Args:
+            title: Window title
+            size: (width, height) in pixels
+            script: Scene steps (names, ``(scene, frames[, area])`` tuples,
+                dicts or ``SceneStep``)
+            loop: Repeat the script when every step has a frame count
+            hwnd: Explicit handle (default: next free one)
+            window_class: Reported window class
+            monitor_id: Reported monitor index
+        """
+        steps = [_normalize_step(item) for item in script] or [SceneStep("static")]
+        seed = self.seed + len(self._windows)
+        return self._register(_SyntheticWindow, title, size, window_class, monitor_id,
+                              steps, loop, seed, hwnd=hwnd)
+
+    def _render(self, window: _SyntheticWindow, index: int) -> np.ndarray:
+        step, offset = window.step_at(index)
+        if step.scene == "static":
+            return window.background
+
+        frame = window.background.copy()
+        width, height = window.size
+        x, y, w, h = step.area or (0, 0, width, height)
+        x, y = max(0, x), max(0, y)
+        w, h = max(1, min(w, width - x)), max(1, min(h, height - y))
+
+        if step.scene == "blobs":
+            radius = max(3, min(w, h) // 10)
+            for blob in range(3):
+                cx = _bounce(offset * (7 + 3 * blob) + blob * w / 3, x + radius, x + w - radius)
+                cy = _bounce(offset * (5 + 2 * blob) + blob * h / 4, y + radius, y + h - radius)
+                cv2.circle(frame, (cx, cy), radius, (235, 225 - 40 * blob, 60 + 60 * blob), -1)
+        else:  # text
+            cv2.rectangle(frame, (x, y), (x + w - 1, y + h - 1), (24, 24, 24), -1)
+            scale = max(0.4, min(h / 40.0, 2.0))
+            cv2.putText(frame, f"{index:06d}", (x + 4, y + min(h - 4, int(30 * scale))),
+                        cv2.FONT_HERSHEY_SIMPLEX, scale, (240, 240, 240), 2, cv2.LINE_8)
+        return frame
+
+
+# ── Directory replay ─────────────────────────────────────────────────────
+
+class _ReplayWindow(_SimulatedWindow):
+
+    def __init__(self, hwnd: int, title: str, size: Tuple[int, int],
+                 window_class: str, monitor_id: int,
+                 frames: List[Tuple[Path, Optional[int]]], loop: bool):
+        super().__init__(hwnd, title, size, window_class, monitor_id)
+        self.frames = frames
+        self.loop = loop
+        self._npz_cache: Tuple[Optional[Path], Optional[np.ndarray]] = (None, None)
+
+    def load(self, position: int) -> np.ndarray:
+        path, stack_index = self.frames[position]
+        if path.suffix.lower() == ".png":
+            with Image.open(path) as img:
+                return np.asarray(img.convert("RGB"))
+        cached_path, stack = self._npz_cache
+        if cached_path != path:
+            stack = _load_npz(path)
+            self._npz_cache = (path, stack)
+        return _to_rgb(stack[stack_index] if stack_index is not None else stack)
+
+
+def _load_npz(path: Path) -> np.ndarray:
+    """Return the ``frames`` stack, ``frame`` array or first array of *path*."""
+    with np.load(path) as data:
+        for key in ("frames", "frame"):
+            if key in data.files:
+                return data[key]
+        if not data.files:
+            raise ValueError(f"{path} contains no arrays")
+        return data[data.files[0]]
+
+
+def _to_rgb(frame: np.ndarray) -> np.ndarray:
+    frame = np.asarray(frame)
+    if frame.dtype != np.uint8:
+        frame = np.clip(frame, 0, 255).astype(np.uint8)
+    if frame.ndim == 2:
+        return cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)
+    if frame.shape[2] == 4:
+        return np.ascontiguousarray(frame[:, :, :3])
+    return frame
+
+
+def list_replay_frames(directory: Union[str, Path]) -> List[Tuple[Path, Optional[int]]]:
+    """Index the frames in *directory*.
+
+    ``*.png`` and ``*.npz`` files are played in file-name order.  An NPZ
+    holding a ``frames`` array of shape (N, H, W[, C]) contributes N
+    frames; any other NPZ contributes its ``frame`` (or first) array.
+
+    Returns:
+        List of ``(path, stack_index)``; stack_index is None for
+        single-frame files.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        raise FileNotFoundError(f"Replay directory not found: {directory}")
+    frames: List[Tuple[Path, Optional[int]]] = []
+    for path in sorted(p for p in directory.iterdir() if p.suffix.lower() in REPLAY_EXTENSIONS):
+        if path.suffix.lower() == ".npz":
+            with np.load(path) as data:
+                if "frames" in data.files:
+                    frames.extend((path, i) for i in range(len(data["frames"])))
+                    continue
+        frames.append((path, None))
+    return frames
+
+
+class ReplayCaptureSource(_SimulatedCaptureSource):
+    """Replay recorded frames from a directory of PNG/NPZ files.
+
+    Once a window's sequence is exhausted its captures return None (as a
+    failed live capture would) unless *loop* is set; ``finished`` reports
+    when every window has run out.
+    """
+
+    name = "replay"
+    replay = True
+
+    def add_window(self, title: str, directory: Union[str, Path], loop: bool = False,
+                   hwnd: Optional[int] = None, window_class: str = "ReplayWindow",
+                   monitor_id: int = 0) -> int:
+        """Register a window that replays *directory* and return its handle.
+
+        Raises:
+            FileNotFoundError: If *directory* does not exist
+            ValueError: If it contains no PNG/NPZ frames
+        """
+        frames = list_replay_frames(directory)
+        if not frames:
+            raise ValueError(f"No .png/.npz frames in {directory}")
+        probe = _ReplayWindow(0, title, (0, 0), window_class, monitor_id, frames, loop)
+        first = probe.load(0)
+        size = (first.shape[1], first.shape[0])
+        logger.info("Replay window '%s': %d frame(s) %dx%d from %s",
+                    title, len(frames), size[0], size[1], directory)
+        return self._register(_ReplayWindow, title, size, window_class, monitor_id,
+                              frames, loop, hwnd=hwnd)
+
+    def frame_count(self, hwnd: int) -> int:
+        with self._lock:
+            window = self._windows.get(hwnd)
+            return len(window.frames) if window else 0
+
+    @property
+    def finished(self) -> bool:
+        """True when no non-looping window has frames left to serve."""
+        with self._lock:
+            return all(not w.loop and self._peek_index(w) >= len(w.frames)
+                       for w in self._windows.values())
+
+    def _render(self, window: _ReplayWindow, index: int) -> Optional[np.ndarray]:
+        if window.loop:
+            index %= len(window.frames)
+        elif index >= len(window.frames):
+            return None
+        return window.load(index)
@@ -0,0 +1,458 @@
+"""Content-addressed store for alert captures and diagnostics images.
+
+Images are stored by the hash of their pixels, so an image that is
+captured again (the same "before" frame for repeated alerts, an
+unchanged region crop) is written once and shared:
+
+    <capture_dir>/store/
+        blobs/ab/ab12….png    one file per unique image
+        manifest.jsonl        append-only: one line per (event, kind)
+
+Each manifest line maps an event id (the alert's event-log id) and an
+image *kind* ("snapshot", "window_prev", "edges_diff", …) to a blob,
+with the window and region the alert came from.  The manifest is read
+once when the store opens; after that lookups by event, window or region
+are dictionary hits – no directory scans.
+
+Blobs are written through the ``ArtifactWriter`` when one is given
+(queued writes of the same blob merge), via a temporary file and an
+atomic rename, so a path handed out is either absent or complete.
+
+The store also keeps each blob's size and reference count, so the
+retention manager can ask for usage and delete whole events, oldest
+first, without touching the filesystem beyond the files it removes.  A
+deletion appends a tombstone line (``{"event_id": …, "deleted": true}``);
+the manifest is rewritten once tombstones outnumber live entries.
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from PIL import Image
+
+from screenalert_core.core.artifact_writer import DEFAULT_PNG_COMPRESS_LEVEL, save_png
+
+logger = logging.getLogger(__name__)
+
+STORE_DIRNAME = "store"
+MANIFEST_FILENAME = "manifest.jsonl"
+KIND_SNAPSHOT = "snapshot"
+_COMPACT_MIN_TOMBSTONES = 1000
+_BLOB_LOCK_STRIPES = 16
+
+
+def image_digest(image: Image.Image) -> str:
+    """Hash of an image's mode, size and pixels (hex)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode("ascii"))
+    h.update(image.tobytes())
+    return h.hexdigest()
+
+
+class ManifestEntry(NamedTuple):
+    """One manifest line: an image of an event."""
+    event_id: str
+    kind: str
+    blob: str           # path relative to the store root
+    window_id: str
+    region_id: str
+    timestamp: float
+
+    @property
+    def digest(self) -> str:
+        return os.path.splitext(self.blob.rsplit("/", 1)[-1])[0]
+
+    def as_dict(self) -> Dict:
+        return self._asdict()
+
+
+class CaptureStore:
+    """Deduplicating image store with an event manifest index."""
+
+    def __init__(self, root: str, writer=None):
+        """Open (or create) the store under *root*.
+
+        Args:
+            root: Store directory (usually ``<capture_dir>/store``)
+            writer: ArtifactWriter for blob writes (None = write inline)
+        """
+        self.root = root
+        self._writer = writer
+        self._manifest_path = os.path.join(root, MANIFEST_FILENAME)
+        self._lock = threading.Lock()
+        # Writing and removing a blob file are serialised per digest (striped)
+        self._blob_locks = [threading.Lock() for _ in range(_BLOB_LOCK_STRIPES)]
+        # Events in insertion (= time) order; deletions are oldest first,
+        # so the per-window/region deques are trimmed from the left
+        self._by_event: Dict[str, Dict[str, ManifestEntry]] = {}
+        self._events_by_window: Dict[str, Deque[str]] = {}
+        self._events_by_region: Dict[Tuple[str, str], Deque[str]] = {}
+        self._written: Set[str] = set()     # digests known to be on disk
+        self._blob_refs: Dict[str, int] = {}
+        self._blob_bytes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._tombstones = 0
+        self._stats = {"puts": 0, "deduplicated": 0, "blobs_queued": 0,
+                       "events_deleted": 0, "blobs_deleted": 0, "bytes_deleted": 0}
+        self._manifest = None
+        self._load()
+
+    # ── writing ──────────────────────────────────────────────────────
+
+    def put(self, event_id: str, kind: str, image: Image.Image,
+            window_id: str = "", region_id: str = "",
+            compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+            timestamp: Optional[float] = None) -> str:
+        """Store *image* as *kind* of *event_id*.
+
+        The blob is only written if no identical image is stored yet.
+
+        Returns:
+            Absolute path of the blob (complete once the write lands)
+        """
+        digest = image_digest(image)
+        blob = os.path.join("blobs", digest[:2], f"{digest}.png")
+        path = os.path.join(self.root, blob)
+        entry = ManifestEntry(event_id, kind, blob.replace(os.sep, "/"), window_id or "",
+                              region_id or "", time.time() if timestamp is None else timestamp)
+        with self._lock:
+            self._stats["puts"] += 1
+            duplicate = digest in self._written
+            if duplicate:
+                self._stats["deduplicated"] += 1
+            else:
+                self._stats["blobs_queued"] += 1
+            self._append(entry)
+            replaced = self._index(entry)
+
+        if replaced:
+            self._remove_blobs(replaced)
+        if not duplicate:
+            def _write() -> None:
+                self._write_blob(digest, path, image, compress_level)
+
+            if self._writer is not None:
+                # Queued writes of the same blob merge into one.  The entry
+                # above already points at the blob, so the write is kept.
+                self._writer.submit("blob", _write, key=digest, keep=True)
+            else:
+                _write()
+        return path
+
+    def delete_event(self, event_id: str) -> int:
+        """Forget *event_id* and delete blobs no other event uses.
+
+        Returns:
+            Bytes freed on disk
+        """
+        with self._lock:
+            kinds = self._by_event.pop(event_id, None)
+            if kinds is None:
+                return 0
+            self._unindex(event_id, kinds)
+            orphans = []
+            for entry in kinds.values():
+                orphan = self._unref(entry.digest)
+                if orphan is not None:
+                    orphans.append(orphan)
+            self._append_line({"event_id": event_id, "deleted": True})
+            self._tombstones += 1
+            self._stats["events_deleted"] += 1
+            if (self._tombstones >= _COMPACT_MIN_TOMBSTONES
+                    and self._tombstones > len(self._by_event)):
+                self._compact()
+
+        return self._remove_blobs(orphans)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._manifest is not None:
+                self._manifest.close()
+                self._manifest = None
+
+    # ── lookups ──────────────────────────────────────────────────────
+
+    def get_event(self, event_id: str) -> Dict[str, str]:
+        """Kind → blob path for every image stored with *event_id*."""
+        with self._lock:
+            entries = dict(self._by_event.get(event_id, {}))
+        return {kind: self._path(entry) for kind, entry in entries.items()}
+
+    def latest_event(self, window_id: str, region_id: Optional[str] = None) -> Optional[str]:
+        """Most recent event id stored for a window, or for one of its regions."""
+        with self._lock:
+            if region_id:
+                events = self._events_by_region.get((window_id, region_id))
+            else:
+                events = self._events_by_window.get(window_id)
+            return events[-1] if events else None
+
+    def latest_capture(self, window_id: str, region_id: str,
+                       kind: str = KIND_SNAPSHOT) -> Optional[str]:
+        """Blob path of the newest *kind* image of a region, or None."""
+        with self._lock:
+            for event_id in reversed(self._events_by_region.get((window_id, region_id), [])):
+                entry = self._by_event.get(event_id, {}).get(kind)
+                if entry is not None:
+                    return self._path(entry)
+        return None
+
+    def events(self, window_id: Optional[str] = None,
+               region_id: Optional[str] = None) -> List[str]:
+        """Event ids in store order, optionally for one window/region."""
+        with self._lock:
+            if window_id and region_id:
+                return list(self._events_by_region.get((window_id, region_id), []))
+            if window_id:
+                return list(self._events_by_window.get(window_id, []))
+            return list(self._by_event)
+
+    def oldest_events(self, limit: int) -> List[Tuple[str, float]]:
+        """The *limit* oldest ``(event_id, timestamp)`` pairs, oldest first."""
+        with self._lock:
+            return [(event_id, self._event_time(kinds))
+                    for event_id, kinds in itertools.islice(self._by_event.items(), max(0, limit))]
+
+    def region_counts(self) -> Dict[Tuple[str, str], int]:
+        """Stored events per (window_id, region_id)."""
+        with self._lock:
+            return {key: len(events) for key, events in self._events_by_region.items() if events}
+
+    def event_time(self, event_id: str) -> Optional[float]:
+        with self._lock:
+            kinds = self._by_event.get(event_id)
+            return self._event_time(kinds) if kinds else None
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def usage(self) -> Dict:
+        """Bytes, blob and event counts, and the oldest/newest event time."""
+        with self._lock:
+            times = [self._event_time(kinds) for kinds in self._by_event.values()]
+            return {
+                "bytes": self._total_bytes,
+                "events": len(self._by_event),
+                "blobs": len(self._blob_refs),
+                "regions": sum(1 for events in self._events_by_region.values() if events),
+                "oldest_timestamp": times[0] if times else None,
+                "newest_timestamp": times[-1] if times else None,
+            }
+
+    def entries(self, event_id: str) -> List[ManifestEntry]:
+        with self._lock:
+            return list(self._by_event.get(event_id, {}).values())
+
+    def stats(self) -> Dict:
+        """Event, blob and deduplication counts."""
+        with self._lock:
+            return {
+                **self._stats,
+                "events": len(self._by_event),
+                "blobs": len(self._written),
+                "bytes": self._total_bytes,
+                "root": self.root,
+            }
+
+    # ── helpers ──────────────────────────────────────────────────────
+
+    def _path(self, entry: ManifestEntry) -> str:
+        return os.path.join(self.root, *entry.blob.split("/"))
+
+    @staticmethod
+    def _event_time(kinds: Dict[str, ManifestEntry]) -> float:
+        return min(entry.timestamp for entry in kinds.values())
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], f"{digest}.png")
+
+    def _blob_lock(self, digest: str) -> threading.Lock:
+        return self._blob_locks[int(digest[:2], 16) % _BLOB_LOCK_STRIPES]
+
+    def _unref(self, digest: str) -> Optional[Tuple[str, int]]:
+        """Drop one reference (lock held); returns ``(digest, size)`` once unused."""
+        refs = self._blob_refs.get(digest, 0) - 1
+        if refs > 0:
+            self._blob_refs[digest] = refs
+            return None
+        self._blob_refs.pop(digest, None)
+        self._written.discard(digest)
+        size = self._blob_bytes.pop(digest, 0)
+        self._total_bytes -= size
+        return digest, size
+
+    def _remove_blobs(self, orphans: List[Tuple[str, int]]) -> int:
+        """Delete unreferenced blob files (lock not held).
+
+        A blob stored again since it lost its last reference is kept: its
+        write may already have found the file and counted it.
+
+        Returns:
+            Bytes freed on disk
+        """
+        freed = removed = 0
+        for digest, size in orphans:
+            path = self._blob_path(digest)
+            with self._blob_lock(digest):
+                with self._lock:
+                    if digest in self._blob_refs:
+                        continue
+                try:
+                    os.remove(path)
+                    freed += size
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                except Exception as error:
+                    logger.warning("Capture store: unable to delete %s: %s", path, error)
+        with self._lock:
+            self._stats["blobs_deleted"] += removed
+            self._stats["bytes_deleted"] += freed
+        return freed
+
+    def _index(self, entry: ManifestEntry) -> List[Tuple[str, int]]:
+        """Index *entry* (lock held).
+
+        Returns:
+            ``(digest, size)`` of a blob that lost its last reference
+            because *entry* replaced an image of the same kind
+        """
+        kinds = self._by_event.get(entry.event_id)
+        if kinds is None:
+            kinds = self._by_event[entry.event_id] = {}
+            if entry.window_id:
+                self._events_by_window.setdefault(
+                    entry.window_id, collections.deque()).append(entry.event_id)
+                if entry.region_id:
+                    self._events_by_region.setdefault(
+                        (entry.window_id, entry.region_id), collections.deque()).append(entry.event_id)
+        previous = kinds.get(entry.kind)
+        kinds[entry.kind] = entry
+        if previous is not None and previous.digest == entry.digest:
+            return []
+        self._blob_refs[entry.digest] = self._blob_refs.get(entry.digest, 0) + 1
+        if previous is not None:
+            orphan = self._unref(previous.digest)
+            if orphan is not None:
+                return [orphan]
+        return []
+
+    def _unindex(self, event_id: str, kinds: Dict[str, ManifestEntry]) -> None:
+        entry = next(iter(kinds.values()))
+        for index, key in ((self._events_by_window, entry.window_id),
+                           (self._events_by_region, (entry.window_id, entry.region_id))):
+            events = index.get(key)
+            if not events:
+                continue
+            if events[0] == event_id:
+                events.popleft()
+            else:
+                try:
+                    events.remove(event_id)
+                except ValueError:
+                    pass
+            if not events:
+                del index[key]
+
+    def _append(self, entry: ManifestEntry) -> None:
+        self._append_line(entry.as_dict())
+
+    def _append_line(self, record: Dict) -> None:
+        try:
+            if self._manifest is None:
+                os.makedirs(self.root, exist_ok=True)
+                self._manifest = open(self._manifest_path, "a", encoding="utf-8")
+            self._manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._manifest.flush()
+        except Exception as error:
+            logger.error("Capture store manifest write failed: %s", error)
+
+    def _compact(self) -> None:
+        """Rewrite the manifest with live entries only (lock held)."""
+        tmp = f"{self._manifest_path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                for kinds in self._by_event.values():
+                    for entry in kinds.values():
+                        f.write(json.dumps(entry.as_dict(), ensure_ascii=False) + "\n")
+            if self._manifest is not None:
+                self._manifest.close()
+                self._manifest = None
+            os.replace(tmp, self._manifest_path)
+            self._tombstones = 0
+            logger.info("Capture store manifest compacted (%d events)", len(self._by_event))
+        except Exception as error:
+            logger.error("Capture store manifest compaction failed: %s", error)
+
+    def _write_blob(self, digest: str, path: str, image: Image.Image,
+                    compress_level: int) -> None:
+        # Held throughout, so a removal of the same blob cannot come between
+        # finding the file and counting it
+        with self._blob_lock(digest):
+            with self._lock:
+                if digest not in self._blob_refs:
+                    return  # its events were deleted while the write was queued
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{threading.get_ident()}.tmp"
+                save_png(image, tmp, compress_level)
+                os.replace(tmp, path)
+            size = os.path.getsize(path)
+            with self._lock:
+                if digest in self._blob_refs and digest not in self._written:
+                    self._written.add(digest)
+                    self._blob_bytes[digest] = size
+                    self._total_bytes += size
+
+    def _load(self) -> None:
+        """Rebuild the indexes from the manifest (one sequential read)."""
+        if not os.path.exists(self._manifest_path):
+            return
+        replaced: List[Tuple[str, int]] = []
+        try:
+            with open(self._manifest_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                        if record.get("deleted"):
+                            kinds = self._by_event.pop(record["event_id"], None)
+                            if kinds is not None:
+                                self._unindex(record["event_id"], kinds)
+                                for entry in kinds.values():
+                                    self._blob_refs[entry.digest] -= 1
+                            self._tombstones += 1
+                            continue
+                        entry = ManifestEntry(**record)
+                    except (ValueError, TypeError, KeyError, AttributeError):
+                        logger.warning("Capture store: skipping malformed manifest line")
+                        continue
+                    replaced.extend(self._index(entry))
+        except Exception as error:
+            logger.error("Capture store manifest read failed: %s", error)
+        if replaced:
+            # Images superseded before a restart that never got removed
+            self._remove_blobs(replaced)
+        # One stat per live blob (never a directory walk)
+        for digest in [d for d, refs in self._blob_refs.items() if refs <= 0]:
+            del self._blob_refs[digest]
+        for digest in self._blob_refs:
+            try:
+                size = os.path.getsize(os.path.join(self.root, "blobs", digest[:2], f"{digest}.png"))
+            except OSError:
+                continue
+            self._written.add(digest)
+            self._blob_bytes[digest] = size
+            self._total_bytes += size
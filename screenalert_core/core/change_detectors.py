@@ -5,11 +5,17 @@ swap detection strategies at runtime.  Detectors optionally support
 persisting their learned state to disk so warmup can be skipped on
 restart.
 
+Frames may be passed either as PIL images or as NumPy arrays.  The
+monitoring hot path hands detectors 2-D ``uint8`` grayscale views sliced
+from a single per-tick conversion of the captured window, so no PIL
+round-trip happens per region.
+
 Available detectors:
-    ssim                  – Structural Similarity (scikit-image)
+    ssim                  – Structural Similarity (OpenCV kernel, core.ssim)
     phash                 – Perceptual hash (average hash)
     edge_only             – Canny edge diff (bilateral-filtered)
     background_subtraction – OpenCV MOG2 background subtractor
+    cascade               – cheap hash/MAD gate, then one of the above
 """
 
 from __future__ import annotations
@@ -17,37 +23,122 @@ from __future__ import annotations
 import abc
 import logging
 import os
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple, Union
 
 import cv2
 import numpy as np
 from PIL import Image
 
+from screenalert_core.core.pyramid import (
+    DEFAULT_ANALYSIS_SCALE, AnalysisScale, normalize_analysis_scale,
+)
+from screenalert_core.core.ssim import (
+    DEFAULT_SSIM_WINDOW, SSIMStats, compute_stats, normalize_window, ssim_from_stats,
+)
+
 logger = logging.getLogger(__name__)
 
+# A detector input: PIL image or NumPy array (2-D gray or 3-D RGB)
+Frame = Union[Image.Image, np.ndarray]
+
+
+def as_gray(frame: Frame) -> np.ndarray:
+    """Return *frame* as a 2-D ``uint8`` grayscale array.
+
+    2-D ``uint8`` arrays (including non-contiguous slice views) are
+    returned unchanged, so callers that pre-convert pay nothing here.
+    """
+    if isinstance(frame, np.ndarray):
+        if frame.ndim == 2:
+            return frame if frame.dtype == np.uint8 else frame.astype(np.uint8)
+        if frame.shape[2] == 4:
+            return cv2.cvtColor(np.ascontiguousarray(frame), cv2.COLOR_RGBA2GRAY)
+        return cv2.cvtColor(np.ascontiguousarray(frame), cv2.COLOR_RGB2GRAY)
+    return np.asarray(frame.convert("L"), dtype=np.uint8)
+
+
+def frame_size(frame: Frame) -> Tuple[int, int]:
+    """Return ``(width, height)`` for a PIL image or NumPy array."""
+    if isinstance(frame, np.ndarray):
+        return int(frame.shape[1]), int(frame.shape[0])
+    return frame.size
+
 
 # ---------------------------------------------------------------------------
 # Abstract base
 # ---------------------------------------------------------------------------
 
 class ChangeDetector(abc.ABC):
-    """Base class for all change detectors."""
+    """Base class for all change detectors.
+
+    Feature cache
+    -------------
+    In the monitoring loop the ``prev`` frame of one tick is the very same
+    object that was ``curr`` on the tick before.  Detectors that derive
+    per-frame features (gray arrays, edge maps, hash bits, SSIM moments)
+    override ``_extract_features`` and call ``_features_for``/``_remember``
+    so the previous frame is never reprocessed.  The cache is keyed on
+    object identity and dropped by ``reset()``/``invalidate_cache()``.
+    """
 
     # Human-readable name shown in UI / logs
     name: str = "base"
 
-    def __init__(self, **kwargs):
-        """Subclasses accept arbitrary config via **kwargs."""
+    def __init__(self, *, analysis_scale: AnalysisScale = DEFAULT_ANALYSIS_SCALE, **kwargs):
+        """Subclasses accept arbitrary config via **kwargs.
+
+        *analysis_scale* is the pyramid level (or ``"auto"``) the owning
+        region crops its frames from before calling ``detect()``; see
+        ``core.pyramid``.  Detectors themselves see only the scaled crop.
+        """
+        self.analysis_scale: AnalysisScale = normalize_analysis_scale(analysis_scale)
         self.last_detect_info: dict = {}  # populated by detect() with method-specific metrics
+        self._cached_frame: Optional[Frame] = None
+        self._cached_features: Any = None
 
     # -- core API ----------------------------------------------------------
 
     @abc.abstractmethod
-    def detect(self, prev: Image.Image, curr: Image.Image) -> bool:
+    def detect(self, prev: Frame, curr: Frame) -> bool:
         """Return *True* if a meaningful change occurred between frames."""
 
+    def observe_unchanged(self, frame: Frame) -> None:
+        """Record a "no change" result without running detection.
+
+        Called instead of ``detect()`` when the caller knows *frame* is
+        pixel-identical to the previous frame (see ``core.dirty_map``).
+        """
+
     def reset(self) -> None:
         """Reset internal state (e.g. learned background)."""
+        self.invalidate_cache()
+
+    @property
+    def auto_scale_method(self) -> str:
+        """Method name used to pick an ``"auto"`` analysis scale."""
+        return self.name
+
+    # -- feature cache -----------------------------------------------------
+
+    def _extract_features(self, frame: Frame) -> Any:
+        """Derive the per-frame features this detector compares."""
+        return as_gray(frame)
+
+    def _features_for(self, frame: Frame) -> Any:
+        """Return features for *frame*, reusing the last frame's if it matches."""
+        if frame is self._cached_frame and self._cached_features is not None:
+            return self._cached_features
+        return self._extract_features(frame)
+
+    def _remember(self, frame: Frame, features: Any) -> None:
+        """Keep *features* of *frame* for reuse when it becomes ``prev``."""
+        self._cached_frame = frame
+        self._cached_features = features
+
+    def invalidate_cache(self) -> None:
+        """Drop cached features of the last frame."""
+        self._cached_frame = None
+        self._cached_features = None
 
     # -- state persistence -------------------------------------------------
 
@@ -69,30 +160,50 @@ class ChangeDetector(abc.ABC):
 # ---------------------------------------------------------------------------
 
 class SSIMDetector(ChangeDetector):
-    """Structural Similarity change detection."""
+    """Structural Similarity change detection.
+
+    Uses the OpenCV kernel in ``core.ssim``.  The per-frame mean and
+    variance terms are cached, so each tick only filters the current
+    frame and the cross term.
+
+    Args:
+        threshold: Similarity below which a change is reported
+        window: ``"box"`` (7x7, scikit-image default) or ``"gaussian"``
+                (11x11, sigma 1.5)
+    """
 
     name = "ssim"
 
-    def __init__(self, *, threshold: float = 0.99, **kwargs):
+    def __init__(self, *, threshold: float = 0.99, window: str = DEFAULT_SSIM_WINDOW,
+                 **kwargs):
         super().__init__(**kwargs)
         self.threshold = threshold
+        self.window = normalize_window(window)
 
-    def detect(self, prev: Image.Image, curr: Image.Image) -> bool:
-        from skimage.metrics import structural_similarity as ssim
-        if prev.size != curr.size:
+    def _extract_features(self, frame: Frame) -> SSIMStats:
+        return compute_stats(as_gray(frame), self.window)
+
+    def detect(self, prev: Frame, curr: Frame) -> bool:
+        if frame_size(prev) != frame_size(curr):
             return True
-        g1 = np.array(prev.convert("L"))
-        g2 = np.array(curr.convert("L"))
-        score = ssim(g1, g2)
-        changed = score < self.threshold
+        f1 = self._features_for(prev)
+        f2 = self._extract_features(curr)
+        self._remember(curr, f2)
+        score = ssim_from_stats(f1, f2)
+        changed = bool(score < self.threshold)
         self.last_detect_info = {
             "similarity": round(score, 4),
             "threshold": self.threshold,
+            "window": self.window,
         }
         if changed:
             logger.debug("SSIM=%.4f < threshold=%.4f -> CHANGED", score, self.threshold)
         return changed
 
+    def observe_unchanged(self, frame: Frame) -> None:
+        self.last_detect_info = {"similarity": 1.0, "threshold": self.threshold,
+                                 "window": self.window}
+
 
 # ---------------------------------------------------------------------------
 # pHash detector
@@ -108,12 +219,13 @@ class PHashDetector(ChangeDetector):
         self.threshold = threshold
         self.hash_size = hash_size
 
-    def detect(self, prev: Image.Image, curr: Image.Image) -> bool:
-        h1 = self._avg_hash(prev)
-        h2 = self._avg_hash(curr)
+    def detect(self, prev: Frame, curr: Frame) -> bool:
+        h1 = self._features_for(prev)
+        h2 = self._extract_features(curr)
+        self._remember(curr, h2)
         hamming = np.count_nonzero(h1 != h2)
         similarity = 1.0 - hamming / max(1, h1.size)
-        changed = similarity < self.threshold
+        changed = bool(similarity < self.threshold)
         self.last_detect_info = {
             "similarity": round(similarity, 4),
             "threshold": self.threshold,
@@ -122,11 +234,20 @@ class PHashDetector(ChangeDetector):
             logger.debug("pHash similarity=%.4f < threshold=%.4f -> CHANGED", similarity, self.threshold)
         return changed
 
-    def _avg_hash(self, img: Image.Image) -> np.ndarray:
-        gray = img.convert("L").resize(
-            (self.hash_size, self.hash_size), Image.Resampling.LANCZOS
+    def observe_unchanged(self, frame: Frame) -> None:
+        self.last_detect_info = {"similarity": 1.0, "threshold": self.threshold}
+
+    def _extract_features(self, frame: Frame) -> np.ndarray:
+        return self._avg_hash(frame)
+
+    def _avg_hash(self, frame: Frame) -> np.ndarray:
+        # INTER_AREA averages source pixels, which is what an 8x8 average
+        # hash wants and is far cheaper than Lanczos on large regions.
+        small = cv2.resize(
+            as_gray(frame), (self.hash_size, self.hash_size),
+            interpolation=cv2.INTER_AREA,
         )
-        arr = np.array(gray, dtype=np.float32)
+        arr = small.astype(np.float32)
         return arr > arr.mean()
 
 
@@ -151,13 +272,21 @@ class EdgeDetector(ChangeDetector):
         self.canny_high = canny_high
         self.binarize = binarize
 
-    def detect(self, prev: Image.Image, curr: Image.Image) -> bool:
-        g1 = np.array(prev.convert("L"), dtype=np.uint8)
-        g2 = np.array(curr.convert("L"), dtype=np.uint8)
-        edges1 = self._canny(g1)
-        edges2 = self._canny(g2)
+    def detect(self, prev: Frame, curr: Frame) -> bool:
+        # Bilateral filter + Canny run once per frame; the previous
+        # frame's edge map comes from the cache.
+        edges1 = self._features_for(prev)
+        edges2 = self._extract_features(curr)
+        self._remember(curr, edges2)
+        if edges1.shape != edges2.shape:
+            # A resized region has nothing to compare against: all changed
+            self.last_detect_info = {
+                "edge_change_pct": 100.0,
+                "min_edge_pct": round(self.min_edge_fraction * 100, 3),
+            }
+            return True
         changed_px = int(np.count_nonzero(edges1 != edges2))
-        total_px = g1.size
+        total_px = edges2.size
         fraction = changed_px / max(1, total_px)
         self.last_detect_info = {
             "edge_change_pct": round(fraction * 100, 3),
@@ -169,6 +298,15 @@ class EdgeDetector(ChangeDetector):
         )
         return fraction >= self.min_edge_fraction
 
+    def observe_unchanged(self, frame: Frame) -> None:
+        self.last_detect_info = {
+            "edge_change_pct": 0.0,
+            "min_edge_pct": round(self.min_edge_fraction * 100, 3),
+        }
+
+    def _extract_features(self, frame: Frame) -> np.ndarray:
+        return self._canny(as_gray(frame))
+
     def _canny(self, gray: np.ndarray) -> np.ndarray:
         gray = cv2.bilateralFilter(gray, 9, 75, 75)
         if self.binarize:
@@ -207,6 +345,10 @@ class MOG2Detector(ChangeDetector):
 
     name = "background_subtraction"
 
+    # After warmup, feed every Nth pixel-identical frame to the model so
+    # the background keeps being reinforced without paying apply() each tick.
+    STATIC_LEARN_INTERVAL = 5
+
     def __init__(self, *,
                  history: int = 500,
                  var_threshold: float = 16.0,
@@ -228,13 +370,14 @@ class MOG2Detector(ChangeDetector):
         )
         self._frame_count: int = 0
         self._warmed_up: bool = False
+        self._static_ticks: int = 0
 
     # -- core --------------------------------------------------------------
 
-    def detect(self, prev: Image.Image, curr: Image.Image) -> bool:
+    def detect(self, prev: Frame, curr: Frame) -> bool:
         # MOG2 is stateful — it only needs the *current* frame.
         # ``prev`` is ignored (kept for interface compatibility).
-        gray = np.array(curr.convert("L"), dtype=np.uint8)
+        gray = as_gray(curr)
 
         lr = self.learning_rate if self.learning_rate >= 0 else -1
         fg_mask = self._subtractor.apply(gray, learningRate=lr)
@@ -269,7 +412,25 @@ class MOG2Detector(ChangeDetector):
         )
         return fraction >= self.min_fg_fraction
 
+    def observe_unchanged(self, frame: Frame) -> None:
+        # Warmup still needs real frames; afterwards a static frame only
+        # reinforces the background, so learn from a subset of them.
+        if not self._warmed_up:
+            self.detect(frame, frame)
+            return
+        self._static_ticks += 1
+        if self._static_ticks % self.STATIC_LEARN_INTERVAL == 0:
+            lr = self.learning_rate if self.learning_rate >= 0 else -1
+            self._subtractor.apply(as_gray(frame), learningRate=lr)
+            self._frame_count += 1
+        if self.last_detect_info:
+            self.last_detect_info = dict(
+                self.last_detect_info,
+                fg_pct=0.0, fg_pixels=0, frame_count=self._frame_count,
+            )
+
     def reset(self) -> None:
+        super().reset()
         self._subtractor = cv2.createBackgroundSubtractorMOG2(
             history=self.history,
             varThreshold=self.var_threshold,
@@ -277,6 +438,7 @@ class MOG2Detector(ChangeDetector):
         )
         self._frame_count = 0
         self._warmed_up = False
+        self._static_ticks = 0
 
     # -- state persistence -------------------------------------------------
 
@@ -330,6 +492,149 @@ class MOG2Detector(ChangeDetector):
         self.reset()
 
 
+# ---------------------------------------------------------------------------
+# Cascade detector (cheap gate + expensive confirm)
+# ---------------------------------------------------------------------------
+
+class CascadeDetector(ChangeDetector):
+    """Cheap gate followed by an expensive confirm detector.
+
+    Every tick the gate compares tiny per-frame features:
+
+        mad    – mean absolute difference of a downsampled view (at most
+                 ``gate_size`` px on the longer side), divided by 255
+        ahash  – fraction of differing average-hash bits
+        dhash  – fraction of differing difference-hash bits
+
+    Only when the gate score exceeds ``gate_threshold`` (a loose bound on
+    the 0–1 score) does the confirm detector run on the full crop.  Gated
+    ticks are reported to the confirm detector via ``observe_unchanged``
+    so stateful detectors (MOG2) keep learning.
+
+    ``last_detect_info["stage"]`` is ``"gate"`` or ``"confirm"`` depending
+    on which stage decided, with the gate score alongside so the gate
+    threshold can be tuned.
+    """
+
+    name = "cascade"
+
+    GATES = ("mad", "ahash", "dhash")
+    DEFAULT_GATE = "mad"
+    # 0.001 ~ 0.25 grey levels of mean change for "mad"; any bit for hashes
+    DEFAULT_GATE_THRESHOLD = 0.001
+
+    def __init__(self, *,
+                 gate: str = DEFAULT_GATE,
+                 gate_threshold: float = DEFAULT_GATE_THRESHOLD,
+                 gate_size: int = 32,
+                 hash_size: int = 8,
+                 confirm: str = "ssim",
+                 confirm_kwargs: Optional[Dict[str, Any]] = None,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.gate = gate if gate in self.GATES else self.DEFAULT_GATE
+        self.gate_threshold = float(gate_threshold)
+        self.gate_size = max(4, int(gate_size))
+        self.hash_size = max(2, int(hash_size))
+        if confirm == self.name or confirm not in DETECTOR_REGISTRY:
+            confirm = "ssim"
+        self.confirm: ChangeDetector = create_detector(confirm, **(confirm_kwargs or {}))
+        self.gate_rejects = 0
+        self.confirm_runs = 0
+
+    @property
+    def confirm_method(self) -> str:
+        return self.confirm.name
+
+    @property
+    def auto_scale_method(self) -> str:
+        return self.confirm.name
+
+    # -- core --------------------------------------------------------------
+
+    def detect(self, prev: Frame, curr: Frame) -> bool:
+        g1 = self._features_for(prev)
+        g2 = self._extract_features(curr)
+        self._remember(curr, g2)
+        score = self._gate_score(g1, g2)
+
+        if score <= self.gate_threshold:
+            self.gate_rejects += 1
+            self.confirm.observe_unchanged(curr)
+            self.last_detect_info = self._info("gate", score)
+            return False
+
+        self.confirm_runs += 1
+        changed = bool(self.confirm.detect(prev, curr))
+        self.last_detect_info = self._info("confirm", score)
+        self.last_detect_info["confirm"] = dict(self.confirm.last_detect_info)
+        if changed:
+            logger.debug("cascade %s=%.6f > %.6f, %s confirmed CHANGED",
+                         self.gate, score, self.gate_threshold, self.confirm.name)
+        return changed
+
+    def observe_unchanged(self, frame: Frame) -> None:
+        self.confirm.observe_unchanged(frame)
+        self.last_detect_info = self._info("gate", 0.0)
+
+    def _info(self, stage: str, score: float) -> dict:
+        return {
+            "stage": stage,
+            "gate": self.gate,
+            "gate_score": round(score, 6),
+            "gate_threshold": self.gate_threshold,
+            "confirm_method": self.confirm.name,
+            "gate_rejects": self.gate_rejects,
+            "confirm_runs": self.confirm_runs,
+        }
+
+    # -- gate features -----------------------------------------------------
+
+    def _extract_features(self, frame: Frame) -> np.ndarray:
+        gray = as_gray(frame)
+        if gray.size == 0:
+            return gray
+        if self.gate == "mad":
+            h, w = gray.shape
+            factor = min(1.0, self.gate_size / max(w, h))
+            size = (max(1, int(round(w * factor))), max(1, int(round(h * factor))))
+            return cv2.resize(gray, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+        if self.gate == "dhash":
+            small = cv2.resize(gray, (self.hash_size + 1, self.hash_size),
+                               interpolation=cv2.INTER_AREA)
+            return small[:, 1:] > small[:, :-1]
+        small = cv2.resize(gray, (self.hash_size, self.hash_size),
+                           interpolation=cv2.INTER_AREA).astype(np.float32)
+        return small > small.mean()
+
+    def _gate_score(self, f1: np.ndarray, f2: np.ndarray) -> float:
+        """Return the gate score in [0, 1] (1.0 for incomparable features)."""
+        if f1.shape != f2.shape or f1.size == 0:
+            return 1.0
+        if self.gate == "mad":
+            return float(cv2.absdiff(f1, f2).mean()) / 255.0
+        return float(np.count_nonzero(f1 != f2)) / f1.size
+
+    # -- delegation --------------------------------------------------------
+
+    def invalidate_cache(self) -> None:
+        super().invalidate_cache()
+        self.confirm.invalidate_cache()
+
+    def reset(self) -> None:
+        super().reset()
+        self.confirm.reset()
+
+    def save_state(self, path: str) -> None:
+        self.confirm.save_state(path)
+
+    def load_state(self, path: str) -> bool:
+        return self.confirm.load_state(path)
+
+    def on_region_removed(self) -> None:
+        self.confirm.on_region_removed()
+
+
 # ---------------------------------------------------------------------------
 # Factory
 # ---------------------------------------------------------------------------
@@ -340,6 +645,7 @@ DETECTOR_REGISTRY: Dict[str, type] = {
     "phash": PHashDetector,
     "edge_only": EdgeDetector,
     "background_subtraction": MOG2Detector,
+    "cascade": CascadeDetector,
 }
 
 # All valid method names (used by config validation)
@@ -11,6 +11,7 @@ from screenalert_core.utils.constants import (
     DEFAULT_ALERT_THRESHOLD, THUMBNAIL_DEFAULT_WIDTH, THUMBNAIL_DEFAULT_HEIGHT, LOG_LEVELS,
 )
 from screenalert_core.utils.helpers import generate_uuid
+from screenalert_core.core.pyramid import normalize_analysis_scale
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,8 @@ class ConfigManager:
             config_path: Path to config file (default: standard location)
         """
         self.config_path = config_path or CONFIG_FILE
+        # When set, changes stay in memory and save() writes nothing
+        self.read_only = False
         self.window_region_config_path = self._derive_window_region_config_path(self.config_path)
         self.mcp_config_path = self._derive_mcp_config_path(self.config_path)
         self._config = self._load_or_create_config()
@@ -64,6 +67,8 @@ class ConfigManager:
                 "last_window_size_filter_value": "",
                 "default_alert_threshold": DEFAULT_ALERT_THRESHOLD,
                 "change_detection_method": "ssim",
+                "ssim_window": "box",
+                "analysis_scale": 1.0,
                 "min_edge_fraction": 0.003,
                 "canny_low": 40,
                 "canny_high": 120,
@@ -73,6 +78,9 @@ class ConfigManager:
                 "bg_learning_rate": -1.0,
                 "bg_warmup_frames": 30,
                 "bg_min_fg_fraction": 0.003,
+                "cascade_gate": "mad",
+                "cascade_gate_threshold": 0.001,
+                "cascade_confirm": "ssim",
                 "alert_hold_seconds": 10,
                 "enable_sound": False,
                 "enable_tts": True,
@@ -80,10 +88,22 @@ class ConfigManager:
                 "default_tts_message": "Alert {window} {region_name}",
                 "mute_until_ts": 0,
                 "pause_reminder_interval_sec": 60,
+                "detection_workers": 0,
+                "capture_workers": 4,
+                "capture_deadline_ms": 0,
+                "adaptive_polling": False,
+                "adaptive_max_interval_ms": 10000,
+                "adaptive_stable_seconds": 30,
+                "load_governor": True,
                 "capture_on_alert": False,
                 "capture_on_green": False,
                 "capture_dir": os.path.join(CONFIG_DIR, "captures"),
                 "capture_filename_format": "{timestamp}_{window}_{region}_{status}.png",
+                "capture_png_compress_level": 1,
+                "capture_store": True,
+                "capture_max_mb": 1024,
+                "capture_max_age_days": 30,
+                "capture_max_per_region": 0,
                 "anonymize_logs": False,
                 "suppress_fullscreen": False,
                 "update_check_enabled": False,
@@ -100,6 +120,7 @@ class ConfigManager:
                 # Event logging
                 "event_log_enabled": True,
                 "event_log_max_rows": 5000,
+                "event_log_backend": "jsonl",
                 # MCP server — these are also persisted to mcp_config.json
                 "mcp_enabled": True,
                 "mcp_listen_host": "127.0.0.1",
@@ -233,7 +254,14 @@ class ConfigManager:
     })
 
     def save(self) -> bool:
-        """Save split config files (app/UI, windows/regions, and MCP)."""
+        """Save split config files (app/UI, windows/regions, and MCP).
+
+        Returns:
+            True if written (False on error or when ``read_only``)
+        """
+        if self.read_only:
+            logger.debug(f"Config is read-only, not saving {self.config_path}")
+            return False
         try:
             os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
             os.makedirs(os.path.dirname(self.window_region_config_path), exist_ok=True)
@@ -398,10 +426,24 @@ class ConfigManager:
 
     def get_change_detection_method(self) -> str:
         method = self._config.get("app", {}).get("change_detection_method", "ssim")
-        return method if method in ("ssim", "phash", "edge_only", "background_subtraction") else "ssim"
+        return method if method in ("ssim", "phash", "edge_only", "background_subtraction", "cascade") else "ssim"
 
     def set_change_detection_method(self, method: str) -> None:
-        self._config["app"]["change_detection_method"] = method if method in ("ssim", "phash", "edge_only", "background_subtraction") else "ssim"
+        self._config["app"]["change_detection_method"] = method if method in ("ssim", "phash", "edge_only", "background_subtraction", "cascade") else "ssim"
+
+    def get_ssim_window(self) -> str:
+        window = self._config.get("app", {}).get("ssim_window", "box")
+        return window if window in ("box", "gaussian") else "box"
+
+    def set_ssim_window(self, window: str) -> None:
+        self._config["app"]["ssim_window"] = window if window in ("box", "gaussian") else "box"
+
+    def get_analysis_scale(self):
+        """Return the default analysis scale (pyramid level float or "auto")."""
+        return normalize_analysis_scale(self._config.get("app", {}).get("analysis_scale", 1.0))
+
+    def set_analysis_scale(self, value) -> None:
+        self._config["app"]["analysis_scale"] = normalize_analysis_scale(value)
 
     def get_min_edge_fraction(self) -> float:
         return float(self._config.get("app", {}).get("min_edge_fraction", 0.003))
@@ -457,6 +499,26 @@ class ConfigManager:
     def set_bg_min_fg_fraction(self, value: float) -> None:
         self._config["app"]["bg_min_fg_fraction"] = max(0.0, min(float(value), 1.0))
 
+    def get_cascade_gate(self) -> str:
+        gate = self._config.get("app", {}).get("cascade_gate", "mad")
+        return gate if gate in ("mad", "ahash", "dhash") else "mad"
+
+    def set_cascade_gate(self, gate: str) -> None:
+        self._config["app"]["cascade_gate"] = gate if gate in ("mad", "ahash", "dhash") else "mad"
+
+    def get_cascade_gate_threshold(self) -> float:
+        return float(self._config.get("app", {}).get("cascade_gate_threshold", 0.001))
+
+    def set_cascade_gate_threshold(self, value: float) -> None:
+        self._config["app"]["cascade_gate_threshold"] = max(0.0, min(float(value), 1.0))
+
+    def get_cascade_confirm(self) -> str:
+        method = self._config.get("app", {}).get("cascade_confirm", "ssim")
+        return method if method in ("ssim", "phash", "edge_only", "background_subtraction") else "ssim"
+
+    def set_cascade_confirm(self, method: str) -> None:
+        self._config["app"]["cascade_confirm"] = method if method in ("ssim", "phash", "edge_only", "background_subtraction") else "ssim"
+
     def get_alert_hold_seconds(self) -> int:
         return int(self._config.get("app", {}).get("alert_hold_seconds", 10))
 
@@ -499,6 +561,53 @@ class ConfigManager:
     def set_pause_reminder_interval_sec(self, seconds: int) -> None:
         self._config["app"]["pause_reminder_interval_sec"] = max(10, min(int(seconds), 3600))
 
+    def get_detection_workers(self) -> int:
+        """Region detection thread pool size (0 = sequential on the engine thread)"""
+        return int(self._config.get("app", {}).get("detection_workers", 0))
+
+    def set_detection_workers(self, workers: int) -> None:
+        self._config["app"]["detection_workers"] = max(0, min(int(workers), 32))
+
+    def get_capture_workers(self) -> int:
+        """Window capture thread pool size (0 = capture windows one at a time)"""
+        return int(self._config.get("app", {}).get("capture_workers", 4))
+
+    def set_capture_workers(self, workers: int) -> None:
+        self._config["app"]["capture_workers"] = max(0, min(int(workers), 16))
+
+    def get_capture_deadline_ms(self) -> int:
+        """Per-tick capture deadline (0 = 80% of the refresh rate)"""
+        return int(self._config.get("app", {}).get("capture_deadline_ms", 0))
+
+    def set_capture_deadline_ms(self, ms: int) -> None:
+        self._config["app"]["capture_deadline_ms"] = max(0, min(int(ms), 5000))
+
+    def get_adaptive_polling(self) -> bool:
+        """Back off polling of regions that stay OK (see adaptive_* settings)"""
+        return bool(self._config.get("app", {}).get("adaptive_polling", False))
+
+    def set_adaptive_polling(self, enabled: bool) -> None:
+        self._config["app"]["adaptive_polling"] = bool(enabled)
+
+    def get_adaptive_max_interval_ms(self) -> int:
+        return int(self._config.get("app", {}).get("adaptive_max_interval_ms", 10000))
+
+    def set_adaptive_max_interval_ms(self, ms: int) -> None:
+        self._config["app"]["adaptive_max_interval_ms"] = max(1000, min(int(ms), 600000))
+
+    def get_adaptive_stable_seconds(self) -> int:
+        return int(self._config.get("app", {}).get("adaptive_stable_seconds", 30))
+
+    def set_adaptive_stable_seconds(self, seconds: int) -> None:
+        self._config["app"]["adaptive_stable_seconds"] = max(5, min(int(seconds), 3600))
+
+    def get_load_governor(self) -> bool:
+        """Shed monitoring work while the loop overruns its refresh rate"""
+        return bool(self._config.get("app", {}).get("load_governor", True))
+
+    def set_load_governor(self, enabled: bool) -> None:
+        self._config["app"]["load_governor"] = bool(enabled)
+
     def get_capture_on_alert(self) -> bool:
         return bool(self._config.get("app", {}).get("capture_on_alert", False))
 
@@ -523,6 +632,41 @@ class ConfigManager:
     def set_capture_filename_format(self, pattern: str) -> None:
         self._config["app"]["capture_filename_format"] = pattern or "{timestamp}_{window}_{region}_{status}.png"
 
+    def get_capture_png_compress_level(self) -> int:
+        """PNG zlib level for snapshots and diagnostics (0 = fastest, 9 = smallest)"""
+        return max(0, min(9, int(self._config.get("app", {}).get("capture_png_compress_level", 1))))
+
+    def set_capture_png_compress_level(self, level: int) -> None:
+        self._config["app"]["capture_png_compress_level"] = max(0, min(9, int(level)))
+
+    def get_capture_store(self) -> bool:
+        """Keep captures in the deduplicating store instead of loose files"""
+        return bool(self._config.get("app", {}).get("capture_store", True))
+
+    def set_capture_store(self, enabled: bool) -> None:
+        self._config["app"]["capture_store"] = bool(enabled)
+
+    def get_capture_max_mb(self) -> int:
+        """Capture store size quota in MB (0 = unlimited)"""
+        return max(0, min(1048576, int(self._config.get("app", {}).get("capture_max_mb", 1024))))
+
+    def set_capture_max_mb(self, value: int) -> None:
+        self._config["app"]["capture_max_mb"] = max(0, min(1048576, int(value)))
+
+    def get_capture_max_age_days(self) -> int:
+        """Delete stored captures older than this many days (0 = keep)"""
+        return max(0, min(3650, int(self._config.get("app", {}).get("capture_max_age_days", 30))))
+
+    def set_capture_max_age_days(self, value: int) -> None:
+        self._config["app"]["capture_max_age_days"] = max(0, min(3650, int(value)))
+
+    def get_capture_max_per_region(self) -> int:
+        """Stored alert captures kept per region (0 = unlimited)"""
+        return max(0, min(100000, int(self._config.get("app", {}).get("capture_max_per_region", 0))))
+
+    def set_capture_max_per_region(self, value: int) -> None:
+        self._config["app"]["capture_max_per_region"] = max(0, min(100000, int(value)))
+
     def get_anonymize_logs(self) -> bool:
         return bool(self._config.get("app", {}).get("anonymize_logs", False))
 
@@ -618,6 +762,15 @@ class ConfigManager:
     def set_event_log_max_rows(self, rows: int) -> None:
         self._config["app"]["event_log_max_rows"] = max(100, int(rows))
 
+    def get_event_log_backend(self) -> str:
+        backend = self._config.get("app", {}).get("event_log_backend", "jsonl")
+        return backend if backend in ("jsonl", "sqlite") else "jsonl"
+
+    def set_event_log_backend(self, backend: str) -> None:
+        if backend not in ("jsonl", "sqlite"):
+            backend = "jsonl"
+        self._config["app"]["event_log_backend"] = backend
+
     # ── MCP server ────────────────────────────────────────────────────────────
 
     def get_mcp_enabled(self) -> bool:
@@ -0,0 +1,121 @@
+"""Tile-hash dirty map for captured window frames.
+
+Most ticks most windows are static.  ``TileDirtyMap`` hashes a grayscale
+window frame in fixed-size tiles and compares the hashes with the previous
+tick, so the monitoring engine can skip detectors for regions whose pixels
+did not change at all.
+
+Hashing is exact for single-word edits: each tile hash is a sum of the
+tile's 64-bit words multiplied by fixed odd constants (mod 2**64), so any
+change to one word always changes the hash.  A whole-frame CRC32 is
+checked first so completely static frames cost a single pass.
+"""
+
+import logging
+import zlib
+from typing import Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TILE_SIZE = 32
+
+
+class TileDirtyMap:
+    """Tracks which tiles of one window's frame changed since the last tick."""
+
+    def __init__(self, tile_size: int = DEFAULT_TILE_SIZE):
+        """Initialize dirty map
+
+        Args:
+            tile_size: Tile edge in pixels (rounded up to a multiple of 8)
+        """
+        self.tile_size = max(8, (int(tile_size) + 7) // 8 * 8)
+        rng = np.random.default_rng(0x5CA1E)
+        words = self.tile_size // 8
+        # Odd multipliers are invertible mod 2**64
+        self._weights = (
+            rng.integers(0, 2**63, size=(self.tile_size, words), dtype=np.uint64)
+            | np.uint64(1)
+        )
+        self._frame_crc: Optional[int] = None
+        self._shape: Optional[Tuple[int, int]] = None
+        self._tile_hashes: Optional[np.ndarray] = None
+        self._dirty: Optional[np.ndarray] = None
+
+    def reset(self) -> None:
+        """Forget the previous frame; the next update marks everything dirty."""
+        self._frame_crc = None
+        self._shape = None
+        self._tile_hashes = None
+        self._dirty = None
+
+    def update(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        """Hash *gray* and compare with the previous tick.
+
+        Args:
+            gray: 2-D uint8 grayscale frame
+
+        Returns:
+            Boolean grid (tile rows x tile cols) of dirty tiles, or None
+            when there is no comparable previous frame (first frame or
+            size change), meaning every tile must be treated as dirty.
+        """
+        frame = np.ascontiguousarray(gray)
+        crc = zlib.crc32(frame)
+        shape = frame.shape
+
+        if shape != self._shape or self._tile_hashes is None:
+            self._shape = shape
+            self._frame_crc = crc
+            self._tile_hashes = self._hash_tiles(frame)
+            self._dirty = None
+            return None
+
+        # Whole-frame fast path: nothing changed
+        if crc == self._frame_crc:
+            self._dirty = np.zeros(self._tile_hashes.shape, dtype=bool)
+            return self._dirty
+
+        hashes = self._hash_tiles(frame)
+        self._dirty = hashes != self._tile_hashes
+        self._tile_hashes = hashes
+        self._frame_crc = crc
+        return self._dirty
+
+    def dirty_tiles(self) -> Optional[Set[Tuple[int, int]]]:
+        """Return the set of dirty ``(col, row)`` tiles from the last update.
+
+        None means "all tiles" (no comparable previous frame).
+        """
+        if self._dirty is None:
+            return None
+        rows, cols = np.nonzero(self._dirty)
+        return {(int(c), int(r)) for r, c in zip(rows, cols)}
+
+    def is_rect_dirty(self, rect: Tuple[int, int, int, int]) -> bool:
+        """Return True if any tile touched by *rect* changed on the last update."""
+        if self._dirty is None:
+            return True
+        x, y, width, height = (int(v) for v in rect)
+        h, w = self._shape
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(w, x + width), min(h, y + height)
+        if x1 <= x0 or y1 <= y0:
+            return False
+        t = self.tile_size
+        return bool(self._dirty[y0 // t:(y1 - 1) // t + 1,
+                                x0 // t:(x1 - 1) // t + 1].any())
+
+    def _hash_tiles(self, frame: np.ndarray) -> np.ndarray:
+        """Return a (tile rows x tile cols) uint64 hash grid for *frame*."""
+        t = self.tile_size
+        h, w = frame.shape
+        rows, cols = -(-h // t), -(-w // t)
+        if h != rows * t or w != cols * t:
+            frame = np.pad(frame, ((0, rows * t - h), (0, cols * t - w)))
+        words = frame.view(np.uint64).reshape(rows, t, cols, t // 8)
+        with np.errstate(over="ignore"):
+            weighted = words * self._weights[np.newaxis, :, np.newaxis, :]
+            return weighted.sum(axis=(1, 3), dtype=np.uint64)
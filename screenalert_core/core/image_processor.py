@@ -5,7 +5,8 @@ import cv2
 import numpy as np
 from typing import Tuple, Optional
 from PIL import Image
-from skimage.metrics import structural_similarity as ssim
+
+from screenalert_core.core.ssim import structural_similarity
 
 logger = logging.getLogger(__name__)
 
@@ -26,14 +27,45 @@ class ImageProcessor:
         """
         x, y, width, height = rect
         return img.crop((x, y, x + width, y + height))
-    
+
+    @staticmethod
+    def to_gray_array(img: Image.Image) -> np.ndarray:
+        """Convert a whole frame to a 2-D uint8 grayscale array.
+
+        Intended to be called once per captured frame; regions are then
+        taken as views with :meth:`crop_array`.
+        """
+        if img.mode == 'L':
+            return np.asarray(img)
+        return np.asarray(img.convert('L'))
+
+    @staticmethod
+    def crop_array(arr: np.ndarray, rect: Tuple[int, int, int, int]) -> np.ndarray:
+        """Return a zero-copy slice view of *arr* for a region rect
+
+        Args:
+            arr: Frame array (H x W or H x W x C)
+            rect: (x, y, width, height)
+
+        Returns:
+            View into *arr*, clipped to the frame bounds (may be empty)
+        """
+        x, y, width, height = (int(v) for v in rect)
+        h, w = arr.shape[:2]
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(w, x + width), min(h, y + height)
+        if x1 <= x0 or y1 <= y0:
+            return arr[0:0, 0:0]
+        return arr[y0:y1, x0:x1]
+
     @staticmethod
-    def calculate_ssim(img1: Image.Image, img2: Image.Image) -> float:
+    def calculate_ssim(img1: Image.Image, img2: Image.Image, window: str = "box") -> float:
         """Calculate structural similarity between two images
         
         Args:
             img1: First PIL Image
             img2: Second PIL Image
+            window: SSIM window, ``"box"`` or ``"gaussian"`` (see ``core.ssim``)
         
         Returns:
             SSIM score (0.0 to 1.0, higher = more similar)
@@ -47,11 +79,11 @@ class ImageProcessor:
             gray2 = img2.convert('L')
             
             # Convert to numpy arrays
-            arr1 = np.array(gray1)
-            arr2 = np.array(gray2)
+            arr1 = np.asarray(gray1)
+            arr2 = np.asarray(gray2)
             
             # Calculate SSIM
-            score = ssim(arr1, arr2)
+            score = structural_similarity(arr1, arr2, window=window)
             return max(0.0, min(score, 1.0))  # Clamp to 0-1
         
         except Exception as e:
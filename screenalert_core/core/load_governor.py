@@ -0,0 +1,153 @@
+"""Overload governor: shed monitoring work while the loop overruns.
+
+The engine loop reports how long each tick took against its budget (the
+global ``refresh_rate_ms``).  When ticks keep running over budget the
+governor raises its *load level* one step at a time; each level adds one
+kind of degradation on top of the previous ones:
+
+    0  full               full quality
+    1  reduced_scale      regions (except ``priority: high``) are analysed
+                          one pyramid level lower
+    2  shed_low_priority  ``priority: low`` regions run on alternate ticks
+    3  defer_diagnostics  alert diagnostics images are queued, not written
+
+Once ticks have comfortable headroom again the level drops back one step
+at a time.  Both directions need a streak of consecutive ticks, and the
+two thresholds are far apart, so the level does not flap.
+"""
+
+from __future__ import annotations
+
+import collections
+import time
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+LEVEL_FULL = 0
+LEVEL_REDUCED_SCALE = 1
+LEVEL_SHED_LOW_PRIORITY = 2
+LEVEL_DEFER_DIAGNOSTICS = 3
+LEVEL_NAMES = ("full", "reduced_scale", "shed_low_priority", "defer_diagnostics")
+MAX_LEVEL = LEVEL_DEFER_DIAGNOSTICS
+
+OVERRUN_RATIO = 1.0     # tick longer than its budget
+HEADROOM_RATIO = 0.5    # tick shorter than half its budget
+DEFAULT_OVERRUN_TICKS = 5
+DEFAULT_HEADROOM_TICKS = 20
+_HISTORY = 20
+
+
+class GovernorStep(NamedTuple):
+    """One change of load level."""
+    timestamp: float    # time.time()
+    old_level: int
+    new_level: int
+    tick_ms: float      # duration of the tick that triggered the step
+    budget_ms: float
+
+    @property
+    def degraded(self) -> bool:
+        return self.new_level > self.old_level
+
+    def as_dict(self) -> Dict:
+        return {
+            "timestamp": self.timestamp,
+            "from": LEVEL_NAMES[self.old_level],
+            "to": LEVEL_NAMES[self.new_level],
+            "level": self.new_level,
+            "tick_ms": round(self.tick_ms, 2),
+            "budget_ms": round(self.budget_ms, 2),
+        }
+
+
+class LoadGovernor:
+    """Track tick durations and pick a load level."""
+
+    def __init__(self, overrun_ticks: int = DEFAULT_OVERRUN_TICKS,
+                 headroom_ticks: int = DEFAULT_HEADROOM_TICKS):
+        """Initialize governor
+
+        Args:
+            overrun_ticks: Consecutive over-budget ticks per degradation step
+            headroom_ticks: Consecutive ticks under half the budget per
+                restoration step
+        """
+        self.overrun_ticks = max(1, int(overrun_ticks))
+        self.headroom_ticks = max(1, int(headroom_ticks))
+        self._level = LEVEL_FULL
+        self._overrun_streak = 0
+        self._headroom_streak = 0
+        self._ticks = 0
+        self._overruns = 0
+        self._last_tick_ms = 0.0
+        self._history: Deque[GovernorStep] = collections.deque(maxlen=_HISTORY)
+
+    @property
+    def level(self) -> int:
+        return self._level
+
+    @property
+    def level_name(self) -> str:
+        return LEVEL_NAMES[self._level]
+
+    def observe(self, tick_ms: float, budget_ms: float,
+                now: Optional[float] = None) -> Optional[GovernorStep]:
+        """Record one tick and move the load level if a streak completed.
+
+        Returns:
+            The GovernorStep taken, or None when the level is unchanged
+        """
+        self._ticks += 1
+        self._last_tick_ms = float(tick_ms)
+        if budget_ms <= 0:
+            return None
+        ratio = tick_ms / budget_ms
+        if ratio > OVERRUN_RATIO:
+            self._overruns += 1
+            self._overrun_streak += 1
+            self._headroom_streak = 0
+        elif ratio < HEADROOM_RATIO:
+            self._headroom_streak += 1
+            self._overrun_streak = 0
+        else:
+            self._overrun_streak = self._headroom_streak = 0
+
+        if self._overrun_streak >= self.overrun_ticks and self._level < MAX_LEVEL:
+            return self._step(self._level + 1, tick_ms, budget_ms, now)
+        if self._headroom_streak >= self.headroom_ticks and self._level > LEVEL_FULL:
+            return self._step(self._level - 1, tick_ms, budget_ms, now)
+        return None
+
+    def reset(self, now: Optional[float] = None) -> Optional[GovernorStep]:
+        """Return to full quality at once (governor switched off)."""
+        self._overrun_streak = self._headroom_streak = 0
+        if self._level == LEVEL_FULL:
+            return None
+        return self._step(LEVEL_FULL, self._last_tick_ms, 0.0, now)
+
+    def history(self) -> List[GovernorStep]:
+        """Most recent level changes, oldest first."""
+        return list(self._history)
+
+    def stats(self) -> Dict:
+        """Current level, tick counters and recent steps."""
+        return {
+            "level": self._level,
+            "level_name": self.level_name,
+            "ticks": self._ticks,
+            "overruns": self._overruns,
+            "last_tick_ms": round(self._last_tick_ms, 2),
+            "overrun_streak": self._overrun_streak,
+            "headroom_streak": self._headroom_streak,
+            "steps": [step.as_dict() for step in self._history],
+        }
+
+    # ── helpers ──────────────────────────────────────────────────────
+
+    def _step(self, level: int, tick_ms: float, budget_ms: float,
+              now: Optional[float]) -> GovernorStep:
+        step = GovernorStep(time.time() if now is None else now,
+                            self._level, level, float(tick_ms), float(budget_ms))
+        self._level = level
+        self._overrun_streak = self._headroom_streak = 0
+        self._history.append(step)
+        return step
@@ -0,0 +1,273 @@
+"""Bounded queues and worker stages for the engine pipeline.
+
+The engine loop is split into stages connected by bounded queues:
+
+    capture (loop thread) ──frames──> detect ──state changes──> dispatch
+                                             └──alert records──> alerts
+
+Each stage has its own worker thread(s), so a slow disk or sound device
+in a downstream stage never holds up detection, and detection never
+holds up the next capture.  (The alerts stage is the AlertDispatcher in
+``monitoring.alert_dispatcher``.)
+
+A full queue never blocks its producer; what happens instead is the
+queue's *backpressure policy* (a queue without a size bound never drops):
+
+* ``drop_oldest`` – the oldest queued item is discarded;
+* ``coalesce``    – items carry a key (window, region); a new item whose
+  key is already queued is merged into the queued one, in place, so the
+  queue holds at most one item per key.  A full queue then drops its
+  oldest item like ``drop_oldest``.
+
+Items a ``keep`` predicate selects are never dropped: a full queue drops
+its oldest other item instead, and grows past its bound when everything
+queued must be kept.
+
+Until ``start()`` is called a stage runs its handler inline on the
+submitting thread, so direct callers (tests, headless tools) keep a
+synchronous engine.
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_COALESCE = "coalesce"
+POLICIES = (POLICY_DROP_OLDEST, POLICY_COALESCE)
+
+_STOP_TIMEOUT_S = 5.0
+
+
+class BoundedQueue:
+    """Thread-safe FIFO with a size bound and a backpressure policy."""
+
+    def __init__(self, maxsize: Optional[int], policy: str = POLICY_DROP_OLDEST,
+                 key: Optional[Callable[[Any], Hashable]] = None,
+                 merge: Optional[Callable[[Any, Any], Any]] = None,
+                 keep: Optional[Callable[[Any], bool]] = None):
+        """Initialize queue
+
+        Args:
+            maxsize: Most items held at once (at least 1); None for no
+                bound, so nothing is ever dropped
+            policy: ``POLICY_DROP_OLDEST`` or ``POLICY_COALESCE``
+            key: Coalesce key of an item (required for ``coalesce``)
+            merge: ``merge(queued, new)`` -> item kept in the queued
+                item's place (default: the new item)
+            keep: True for items that must never be dropped
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        if policy == POLICY_COALESCE and key is None:
+            raise ValueError("coalesce policy needs a key function")
+        self.maxsize = None if maxsize is None else max(1, int(maxsize))
+        self.policy = policy
+        self._key = key
+        self._merge = merge or (lambda queued, new: new)
+        self._keep = keep
+        self._items: "collections.OrderedDict[Hashable, Any]" = collections.OrderedDict()
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._stats = {"put": 0, "dropped": 0, "coalesced": 0, "max_depth": 0}
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+    def put(self, item: Any) -> int:
+        """Queue *item*, applying the backpressure policy when full.
+
+        Returns:
+            How many items will not come out of the queue because of this
+            put (merged into a queued item, or dropped)
+        """
+        with self._cond:
+            self._stats["put"] += 1
+            if self.policy == POLICY_COALESCE:
+                key = self._key(item)
+                if key in self._items:
+                    self._items[key] = self._merge(self._items[key], item)
+                    self._stats["coalesced"] += 1
+                    return 1
+            else:
+                key = self._seq
+                self._seq += 1
+            dropped = 0
+            while self.maxsize is not None and len(self._items) >= self.maxsize:
+                victim = self._oldest_droppable()
+                if victim is None:
+                    break
+                del self._items[victim]
+                dropped += 1
+            self._stats["dropped"] += dropped
+            self._items[key] = item
+            self._stats["max_depth"] = max(self._stats["max_depth"], len(self._items))
+            self._cond.notify()
+            return dropped
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Remove and return the oldest item, or None after *timeout*."""
+        with self._cond:
+            if not self._items and not self._cond.wait_for(lambda: self._items, timeout):
+                return None
+            return self._items.popitem(last=False)[1]
+
+    def clear(self) -> int:
+        """Discard everything queued; returns how many items were dropped."""
+        with self._cond:
+            count = len(self._items)
+            self._items.clear()
+            self._stats["dropped"] += count
+            return count
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {**self._stats, "depth": len(self._items),
+                    "maxsize": self.maxsize, "policy": self.policy}
+
+    def _oldest_droppable(self) -> Optional[Hashable]:
+        """Key of the oldest item ``keep`` does not protect (caller holds the lock)."""
+        for key, item in self._items.items():
+            if self._keep is None or not self._keep(item):
+                return key
+        return None
+
+
+class PipelineStage:
+    """A bounded queue drained by worker threads running one handler."""
+
+    def __init__(self, name: str, handler: Callable[[Any], None], maxsize: Optional[int],
+                 policy: str = POLICY_DROP_OLDEST,
+                 key: Optional[Callable[[Any], Hashable]] = None,
+                 merge: Optional[Callable[[Any, Any], Any]] = None,
+                 workers: int = 1,
+                 keep: Optional[Callable[[Any], bool]] = None):
+        """Initialize stage
+
+        Args:
+            name: Stage name (thread names, logs, stats)
+            handler: Called with each item; exceptions are logged
+            maxsize, policy, key, merge, keep: See ``BoundedQueue``
+            workers: Worker threads once started.  More than one only
+                suits handlers that are safe to run concurrently.
+        """
+        self.name = name
+        self._handler = handler
+        self.queue = BoundedQueue(maxsize, policy, key, merge, keep)
+        self._workers = max(1, int(workers))
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self._idle = threading.Condition()
+        self._busy = 0
+        self._stats_lock = threading.Lock()
+        self._stats = {"processed": 0, "errors": 0, "busy_ms": 0.0, "last_ms": 0.0}
+        self._unreported_busy_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        """True while worker threads drain the queue (False = inline)."""
+        return self._running
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._work, daemon=True, name=f"pipeline-{self.name}-{i}")
+            for i in range(self._workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, drain: bool = True, timeout: float = _STOP_TIMEOUT_S) -> None:
+        """Stop the workers, first finishing queued items when *drain*."""
+        if not self._running:
+            return
+        if drain:
+            self.wait_idle(timeout)
+        else:
+            self._settle(self.queue.clear())
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        # Anything submitted while stopping still gets handled
+        while len(self.queue):
+            item = self.queue.get(0)
+            if item is not None:
+                self._process(item)
+        with self._idle:
+            self._busy = 0
+
+    def submit(self, item: Any) -> None:
+        """Queue *item* for the workers, or handle it now when not started."""
+        if self._running:
+            with self._idle:
+                self._busy += 1
+            # Merged or dropped items will never reach a worker
+            discarded = self.queue.put(item)
+            if discarded:
+                self._settle(discarded)
+        else:
+            self._process(item)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted item has been handled."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._busy <= 0, timeout)
+
+    def take_busy_ms(self) -> float:
+        """Worker time spent handling items since the last call."""
+        with self._stats_lock:
+            busy, self._unreported_busy_ms = self._unreported_busy_ms, 0.0
+        return busy
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {**self.queue.stats(), **stats,
+                "busy_ms": round(stats["busy_ms"], 2),
+                "last_ms": round(stats["last_ms"], 2),
+                "workers": self._workers if self._running else 0}
+
+    # ── helpers ──────────────────────────────────────────────────────
+
+    def _work(self) -> None:
+        while self._running:
+            item = self.queue.get(timeout=0.1)
+            if item is None:
+                continue
+            self._process(item, report=True)
+            self._settle(1)
+
+    def _process(self, item: Any, report: bool = False) -> None:
+        """Run the handler on *item*; *report* counts it for ``take_busy_ms``."""
+        start = time.perf_counter()
+        failed = False
+        try:
+            self._handler(item)
+        except Exception as error:
+            failed = True
+            logger.error("Pipeline stage %s failed: %s", self.name, error, exc_info=True)
+        elapsed = (time.perf_counter() - start) * 1000.0
+        # Workers and the submitting thread all land here
+        with self._stats_lock:
+            self._stats["errors"] += int(failed)
+            self._stats["processed"] += 1
+            self._stats["busy_ms"] += elapsed
+            self._stats["last_ms"] = elapsed
+            if report:
+                self._unreported_busy_ms += elapsed
+
+    def _settle(self, count: int) -> None:
+        with self._idle:
+            self._busy -= count
+            if self._busy <= 0:
+                self._idle.notify_all()
@@ -0,0 +1,239 @@
+"""Deadline-ordered polling of windows and regions.
+
+Every window and region is a periodic job with its own interval.  Jobs
+sit in a heap ordered by their next deadline (``time.monotonic``), so the
+engine loop can sleep until exactly the next one is due instead of
+ticking at a single global rate.
+
+Deadlines advance by whole intervals from the previous deadline, never
+from the time the job actually ran, so a late tick does not shift every
+later one (no drift).  A job that falls more than one interval behind
+skips the missed slots rather than running several times in a row.
+
+Each run records how late it started against its deadline; ``stats()``
+and ``lateness()`` report the aggregate and per-job figures.
+
+``adaptive_interval`` computes the back-off used for adaptive polling:
+a job that has been quiet for a while is polled progressively less often.
+
+A job may also carry a *minimum interval*: ``run_early()`` lets it run
+ahead of its deadline (e.g. on a frame captured for another region of
+the same window) as long as at least that long has passed since it last
+ran.  The early run re-anchors its deadlines.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+MIN_POLL_INTERVAL_S = 0.05
+
+
+class DueJob(NamedTuple):
+    """A job whose deadline has passed."""
+    key: Hashable
+    due: float          # deadline it is running for (monotonic seconds)
+    late_ms: float      # how far past the deadline it was popped
+
+
+class _Job:
+    __slots__ = ("interval", "min_interval", "due", "last_run", "seq",
+                 "runs", "early_runs", "skipped", "late_last", "late_max", "late_total")
+
+    def __init__(self, interval: float, min_interval: float, due: float):
+        self.interval = interval
+        self.min_interval = min_interval
+        self.due = due
+        self.last_run: Optional[float] = None
+        self.seq = 0
+        self.runs = 0
+        self.early_runs = 0
+        self.skipped = 0
+        self.late_last = 0.0
+        self.late_max = 0.0
+        self.late_total = 0.0
+
+
+def _clamp_interval(seconds: float) -> float:
+    return max(MIN_POLL_INTERVAL_S, float(seconds))
+
+
+def adaptive_interval(base: float, stable_for: float, stable_period: float,
+                      ceiling: float) -> float:
+    """Back off a quiet job: double *base* for every *stable_period* it stayed stable.
+
+    Args:
+        base: Normal interval
+        stable_for: How long the job has been stable (same unit as *base*)
+        stable_period: Stable time per doubling
+        ceiling: Longest interval returned (never below *base*)
+
+    Returns:
+        ``min(ceiling, base * 2**(stable_for // stable_period))``
+    """
+    if stable_for <= 0 or stable_period <= 0 or ceiling <= base:
+        return base
+    steps = min(int(stable_for // stable_period), 32)
+    return min(ceiling, base * (2 ** steps))
+
+
+class PollScheduler:
+    """Heap of periodic jobs keyed by any hashable id."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._jobs: Dict[Hashable, _Job] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._jobs
+
+    def keys(self) -> List[Hashable]:
+        return list(self._jobs)
+
+    # ── jobs ─────────────────────────────────────────────────────────
+
+    def set_job(self, key: Hashable, interval: float, min_interval: float = 0.0,
+                now: Optional[float] = None) -> None:
+        """Add a job (due immediately) or update an existing job's intervals.
+
+        Args:
+            key: Job id
+            interval: Seconds between runs (clamped to MIN_POLL_INTERVAL_S)
+            min_interval: Shortest gap allowed for ``run_early``; 0 disables
+                early runs
+            now: Current monotonic time (default: the scheduler clock)
+        """
+        interval = _clamp_interval(interval)
+        min_interval = min(interval, max(0.0, float(min_interval or 0.0)))
+        job = self._jobs.get(key)
+        if job is None:
+            job = self._jobs[key] = _Job(interval, min_interval,
+                                         self._clock() if now is None else now)
+            self._push(key, job)
+            return
+        if job.interval == interval and job.min_interval == min_interval:
+            return
+        job.interval, job.min_interval = interval, min_interval
+        if job.last_run is not None:
+            job.due = job.last_run + interval
+            self._push(key, job)
+
+    def sync(self, jobs: Dict[Hashable, Tuple[float, float]], now: Optional[float] = None) -> None:
+        """Make the job set match *jobs* (key → (interval, min_interval))."""
+        for key in [k for k in self._jobs if k not in jobs]:
+            self.remove(key)
+        for key, (interval, min_interval) in jobs.items():
+            self.set_job(key, interval, min_interval, now=now)
+
+    def remove(self, key: Hashable) -> bool:
+        """Drop a job; its heap entry is discarded lazily."""
+        return self._jobs.pop(key, None) is not None
+
+    def next_due(self) -> Optional[float]:
+        """Deadline of the earliest job, or None when there are no jobs."""
+        while self._heap:
+            due, seq, key = self._heap[0]
+            job = self._jobs.get(key)
+            if job is not None and job.seq == seq:
+                return due
+            heapq.heappop(self._heap)  # stale entry
+        return None
+
+    def pop_due(self, now: Optional[float] = None) -> List[DueJob]:
+        """Pop every job due at *now* and schedule its next deadline.
+
+        Returns:
+            DueJobs in deadline order
+        """
+        now = self._clock() if now is None else now
+        due_jobs: List[DueJob] = []
+        while self._heap and self._heap[0][0] <= now:
+            due, seq, key = heapq.heappop(self._heap)
+            job = self._jobs.get(key)
+            if job is None or job.seq != seq:
+                continue
+            late = max(0.0, now - due)
+            self._record_run(job, now, late)
+            # Advance from the deadline, skipping slots that are already gone
+            missed = int(late // job.interval)
+            job.skipped += missed
+            job.due = due + (missed + 1) * job.interval
+            self._push(key, job)
+            due_jobs.append(DueJob(key, due, late * 1000.0))
+        return due_jobs
+
+    def run_early(self, key: Hashable, now: Optional[float] = None) -> bool:
+        """Run *key* ahead of its deadline if its minimum interval allows.
+
+        Returns:
+            True if the job should run now (its next deadline is then one
+            interval from *now*)
+        """
+        job = self._jobs.get(key)
+        if job is None or job.min_interval <= 0:
+            return False
+        now = self._clock() if now is None else now
+        if job.last_run is not None and now - job.last_run < job.min_interval:
+            return False
+        self._record_run(job, now, 0.0, early=True)
+        job.due = now + job.interval
+        self._push(key, job)
+        return True
+
+    # ── reporting ────────────────────────────────────────────────────
+
+    def lateness(self) -> Dict[Hashable, Dict]:
+        """Per-job run counts and lateness in ms."""
+        return {
+            key: {
+                "interval_ms": round(job.interval * 1000.0, 1),
+                "runs": job.runs,
+                "early_runs": job.early_runs,
+                "skipped": job.skipped,
+                "late_last_ms": round(job.late_last * 1000.0, 2),
+                "late_max_ms": round(job.late_max * 1000.0, 2),
+                "late_mean_ms": round(job.late_total * 1000.0 / max(1, job.runs - job.early_runs), 2),
+            }
+            for key, job in self._jobs.items()
+        }
+
+    def stats(self) -> Dict:
+        """Aggregate job count, runs, skipped slots and lateness."""
+        jobs = list(self._jobs.values())
+        scheduled_runs = sum(j.runs - j.early_runs for j in jobs)
+        next_due = self.next_due()
+        return {
+            "jobs": len(jobs),
+            "runs": sum(j.runs for j in jobs),
+            "early_runs": sum(j.early_runs for j in jobs),
+            "skipped": sum(j.skipped for j in jobs),
+            "late_mean_ms": round(sum(j.late_total for j in jobs) * 1000.0 / max(1, scheduled_runs), 2),
+            "late_max_ms": round(max((j.late_max for j in jobs), default=0.0) * 1000.0, 2),
+            "next_due_in_ms": (round(max(0.0, next_due - self._clock()) * 1000.0, 1)
+                               if next_due is not None else None),
+        }
+
+    # ── helpers ──────────────────────────────────────────────────────
+
+    def _push(self, key: Hashable, job: _Job) -> None:
+        job.seq = next(self._counter)
+        heapq.heappush(self._heap, (job.due, job.seq, key))
+
+    @staticmethod
+    def _record_run(job: _Job, now: float, late: float, early: bool = False) -> None:
+        job.last_run = now
+        job.runs += 1
+        if early:
+            job.early_runs += 1
+            return
+        job.late_last = late
+        job.late_max = max(job.late_max, late)
+        job.late_total += late
@@ -0,0 +1,136 @@
+"""Downsampled analysis pyramid for captured window frames.
+
+Large regions rarely need full-resolution detection: pHash reduces every
+frame to 8x8 anyway, and SSIM at a loose threshold behaves the same at
+half resolution.  A region's ``analysis_scale`` picks a pyramid level
+(1, 1/2, 1/4, 1/8) and the region is cropped from that level instead of
+the full-resolution frame.
+
+``FramePyramid`` builds levels lazily, each from the level above it with
+``cv2.INTER_AREA`` (2x2 averaging), so regions on one window that share
+a scale share one downsampled frame per tick.
+
+``"auto"`` picks the smallest level that still leaves the region enough
+pixels for its detection method (see ``auto_analysis_scale``).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, Tuple, Union
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_SCALES = (1.0, 0.5, 0.25, 0.125)
+AUTO_SCALE = "auto"
+DEFAULT_ANALYSIS_SCALE = 1.0
+
+AnalysisScale = Union[float, str]
+
+# "auto": keep at least this many region pixels per detection method
+_AUTO_MIN_PIXELS = {
+    "phash": 128 * 128,
+    "ssim": 320 * 240,
+    "background_subtraction": 320 * 240,
+    "edge_only": 640 * 480,
+}
+_AUTO_MIN_PIXELS_DEFAULT = 320 * 240
+# ...and never shrink the shorter side below this
+_AUTO_MIN_SIDE = 32
+
+
+def normalize_analysis_scale(value) -> AnalysisScale:
+    """Return a valid analysis scale for a config value.
+
+    Accepts ``"auto"`` or any number (or numeric string); numbers snap to
+    the nearest pyramid level.  Anything else falls back to full size.
+    """
+    if isinstance(value, str):
+        if value.strip().lower() == AUTO_SCALE:
+            return AUTO_SCALE
+    try:
+        scale = float(value)
+    except (TypeError, ValueError):
+        return DEFAULT_ANALYSIS_SCALE
+    if not scale > 0:
+        return DEFAULT_ANALYSIS_SCALE
+    return min(ANALYSIS_SCALES, key=lambda s: abs(np.log2(s) - np.log2(scale)))
+
+
+def auto_analysis_scale(width: int, height: int, method: str) -> float:
+    """Pick a pyramid level for a *width* x *height* region.
+
+    Returns the smallest level at which the region still has at least the
+    method's minimum pixel count and a shorter side of ``_AUTO_MIN_SIDE``.
+    """
+    min_pixels = _AUTO_MIN_PIXELS.get(method, _AUTO_MIN_PIXELS_DEFAULT)
+    best = 1.0
+    for scale in ANALYSIS_SCALES[1:]:
+        w, h = int(width * scale), int(height * scale)
+        if w * h < min_pixels or min(w, h) < _AUTO_MIN_SIDE:
+            break
+        best = scale
+    return best
+
+
+def reduce_analysis_scale(scale: float, steps: int, width: int, height: int) -> float:
+    """Drop *scale* by up to *steps* pyramid levels for a *width* x *height* region.
+
+    Stops early rather than shrink the region's shorter side below
+    ``_AUTO_MIN_SIDE`` (the load governor's reduced-scale level).
+    """
+    index = ANALYSIS_SCALES.index(scale)
+    while steps > 0 and index + 1 < len(ANALYSIS_SCALES):
+        lower = ANALYSIS_SCALES[index + 1]
+        if min(int(width * lower), int(height * lower)) < _AUTO_MIN_SIDE:
+            break
+        index += 1
+        steps -= 1
+    return ANALYSIS_SCALES[index]
+
+
+def scale_rect(rect: Tuple[int, int, int, int], scale: float) -> Tuple[int, int, int, int]:
+    """Map a full-resolution ``(x, y, w, h)`` rect onto a pyramid level."""
+    x, y, width, height = (int(v) for v in rect)
+    if scale == 1.0:
+        return x, y, width, height
+    x0, y0 = int(x * scale), int(y * scale)
+    x1, y1 = int((x + width) * scale), int((y + height) * scale)
+    return x0, y0, max(1, x1 - x0), max(1, y1 - y0)
+
+
+class FramePyramid:
+    """Lazily built downsampled copies of one grayscale frame."""
+
+    def __init__(self, base: np.ndarray):
+        """Initialize pyramid
+
+        Args:
+            base: Full-resolution 2-D uint8 grayscale frame
+        """
+        self._levels: Dict[float, np.ndarray] = {1.0: base}
+
+    @property
+    def base(self) -> np.ndarray:
+        return self._levels[1.0]
+
+    def level(self, scale: float) -> np.ndarray:
+        """Return the frame at *scale* (one of ``ANALYSIS_SCALES``)."""
+        cached = self._levels.get(scale)
+        if cached is not None:
+            return cached
+        if scale not in ANALYSIS_SCALES:
+            raise ValueError(f"Unsupported analysis scale: {scale}")
+        parent = self.level(scale * 2)
+        h, w = parent.shape[:2]
+        frame = cv2.resize(parent, (max(1, w // 2), max(1, h // 2)),
+                           interpolation=cv2.INTER_AREA)
+        self._levels[scale] = frame
+        return frame
+
+    def built_levels(self) -> Tuple[float, ...]:
+        """Return the scales built so far (for diagnostics/tests)."""
+        return tuple(sorted(self._levels, reverse=True))
@@ -0,0 +1,180 @@
+"""Capture retention: keep the capture store within its quotas.
+
+The capture store already indexes every stored event with its time, its
+region and the size of its blobs, so retention never walks the capture
+directory.  A background thread wakes every ``interval`` seconds and
+deletes whole events, oldest first, while any quota is exceeded:
+
+* ``max_age_s``      – events older than this;
+* ``max_per_region`` – the oldest events of a region beyond this count;
+* ``max_bytes``      – the oldest events while the store is over size.
+
+Deletions run in small batches with a short pause in between, so a
+large backlog (first run after enabling a quota) never monopolises the
+disk.  A quota of 0 is unlimited.  With the capture store off, captures
+are written as loose files that no quota covers; a warning says so.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_S = 60.0
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_BATCH_PAUSE_S = 0.05
+
+
+class RetentionPolicy(NamedTuple):
+    """Capture quotas; 0 disables a limit."""
+    max_bytes: int = 0
+    max_age_s: float = 0.0
+    max_per_region: int = 0
+
+    @property
+    def unlimited(self) -> bool:
+        return not (self.max_bytes or self.max_age_s or self.max_per_region)
+
+    def as_dict(self) -> Dict:
+        return {
+            "max_bytes": self.max_bytes,
+            "max_age_days": round(self.max_age_s / 86400.0, 2),
+            "max_per_region": self.max_per_region,
+        }
+
+
+def select_expired(store, policy: RetentionPolicy, now: float, limit: int) -> List[str]:
+    """Up to *limit* event ids to delete for the age and per-region quotas.
+
+    The size quota depends on what each deletion frees, so it is applied
+    one event at a time by ``RetentionManager.run_once``.
+    """
+    victims: List[str] = []
+    chosen = set()
+    if policy.max_age_s > 0:
+        cutoff = now - policy.max_age_s
+        for event_id, timestamp in store.oldest_events(limit):
+            if timestamp >= cutoff:
+                break
+            victims.append(event_id)
+            chosen.add(event_id)
+    if policy.max_per_region > 0 and len(victims) < limit:
+        for (window_id, region_id), count in store.region_counts().items():
+            excess = count - policy.max_per_region
+            if excess <= 0:
+                continue
+            for event_id in store.events(window_id, region_id)[:excess]:
+                if len(victims) >= limit:
+                    break
+                if event_id not in chosen:
+                    victims.append(event_id)
+                    chosen.add(event_id)
+    return victims
+
+
+class RetentionManager:
+    """Background enforcement of a RetentionPolicy on the capture store."""
+
+    def __init__(self, store_getter: Callable[[], Optional[object]],
+                 policy_getter: Callable[[], RetentionPolicy],
+                 interval_s: float = DEFAULT_INTERVAL_S,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 batch_pause_s: float = DEFAULT_BATCH_PAUSE_S):
+        """Initialize retention manager
+
+        Args:
+            store_getter: Returns the current CaptureStore (or None)
+            policy_getter: Returns the quotas to enforce (read every pass)
+            interval_s: Seconds between passes
+            batch_size: Events deleted per batch
+            batch_pause_s: Pause between batches
+        """
+        self._store_getter = store_getter
+        self._policy_getter = policy_getter
+        self.interval_s = max(1.0, float(interval_s))
+        self.batch_size = max(1, int(batch_size))
+        self.batch_pause_s = max(0.0, float(batch_pause_s))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {"passes": 0, "events_deleted": 0, "bytes_freed": 0,
+                       "last_pass_ts": None, "last_pass_ms": 0.0, "last_deleted": 0}
+        self._warned_store_off = False
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="capture-retention")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self, now: Optional[float] = None) -> int:
+        """One enforcement pass, batch by batch.
+
+        Returns:
+            Number of events deleted
+        """
+        store = self._store_getter()
+        policy = self._policy_getter()
+        if store is None:
+            if not policy.unlimited and not self._warned_store_off:
+                logger.warning("Capture quotas are set but the capture store is off: "
+                               "loose capture files are not managed")
+            self._warned_store_off = not policy.unlimited
+            return 0
+        self._warned_store_off = False
+        if policy.unlimited:
+            return 0
+        start = time.perf_counter()
+        deleted = freed = 0
+        while not self._stop.is_set():
+            current = time.time() if now is None else now
+            batch = select_expired(store, policy, current, self.batch_size)
+            for event_id in batch:
+                freed += store.delete_event(event_id)
+            if not batch and policy.max_bytes > 0:
+                # Blobs can be shared, so re-check the size after each event
+                for event_id, _ in store.oldest_events(self.batch_size):
+                    if store.total_bytes <= policy.max_bytes:
+                        break
+                    freed += store.delete_event(event_id)
+                    batch.append(event_id)
+            if not batch:
+                break
+            deleted += len(batch)
+            if self.batch_pause_s:
+                self._stop.wait(self.batch_pause_s)
+        with self._lock:
+            self._stats["passes"] += 1
+            self._stats["events_deleted"] += deleted
+            self._stats["bytes_freed"] += freed
+            self._stats["last_pass_ts"] = time.time()
+            self._stats["last_pass_ms"] = round((time.perf_counter() - start) * 1000.0, 2)
+            self._stats["last_deleted"] = deleted
+        if deleted:
+            logger.info("Capture retention: deleted %d events (%d bytes)", deleted, freed)
+        return deleted
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats)
+
+    # ── helpers ──────────────────────────────────────────────────────
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as error:
+                logger.error("Capture retention pass failed: %s", error, exc_info=True)
+            self._stop.wait(self.interval_s)
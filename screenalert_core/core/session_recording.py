@@ -0,0 +1,326 @@
+"""Recorded monitoring sessions: on-disk format, recorder and reader.
+
+A session is a directory:
+
+    session.json      manifest: format/version, detection config, alert
+                      hold time and, per window, its title, regions and
+                      frame chunk files
+    events.jsonl      timestamped events, one JSON object per line
+    windows/<id>/chunk_NNNNNN.npz
+                      compressed frame chunks:
+                        frames  (U, H, W[, 3]) uint8 – distinct frames
+                        refs    (N,) int32       – frame i shows frames[refs[i]]
+                        ts      (N,) float64     – seconds since session start
+
+Consecutive identical captures (a static screen) are stored once and
+referenced from ``refs``, and frames are kept grayscale by default (the
+detectors only look at luma), which keeps long idle sessions small.
+
+Events carry ``t`` (seconds since start), ``kind``, ``window_id`` and
+optionally ``region_id``.  Two kinds matter to the replay runner:
+
+    change  – ground truth: the region really changed at ``t``
+              (hand labelled, or known from a synthetic script)
+    alert   – an alert the live detector raised while recording
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+SESSION_FORMAT = "screenalert-session"
+SESSION_VERSION = 1
+MANIFEST_FILE = "session.json"
+EVENTS_FILE = "events.jsonl"
+WINDOWS_DIR = "windows"
+DEFAULT_CHUNK_FRAMES = 64
+
+EVENT_CHANGE = "change"
+EVENT_ALERT = "alert"
+
+Frame = Union[Image.Image, np.ndarray]
+
+
+def _safe_dirname(window_id: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in str(window_id)) or "window"
+
+
+class _WindowBuffer:
+    """Frames of one window waiting to be written as a chunk."""
+
+    def __init__(self, window_id: str, directory: Path):
+        self.window_id = window_id
+        self.directory = directory
+        self.chunks: List[str] = []
+        self.frame_count = 0
+        self.stored_frames = 0
+        self.size: Optional[Tuple[int, int]] = None
+        self._frames: List[np.ndarray] = []
+        self._refs: List[int] = []
+        self._ts: List[float] = []
+
+    def add(self, frame: np.ndarray, t: float) -> None:
+        if self._frames and frame.shape != self._frames[-1].shape:
+            self.flush()  # a chunk holds one frame size
+        if not self._frames or not np.array_equal(frame, self._frames[-1]):
+            self._frames.append(frame)
+            self.stored_frames += 1
+        self._refs.append(len(self._frames) - 1)
+        self._ts.append(t)
+        self.frame_count += 1
+        self.size = (frame.shape[1], frame.shape[0])
+
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    def flush(self) -> None:
+        if not self._ts:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"chunk_{len(self.chunks):06d}.npz"
+        np.savez_compressed(
+            self.directory / name,
+            frames=np.stack(self._frames),
+            refs=np.asarray(self._refs, dtype=np.int32),
+            ts=np.asarray(self._ts, dtype=np.float64),
+        )
+        self.chunks.append(f"{WINDOWS_DIR}/{self.directory.name}/{name}")
+        self._frames, self._refs, self._ts = [], [], []
+
+
+class SessionRecorder:
+    """Write a recorded session incrementally.
+
+    Frames are buffered per window and written every *chunk_frames*
+    frames; ``close()`` flushes the rest and writes the manifest.  All
+    methods are thread-safe.
+    """
+
+    def __init__(self, path: Union[str, Path], grayscale: bool = True,
+                 chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+                 global_config: Optional[Dict] = None,
+                 alert_hold_seconds: Optional[float] = None):
+        """Initialize recorder
+
+        Args:
+            path: Session directory (created; must not already hold a session)
+            grayscale: Store frames as 8-bit luma instead of RGB
+            chunk_frames: Frames per chunk file
+            global_config: Global detection settings in effect
+            alert_hold_seconds: Alert hold time in effect
+        """
+        self.path = Path(path)
+        if (self.path / MANIFEST_FILE).exists():
+            raise FileExistsError(f"Session already exists: {self.path}")
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.grayscale = grayscale
+        self.chunk_frames = max(1, int(chunk_frames))
+        self.global_config = dict(global_config or {})
+        self.alert_hold_seconds = alert_hold_seconds
+        self.created = datetime.now().isoformat()
+        self._start = time.monotonic()
+        self._windows: Dict[str, Dict] = {}
+        self._buffers: Dict[str, _WindowBuffer] = {}
+        self._events_file = open(self.path / EVENTS_FILE, "a", encoding="utf-8")
+        self._event_count = 0
+        self._last_t = 0.0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        """Seconds since the recording started."""
+        return time.monotonic() - self._start
+
+    def has_window(self, window_id: str) -> bool:
+        with self._lock:
+            return window_id in self._windows
+
+    def add_window(self, window_id: str, title: str = "",
+                   regions: Optional[List[Dict]] = None) -> None:
+        """Register a window and snapshot its region configs."""
+        with self._lock:
+            directory = self.path / WINDOWS_DIR / _safe_dirname(window_id)
+            taken = {b.directory for b in self._buffers.values()}
+            suffix = 1
+            while directory in taken:
+                suffix += 1
+                directory = self.path / WINDOWS_DIR / f"{_safe_dirname(window_id)}-{suffix}"
+            self._windows[window_id] = {
+                "title": title,
+                "regions": [dict(r) for r in (regions or [])],
+            }
+            self._buffers[window_id] = _WindowBuffer(window_id, directory)
+
+    def add_frame(self, window_id: str, frame: Frame, t: Optional[float] = None) -> int:
+        """Append a captured frame of *window_id*.
+
+        Args:
+            window_id: A window registered with ``add_window``
+            frame: PIL image or uint8 array
+            t: Seconds since session start (default: now)
+
+        Returns:
+            Index of the frame within the window's sequence
+        """
+        if isinstance(frame, Image.Image):
+            frame = frame.convert("L" if self.grayscale else "RGB")
+            arr = np.asarray(frame)
+        else:
+            arr = np.asarray(frame, dtype=np.uint8)
+            if self.grayscale and arr.ndim == 3:
+                arr = np.asarray(Image.fromarray(arr[:, :, :3]).convert("L"))
+        with self._lock:
+            if self._closed:
+                raise ValueError("Session recorder is closed")
+            buffer = self._buffers[window_id]
+            t = self.elapsed() if t is None else float(t)
+            self._last_t = max(self._last_t, t)
+            buffer.add(arr, t)
+            if len(buffer) >= self.chunk_frames:
+                buffer.flush()
+            return buffer.frame_count - 1
+
+    def add_event(self, kind: str, window_id: str, region_id: Optional[str] = None,
+                  t: Optional[float] = None, **fields) -> Dict:
+        """Append an event (``change`` ground truth, live ``alert``, ...)."""
+        with self._lock:
+            if self._closed:
+                raise ValueError("Session recorder is closed")
+            event = {"t": round(self.elapsed() if t is None else float(t), 6),
+                     "kind": kind, "window_id": window_id}
+            if region_id is not None:
+                event["region_id"] = region_id
+            event.update(fields)
+            self._events_file.write(json.dumps(event) + "\n")
+            self._events_file.flush()
+            self._event_count += 1
+            self._last_t = max(self._last_t, event["t"])
+            return event
+
+    def close(self) -> Path:
+        """Flush pending frames and write the manifest.  Idempotent."""
+        with self._lock:
+            if self._closed:
+                return self.path
+            self._closed = True
+            for buffer in self._buffers.values():
+                buffer.flush()
+            self._events_file.close()
+            windows = {}
+            stored = total = 0
+            for window_id, info in self._windows.items():
+                buffer = self._buffers[window_id]
+                windows[window_id] = {
+                    **info,
+                    "size": list(buffer.size) if buffer.size else None,
+                    "frame_count": buffer.frame_count,
+                    "stored_frames": buffer.stored_frames,
+                    "chunks": buffer.chunks,
+                }
+                stored += buffer.stored_frames
+                total += buffer.frame_count
+            manifest = {
+                "format": SESSION_FORMAT,
+                "version": SESSION_VERSION,
+                "created": self.created,
+                "duration_s": round(self._last_t, 6),
+                "grayscale": self.grayscale,
+                "global_config": self.global_config,
+                "alert_hold_seconds": self.alert_hold_seconds,
+                "event_count": self._event_count,
+                "windows": windows,
+            }
+            tmp = self.path / (MANIFEST_FILE + ".tmp")
+            tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+            os.replace(tmp, self.path / MANIFEST_FILE)
+        logger.info("Recorded session %s: %d window(s), %d frame(s) (%d stored)",
+                    self.path, len(windows), total, stored)
+        return self.path
+
+
+class RecordedSession:
+    """Read a session written by ``SessionRecorder``."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Load the manifest and events of the session at *path*.
+
+        Raises:
+            FileNotFoundError: If *path* holds no session manifest
+            ValueError: If the manifest is not a supported session format
+        """
+        self.path = Path(path)
+        manifest_path = self.path / MANIFEST_FILE
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No {MANIFEST_FILE} in {self.path}")
+        self.manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if self.manifest.get("format") != SESSION_FORMAT:
+            raise ValueError(f"{manifest_path} is not a ScreenAlert session")
+        if self.manifest.get("version", 0) > SESSION_VERSION:
+            raise ValueError(f"Unsupported session version {self.manifest.get('version')}")
+        self.events: List[Dict] = []
+        events_path = self.path / EVENTS_FILE
+        if events_path.exists():
+            with open(events_path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    line = line.strip()
+                    if line:
+                        self.events.append(json.loads(line))
+        self.events.sort(key=lambda e: e.get("t", 0.0))
+
+    @property
+    def windows(self) -> Dict[str, Dict]:
+        return self.manifest.get("windows", {})
+
+    @property
+    def global_config(self) -> Dict:
+        return self.manifest.get("global_config") or {}
+
+    @property
+    def alert_hold_seconds(self) -> Optional[float]:
+        return self.manifest.get("alert_hold_seconds")
+
+    @property
+    def duration(self) -> float:
+        return float(self.manifest.get("duration_s", 0.0))
+
+    def frame_count(self, window_id: Optional[str] = None) -> int:
+        """Frames of *window_id*, or of all windows."""
+        if window_id is not None:
+            return int(self.windows.get(window_id, {}).get("frame_count", 0))
+        return sum(int(w.get("frame_count", 0)) for w in self.windows.values())
+
+    def events_of(self, kind: str) -> List[Dict]:
+        return [e for e in self.events if e.get("kind") == kind]
+
+    def iter_frames(self, window_id: str) -> Iterator[Tuple[float, np.ndarray]]:
+        """Yield ``(t, frame)`` for *window_id* in recording order.
+
+        Repeated frames are yielded as the same array object, so callers
+        can skip work with an identity check.
+        """
+        for chunk in self.windows[window_id].get("chunks", []):
+            with np.load(self.path / chunk) as data:
+                frames, refs, ts = list(data["frames"]), data["refs"], data["ts"]
+            for ref, t in zip(refs, ts):
+                yield float(t), frames[int(ref)]
+
+    def iter_all_frames(self) -> Iterator[Tuple[float, str, np.ndarray]]:
+        """Yield ``(t, window_id, frame)`` for every window, merged by time."""
+        def _tagged(window_id: str):
+            for t, frame in self.iter_frames(window_id):
+                yield t, window_id, frame
+
+        return heapq.merge(*(_tagged(w) for w in self.windows), key=lambda item: item[0])
@@ -0,0 +1,205 @@
+"""
+ScreenAlert MCP event summary aggregates
+
+Running counts behind ``EventLogger.summary``: totals by category, event
+name and window name plus alerts with a capture file, kept up to date as
+events are appended and decremented as trim or clear removes them.  The
+same counts are kept per hour and, for the newest 48 hours of the log,
+per minute, so ``summary(since=...)`` adds up the buckets after ``since``
+instead of reading events.
+
+The one bucket ``since`` falls in (its minute, or its hour when older
+than the per-minute window) is counted exactly from its own events: the
+store asks ``boundary(since)`` for that bucket's key, reads the bucket's
+events at or after ``since`` and passes them to ``summary``.  Bucket keys
+are timestamp prefixes (``2026-01-01T10`` / ``2026-01-01T10:05``) and
+compare as strings, as ``since`` always has against event timestamps.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MINUTE_BUCKET_HOURS = 48
+
+_HOUR_KEY = 13      # len("2026-01-01T10")
+_MINUTE_KEY = 16    # len("2026-01-01T10:05")
+
+
+def empty_summary() -> Dict:
+    return {
+        "total": 0,
+        "counts_by_category": {},
+        "counts_by_event": {},
+        "counts_by_window": {},
+        "alerts_with_captures": 0,
+    }
+
+
+def bucket_keys(timestamp: str) -> Tuple[str, str]:
+    """The hour and minute bucket keys of an event timestamp."""
+    return timestamp[:_HOUR_KEY], timestamp[:_MINUTE_KEY]
+
+
+def _bump(counts: Dict[str, int], key: str, delta: int) -> None:
+    value = counts.get(key, 0) + delta
+    if value > 0:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+class _Counts:
+    __slots__ = ("total", "by_category", "by_event", "by_window", "captures")
+
+    def __init__(self):
+        self.total = 0
+        self.by_category: Dict[str, int] = {}
+        self.by_event: Dict[str, int] = {}
+        self.by_window: Dict[str, int] = {}
+        self.captures = 0
+
+    def add(self, entry: Dict, delta: int) -> None:
+        cat = entry.get("category") or "unknown"
+        evt = entry.get("event") or "unknown"
+        wname = entry.get("window_name")
+        self.total += delta
+        _bump(self.by_category, cat, delta)
+        _bump(self.by_event, evt, delta)
+        if wname:
+            _bump(self.by_window, wname, delta)
+        if cat == "alert" and evt == "region_alert" and entry.get("capture_file"):
+            self.captures += delta
+
+    def add_to(self, result: Dict) -> None:
+        result["total"] += self.total
+        for key, counts in (("counts_by_category", self.by_category),
+                            ("counts_by_event", self.by_event),
+                            ("counts_by_window", self.by_window)):
+            target = result[key]
+            for name, count in counts.items():
+                target[name] = target.get(name, 0) + count
+        result["alerts_with_captures"] += self.captures
+
+
+class EventAggregates:
+    """Incrementally maintained event counts with hour and minute buckets."""
+
+    def __init__(self, minute_bucket_hours: float = MINUTE_BUCKET_HOURS):
+        self._minute_span = timedelta(hours=minute_bucket_hours)
+        self.clear()
+
+    def clear(self) -> None:
+        self._totals = _Counts()
+        self._hours: Dict[str, _Counts] = {}
+        self._minutes: Dict[str, _Counts] = {}
+        self._newest_hour = ""
+        # Minute keys below this were pruned (or never kept)
+        self._minute_floor = ""
+
+    def add(self, entry: Dict) -> None:
+        self._apply(entry, 1)
+        hour = str(entry.get("timestamp", ""))[:_HOUR_KEY]
+        if hour > self._newest_hour:
+            self._newest_hour = hour
+            self._prune_minutes(str(entry.get("timestamp", "")))
+
+    def remove(self, entry: Dict) -> None:
+        self._apply(entry, -1)
+
+    def has_bucket(self, key: str) -> bool:
+        """Whether the hour or minute bucket *key* still counts any event."""
+        return key in self._hours or key in self._minutes
+
+    def boundary(self, since: Optional[str]) -> Optional[str]:
+        """Key of the bucket *since* falls inside, or None when there is none.
+
+        Its events at or after *since* are for the caller to read and pass
+        to ``summary``; every later bucket is counted from the aggregates.
+        """
+        if not since:
+            return None
+        since_hour = since[:_HOUR_KEY]
+        if since_hour not in self._hours or since == since_hour:
+            return None
+        since_minute = since[:_MINUTE_KEY]
+        if self._has_minutes(since_minute):
+            if since_minute not in self._minutes or since == since_minute:
+                return None
+            return since_minute
+        return since_hour
+
+    def summary(self, since: Optional[str] = None, boundary: Optional[str] = None,
+                boundary_events: Iterable[Dict] = ()) -> Dict:
+        """Counts of the events at or after *since* (all events when None).
+
+        Args:
+            since: Lower timestamp bound
+            boundary: ``boundary(since)``, read before *boundary_events*
+            boundary_events: That bucket's events at or after *since*
+        """
+        result = empty_summary()
+        if not since:
+            self._totals.add_to(result)
+            return result
+        since_hour = since[:_HOUR_KEY]
+        since_minute = since[:_MINUTE_KEY]
+        for hour, counts in self._hours.items():
+            if hour > since_hour:
+                counts.add_to(result)
+        if since_hour in self._hours and boundary != since_hour:
+            if self._has_minutes(since_minute):
+                first = int(since_minute[-2:]) if since_minute[-2:].isdigit() else 0
+                for minute in range(first, 60):
+                    key = f"{since_hour}:{minute:02d}"
+                    counts = self._minutes.get(key)
+                    if counts is not None and key != boundary:
+                        counts.add_to(result)
+            else:
+                # since is the hour itself: all of it counts
+                self._hours[since_hour].add_to(result)
+        partial = _Counts()
+        for entry in boundary_events:
+            partial.add(entry, 1)
+        partial.add_to(result)
+        return result
+
+    # ── Internal ──────────────────────────────────────────────────────────────
+
+    def _has_minutes(self, since_minute: str) -> bool:
+        """Whether minute buckets cover the minute *since_minute*."""
+        return len(since_minute) == _MINUTE_KEY and since_minute >= self._minute_floor
+
+    def _apply(self, entry: Dict, delta: int) -> None:
+        timestamp = str(entry.get("timestamp", ""))
+        self._totals.add(entry, delta)
+        self._bucket(self._hours, timestamp[:_HOUR_KEY], entry, delta)
+        minute = timestamp[:_MINUTE_KEY]
+        if minute >= self._minute_floor:
+            self._bucket(self._minutes, minute, entry, delta)
+
+    @staticmethod
+    def _bucket(buckets: Dict[str, _Counts], key: str, entry: Dict, delta: int) -> None:
+        counts = buckets.get(key)
+        if counts is None:
+            if delta < 0:
+                return
+            counts = buckets[key] = _Counts()
+        counts.add(entry, delta)
+        if counts.total <= 0:
+            del buckets[key]
+
+    def _prune_minutes(self, newest: str) -> None:
+        """Drop minute buckets older than the per-minute window (once per new hour)."""
+        try:
+            cutoff = datetime.fromisoformat(newest) - self._minute_span
+        except ValueError:
+            return
+        floor = cutoff.isoformat()[:_MINUTE_KEY]
+        if floor <= self._minute_floor:
+            return
+        self._minute_floor = floor
+        for key in [key for key in self._minutes if key < floor]:
+            del self._minutes[key]
@@ -1,19 +1,20 @@
 """
 ScreenAlert MCP Event Logger
 
-Appends structured events to a JSONL file (one JSON object per line).
-In-memory ring buffer flushes to disk every 5 seconds or every 50 events.
-Rotation trims oldest entries when max_rows is exceeded.
+Appends structured events to an event store: a JSONL file (one JSON
+object per line, the default) or an indexed SQLite database – see
+event_stores.py.  In-memory ring buffer flushes to disk every 5 seconds
+or every 50 events.  Rotation trims oldest entries when max_rows is
+exceeded.
 """
 
-import json
 import logging
-import os
 import threading
-import time
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from screenalert_core.mcp.event_stores import DEFAULT_EVENT_LOG_BACKEND, open_event_store
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +25,10 @@ _FLUSH_BATCH_SIZE = 50
 
 class EventLogger:
     """
-    Thread-safe JSONL event logger.
+    Thread-safe event logger.
 
     Usage:
-        el = EventLogger(path, max_rows=5000, enabled=True)
+        el = EventLogger(path, max_rows=5000, enabled=True, backend="jsonl")
         el.start()
         el.log("alert", "region_alert", "engine",
                 window_id="abc", window_name="EVE", region_id="def",
@@ -35,13 +36,17 @@ class EventLogger:
         el.stop()
     """
 
-    def __init__(self, log_path: str, max_rows: int = 5000, enabled: bool = True):
+    def __init__(self, log_path: str, max_rows: int = 5000, enabled: bool = True,
+                 backend: str = DEFAULT_EVENT_LOG_BACKEND):
         self._path = log_path
         self._max_rows = max_rows
         self._enabled = enabled
+        self._store = open_event_store(backend, log_path, max_rows)
 
         self._buffer: List[Dict] = []
         self._lock = threading.Lock()
+        # Serialises store writes (flush, trim, clear) across threads
+        self._write_lock = threading.Lock()
         self._flush_event = threading.Event()
         self._stop_event = threading.Event()
         self._flush_thread: Optional[threading.Thread] = None
@@ -55,7 +60,8 @@ class EventLogger:
             target=self._flush_loop, daemon=True, name="EventLogger-flush"
         )
         self._flush_thread.start()
-        logger.debug("EventLogger started: path=%s max_rows=%s", self._path, self._max_rows)
+        logger.debug("EventLogger started: path=%s backend=%s max_rows=%s",
+                     self._path, self._store.name, self._max_rows)
 
     def stop(self) -> None:
         """Flush remaining buffer and stop the background thread."""
@@ -64,28 +70,36 @@ class EventLogger:
         if self._flush_thread:
             self._flush_thread.join(timeout=10)
         self._flush_to_disk()
+        self._store.close()
         logger.debug("EventLogger stopped")
 
     # ── Public API ────────────────────────────────────────────────────────────
 
+    @property
+    def backend(self) -> str:
+        return self._store.name
+
     def set_enabled(self, enabled: bool) -> None:
         self._enabled = enabled
 
     def set_max_rows(self, max_rows: int) -> None:
         self._max_rows = max(100, int(max_rows))
 
-    def log(self, category: str, event: str, source: str, **kwargs: Any) -> Optional[str]:
+    def log(self, category: str, event: str, source: str,
+            event_id: Optional[str] = None, **kwargs: Any) -> Optional[str]:
         """
         Append an event to the log.
 
         Required: category, event, source.
+        event_id is generated unless the caller already assigned one (e.g.
+        an alert whose captures are stored under that id).
         All additional kwargs become top-level fields in the event object.
         Returns the event id, or None if logging is disabled.
         """
         if not self._enabled:
             return None
 
-        event_id = str(uuid.uuid4())
+        event_id = event_id or str(uuid.uuid4())
         entry = {
             "id": event_id,
             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -113,77 +127,64 @@ class EventLogger:
         category: Optional[str] = None,
         window_id: Optional[str] = None,
         region_id: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> Dict:
         """
         Query the event log. Flushes the in-memory buffer first so results
         include all recent events.
 
-        Returns {"events": [...], "total": int, "has_more": bool}
+        cursor is the opaque "cursor" of a previous result: the page starts
+        right after that result's last event and only the returned rows are
+        read, so "total" is None. Raises ValueError for an invalid cursor.
+
+        Returns {"events": [...], "total": int, "has_more": bool, "cursor": str}
         """
         self._flush_to_disk()
-        events = self._read_all()
-
-        # Filter
-        if since:
-            events = [e for e in events if e.get("timestamp", "") >= since]
-        if category:
-            events = [e for e in events if e.get("category") == category]
-        if window_id:
-            events = [e for e in events if e.get("window_id") == window_id]
-        if region_id:
-            events = [e for e in events if e.get("region_id") == region_id]
-
-        # Cursor: skip everything up to and including after_id
-        if after_id:
-            idx = next((i for i, e in enumerate(events) if e.get("id") == after_id), None)
-            if idx is not None:
-                events = events[idx + 1:]
-
-        total = len(events)
-
-        # Offset + limit
-        page = events[offset: offset + limit]
-
-        return {
-            "events": page,
-            "total": total,
-            "has_more": (offset + limit) < total,
-        }
+        return self._store.query(limit, offset, after_id, since, category, window_id,
+                                 region_id, cursor=cursor or None)
+
+    def iter_events(
+        self,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None,
+        category: Optional[str] = None,
+        window_id: Optional[str] = None,
+        region_id: Optional[str] = None,
+    ) -> Iterator[Tuple[str, Dict]]:
+        """
+        Lazily yield (cursor, event) for matching events, oldest first,
+        starting after *cursor*. Rows are read as the iterator advances;
+        each cursor resumes right after its event.
+        """
+        self._flush_to_disk()
+        return self._store.iter_events(cursor or None, since, category, window_id, region_id)
+
+    def get_by_id(self, event_id: str) -> Optional[Dict]:
+        """
+        Return the event with this id, or None. Answered from the store's
+        id index; no scan of the log.
+        """
+        if not event_id:
+            return None
+        self._flush_to_disk()
+        return self._store.get_by_id(event_id)
+
+    def latest_capture(self, window_id: str, region_id: str) -> Optional[str]:
+        """
+        Return the capture_file of the most recent alert of a window region,
+        or None. Answered from the store's per-region index.
+        """
+        if not (window_id and region_id):
+            return None
+        self._flush_to_disk()
+        return self._store.latest_capture(window_id, region_id)
 
     def summary(self, since: Optional[str] = None) -> Dict:
         """
         Return aggregated counts by category, event name, and window.
         """
         self._flush_to_disk()
-        events = self._read_all()
-
-        if since:
-            events = [e for e in events if e.get("timestamp", "") >= since]
-
-        counts_by_category: Dict[str, int] = {}
-        counts_by_event: Dict[str, int] = {}
-        counts_by_window: Dict[str, int] = {}
-        alerts_with_captures = 0
-
-        for e in events:
-            cat = e.get("category", "unknown")
-            evt = e.get("event", "unknown")
-            wname = e.get("window_name")
-
-            counts_by_category[cat] = counts_by_category.get(cat, 0) + 1
-            counts_by_event[evt] = counts_by_event.get(evt, 0) + 1
-            if wname:
-                counts_by_window[wname] = counts_by_window.get(wname, 0) + 1
-            if cat == "alert" and evt == "region_alert" and e.get("capture_file"):
-                alerts_with_captures += 1
-
-        return {
-            "total": len(events),
-            "counts_by_category": counts_by_category,
-            "counts_by_event": counts_by_event,
-            "counts_by_window": counts_by_window,
-            "alerts_with_captures": alerts_with_captures,
-        }
+        return self._store.summary(since=since)
 
     def clear(self, category: Optional[str] = None) -> int:
         """
@@ -192,28 +193,19 @@ class EventLogger:
         The clear action is logged BEFORE deletion.
         """
         self._flush_to_disk()
-        events = self._read_all()
-
-        if category:
-            kept = [e for e in events if e.get("category") != category]
-            deleted = len(events) - len(kept)
-        else:
-            kept = []
-            deleted = len(events)
-
-        # Log the clear before writing (so the action itself is in the new log)
-        clear_entry = {
-            "id": str(uuid.uuid4()),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "category": "system",
-            "event": "event_log_cleared",
-            "source": "user",
-            "category_cleared": category,
-            "entries_deleted": deleted,
-        }
-        kept.append(clear_entry)
 
-        self._write_all(kept)
+        with self._write_lock:
+            deleted = self._store.clear(category)
+            # The clear action itself is kept in the new log
+            self._store.append([{
+                "id": str(uuid.uuid4()),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "category": "system",
+                "event": "event_log_cleared",
+                "source": "user",
+                "category_cleared": category,
+                "entries_deleted": deleted,
+            }])
         return deleted
 
     # ── Internal ──────────────────────────────────────────────────────────────
@@ -229,7 +221,7 @@ class EventLogger:
                 logger.error("EventLogger flush error: %s", exc, exc_info=True)
 
     def _flush_to_disk(self) -> None:
-        """Write buffered events to the JSONL file and trim if needed."""
+        """Write buffered events to the store and trim if needed."""
         with self._lock:
             if not self._buffer:
                 return
@@ -239,60 +231,23 @@ class EventLogger:
         if not to_write:
             return
 
-        os.makedirs(os.path.dirname(self._path), exist_ok=True)
-
-        try:
-            with open(self._path, "a", encoding="utf-8") as f:
-                for entry in to_write:
-                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-        except Exception as exc:
-            logger.error("EventLogger write error: %s", exc, exc_info=True)
-            # Put events back in buffer so they aren't lost
-            with self._lock:
-                self._buffer = to_write + self._buffer
-            return
+        with self._write_lock:
+            try:
+                self._store.append(to_write)
+            except Exception as exc:
+                logger.error("EventLogger write error: %s", exc, exc_info=True)
+                # Put events back in buffer so they aren't lost
+                with self._lock:
+                    self._buffer = to_write + self._buffer
+                return
 
-        self._trim_if_needed()
+            self._trim_if_needed()
 
     def _trim_if_needed(self) -> None:
-        """Trim oldest entries if file exceeds max_rows. Runs on background thread."""
+        """Trim oldest entries if the store exceeds max_rows. Runs on background thread."""
         try:
-            events = self._read_all()
-            if len(events) <= self._max_rows:
-                return
-            trimmed = events[-self._max_rows:]
-            self._write_all(trimmed)
-            logger.debug(
-                "EventLogger trimmed %d entries (kept %d)",
-                len(events) - len(trimmed), len(trimmed)
-            )
+            trimmed = self._store.trim(self._max_rows)
+            if trimmed:
+                logger.debug("EventLogger trimmed %d entries (max %d)", trimmed, self._max_rows)
         except Exception as exc:
             logger.error("EventLogger trim error: %s", exc, exc_info=True)
-
-    def _read_all(self) -> List[Dict]:
-        """Read and parse all events from the JSONL file."""
-        if not os.path.exists(self._path):
-            return []
-        events = []
-        try:
-            with open(self._path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        events.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        logger.warning("EventLogger: skipping malformed line")
-        except Exception as exc:
-            logger.error("EventLogger read error: %s", exc, exc_info=True)
-        return events
-
-    def _write_all(self, events: List[Dict]) -> None:
-        """Overwrite the JSONL file with the given events list."""
-        try:
-            with open(self._path, "w", encoding="utf-8") as f:
-                for entry in events:
-                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-        except Exception as exc:
-            logger.error("EventLogger write_all error: %s", exc, exc_info=True)
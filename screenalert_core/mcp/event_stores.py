@@ -0,0 +1,895 @@
+"""
+ScreenAlert MCP event storage backends
+
+``EventLogger`` buffers events in memory and hands them to an
+``EventStore`` to persist and query:
+
+    JsonlEventStore   – JSON lines in fixed-size segment files with a
+                        small header each (default); old segments are
+                        dropped whole and queries skip segments outside
+                        ``since``
+    SqliteEventStore  – SQLite in WAL mode with indexes on id, timestamp,
+                        category, window_id and region_id; filters, the
+                        after_id cursor and offset/limit run in SQL
+
+Both answer ``summary`` from running ``EventAggregates`` rather than by
+reading events.
+
+The backend is chosen with the ``event_log_backend`` setting.  The SQLite
+database lives next to the JSONL log (``event_log.db``); when it is first
+opened an existing JSONL log is renamed ``*.migrated`` (``*.migrated.N``
+when an earlier migration took that name) and imported.  A log that
+cannot be renamed is left alone rather than imported on every start.
+"""
+
+import base64
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from screenalert_core.mcp.event_aggregates import EventAggregates, bucket_keys
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOG_BACKENDS = ("jsonl", "sqlite")
+DEFAULT_EVENT_LOG_BACKEND = "jsonl"
+
+# Fields copied into their own SQLite columns (the full event is kept as JSON)
+_INDEXED_FIELDS = ("id", "timestamp", "category", "event", "source",
+                   "window_id", "window_name", "region_id", "capture_file")
+# Columns the summary aggregates need, read back when rows are removed
+_SUMMARY_FIELDS = ("timestamp", "category", "event", "window_name", "capture_file")
+_SUMMARY_COLUMNS = ", ".join(_SUMMARY_FIELDS)
+
+
+def _page(events: List[Dict], total: Optional[int], offset: int, limit: int,
+          cursor: Optional[str] = None, has_more: Optional[bool] = None) -> Dict:
+    if has_more is None:
+        has_more = (offset + limit) < total
+    return {"events": events, "total": total, "has_more": has_more, "cursor": cursor}
+
+
+def encode_cursor(backend: str, *position: int) -> str:
+    """Opaque, URL-safe cursor for a read position of *backend*."""
+    raw = ":".join([backend] + [str(int(p)) for p in position])
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(backend: str, cursor: str, parts: int) -> Tuple[int, ...]:
+    """Inverse of ``encode_cursor``; raises ValueError for a foreign or damaged cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        name, *position = raw.split(":")
+        values = tuple(int(p) for p in position)
+    except (ValueError, UnicodeDecodeError, TypeError) as exc:
+        raise ValueError(f"invalid cursor: {cursor!r}") from exc
+    if name != backend or len(values) != parts or min(values, default=0) < 0:
+        raise ValueError(f"invalid cursor: {cursor!r}")
+    return values
+
+
+def _matches(entry: Dict, since: Optional[str], category: Optional[str],
+             window_id: Optional[str], region_id: Optional[str]) -> bool:
+    return ((not since or entry.get("timestamp", "") >= since)
+            and (not category or entry.get("category") == category)
+            and (not window_id or entry.get("window_id") == window_id)
+            and (not region_id or entry.get("region_id") == region_id))
+
+
+class EventStore(ABC):
+    """Abstract interface for persisting and querying logged events."""
+
+    name = "base"
+
+    @abstractmethod
+    def append(self, entries: List[Dict]) -> None:
+        """Persist *entries* (oldest first).  Raises on write failure."""
+
+    @abstractmethod
+    def trim(self, max_rows: int) -> int:
+        """Drop the oldest events beyond *max_rows*; returns rows dropped."""
+
+    @abstractmethod
+    def query(self, limit: int, offset: int, after_id: Optional[str],
+              since: Optional[str], category: Optional[str],
+              window_id: Optional[str], region_id: Optional[str],
+              cursor: Optional[str] = None) -> Dict:
+        """Filtered page of events: ``{"events", "total", "has_more", "cursor"}``.
+
+        ``cursor`` is the position after the last returned event (or the
+        end of what was scanned); passing it back resumes there and reads
+        only the rows returned, so ``total`` is None on cursor pages.
+        Raises ValueError for a cursor this store did not issue.
+        """
+
+    @abstractmethod
+    def iter_events(self, cursor: Optional[str] = None, since: Optional[str] = None,
+                    category: Optional[str] = None, window_id: Optional[str] = None,
+                    region_id: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+        """Lazily yield ``(cursor, event)`` for matching events after *cursor*.
+
+        Each cursor is the position after its event.  Rows are read in
+        small batches, so stopping early leaves the rest of the log unread.
+        """
+
+    @abstractmethod
+    def summary(self, since: Optional[str] = None) -> Dict:
+        """Counts by category, event name and window name (see event_aggregates)."""
+
+    @abstractmethod
+    def clear(self, category: Optional[str] = None) -> int:
+        """Delete all events, or only those of *category*.
+
+        Returns:
+            Number of events deleted
+        """
+
+    @abstractmethod
+    def get_by_id(self, event_id: str) -> Optional[Dict]:
+        """The newest event with *event_id*, or None."""
+
+    @abstractmethod
+    def latest_capture(self, window_id: str, region_id: str) -> Optional[str]:
+        """capture_file of the newest alert event of a window region, or None."""
+
+    def close(self) -> None:
+        """Release file handles / connections."""
+
+
+# ── JSONL ─────────────────────────────────────────────────────────────────────
+
+_SEGMENT_SUFFIX = ".jsonl"
+_HEADER_SIZE = 256            # bytes, newline included; rewritten in place
+_SEGMENTS_PER_LOG = 10        # max_rows is spread over about this many segments
+_MIN_SEGMENT_ROWS = 10
+_READ_BATCH = 256             # lines read per lock hold while streaming
+
+
+def segments_dir(log_path: str) -> str:
+    """Directory holding the segment files of the JSONL log *log_path*."""
+    return os.path.splitext(log_path)[0] + ".segments"
+
+
+def _set_aside(path: str) -> Optional[str]:
+    """Rename a migrated log to ``*.migrated`` (``*.migrated.N`` if taken).
+
+    Returns:
+        The new path, or None when the rename failed
+    """
+    target = path + ".migrated"
+    n = 1
+    while os.path.exists(target):
+        target = f"{path}.migrated.{n}"
+        n += 1
+    try:
+        os.replace(path, target)
+    except OSError as exc:
+        logger.warning("EventLogger: could not rename migrated log %s: %s", path, exc)
+        return None
+    return target
+
+
+def _capture_key(entry: Dict) -> Optional[Tuple[str, str]]:
+    """(window_id, region_id) when *entry* is an alert with a capture file."""
+    if entry.get("category") != "alert" or not entry.get("capture_file"):
+        return None
+    window_id, region_id = entry.get("window_id"), entry.get("region_id")
+    if not (window_id and region_id):
+        return None
+    return window_id, region_id
+
+
+def segment_rows_for(max_rows: int) -> int:
+    """Rows per segment for a log capped at *max_rows*."""
+    return max(_MIN_SEGMENT_ROWS, int(max_rows) // _SEGMENTS_PER_LOG)
+
+
+class _Segment:
+    __slots__ = ("number", "path", "rows", "first_ts", "last_ts")
+
+    def __init__(self, number: int, path: str):
+        self.number = number
+        self.path = path
+        self.rows = 0
+        self.first_ts: Optional[str] = None
+        self.last_ts: Optional[str] = None
+
+    def add(self, timestamp: str) -> None:
+        self.rows += 1
+        if self.first_ts is None:
+            self.first_ts = timestamp
+        if self.last_ts is None or timestamp > self.last_ts:
+            self.last_ts = timestamp
+
+    def header(self) -> bytes:
+        """Fixed-size header line: ``{"segment": {...}}`` padded with spaces."""
+        meta = {"number": self.number, "rows": self.rows,
+                "first_ts": self.first_ts, "last_ts": self.last_ts}
+        raw = json.dumps({"segment": meta}).encode("utf-8")
+        if len(raw) >= _HEADER_SIZE:
+            # Oversized timestamps: keep the count, lose the time range
+            meta["first_ts"] = meta["last_ts"] = None
+            raw = json.dumps({"segment": meta}).encode("utf-8")
+        return raw.ljust(_HEADER_SIZE - 1) + b"\n"
+
+    def before(self, since: Optional[str]) -> bool:
+        """True when every row is older than *since* (the segment can be skipped)."""
+        return bool(since) and self.last_ts is not None and self.last_ts < since
+
+
+class JsonlEventStore(EventStore):
+    """Events as JSON lines in numbered, fixed-size segment files.
+
+    Each segment (``event_log.segments/000001.jsonl``) starts with a
+    fixed-size header line holding its row count and first/last timestamp,
+    which is rewritten in place after every append.  The newest segment
+    stays open for appending; once it holds ``segment_rows`` rows the next
+    one is started.  Trimming to ``max_rows`` deletes whole old segments,
+    so up to one segment more than ``max_rows`` may be kept, and queries
+    skip segments that end before ``since``.
+
+    Two in-memory indexes are rebuilt when the store opens and kept up to
+    date on append, trim and clear: event id → (segment, byte offset) for
+    ``get_by_id``, and (window_id, region_id) → newest alert capture_file
+    for ``latest_capture``.  Summary counts come from ``EventAggregates``,
+    maintained alongside (a trimmed segment is read once to subtract it).
+
+    A single-file log from older versions is split into segments on first
+    open and renamed ``*.migrated``.
+    """
+
+    name = "jsonl"
+
+    def __init__(self, path: str, max_rows: int = 5000):
+        self._path = path
+        self._dir = segments_dir(path)
+        self._segment_rows = segment_rows_for(max_rows)
+        self._lock = threading.Lock()
+        self._segments: List[_Segment] = []
+        self._handle = None
+        # id -> (segment number, byte offset of its line)
+        self._by_id: Dict[str, Tuple[int, int]] = {}
+        self._segment_ids: Dict[int, List[str]] = {}
+        # (window_id, region_id) -> (capture_file, event id)
+        self._captures: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        # hour/minute bucket key -> [(segment, offset) of its first row, of its last row]
+        self._bucket_spans: Dict[str, List[Tuple[int, int]]] = {}
+        self._aggregates = EventAggregates()
+        os.makedirs(self._dir, exist_ok=True)
+        self._load()
+        if os.path.isfile(path):
+            self._import_legacy(path)
+
+    @property
+    def rows(self) -> int:
+        return sum(seg.rows for seg in self._segments)
+
+    def append(self, entries: List[Dict]) -> None:
+        with self._lock:
+            self._append(entries)
+
+    def trim(self, max_rows: int) -> int:
+        with self._lock:
+            self._segment_rows = segment_rows_for(max_rows)
+            total = self.rows
+            dropped = 0
+            while len(self._segments) > 1 and total - self._segments[0].rows >= max_rows:
+                seg = self._segments.pop(0)
+                for entry in self._read_segment(seg):
+                    self._aggregates.remove(entry)
+                self._remove(seg.path)
+                self._unindex(seg.number)
+                total -= seg.rows
+                dropped += seg.rows
+            return dropped
+
+    def query(self, limit, offset, after_id, since, category, window_id, region_id,
+              cursor=None) -> Dict:
+        start = cursor
+        if start is None and after_id:
+            start = self._cursor_after(after_id)
+        events: List[Dict] = []
+        last = start
+        matched = 0
+        has_more = False
+        for position, entry in self.iter_events(start, since, category, window_id, region_id):
+            matched += 1
+            if matched <= offset:
+                last = position
+                continue
+            if len(events) >= limit:
+                has_more = True
+                if cursor is not None:
+                    # Cursor pages stop at one row of lookahead
+                    break
+                continue
+            events.append(entry)
+            last = position
+        if cursor is not None:
+            return _page(events, None, offset, limit, last, has_more)
+        return _page(events, matched, offset, limit, last)
+
+    def iter_events(self, cursor=None, since=None, category=None, window_id=None,
+                    region_id=None) -> Iterator[Tuple[str, Dict]]:
+        number, offset = decode_cursor(self.name, cursor, 2) if cursor else (0, _HEADER_SIZE)
+        while True:
+            with self._lock:
+                seg = next((seg for seg in self._segments if seg.number >= number), None)
+                if seg is None:
+                    return
+                if seg.number != number:
+                    # Next segment (or the cursor's segment was trimmed)
+                    number, offset = seg.number, _HEADER_SIZE
+                if seg.before(since):
+                    number, offset = number + 1, _HEADER_SIZE
+                    continue
+                batch = self._read_lines(seg, offset)
+            if not batch:
+                number, offset = number + 1, _HEADER_SIZE
+                continue
+            for end, line in batch:
+                offset = end
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("EventLogger: skipping malformed line")
+                    continue
+                if _matches(entry, since, category, window_id, region_id):
+                    yield encode_cursor(self.name, number, end), entry
+
+    def summary(self, since: Optional[str] = None) -> Dict:
+        with self._lock:
+            boundary = self._aggregates.boundary(since)
+        events = list(self._bucket_events(boundary, since)) if boundary else []
+        with self._lock:
+            return self._aggregates.summary(since, boundary, events)
+
+    def clear(self, category: Optional[str] = None) -> int:
+        with self._lock:
+            self._close_handle()
+            deleted = 0
+            kept: List[Dict] = []
+            for seg in self._segments:
+                if category:
+                    for entry in self._read_segment(seg):
+                        if entry.get("category") == category:
+                            deleted += 1
+                        else:
+                            kept.append(entry)
+                else:
+                    deleted += seg.rows
+                self._remove(seg.path)
+            next_number = self._segments[-1].number + 1 if self._segments else 1
+            self._segments = []
+            self._by_id.clear()
+            self._segment_ids.clear()
+            self._captures.clear()
+            self._bucket_spans.clear()
+            self._aggregates.clear()
+            # Survivors are written to fresh segments numbered after the old ones
+            self._open_segment(next_number)
+            if kept:
+                self._append(kept)
+            return deleted
+
+    def get_by_id(self, event_id: str) -> Optional[Dict]:
+        with self._lock:
+            location = self._by_id.get(event_id)
+            if location is None:
+                return None
+            number, offset = location
+            if self._handle is not None:
+                self._handle.flush()
+            try:
+                with open(self._segment_path(number), "rb") as f:
+                    f.seek(offset)
+                    return json.loads(f.readline())
+            except (OSError, ValueError) as exc:
+                logger.error("EventLogger: could not read event %s: %s", event_id, exc)
+                return None
+
+    def latest_capture(self, window_id: str, region_id: str) -> Optional[str]:
+        with self._lock:
+            found = self._captures.get((window_id, region_id))
+        return found[0] if found else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_handle()
+
+    def read_all(self) -> List[Dict]:
+        """Every stored event, oldest first."""
+        return [entry for _, entry in self.iter_events()]
+
+    def retire(self) -> Optional[str]:
+        """Close and set the segment directory aside (after a migration).
+
+        Returns:
+            Where the directory went, or None when it could not be renamed
+        """
+        self.close()
+        return _set_aside(self._dir)
+
+    # ── Internal ──────────────────────────────────────────────────────────────
+
+    def _load(self) -> None:
+        """Read segment headers; recount the newest segment (it may be torn)."""
+        numbers = []
+        for name in os.listdir(self._dir):
+            stem, ext = os.path.splitext(name)
+            if ext == _SEGMENT_SUFFIX and stem.isdigit():
+                numbers.append(int(stem))
+        for number in sorted(numbers):
+            seg = _Segment(number, self._segment_path(number))
+            try:
+                with open(seg.path, "rb") as f:
+                    meta = json.loads(f.read(_HEADER_SIZE)).get("segment", {})
+                seg.rows = int(meta.get("rows", 0))
+                seg.first_ts = meta.get("first_ts")
+                seg.last_ts = meta.get("last_ts")
+            except (OSError, ValueError, AttributeError) as exc:
+                logger.warning("EventLogger: unreadable segment header %s: %s", seg.path, exc)
+                continue
+            self._segments.append(seg)
+        if self._segments:
+            self._recover(self._segments[-1])
+        for seg in self._segments:
+            for offset, entry in self._scan_segment(seg):
+                self._index(seg.number, offset, entry)
+
+    def _recover(self, seg: _Segment) -> None:
+        """Drop a partially written last line and make the header match the rows."""
+        with open(seg.path, "r+b") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+        counted = _Segment(seg.number, seg.path)
+        for entry in self._read_segment(seg):
+            counted.add(entry.get("timestamp", ""))
+        if (counted.rows, counted.last_ts) != (seg.rows, seg.last_ts):
+            logger.info("EventLogger: repaired segment header %s (%d rows)", seg.path, counted.rows)
+            seg.rows, seg.first_ts, seg.last_ts = counted.rows, counted.first_ts, counted.last_ts
+            with open(seg.path, "r+b") as f:
+                f.write(seg.header())
+
+    def _import_legacy(self, path: str) -> None:
+        # Set aside first: a log that stays in place would be imported again
+        moved = _set_aside(path)
+        if moved is None:
+            return
+        entries = list(read_jsonl(moved))
+        with self._lock:
+            self._append(entries)
+        logger.info("EventLogger: split %d events from %s into segments", len(entries), path)
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self._dir, f"{number:06d}{_SEGMENT_SUFFIX}")
+
+    def _open_segment(self, number: int) -> _Segment:
+        seg = _Segment(number, self._segment_path(number))
+        self._handle = open(seg.path, "w+b")
+        self._handle.write(seg.header())
+        self._handle.flush()
+        self._segments.append(seg)
+        return seg
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _append(self, entries: List[Dict]) -> None:
+        """Write *entries* through the persistent handle. Caller holds the lock."""
+        if not entries:
+            return
+        if self._handle is None:
+            if self._segments and self._segments[-1].rows < self._segment_rows:
+                self._handle = open(self._segments[-1].path, "r+b")
+            else:
+                number = self._segments[-1].number + 1 if self._segments else 1
+                self._open_segment(number)
+        seg = self._segments[-1]
+        for entry in entries:
+            if seg.rows >= self._segment_rows:
+                self._seal(seg)
+                seg = self._open_segment(seg.number + 1)
+            offset = self._handle.seek(0, os.SEEK_END)
+            self._handle.write(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+            seg.add(entry.get("timestamp", ""))
+            self._index(seg.number, offset, entry)
+        self._seal(seg, close=False)
+
+    def _seal(self, seg: _Segment, close: bool = True) -> None:
+        """Rewrite *seg*'s header after its rows are on disk."""
+        self._handle.flush()
+        self._handle.seek(0)
+        self._handle.write(seg.header())
+        self._handle.flush()
+        if close:
+            self._close_handle()
+
+    def _cursor_after(self, event_id: str) -> Optional[str]:
+        """Cursor just past *event_id*, found through the id index."""
+        with self._lock:
+            location = self._by_id.get(event_id)
+            if location is None:
+                return None
+            number, offset = location
+            if self._handle is not None:
+                self._handle.flush()
+            try:
+                with open(self._segment_path(number), "rb") as f:
+                    f.seek(offset)
+                    return encode_cursor(self.name, number, offset + len(f.readline()))
+            except OSError:
+                return None
+
+    def _read_lines(self, seg: _Segment, offset: int) -> List[Tuple[int, bytes]]:
+        """Up to ``_READ_BATCH`` (end offset, line) pairs from *offset*. Caller holds the lock."""
+        if self._handle is not None:
+            self._handle.flush()
+        lines: List[Tuple[int, bytes]] = []
+        try:
+            with open(seg.path, "rb") as f:
+                f.seek(max(offset, _HEADER_SIZE))
+                end = f.tell()
+                for line in f:
+                    end += len(line)
+                    if line.strip():
+                        lines.append((end, line))
+                        if len(lines) >= _READ_BATCH:
+                            break
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.error("EventLogger read error: %s", exc, exc_info=True)
+        return lines
+
+    def _index(self, number: int, offset: int, entry: Dict) -> None:
+        """Add *entry* to the in-memory indexes and summary aggregates."""
+        self._aggregates.add(entry)
+        event_id = entry.get("id")
+        if event_id:
+            self._by_id[event_id] = (number, offset)
+            self._segment_ids.setdefault(number, []).append(event_id)
+        key = _capture_key(entry)
+        if key is not None:
+            self._captures[key] = (entry["capture_file"], event_id)
+        for bucket in bucket_keys(str(entry.get("timestamp", ""))):
+            span = self._bucket_spans.get(bucket)
+            if span is None:
+                self._bucket_spans[bucket] = [(number, offset), (number, offset)]
+            else:
+                span[1] = (number, offset)
+
+    def _bucket_events(self, bucket: str, since: str) -> Iterator[Dict]:
+        """Events of one summary bucket at or after *since*: its first to its last row."""
+        with self._lock:
+            span = self._bucket_spans.get(bucket)
+            if span is None:
+                return
+            start, last = span
+        for cursor, entry in self.iter_events(cursor=encode_cursor(self.name, *start)):
+            timestamp = str(entry.get("timestamp", ""))
+            if timestamp.startswith(bucket) and timestamp >= since:
+                yield entry
+            # The cursor is the end of this row: past the last row's start means it was the last
+            if decode_cursor(self.name, cursor, 2) > last:
+                return
+
+    def _unindex(self, number: int) -> None:
+        """Forget the events of a dropped segment."""
+        for event_id in self._segment_ids.pop(number, ()):
+            if self._by_id.get(event_id, (None,))[0] == number:
+                del self._by_id[event_id]
+        # Dropped segments are the oldest, so an older capture cannot take over
+        stale = [key for key, (_, event_id) in self._captures.items() if event_id not in self._by_id]
+        for key in stale:
+            del self._captures[key]
+        # A bucket that continues in a later segment now starts at the oldest one left
+        for bucket in [b for b, span in self._bucket_spans.items() if span[0][0] == number]:
+            if self._segments and self._aggregates.has_bucket(bucket):
+                self._bucket_spans[bucket][0] = (self._segments[0].number, _HEADER_SIZE)
+            else:
+                del self._bucket_spans[bucket]
+
+    @staticmethod
+    def _read_segment(seg: _Segment) -> Iterable[Dict]:
+        """Parse the rows of one segment (header skipped)."""
+        for _, entry in JsonlEventStore._scan_segment(seg):
+            yield entry
+
+    @staticmethod
+    def _scan_segment(seg: _Segment) -> Iterator[Tuple[int, Dict]]:
+        """(byte offset, event) for every row of one segment."""
+        try:
+            with open(seg.path, "rb") as f:
+                offset = f.seek(_HEADER_SIZE)
+                for line in f:
+                    start, offset = offset, offset + len(line)
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield start, json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning("EventLogger: skipping malformed line")
+        except FileNotFoundError:
+            return
+        except Exception as exc:
+            logger.error("EventLogger read error: %s", exc, exc_info=True)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.warning("EventLogger: could not remove segment %s: %s", path, exc)
+
+
+def read_jsonl(path: str) -> Iterable[Dict]:
+    """Yield the events of a JSONL log, skipping malformed lines."""
+    if not os.path.exists(path):
+        return
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("EventLogger: skipping malformed line")
+    except Exception as exc:
+        logger.error("EventLogger read error: %s", exc, exc_info=True)
+
+
+# ── SQLite ────────────────────────────────────────────────────────────────────
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq          INTEGER PRIMARY KEY AUTOINCREMENT,
+    id           TEXT NOT NULL,
+    timestamp    TEXT NOT NULL DEFAULT '',
+    category     TEXT,
+    event        TEXT,
+    source       TEXT,
+    window_id    TEXT,
+    window_name  TEXT,
+    region_id    TEXT,
+    capture_file TEXT,
+    data         TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_events_unique_id ON events (id);
+CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_category ON events (category);
+CREATE INDEX IF NOT EXISTS idx_events_window ON events (window_id);
+CREATE INDEX IF NOT EXISTS idx_events_region ON events (region_id);
+CREATE INDEX IF NOT EXISTS idx_events_window_region ON events (window_id, region_id, seq);
+"""
+
+
+class SqliteEventStore(EventStore):
+    """Events in an indexed SQLite table (WAL journal)."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, migrate_from: Optional[str] = None):
+        """Open (or create) the database.
+
+        Args:
+            path: SQLite database file
+            migrate_from: JSONL log imported once if it exists; renamed
+                to ``*.migrated`` afterwards
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._upgrade_schema()
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._rows = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        self._aggregates = EventAggregates()
+        for row in self._conn.execute(f"SELECT {_SUMMARY_COLUMNS} FROM events ORDER BY seq"):
+            self._aggregates.add(dict(zip(_SUMMARY_FIELDS, row)))
+        if migrate_from and (os.path.isfile(migrate_from)
+                             or os.path.isdir(segments_dir(migrate_from))):
+            self._migrate(migrate_from)
+
+    def append(self, entries: List[Dict]) -> None:
+        """Insert *entries*; an id already stored (a retried import) is skipped."""
+        rows = [self._row(entry) for entry in entries]
+        with self._lock:
+            inserted = []
+            with self._conn:
+                for entry, row in zip(entries, rows):
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO events (id, timestamp, category, event, source, "
+                        "window_id, window_name, region_id, capture_file, data) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+                    if cursor.rowcount:
+                        inserted.append(entry)
+            self._rows += len(inserted)
+            for entry in inserted:
+                self._aggregates.add(entry)
+
+    def trim(self, max_rows: int) -> int:
+        with self._lock:
+            excess = self._rows - max_rows
+            if excess <= 0:
+                return 0
+            self._unsummarise("SELECT {} FROM events ORDER BY seq LIMIT ?", (excess,))
+            with self._conn:
+                cursor = self._conn.execute(
+                    "DELETE FROM events WHERE seq IN "
+                    "(SELECT seq FROM events ORDER BY seq LIMIT ?)", (excess,))
+            self._rows -= cursor.rowcount
+            return cursor.rowcount
+
+    def query(self, limit, offset, after_id, since, category, window_id, region_id,
+              cursor=None) -> Dict:
+        where, params = self._where(since, category, window_id, region_id)
+        start = decode_cursor(self.name, cursor, 1)[0] if cursor else None
+        with self._lock:
+            if start is None and after_id:
+                anchor = self._conn.execute(
+                    "SELECT seq FROM events WHERE id = ? ORDER BY seq DESC LIMIT 1",
+                    (after_id,)).fetchone()
+                if anchor is not None:
+                    start = anchor[0]
+            if start is not None:
+                where.append("seq > ?")
+                params.append(start)
+            clause = (" WHERE " + " AND ".join(where)) if where else ""
+            total = None
+            if cursor is None:
+                total = self._conn.execute(
+                    "SELECT COUNT(*) FROM events" + clause, params).fetchone()[0]
+            # One row of lookahead tells a cursor page whether more follow
+            rows = self._conn.execute(
+                "SELECT seq, data FROM events" + clause + " ORDER BY seq LIMIT ? OFFSET ?",
+                params + [limit + 1, offset]).fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+        last = rows[-1][0] if rows else start
+        next_cursor = encode_cursor(self.name, last) if last is not None else None
+        return _page([json.loads(data) for _, data in rows], total, offset, limit,
+                     next_cursor, has_more if cursor is not None else None)
+
+    def iter_events(self, cursor=None, since=None, category=None, window_id=None,
+                    region_id=None) -> Iterator[Tuple[str, Dict]]:
+        last = decode_cursor(self.name, cursor, 1)[0] if cursor else 0
+        where, params = self._where(since, category, window_id, region_id)
+        where.append("seq > ?")
+        clause = " WHERE " + " AND ".join(where)
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT seq, data FROM events" + clause + " ORDER BY seq LIMIT ?",
+                    params + [last, _READ_BATCH]).fetchall()
+            if not rows:
+                return
+            for last, data in rows:
+                yield encode_cursor(self.name, last), json.loads(data)
+
+    def summary(self, since: Optional[str] = None) -> Dict:
+        with self._lock:
+            boundary = self._aggregates.boundary(since)
+            events = []
+            if boundary:
+                rows = self._conn.execute(
+                    f"SELECT {_SUMMARY_COLUMNS} FROM events WHERE timestamp >= ? AND timestamp < ?",
+                    (since, boundary + "\uffff"))
+                events = [dict(zip(_SUMMARY_FIELDS, row)) for row in rows]
+            return self._aggregates.summary(since, boundary, events)
+
+    def clear(self, category: Optional[str] = None) -> int:
+        with self._lock:
+            if category:
+                self._unsummarise("SELECT {} FROM events WHERE category = ?", (category,))
+            else:
+                self._aggregates.clear()
+            with self._conn:
+                if category:
+                    cursor = self._conn.execute("DELETE FROM events WHERE category = ?", (category,))
+                else:
+                    cursor = self._conn.execute("DELETE FROM events")
+            deleted = cursor.rowcount
+            self._rows -= deleted
+        return deleted
+
+    def get_by_id(self, event_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM events WHERE id = ? ORDER BY seq DESC LIMIT 1",
+                (event_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def latest_capture(self, window_id: str, region_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT capture_file FROM events WHERE window_id = ? AND region_id = ? "
+                "AND category = 'alert' AND capture_file != '' ORDER BY seq DESC LIMIT 1",
+                (window_id, region_id)).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ── Internal ──────────────────────────────────────────────────────────────
+
+    def _unsummarise(self, sql: str, params: tuple) -> None:
+        """Subtract the rows *sql* selects from the aggregates. Caller holds the lock."""
+        for row in self._conn.execute(sql.format(_SUMMARY_COLUMNS), params):
+            self._aggregates.remove(dict(zip(_SUMMARY_FIELDS, row)))
+
+    @staticmethod
+    def _row(entry: Dict) -> tuple:
+        values = []
+        for field in _INDEXED_FIELDS:
+            value = entry.get(field)
+            values.append(value if value is None or isinstance(value, str) else str(value))
+        values[1] = values[1] or ""
+        values.append(json.dumps(entry, ensure_ascii=False))
+        return tuple(values)
+
+    @staticmethod
+    def _where(since, category, window_id, region_id):
+        where: List[str] = []
+        params: List = []
+        for column, op, value in (("timestamp", ">=", since), ("category", "=", category),
+                                  ("window_id", "=", window_id), ("region_id", "=", region_id)):
+            if value:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+        return where, params
+
+    def _upgrade_schema(self) -> None:
+        """Make event ids unique in databases created with a plain id index."""
+        old = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_events_id'").fetchone()
+        if not old:
+            return
+        with self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM events WHERE seq NOT IN (SELECT MIN(seq) FROM events GROUP BY id)")
+            self._conn.execute("DROP INDEX idx_events_id")
+        if cursor.rowcount:
+            logger.warning("EventLogger: removed %d duplicate events from %s", cursor.rowcount, self._path)
+
+    def _migrate(self, jsonl_path: str) -> None:
+        """Import an existing JSONL log (single file or segments), then set it aside."""
+        legacy = JsonlEventStore(jsonl_path)
+        entries = legacy.read_all()
+        # Only import what is no longer in place to be imported again
+        if legacy.retire() is None:
+            logger.warning("EventLogger: %s left in place, not migrated", jsonl_path)
+            return
+        if entries:
+            self.append(entries)
+        logger.info("EventLogger: migrated %d events from %s", len(entries), jsonl_path)
+
+
+def open_event_store(backend: str, log_path: str, max_rows: int = 5000) -> EventStore:
+    """Open the event store for *backend*.
+
+    Args:
+        backend: One of ``EVENT_LOG_BACKENDS``; unknown names use JSONL
+        log_path: The JSONL log path; SQLite uses the same name with ``.db``
+        max_rows: Row cap, which sizes the JSONL segments
+    """
+    if backend == "sqlite":
+        return SqliteEventStore(os.path.splitext(log_path)[0] + ".db", migrate_from=log_path)
+    return JsonlEventStore(log_path, max_rows=max_rows)
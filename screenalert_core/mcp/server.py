@@ -22,10 +22,14 @@ import os
 import secrets
 import threading
 import time
+from html import escape
 from typing import Any, Callable, Dict, Optional
+from urllib.parse import quote
 
 logger = logging.getLogger(__name__)
 
+RESOURCE_PAGE_EVENTS = 50  # capture store events per /v1/resources page
+
 
 class MCPServer:
     """
@@ -213,7 +217,11 @@ class MCPServer:
         async def handle_resources_index(request: Request) -> Response:
             from starlette.responses import HTMLResponse
             capture_dir = self._config.get_capture_dir() if hasattr(self._config, "get_capture_dir") else ""
-            html = self._build_resource_browser_html(capture_dir)
+            try:
+                offset = max(0, int(request.query_params.get("offset", 0)))
+            except ValueError:
+                offset = 0
+            html = self._build_resource_browser_html(capture_dir, offset)
             return HTMLResponse(html)
 
         async def handle_resource_file(request: Request) -> Response:
@@ -306,9 +314,11 @@ class MCPServer:
             if window_name:
                 parts.append(f"for window '{window_name}'")
             parts.append(
-                ". Call get_event_summary to get counts, then get_event_log "
-                "to see details. Highlight any patterns, frequent alerts, or "
-                "windows that look problematic."
+                ". Call get_alert_rollup (with the same since) for alert counts per "
+                "window and region over time, alert durations and detector metrics, "
+                "and get_event_summary for counts of other events. Only call "
+                "get_event_log for the details of specific alerts. Highlight any "
+                "patterns, frequent or long alerts, or windows that look problematic."
             )
             return " ".join(parts)
 
@@ -358,9 +368,11 @@ class MCPServer:
             return (
                 f"Please produce a daily activity summary for ScreenAlert for {today}. "
                 "Call get_event_summary with since set to today's date. "
-                "Then call get_event_log filtered to today's alerts. "
-                "Include: total events, alert counts per window, any windows that "
-                "disconnected, and settings changes made today."
+                "Then call get_alert_rollup with since set to today's date and "
+                "bucket_minutes=60 for today's alerts per window and hour. "
+                "Include: total events, alert counts per window, the busiest hours, "
+                "the longest alerts, any windows that disconnected, and settings "
+                "changes made today."
             )
 
     # ── HTTP redirect ──────────────────────────────────────────────────────────
@@ -446,13 +458,48 @@ class MCPServer:
         except Exception:
             return "unknown"
 
-    def _build_resource_browser_html(self, capture_dir: str) -> str:
-        """Build a simple HTML file listing for the captures directory."""
+    def _build_resource_browser_html(self, capture_dir: str, offset: int = 0) -> str:
+        """Build a simple HTML file listing for the captures directory.
+
+        Capture store events are listed newest first, ``RESOURCE_PAGE_EVENTS``
+        per page, skipping the *offset* newest.
+        """
         if not capture_dir or not os.path.isdir(capture_dir):
             return "<html><body><p>No captures directory configured.</p></body></html>"
 
+        # Capture store: one row per stored image, straight from its manifest
+        store_rows = ""
+        pager = ""
+        try:
+            store = getattr(self._engine, "capture_store", None)
+        except Exception:
+            store = None
+        if store is not None:
+            events = store.events()
+            newest = max(0, len(events) - offset)
+            page = events[max(0, newest - RESOURCE_PAGE_EVENTS):newest]
+            for event_id in reversed(page):
+                for entry in store.entries(event_id):
+                    rel = os.path.relpath(os.path.join(store.root, entry.blob), capture_dir).replace("\\", "/")
+                    store_rows += (
+                        f'<tr><td>{escape(event_id)}</td><td>{escape(entry.window_id)}</td>'
+                        f'<td>{escape(entry.region_id)}</td>'
+                        f'<td><a href="/v1/resources/{quote(rel)}">{escape(entry.kind)}</a></td></tr>'
+                    )
+            links = []
+            if offset > 0:
+                links.append(f'<a href="/v1/resources?offset={max(0, offset - RESOURCE_PAGE_EVENTS)}">Newer</a>')
+            if newest > RESOURCE_PAGE_EVENTS:
+                links.append(f'<a href="/v1/resources?offset={offset + RESOURCE_PAGE_EVENTS}">Older</a>')
+            if events:
+                shown = (f"Events {offset + 1}-{offset + len(page)} of {len(events)}, newest first. "
+                         if page else "")
+                pager = f"<p>{shown}{' | '.join(links)}</p>"
+
         files = []
-        for root, _, filenames in os.walk(capture_dir):
+        for root, dirnames, filenames in os.walk(capture_dir):
+            if store is not None and os.path.normpath(root) == os.path.normpath(capture_dir):
+                dirnames[:] = [d for d in dirnames if d != os.path.basename(store.root)]
             for fname in sorted(filenames):
                 full = os.path.join(root, fname)
                 rel = os.path.relpath(full, capture_dir).replace("\\", "/")
@@ -460,13 +507,20 @@ class MCPServer:
                 files.append((rel, size))
 
         rows = "".join(
-            f'<tr><td><a href="/v1/resources/{rel}">{rel}</a></td>'
+            f'<tr><td><a href="/v1/resources/{quote(rel)}">{escape(rel)}</a></td>'
             f'<td>{size:,} bytes</td></tr>'
             for rel, size in files
         )
+        store_table = (
+            "<h3>Alert captures</h3>"
+            f"{pager}"
+            "<table border='1' cellpadding='4'><tr><th>Event</th><th>Window</th>"
+            f"<th>Region</th><th>Image</th></tr>{store_rows}</table>"
+        ) if store_rows or pager else ""
         return (
             "<html><head><title>ScreenAlert Captures</title></head><body>"
             "<h2>ScreenAlert Captures</h2>"
+            f"{store_table}"
             f"<table border='1' cellpadding='4'><tr><th>File</th><th>Size</th></tr>"
             f"{rows}</table></body></html>"
         )
@@ -1,8 +1,10 @@
 """
-MCP event log tools — query, summarise, clear the JSONL event log.
+MCP event log tools — query, summarise, clear the JSONL event log, and
+the bucketed alert rollup built alongside it.
 """
 
 import logging
+import time
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -16,10 +18,12 @@ def register(mcp, engine, config, event_logger) -> None:
     @mcp.tool(
         description=(
             "Query the ScreenAlert event log. "
-            "Use after_id for cursor-based polling (pass the id of the last seen event). "
+            "For polling or deep paging pass the cursor returned by the previous call: "
+            "the page continues after its last event and only the returned rows are read "
+            "(total is then null). after_id (the id of the last seen event) also works. "
             "Use offset for page-based browsing. "
             "Filter by since (ISO datetime string), category, window_id, or region_id. "
-            "Returns {events, total, has_more}."
+            "Returns {events, total, has_more, cursor}."
         )
     )
     def get_event_log(
@@ -30,6 +34,7 @@ def register(mcp, engine, config, event_logger) -> None:
         category: str = "",
         window_id: str = "",
         region_id: str = "",
+        cursor: str = "",
     ) -> dict:
         if not event_logger:
             return {"events": [], "total": 0, "has_more": False,
@@ -38,15 +43,19 @@ def register(mcp, engine, config, event_logger) -> None:
         limit = max(1, min(1000, int(limit)))
         offset = max(0, int(offset))
 
-        return event_logger.query(
-            limit=limit,
-            offset=offset,
-            after_id=after_id or None,
-            since=since or None,
-            category=category or None,
-            window_id=window_id or None,
-            region_id=region_id or None,
-        )
+        try:
+            return event_logger.query(
+                limit=limit,
+                offset=offset,
+                after_id=after_id or None,
+                since=since or None,
+                category=category or None,
+                window_id=window_id or None,
+                region_id=region_id or None,
+                cursor=cursor or None,
+            )
+        except ValueError as exc:
+            return {"error": str(exc), "code": 400, "field": "cursor"}
 
     # ── get_event_summary ─────────────────────────────────────────────────────
 
@@ -78,3 +87,45 @@ def register(mcp, engine, config, event_logger) -> None:
 
         deleted = event_logger.clear(category=category or None)
         return {"entries_deleted": deleted}
+
+    # ── get_alert_rollup ──────────────────────────────────────────────────────
+
+    @mcp.tool(
+        description=(
+            "Alert analytics in fixed time buckets, without reading the event log: per bucket "
+            "the alert count (total, by window_id and by region_id) and the seconds spent in "
+            "ALERT and WARNING by alert episodes that ended in it; per window and per region "
+            "totals with mean alert/warning durations, the longest episode, and the "
+            "distribution (mean/min/max/histogram) of the detector metric at alert time. "
+            "since/until are ISO datetimes, UTC unless they carry an offset (default: the "
+            "last 24 hours); bucket start/end labels are UTC. bucket_minutes is rounded up "
+            "to a multiple of 5. Empty buckets are omitted. "
+            "Filter by window_id or region_id."
+        )
+    )
+    def get_alert_rollup(
+        since: str = "",
+        until: str = "",
+        bucket_minutes: int = 60,
+        window_id: str = "",
+        region_id: str = "",
+    ) -> dict:
+        from screenalert_core.monitoring.alert_rollup import parse_timestamp
+
+        rollup = getattr(engine, "alert_rollup", None)
+        if rollup is None or not hasattr(rollup, "query"):
+            return {"error": "Alert rollup is not available", "code": 503}
+        try:
+            end = parse_timestamp(until) if until else time.time()
+            start = parse_timestamp(since) if since else end - 86400.0
+        except ValueError as exc:
+            return {"error": f"Invalid datetime: {exc}", "code": 400, "field": "since/until"}
+        try:
+            return rollup.query(
+                start, end,
+                bucket_s=max(1, int(bucket_minutes)) * 60,
+                window_id=window_id or None,
+                region_id=region_id or None,
+            )
+        except ValueError as exc:
+            return {"error": str(exc), "code": 400, "field": "bucket_minutes"}
@@ -33,23 +33,40 @@ def _encode_image(path: str, max_width: int) -> Optional[str]:
         return None
 
 
-def _find_capture_for_event(event_logger, event_id: str) -> Optional[str]:
+def _capture_store(engine):
+    """The engine's capture store, or None (disabled, or an older engine)."""
+    try:
+        return getattr(engine, "capture_store", None)
+    except Exception as exc:
+        logger.error("Capture store unavailable: %s", exc)
+        return None
+
+
+def _find_capture_for_event(event_logger, event_id: str, store=None) -> Optional[str]:
     """Find the capture_file field of a specific event by id."""
+    if store is not None:
+        path = store.get_event(event_id).get("snapshot")
+        if path:
+            return path
     if not event_logger:
         return None
-    result = event_logger.query(limit=1, after_id=None, since=None)
-    # Fast path: query all and find by id (EventLogger doesn't have get_by_id)
-    all_events = event_logger.query(limit=100000)
-    for ev in all_events.get("events", []):
-        if ev.get("id") == event_id:
-            return ev.get("capture_file")
-    return None
+    event = event_logger.get_by_id(event_id)
+    return event.get("capture_file") if event else None
 
 
-def _find_latest_capture(event_logger, window_id: str, region_id: str) -> Optional[str]:
+def _find_latest_capture(event_logger, window_id: str, region_id: str,
+                         store=None) -> Optional[str]:
     """Find the most recent capture_file for a given window+region."""
+    if store is not None:
+        path = store.latest_capture(window_id, region_id)
+        if path and os.path.isfile(path):
+            return path
     if not event_logger:
         return None
+    path = event_logger.latest_capture(window_id, region_id)
+    if path is None or os.path.isfile(path):
+        return path
+    # The newest capture was deleted from disk: fall back to older alerts
     result = event_logger.query(
         limit=100000,
         category="alert",
@@ -91,14 +108,15 @@ def register(mcp, engine, config, event_logger) -> None:
         capture_file = None
 
         if event_id:
-            capture_file = _find_capture_for_event(event_logger, event_id)
+            capture_file = _find_capture_for_event(event_logger, event_id, _capture_store(engine))
             if not capture_file:
                 return {"error": f"Event '{event_id}' not found or has no capture_file", "code": 404}
         elif window_id or region_id:
             if not (window_id and region_id):
                 return {"error": "Both window_id and region_id are required when event_id is omitted",
                         "code": 400, "field": "window_id"}
-            capture_file = _find_latest_capture(event_logger, window_id, region_id)
+            capture_file = _find_latest_capture(event_logger, window_id, region_id,
+                                                _capture_store(engine))
             if not capture_file:
                 return {"error": "No capture found for that window/region combination", "code": 404}
         else:
@@ -134,7 +152,24 @@ def register(mcp, engine, config, event_logger) -> None:
         if not event_logger:
             return [{"error": "Event logging is not enabled", "code": 503}]
 
-        capture_file = _find_capture_for_event(event_logger, event_id)
+        # Capture store: the manifest lists the event's images directly
+        store = _capture_store(engine)
+        stored = store.get_event(event_id) if store is not None else {}
+        diagnostics = [(kind, path) for kind, path in stored.items() if kind != "snapshot"]
+        if diagnostics:
+            result = []
+            for kind, path in diagnostics:
+                encoded = _encode_image(path, 0) if os.path.isfile(path) else None
+                if encoded:
+                    result.append({
+                        "filename": f"{event_id}_{kind}.png",
+                        "image": encoded,
+                        "format": "png",
+                        "encoding": "base64",
+                    })
+            return result or [{"note": "No diagnostic images found for this event"}]
+
+        capture_file = _find_capture_for_event(event_logger, event_id, store)
         if not capture_file:
             return [{"error": f"Event '{event_id}' not found or has no capture_file", "code": 404}]
 
@@ -167,3 +202,27 @@ def register(mcp, engine, config, event_logger) -> None:
             return [{"note": "No diagnostic images found for this event"}]
 
         return result
+
+    # ── get_capture_usage ─────────────────────────────────────────────────────
+
+    @mcp.tool(
+        description=(
+            "Return how much disk the capture store uses (bytes, events, blobs, oldest and "
+            "newest capture) against the retention quotas capture_max_mb, "
+            "capture_max_age_days and capture_max_per_region, plus what retention "
+            "has deleted so far. quotas_enforced is false while capture_store is off: "
+            "loose capture files are not managed."
+        )
+    )
+    def get_capture_usage() -> dict:
+        if not hasattr(engine, "capture_usage"):
+            return {"error": "Capture usage is not available", "code": 503}
+        try:
+            result = engine.capture_usage()
+        except Exception as exc:
+            logger.error("Error reading capture usage: %s", exc)
+            return {"error": f"Failed to read capture usage: {exc}", "code": 500}
+        usage = result.get("usage")
+        if usage:
+            usage["megabytes"] = round(usage["bytes"] / (1024 * 1024), 2)
+        return result
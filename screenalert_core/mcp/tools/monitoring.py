@@ -68,7 +68,9 @@ def register(mcp, engine, config, event_logger) -> None:
         description=(
             "Get the current monitoring state. "
             "state values: 'running', 'paused', 'stopped'. "
-            "Includes active window/region counts and mute status."
+            "Includes active window/region counts and mute status, and the load "
+            "governor's level (load.level_name: full, reduced_scale, "
+            "shed_low_priority, defer_diagnostics) with its recent steps."
         )
     )
     def get_monitoring_status() -> dict:
@@ -100,7 +102,7 @@ def register(mcp, engine, config, event_logger) -> None:
         if hasattr(engine, "_start_time") and engine._start_time:
             uptime = int(time.time() - engine._start_time)
 
-        return {
+        result = {
             "state": state,
             "muted": muted,
             "mute_remaining_seconds": mute_remaining,
@@ -109,3 +111,14 @@ def register(mcp, engine, config, event_logger) -> None:
             "total_windows": len(thumbnails),
             "active_regions": active_regions,
         }
+        # Poll deadlines and capture pool health (how late jobs run, stalled captures)
+        if hasattr(engine, "poll_scheduler"):
+            result["scheduler"] = engine.poll_scheduler.stats()
+        if hasattr(engine, "capture_scheduler"):
+            result["capture"] = engine.capture_scheduler.stats()
+        if hasattr(engine, "load_status"):
+            result["load"] = engine.load_status()
+        # Per-stage queue depth, coalesced/dropped items and worker time
+        if hasattr(engine, "pipeline_stats"):
+            result["pipeline"] = engine.pipeline_stats()
+        return result
@@ -45,10 +45,75 @@ _REGION_SETTING_META = {
     "change_detection_method": {
         "type": "str",
         "description": "Algorithm used for change detection",
+        "valid_values": ["ssim", "phash", "edge_only", "background_subtraction", "cascade"],
+    },
+    "ssim_window": {
+        "type": "str",
+        "description": "SSIM filter window: box (7x7 uniform) or gaussian (11x11, sigma 1.5)",
+        "valid_values": ["box", "gaussian"],
+    },
+    "analysis_scale": {
+        "type": "float|str",
+        "description": "Resolution the region is analysed at: 1.0 (full), 0.5, 0.25, 0.125, "
+                       "or 'auto' to pick from region size and detection method",
+        "valid_values": [1.0, 0.5, 0.25, 0.125, "auto"],
+    },
+    "cascade_gate": {
+        "type": "str",
+        "description": "Cascade method: cheap gate run every tick",
+        "valid_values": ["mad", "ahash", "dhash"],
+    },
+    "cascade_gate_threshold": {
+        "type": "float",
+        "description": "Cascade method: gate score (0-1) above which the confirm detector runs",
+        "valid_range": [0.0, 1.0],
+    },
+    "cascade_confirm": {
+        "type": "str",
+        "description": "Cascade method: detector that confirms a change once the gate fires",
         "valid_values": ["ssim", "phash", "edge_only", "background_subtraction"],
     },
+    "priority": {
+        "type": "str",
+        "description": "Under overload, high keeps full analysis quality and low is checked "
+                       "only every other time",
+        "valid_values": ["low", "normal", "high"],
+    },
+    "poll_interval_ms": {
+        "type": "int|null",
+        "description": "How often this region is checked, in ms (null = with its window)",
+        "valid_range": [50, 3600000],
+    },
+    "adaptive_polling": {
+        "type": "bool|null",
+        "description": "Back off polling while this region stays OK (null = global adaptive_polling)",
+    },
+    "min_interval_ms": {
+        "type": "int|null",
+        "description": "Region may also be checked early on a frame captured for another region "
+                       "of its window, at most this often (0 = never early, null = window default)",
+        "valid_range": [0, 3600000],
+    },
 }
 
+# Interval keys shared by regions and windows: key -> (min, max)
+_INTERVAL_RANGES = {"poll_interval_ms": (50, 3600000), "min_interval_ms": (0, 3600000)}
+
+
+def _parse_interval(key: str, value: Any):
+    """Return (interval_or_None, error_dict) for a poll/min interval setting."""
+    if value is None:
+        return None, None
+    lo, hi = _INTERVAL_RANGES[key]
+    try:
+        v = int(value)
+    except (TypeError, ValueError):
+        return None, {"error": f"{key} must be an integer or null", "code": 422, "field": "value"}
+    if isinstance(value, bool) or not (lo <= v <= hi):
+        return None, {"error": f"{key} must be between {lo} and {hi}",
+                      "code": 422, "field": "value", "valid_range": [lo, hi]}
+    return v, None
+
 
 def _resolve_window(config, engine, window_id: Optional[str], window_name: Optional[str]):
     if window_id:
@@ -344,6 +409,29 @@ def register(mcp, engine, config, event_logger) -> None:
                 entry["value"] = r.get("alert_threshold", config.get_default_alert_threshold())
             elif key == "change_detection_method":
                 entry["value"] = r.get("change_detection_method", config.get_change_detection_method())
+            elif key == "ssim_window":
+                entry["value"] = r.get("ssim_window", config.get_ssim_window())
+            elif key == "cascade_gate":
+                entry["value"] = r.get("cascade_gate", config.get_cascade_gate())
+            elif key == "cascade_gate_threshold":
+                entry["value"] = r.get("cascade_gate_threshold", config.get_cascade_gate_threshold())
+            elif key == "cascade_confirm":
+                entry["value"] = r.get("cascade_confirm", config.get_cascade_confirm())
+            elif key == "analysis_scale":
+                entry["value"] = r.get("analysis_scale") or config.get_analysis_scale()
+                monitor = engine.monitoring_engine.get_monitor(region_id)
+                effective = getattr(monitor, "effective_analysis_scale", None)
+                if effective is not None:
+                    entry["effective_value"] = effective
+            elif key == "priority":
+                entry["value"] = r.get("priority", "normal")
+            elif key == "poll_interval_ms":
+                entry["value"] = r.get(key)
+                # Current interval, including any adaptive back-off
+                if hasattr(engine, "poll_lateness"):
+                    polled = engine.poll_lateness().get(f"region:{region_id}")
+                    if polled:
+                        entry["effective_value"] = polled["interval_ms"]
             else:
                 entry["value"] = r.get(key)
             result[key] = entry
@@ -355,7 +443,9 @@ def register(mcp, engine, config, event_logger) -> None:
         description=(
             "Set a single configurable setting for a monitoring region. "
             "Valid keys: name, rect, enabled, tts_message, sound_file, sound_enabled, "
-            "tts_enabled, alert_threshold, change_detection_method. "
+            "tts_enabled, alert_threshold, change_detection_method, ssim_window, "
+            "analysis_scale, cascade_gate, cascade_gate_threshold, cascade_confirm, "
+            "priority, poll_interval_ms, min_interval_ms, adaptive_polling. "
             "Returns 422 with valid_values if value is out of range."
         )
     )
@@ -422,7 +512,7 @@ def register(mcp, engine, config, event_logger) -> None:
             updates["alert_threshold"] = v
 
         elif key == "change_detection_method":
-            valid = ["ssim", "phash", "edge_only", "background_subtraction"]
+            valid = _REGION_SETTING_META["change_detection_method"]["valid_values"]
             if value not in valid:
                 return {"error": f"change_detection_method must be one of: {', '.join(valid)}",
                         "code": 422, "field": "value", "valid_values": valid}
@@ -435,6 +525,86 @@ def register(mcp, engine, config, event_logger) -> None:
                 except Exception as exc:
                     logger.warning("Could not update live detector for region %s: %s", region_id, exc)
 
+        elif key == "ssim_window":
+            valid = _REGION_SETTING_META["ssim_window"]["valid_values"]
+            if value not in valid:
+                return {"error": f"ssim_window must be one of: {', '.join(valid)}",
+                        "code": 422, "field": "value", "valid_values": valid}
+            updates["ssim_window"] = value
+            monitor = engine.monitoring_engine.get_monitor(region_id)
+            if monitor:
+                try:
+                    monitor.set_detector(monitor.detector_method,
+                                         engine._get_global_detection_config(),
+                                         ssim_window=value)
+                except Exception as exc:
+                    logger.warning("Could not update live detector for region %s: %s", region_id, exc)
+
+        elif key == "analysis_scale":
+            valid = _REGION_SETTING_META["analysis_scale"]["valid_values"]
+            if isinstance(value, str) and value.strip().lower() == "auto":
+                scale = "auto"
+            else:
+                try:
+                    scale = float(value)
+                except (TypeError, ValueError):
+                    scale = None
+                if isinstance(value, bool) or scale not in valid:
+                    return {"error": "analysis_scale must be one of: 1.0, 0.5, 0.25, 0.125, auto",
+                            "code": 422, "field": "value", "valid_values": valid}
+            updates["analysis_scale"] = scale
+            monitor = engine.monitoring_engine.get_monitor(region_id)
+            if monitor:
+                try:
+                    monitor.set_detector(monitor.detector_method,
+                                         engine._get_global_detection_config(),
+                                         analysis_scale=scale)
+                except Exception as exc:
+                    logger.warning("Could not update live detector for region %s: %s", region_id, exc)
+
+        elif key in ("cascade_gate", "cascade_confirm"):
+            valid = _REGION_SETTING_META[key]["valid_values"]
+            if value not in valid:
+                return {"error": f"{key} must be one of: {', '.join(valid)}",
+                        "code": 422, "field": "value", "valid_values": valid}
+            updates[key] = value
+
+        elif key == "cascade_gate_threshold":
+            try:
+                v = float(value)
+            except (TypeError, ValueError):
+                return {"error": "cascade_gate_threshold must be a float", "code": 422, "field": "value"}
+            if not (0.0 <= v <= 1.0):
+                return {"error": "cascade_gate_threshold must be between 0.0 and 1.0",
+                        "code": 422, "field": "value", "valid_range": [0.0, 1.0]}
+            updates[key] = v
+
+        elif key == "priority":
+            valid = _REGION_SETTING_META["priority"]["valid_values"]
+            if value not in valid:
+                return {"error": f"priority must be one of: {', '.join(valid)}",
+                        "code": 422, "field": "value", "valid_values": valid}
+            updates[key] = value
+
+        elif key == "adaptive_polling":
+            updates[key] = None if value is None else bool(value)
+
+        elif key in _INTERVAL_RANGES:
+            v, err = _parse_interval(key, value)
+            if err:
+                return err
+            updates[key] = v
+
+        if key.startswith("cascade_"):
+            monitor = engine.monitoring_engine.get_monitor(region_id)
+            if monitor:
+                try:
+                    if monitor.detector_method == "cascade":
+                        monitor.set_detector("cascade", engine._get_global_detection_config(),
+                                             **updates)
+                except Exception as exc:
+                    logger.warning("Could not update live detector for region %s: %s", region_id, exc)
+
         ok = config.update_region(tc["id"], region_id, updates)
         if not ok:
             return {"error": "Failed to update region setting", "code": 500}
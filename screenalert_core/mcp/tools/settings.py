@@ -32,6 +32,26 @@ _GLOBAL_SETTING_META = {
         "description": "Monitoring loop polling interval in milliseconds",
         "valid_range": [300, 5000],
     },
+    "adaptive_polling": {
+        "type": "bool",
+        "description": "Poll regions that stay OK progressively less often "
+                       "(alerting regions keep full rate; a change restores it)",
+    },
+    "adaptive_max_interval_ms": {
+        "type": "int",
+        "description": "Adaptive polling: longest interval for a quiet region (ms)",
+        "valid_range": [1000, 600000],
+    },
+    "adaptive_stable_seconds": {
+        "type": "int",
+        "description": "Adaptive polling: quiet time (s) per doubling of a region's interval",
+        "valid_range": [5, 3600],
+    },
+    "load_governor": {
+        "type": "bool",
+        "description": "Shed work (lower analysis scale, skip low-priority regions on alternate "
+                       "runs, defer diagnostics) while the loop overruns refresh_rate_ms",
+    },
     "log_level": {
         "type": "str",
         "description": "Active log verbosity level",
@@ -88,6 +108,30 @@ _GLOBAL_SETTING_META = {
         "type": "bool",
         "description": "Save diagnostic images (diff, mask) alongside alert captures",
     },
+    "capture_png_compress_level": {
+        "type": "int",
+        "description": "PNG compression for captures and diagnostics (0 = fastest, 9 = smallest)",
+        "valid_range": [0, 9],
+    },
+    "capture_store": {
+        "type": "bool",
+        "description": "Store captures content-addressed (identical images saved once)",
+    },
+    "capture_max_mb": {
+        "type": "int",
+        "description": "Capture store size quota in MB; oldest captures deleted beyond it (0 = unlimited)",
+        "valid_range": [0, 1048576],
+    },
+    "capture_max_age_days": {
+        "type": "int",
+        "description": "Delete stored captures older than this many days (0 = keep forever)",
+        "valid_range": [0, 3650],
+    },
+    "capture_max_per_region": {
+        "type": "int",
+        "description": "Most stored alert captures kept per region (0 = unlimited)",
+        "valid_range": [0, 100000],
+    },
     "event_log_enabled": {
         "type": "bool",
         "description": "Enable JSONL event logging to disk",
@@ -97,6 +141,11 @@ _GLOBAL_SETTING_META = {
         "description": "Maximum number of rows kept in the event log before pruning",
         "valid_range": [100, 100000],
     },
+    "event_log_backend": {
+        "type": "str",
+        "description": "Event log storage: jsonl file or indexed sqlite database (applies after restart)",
+        "valid_values": ["jsonl", "sqlite"],
+    },
     "mcp_max_connections": {
         "type": "int",
         "description": "Maximum concurrent MCP client connections",
@@ -112,6 +161,10 @@ def _read_value(config, key: str) -> Any:
         "show_borders": config.get_show_borders,
         "overlay_scaling_mode": config.get_overlay_scaling_mode,
         "refresh_rate_ms": config.get_refresh_rate,
+        "adaptive_polling": config.get_adaptive_polling,
+        "adaptive_max_interval_ms": config.get_adaptive_max_interval_ms,
+        "adaptive_stable_seconds": config.get_adaptive_stable_seconds,
+        "load_governor": config.get_load_governor,
         "log_level": config.get_log_level,
         "show_overlay_when_unavailable": config.get_show_overlay_when_unavailable,
         "show_overlay_on_connect": config.get_show_overlay_on_connect,
@@ -125,8 +178,14 @@ def _read_value(config, key: str) -> Any:
         "size_tolerance_px": config.get_reconnect_size_tolerance,
         "capture_on_alert": config.get_capture_on_alert,
         "save_alert_diagnostics": config.get_save_alert_diagnostics,
+        "capture_png_compress_level": config.get_capture_png_compress_level,
+        "capture_store": config.get_capture_store,
+        "capture_max_mb": config.get_capture_max_mb,
+        "capture_max_age_days": config.get_capture_max_age_days,
+        "capture_max_per_region": config.get_capture_max_per_region,
         "event_log_enabled": config.get_event_log_enabled,
         "event_log_max_rows": config.get_event_log_max_rows,
+        "event_log_backend": config.get_event_log_backend,
         "mcp_max_connections": config.get_mcp_max_connections,
     }
     fn = getters.get(key)
@@ -190,6 +249,10 @@ def _write_value(config, engine, event_logger, key: str, value: Any) -> dict:
         "show_borders": lambda v: config.set_show_borders(v),
         "overlay_scaling_mode": lambda v: config.set_overlay_scaling_mode(v),
         "refresh_rate_ms": lambda v: config.set_refresh_rate(v),
+        "adaptive_polling": lambda v: config.set_adaptive_polling(v),
+        "adaptive_max_interval_ms": lambda v: config.set_adaptive_max_interval_ms(v),
+        "adaptive_stable_seconds": lambda v: config.set_adaptive_stable_seconds(v),
+        "load_governor": lambda v: config.set_load_governor(v),
         "log_level": _apply_log_level,
         "show_overlay_when_unavailable": lambda v: config.set_show_overlay_when_unavailable(v),
         "show_overlay_on_connect": lambda v: config.set_show_overlay_on_connect(v),
@@ -203,8 +266,14 @@ def _write_value(config, engine, event_logger, key: str, value: Any) -> dict:
         "size_tolerance_px": lambda v: config.set_reconnect_size_tolerance(v),
         "capture_on_alert": lambda v: config.set_capture_on_alert(v),
         "save_alert_diagnostics": lambda v: config.set_save_alert_diagnostics(v),
+        "capture_png_compress_level": lambda v: config.set_capture_png_compress_level(v),
+        "capture_store": lambda v: config.set_capture_store(v),
+        "capture_max_mb": lambda v: config.set_capture_max_mb(v),
+        "capture_max_age_days": lambda v: config.set_capture_max_age_days(v),
+        "capture_max_per_region": lambda v: config.set_capture_max_per_region(v),
         "event_log_enabled": _apply_event_log_enabled,
         "event_log_max_rows": _apply_event_log_max_rows,
+        "event_log_backend": lambda v: config.set_event_log_backend(v),
         "mcp_max_connections": lambda v: config.set_mcp_max_connections(v),
     }
 
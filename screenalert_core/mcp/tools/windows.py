@@ -38,6 +38,18 @@ _WINDOW_SETTING_META = {
         "type": "bool",
         "description": "Whether this window is actively monitored",
     },
+    "poll_interval_ms": {
+        "type": "int|null",
+        "description": "How often this window and its regions are checked, in ms "
+                       "(null = global refresh rate)",
+        "valid_range": [50, 3600000],
+    },
+    "min_interval_ms": {
+        "type": "int|null",
+        "description": "Default minimum interval for this window's regions: a region may be "
+                       "checked early on a frame captured for another region, at most this often",
+        "valid_range": [0, 3600000],
+    },
 }
 
 
@@ -290,6 +302,11 @@ def register(mcp, engine, config, event_logger) -> None:
                 entry["value"] = tc.get("window_slot")
             elif key == "enabled":
                 entry["value"] = tc.get("enabled", True)
+            elif key == "poll_interval_ms":
+                entry["value"] = tc.get("poll_interval_ms")
+                entry["effective_value"] = tc.get("poll_interval_ms") or config.get_refresh_rate()
+            else:
+                entry["value"] = tc.get(key)
             result[key] = entry
         return result
 
@@ -298,7 +315,8 @@ def register(mcp, engine, config, event_logger) -> None:
     @mcp.tool(
         description=(
             "Set a single configurable setting for a monitored window. "
-            "Valid keys: name, overlay_visible, opacity, always_on_top, show_border, window_slot, enabled. "
+            "Valid keys: name, overlay_visible, opacity, always_on_top, show_border, window_slot, enabled, "
+            "poll_interval_ms, min_interval_ms. "
             "Returns 422 with valid_values if the value is out of range."
         )
     )
@@ -377,6 +395,20 @@ def register(mcp, engine, config, event_logger) -> None:
                 except Exception:
                     pass
 
+        elif key in ("poll_interval_ms", "min_interval_ms"):
+            lo, hi = _WINDOW_SETTING_META[key]["valid_range"]
+            if value is None:
+                updates[key] = None
+            else:
+                try:
+                    v = int(value)
+                except (TypeError, ValueError):
+                    return {"error": f"{key} must be an integer or null", "code": 422, "field": "value"}
+                if isinstance(value, bool) or not (lo <= v <= hi):
+                    return {"error": f"{key} must be between {lo} and {hi}", "code": 422,
+                            "field": "value", "valid_range": [lo, hi]}
+                updates[key] = v
+
         ok = config.update_thumbnail(wid, updates)
         if not ok:
             return {"error": "Failed to update window setting", "code": 500}
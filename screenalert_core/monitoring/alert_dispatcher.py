@@ -0,0 +1,172 @@
+"""Alert dispatcher: deliver alerts off the detection path.
+
+Detection only builds a small ``AlertRecord`` (ids, names, rendered
+message and the images the alert needs) and hands it to the dispatcher,
+which returns immediately.  A single worker thread then takes records in
+the order they were raised and does the slow part:
+
+1. fullscreen suppression – the whole alert is dropped while a fullscreen
+   application is in the foreground (``suppress_fullscreen``);
+2. the global mute timer – sound and TTS are skipped, the rest still runs;
+3. sound / TTS playback;
+4. the engine's delivery callback (snapshot, diagnostics, alert history,
+   event log, plugin hooks, UI callback).
+
+One worker and a plain FIFO keep alerts strictly ordered; they are never
+coalesced or dropped, because every alert has to reach alert history,
+the event log, plugin hooks and ``on_alert``.  What an alert storm sheds
+instead is the expensive part: once ``shed_depth`` records are waiting,
+new records are queued without their images and are delivered without
+sound or TTS (``media_shed``, counted as ``shed``).  Like the other
+pipeline stages, the dispatcher runs inline on the submitting thread
+until ``start()``.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from PIL import Image
+
+from screenalert_core.core.pipeline import PipelineStage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHED_DEPTH = 256
+
+
+class AlertRecord(NamedTuple):
+    """Everything needed to deliver one alert, captured at detection time."""
+    seq: int
+    event_id: str                           # event-log id, also keys stored captures
+    timestamp: float                        # time.time() when detected
+    thumbnail_id: str
+    window_title: str
+    region_id: str
+    region_name: str
+    sound_file: str
+    tts_message: str
+    region_image: Optional[Image.Image]     # crop for the snapshot (capture_on_alert)
+    diagnostics: Optional[tuple]            # save_alert_diagnostics args, if enabled
+    media_shed: bool = False                # queued under a backlog: no media, no images
+
+
+class AlertDispatcher:
+    """Ordered alert queue with one worker applying suppression and playback."""
+
+    def __init__(self, config, alert_system,
+                 is_foreground_fullscreen: Callable[[], bool],
+                 deliver: Callable[[AlertRecord], None],
+                 shed_depth: int = DEFAULT_SHED_DEPTH):
+        """Initialize dispatcher
+
+        Args:
+            config: ConfigManager (suppression, mute and media settings)
+            alert_system: AlertSystem used for sound/TTS playback
+            is_foreground_fullscreen: Returns True while a fullscreen app
+                has the foreground
+            deliver: Called with each record that was not suppressed
+            shed_depth: Records waiting before new ones shed their media
+        """
+        self.config = config
+        self.alert_system = alert_system
+        self._is_foreground_fullscreen = is_foreground_fullscreen
+        self._deliver = deliver
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._shed_depth = max(1, int(shed_depth))
+        self._shedding = 0  # records shed in the current backlog
+        self._stage = PipelineStage("alerts", self._dispatch, None)
+        self._stats = {"dispatched": 0, "suppressed_fullscreen": 0, "muted": 0, "shed": 0,
+                       "lag_last_ms": 0.0, "lag_max_ms": 0.0}
+
+    @property
+    def running(self) -> bool:
+        return self._stage.running
+
+    def next_seq(self) -> int:
+        """Sequence number for the next record (raise order)."""
+        with self._lock:
+            return next(self._seq)
+
+    def start(self) -> None:
+        self._stage.start()
+
+    def stop(self, drain: bool = True) -> None:
+        """Stop the worker, first delivering queued alerts when *drain*."""
+        self._stage.stop(drain=drain)
+
+    def submit(self, record: AlertRecord) -> None:
+        """Queue *record* (or dispatch it now when not started).
+
+        The record is always delivered; under a backlog it loses its
+        images and media (see ``shed_depth``).
+        """
+        backlog = len(self._stage.queue)
+        with self._lock:
+            if backlog >= self._shed_depth:
+                if not self._shedding:
+                    logger.warning("Alert backlog of %d: new alerts are delivered without "
+                                   "sound, TTS or images until it drains", backlog)
+                self._shedding += 1
+                self._stats["shed"] += 1
+                record = record._replace(region_image=None, diagnostics=None, media_shed=True)
+            elif self._shedding:
+                logger.info("Alert backlog drained; %d alert(s) were delivered without media",
+                            self._shedding)
+                self._shedding = 0
+        self._stage.submit(record)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        return self._stage.wait_idle(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue counters plus dispatched/suppressed/muted/shed counts and lag."""
+        with self._lock:
+            own = dict(self._stats)
+        own["lag_last_ms"] = round(own["lag_last_ms"], 2)
+        own["lag_max_ms"] = round(own["lag_max_ms"], 2)
+        return {**self._stage.stats(), **own}
+
+    # ── helpers ──────────────────────────────────────────────────────
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _dispatch(self, record: AlertRecord) -> None:
+        lag_ms = max(0.0, (time.time() - record.timestamp) * 1000.0)
+        with self._lock:
+            self._stats["lag_last_ms"] = lag_ms
+            self._stats["lag_max_ms"] = max(self._stats["lag_max_ms"], lag_ms)
+
+        # Optional: suppress alerts during fullscreen apps
+        if self.config.get_suppress_fullscreen() and self._is_foreground_fullscreen():
+            logger.info("Suppressing alert due to fullscreen foreground application")
+            self._count("suppressed_fullscreen")
+            return
+
+        # Optional: global mute timer
+        mute_until = self.config.get_mute_until_ts()
+        if record.media_shed:
+            logger.debug("Alert %s delivered without media (backlog)", record.event_id)
+        elif mute_until > int(time.time()):
+            logger.info("Alert muted by countdown timer")
+            self._count("muted")
+        else:
+            play_sound = record.sound_file if self.config.get_enable_sound() else ""
+            play_tts = record.tts_message if self.config.get_enable_tts() else ""
+            logger.info(
+                "Dispatching alert media: sound=%s tts=%s message=%s",
+                bool(play_sound),
+                bool(play_tts),
+                play_tts if play_tts else ""
+            )
+            self.alert_system.play_alert(play_sound, play_tts)
+
+        self._deliver(record)
+        self._count("dispatched")
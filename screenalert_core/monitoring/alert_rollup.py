@@ -0,0 +1,466 @@
+"""Alert rollups: per-region alert statistics in fixed time buckets.
+
+The event log keeps every event; analysing a day or a week of alerts from
+it means reading every event.  The rollup keeps, per region and per
+``BASE_BUCKET_S`` bucket, only what analysis asks for:
+
+* alerts raised;
+* alert episodes closed (ALERT → WARNING → OK, as RegionMonitor moves
+  through its states) with the time spent in ALERT and in WARNING and
+  the longest episode;
+* the distribution of the detector's change metric at alert time
+  (similarity, edge or foreground percentage, cascade gate score) as
+  count/sum/min/max and a ``METRIC_BINS``-bin histogram.
+
+``query`` re-aggregates base buckets into any multiple of the base size
+and adds them up per window.  Episodes are counted in the bucket they
+end in; one still open is not counted until it closes.
+
+On disk the rollup is append-only JSONL: one line per non-empty base
+bucket, written when the bucket closes (and on ``flush``), plus a name
+line when a region is first seen or renamed.  Lines for the same bucket
+are merged on load, so a bucket written at shutdown and continued after
+a restart is not double counted.  Buckets older than ``retention_days``
+are dropped, and the file rewritten, when it is loaded.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from screenalert_core.monitoring.region_monitor import STATE_ALERT, STATE_WARNING
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_FILENAME = "alert_rollup.jsonl"
+BASE_BUCKET_S = 300
+DEFAULT_RETENTION_DAYS = 90
+MAX_QUERY_BUCKETS = 2000
+METRIC_BINS = 10
+
+# Change metric per detector, first match wins (cascade: the confirm
+# detector's metric when it ran, else the gate score)
+_METRIC_RANGES = (
+    ("similarity", (0.0, 1.0)),
+    ("edge_change_pct", (0.0, 100.0)),
+    ("fg_pct", (0.0, 100.0)),
+    ("gate_score", (0.0, 1.0)),
+)
+
+RegionKey = Tuple[str, str]  # (window_id, region_id)
+
+
+def detector_metric(info: Optional[Dict]) -> Optional[Tuple[str, float]]:
+    """The change metric in a detector's ``last_detect_info``, if any."""
+    if not info:
+        return None
+    confirm = info.get("confirm")
+    if isinstance(confirm, dict) and confirm:
+        found = detector_metric(confirm)
+        if found is not None:
+            return found
+    for name, _ in _METRIC_RANGES:
+        value = info.get(name)
+        if isinstance(value, (int, float)) and math.isfinite(value):
+            return name, float(value)
+    return None
+
+
+def _metric_range(name: str) -> Tuple[float, float]:
+    return dict(_METRIC_RANGES).get(name, (0.0, 1.0))
+
+
+# ── bucket records ───────────────────────────────────────────────────
+
+class _Distribution:
+    __slots__ = ("count", "total", "low", "high", "bins")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.low = math.inf
+        self.high = -math.inf
+        self.bins = [0] * METRIC_BINS
+
+    def add(self, name: str, value: float) -> None:
+        lo, hi = _metric_range(name)
+        index = int((value - lo) / (hi - lo) * METRIC_BINS)
+        self.bins[min(METRIC_BINS - 1, max(0, index))] += 1
+        self.count += 1
+        self.total += value
+        self.low = min(self.low, value)
+        self.high = max(self.high, value)
+
+    def merge(self, other: "_Distribution") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.low = min(self.low, other.low)
+        self.high = max(self.high, other.high)
+        self.bins = [a + b for a, b in zip(self.bins, other.bins)]
+
+    def to_row(self) -> List:
+        return [self.count, round(self.total, 6), self.low, self.high, self.bins]
+
+    @classmethod
+    def from_row(cls, row: List) -> "_Distribution":
+        dist = cls()
+        dist.count, dist.total, dist.low, dist.high = int(row[0]), float(row[1]), float(row[2]), float(row[3])
+        bins = [int(n) for n in row[4]][:METRIC_BINS]
+        dist.bins = bins + [0] * (METRIC_BINS - len(bins))
+        return dist
+
+    def as_dict(self, name: str) -> Dict:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 6) if self.count else None,
+            "min": self.low if self.count else None,
+            "max": self.high if self.count else None,
+            "histogram": {"range": list(_metric_range(name)), "counts": list(self.bins)},
+        }
+
+
+class _RegionStats:
+    __slots__ = ("alerts", "episodes", "alert_s", "warning_s", "max_episode_s", "metrics")
+
+    def __init__(self):
+        self.alerts = 0
+        self.episodes = 0
+        self.alert_s = 0.0
+        self.warning_s = 0.0
+        self.max_episode_s = 0.0
+        self.metrics: Dict[str, _Distribution] = {}
+
+    def merge(self, other: "_RegionStats") -> None:
+        self.alerts += other.alerts
+        self.episodes += other.episodes
+        self.alert_s += other.alert_s
+        self.warning_s += other.warning_s
+        self.max_episode_s = max(self.max_episode_s, other.max_episode_s)
+        for name, dist in other.metrics.items():
+            mine = self.metrics.get(name)
+            if mine is None:
+                mine = self.metrics[name] = _Distribution()
+            mine.merge(dist)
+
+    def to_row(self, key: RegionKey) -> List:
+        return [key[0], key[1], self.alerts, self.episodes, round(self.alert_s, 3),
+                round(self.warning_s, 3), round(self.max_episode_s, 3),
+                {name: dist.to_row() for name, dist in self.metrics.items()}]
+
+    @classmethod
+    def from_row(cls, row: List) -> Tuple[RegionKey, "_RegionStats"]:
+        stats = cls()
+        stats.alerts, stats.episodes = int(row[2]), int(row[3])
+        stats.alert_s, stats.warning_s, stats.max_episode_s = float(row[4]), float(row[5]), float(row[6])
+        stats.metrics = {name: _Distribution.from_row(dist) for name, dist in (row[7] or {}).items()}
+        return (str(row[0]), str(row[1])), stats
+
+
+class _Episode:
+    """Where a region is in its current ALERT/WARNING episode."""
+    __slots__ = ("state", "since", "alert_s", "warning_s")
+
+    def __init__(self, state: str, since: float):
+        self.state = state
+        self.since = since
+        self.alert_s = 0.0
+        self.warning_s = 0.0
+
+    def close_state(self, now: float) -> None:
+        spent = max(0.0, now - self.since)
+        if self.state == STATE_ALERT:
+            self.alert_s += spent
+        elif self.state == STATE_WARNING:
+            self.warning_s += spent
+
+
+# ── store ────────────────────────────────────────────────────────────
+
+class AlertRollup:
+    """Bucketed alert counts, durations and detector metrics per region."""
+
+    def __init__(self, path: Optional[str], retention_days: float = DEFAULT_RETENTION_DAYS):
+        """Initialize the rollup
+
+        Args:
+            path: JSONL file the buckets are kept in (None = memory only)
+            retention_days: Buckets older than this are dropped on load
+        """
+        self.path = path
+        self.retention_s = max(0.0, float(retention_days)) * 86400.0
+        self._lock = threading.Lock()
+        self._buckets: Dict[int, Dict[RegionKey, _RegionStats]] = {}
+        self._names: Dict[RegionKey, Tuple[str, str]] = {}
+        self._episodes: Dict[RegionKey, _Episode] = {}
+        self._open_bucket: Optional[int] = None
+        # Buckets changed since they were last written
+        self._dirty: Dict[int, Dict[RegionKey, _RegionStats]] = {}
+        self._pending_names: Dict[RegionKey, Tuple[str, str]] = {}
+        self._load()
+
+    # ── recording ────────────────────────────────────────────────────
+
+    def record_state(self, window_id: str, region_id: str, state: str,
+                     now: Optional[float] = None) -> None:
+        """A region changed state; closes an episode when it leaves ALERT/WARNING."""
+        now = time.time() if now is None else now
+        key = (window_id, region_id)
+        with self._lock:
+            episode = self._episodes.get(key)
+            if state in (STATE_ALERT, STATE_WARNING):
+                if episode is None:
+                    self._episodes[key] = _Episode(state, now)
+                elif episode.state != state:
+                    episode.close_state(now)
+                    episode.state, episode.since = state, now
+                return
+            if episode is None:
+                return
+            del self._episodes[key]
+            episode.close_state(now)
+            change = _RegionStats()
+            change.episodes = 1
+            change.alert_s = episode.alert_s
+            change.warning_s = episode.warning_s
+            change.max_episode_s = episode.alert_s + episode.warning_s
+            self._add(key, now, change)
+
+    def record_alert(self, window_id: str, region_id: str, now: Optional[float] = None,
+                     window_name: str = "", region_name: str = "",
+                     detect_info: Optional[Dict] = None) -> None:
+        """An alert was raised for a region (with the detector's metrics at the time)."""
+        now = time.time() if now is None else now
+        key = (window_id, region_id)
+        metric = detector_metric(detect_info)
+        change = _RegionStats()
+        change.alerts = 1
+        if metric is not None:
+            name, value = metric
+            change.metrics[name] = _Distribution()
+            change.metrics[name].add(name, value)
+        with self._lock:
+            self._add(key, now, change)
+            names = (window_name, region_name)
+            if (window_name or region_name) and self._names.get(key) != names:
+                self._names[key] = self._pending_names[key] = names
+
+    def flush(self) -> None:
+        """Write every bucket changed since the last write (call on shutdown)."""
+        with self._lock:
+            self._write_dirty(None)
+
+    # ── queries ──────────────────────────────────────────────────────
+
+    def query(self, start: float, end: float, bucket_s: float = 3600,
+              window_id: Optional[str] = None, region_id: Optional[str] = None) -> Dict:
+        """Alert statistics between *start* and *end* in *bucket_s* buckets.
+
+        Buckets start at *start* (rounded down to the base bucket) and
+        *bucket_s* is rounded up to a multiple of ``BASE_BUCKET_S``.  Empty
+        buckets are left out of the series.
+
+        Raises:
+            ValueError: The range is empty or needs more than
+                ``MAX_QUERY_BUCKETS`` buckets
+        """
+        step = max(1, math.ceil(float(bucket_s) / BASE_BUCKET_S)) * BASE_BUCKET_S
+        first = int(start // BASE_BUCKET_S) * BASE_BUCKET_S
+        if end <= first:
+            raise ValueError("end must be after start")
+        if (end - first) / step > MAX_QUERY_BUCKETS:
+            raise ValueError(f"range needs more than {MAX_QUERY_BUCKETS} buckets; use a larger bucket size")
+
+        series: Dict[int, Dict[RegionKey, _RegionStats]] = {}
+        totals: Dict[RegionKey, _RegionStats] = {}
+        with self._lock:
+            for bucket, regions in self._buckets.items():
+                if bucket < first or bucket >= end:
+                    continue
+                slot = first + (bucket - first) // step * step
+                for key, stats in regions.items():
+                    if window_id and key[0] != window_id or region_id and key[1] != region_id:
+                        continue
+                    for target in (series.setdefault(slot, {}), totals):
+                        merged = target.get(key)
+                        if merged is None:
+                            merged = target[key] = _RegionStats()
+                        merged.merge(stats)
+            names = dict(self._names)
+
+        return {
+            "start": _iso(first),
+            "end": _iso(end),
+            "bucket_seconds": step,
+            "series": [self._series_row(slot, series[slot]) for slot in sorted(series)],
+            "windows": self._window_rows(totals, names),
+            "regions": self._region_rows(totals, names),
+        }
+
+    # ── internal ─────────────────────────────────────────────────────
+
+    def _add(self, key: RegionKey, now: float, change: _RegionStats) -> None:
+        """Add *change* to the bucket of *now*; closed buckets are written first."""
+        bucket = int(now // BASE_BUCKET_S) * BASE_BUCKET_S
+        if self._open_bucket is not None and bucket > self._open_bucket:
+            self._write_dirty(bucket)
+        if self._open_bucket is None or bucket > self._open_bucket:
+            self._open_bucket = bucket
+        # The bucket, and what of it has not been written yet
+        for buckets in (self._buckets, self._dirty):
+            regions = buckets.setdefault(bucket, {})
+            stats = regions.get(key)
+            if stats is None:
+                stats = regions[key] = _RegionStats()
+            stats.merge(change)
+
+    def _write_dirty(self, before: Optional[int]) -> None:
+        """Append dirty buckets older than *before* (all when None)."""
+        buckets = sorted(b for b in self._dirty if before is None or b < before)
+        if not buckets and not self._pending_names:
+            return
+        lines = []
+        if self._pending_names:
+            lines.append({"n": [[w, r, wn, rn] for (w, r), (wn, rn) in self._pending_names.items()]})
+            self._pending_names = {}
+        for bucket in buckets:
+            regions = self._dirty.pop(bucket)
+            lines.append({"t": bucket, "r": [stats.to_row(key) for key, stats in regions.items()]})
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                for line in lines:
+                    f.write(json.dumps(line, separators=(",", ":")) + "\n")
+        except OSError as error:
+            logger.warning("Failed to write alert rollup %s: %s", self.path, error)
+
+    def _load(self) -> None:
+        if not self.path or not os.path.isfile(self.path):
+            return
+        cutoff = time.time() - self.retention_s if self.retention_s else -math.inf
+        dropped = 0
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        if "n" in entry:
+                            for window_id, region_id, window_name, region_name in entry["n"]:
+                                self._names[(window_id, region_id)] = (window_name, region_name)
+                            continue
+                        bucket = int(entry["t"])
+                        if bucket < cutoff:
+                            dropped += 1
+                            continue
+                        regions = self._buckets.setdefault(bucket, {})
+                        for row in entry["r"]:
+                            key, stats = _RegionStats.from_row(row)
+                            if key in regions:
+                                regions[key].merge(stats)
+                            else:
+                                regions[key] = stats
+                    except (ValueError, KeyError, TypeError, IndexError):
+                        dropped += 1  # torn or foreign line
+        except OSError as error:
+            logger.warning("Failed to read alert rollup %s: %s", self.path, error)
+            return
+        if dropped:
+            self._rewrite()
+
+    def _rewrite(self) -> None:
+        """Rewrite the file with one line per retained bucket."""
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                if self._names:
+                    names = [[w, r, wn, rn] for (w, r), (wn, rn) in self._names.items()]
+                    f.write(json.dumps({"n": names}, separators=(",", ":")) + "\n")
+                for bucket in sorted(self._buckets):
+                    rows = [stats.to_row(key) for key, stats in self._buckets[bucket].items()]
+                    f.write(json.dumps({"t": bucket, "r": rows}, separators=(",", ":")) + "\n")
+            os.replace(tmp, self.path)
+        except OSError as error:
+            logger.warning("Failed to rewrite alert rollup %s: %s", self.path, error)
+
+    @staticmethod
+    def _series_row(slot: int, regions: Dict[RegionKey, _RegionStats]) -> Dict:
+        by_window: Dict[str, int] = {}
+        by_region: Dict[str, int] = {}
+        row = {"start": _iso(slot), "alerts": 0, "episodes": 0,
+               "alert_seconds": 0.0, "warning_seconds": 0.0}
+        for (window_id, region_id), stats in regions.items():
+            row["alerts"] += stats.alerts
+            row["episodes"] += stats.episodes
+            row["alert_seconds"] += stats.alert_s
+            row["warning_seconds"] += stats.warning_s
+            if stats.alerts:
+                by_window[window_id] = by_window.get(window_id, 0) + stats.alerts
+                by_region[region_id] = by_region.get(region_id, 0) + stats.alerts
+        row["alert_seconds"] = round(row["alert_seconds"], 1)
+        row["warning_seconds"] = round(row["warning_seconds"], 1)
+        row["alerts_by_window"] = by_window
+        row["alerts_by_region"] = by_region
+        return row
+
+    @staticmethod
+    def _window_rows(totals: Dict[RegionKey, _RegionStats],
+                     names: Dict[RegionKey, Tuple[str, str]]) -> List[Dict]:
+        windows: Dict[str, Dict] = {}
+        for key, stats in totals.items():
+            row = windows.setdefault(key[0], {
+                "window_id": key[0], "window_name": "", "alerts": 0, "episodes": 0, "regions": 0,
+            })
+            row["window_name"] = row["window_name"] or names.get(key, ("", ""))[0]
+            row["alerts"] += stats.alerts
+            row["episodes"] += stats.episodes
+            row["regions"] += 1
+        return sorted(windows.values(), key=lambda row: (-row["alerts"], row["window_id"]))
+
+    @staticmethod
+    def _region_rows(totals: Dict[RegionKey, _RegionStats],
+                     names: Dict[RegionKey, Tuple[str, str]]) -> List[Dict]:
+        rows = []
+        for key, stats in totals.items():
+            window_name, region_name = names.get(key, ("", ""))
+            episodes = stats.episodes
+            rows.append({
+                "window_id": key[0],
+                "window_name": window_name,
+                "region_id": key[1],
+                "region_name": region_name,
+                "alerts": stats.alerts,
+                "episodes": episodes,
+                "mean_alert_seconds": round(stats.alert_s / episodes, 1) if episodes else None,
+                "mean_warning_seconds": round(stats.warning_s / episodes, 1) if episodes else None,
+                "max_episode_seconds": round(stats.max_episode_s, 1) if episodes else None,
+                "metrics": {name: dist.as_dict(name) for name, dist in stats.metrics.items()},
+            })
+        rows.sort(key=lambda row: (-row["alerts"], row["window_id"], row["region_id"]))
+        return rows
+
+
+def parse_timestamp(text: str) -> float:
+    """Parse an ISO datetime to a Unix timestamp, reading a naive one as UTC.
+
+    The event log stamps events in UTC, so a naive ``since`` copied from
+    it means UTC too; an explicit offset is respected.
+
+    Raises:
+        ValueError: if ``text`` is not an ISO datetime.
+    """
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds")
@@ -22,10 +22,17 @@ States:
 import logging
 import os
 import time
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Collection, Dict, List, NamedTuple, Optional, Set, Tuple
+import numpy as np
 from PIL import Image
 
 from screenalert_core.core.image_processor import ImageProcessor
+from screenalert_core.core.dirty_map import TileDirtyMap
+from screenalert_core.core.pyramid import (
+    AUTO_SCALE, DEFAULT_ANALYSIS_SCALE, FramePyramid, auto_analysis_scale,
+    normalize_analysis_scale, reduce_analysis_scale, scale_rect,
+)
 from screenalert_core.core.change_detectors import (
     ChangeDetector, create_detector, VALID_METHODS,
 )
@@ -40,6 +47,17 @@ STATE_WARNING = "warning"
 STATE_PAUSED = "paused"
 STATE_DISABLED = "disabled"
 
+# Region priorities (region config "priority"; absent = normal).  Under
+# overload, high-priority regions keep full quality and low-priority
+# regions are the first to be skipped (see core.load_governor).
+PRIORITY_LOW = "low"
+PRIORITY_NORMAL = "normal"
+PRIORITY_HIGH = "high"
+REGION_PRIORITIES = (PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH)
+
+# Upper bound for MonitoringEngine.set_workers
+MAX_DETECTION_WORKERS = 32
+
 
 def _build_detector_kwargs(region_config: Dict, global_config: Optional[Dict] = None) -> Tuple[str, dict]:
     """Extract the detection method and kwargs from region config,
@@ -54,14 +72,25 @@ def _build_detector_kwargs(region_config: Dict, global_config: Optional[Dict] =
     if method not in VALID_METHODS:
         method = "ssim"
 
+    # Pyramid level the region is analysed at (all methods)
+    kwargs: Dict = {
+        "analysis_scale": normalize_analysis_scale(
+            region_config.get("analysis_scale")
+            or gcfg.get("analysis_scale", DEFAULT_ANALYSIS_SCALE)
+        ),
+    }
+
     # Build kwargs appropriate for the chosen method
-    kwargs: Dict = {}
 
     if method in ("ssim", "phash"):
         kwargs["threshold"] = float(
             region_config.get("alert_threshold",
                               gcfg.get("alert_threshold", DEFAULT_ALERT_THRESHOLD))
         )
+        if method == "ssim":
+            kwargs["window"] = str(
+                region_config.get("ssim_window", gcfg.get("ssim_window", "box"))
+            )
     elif method == "edge_only":
         kwargs["min_edge_fraction"] = float(
             region_config.get("min_edge_fraction",
@@ -76,6 +105,25 @@ def _build_detector_kwargs(region_config: Dict, global_config: Optional[Dict] =
         kwargs["binarize"] = bool(
             region_config.get("edge_binarize", gcfg.get("edge_binarize", False))
         )
+    elif method == "cascade":
+        kwargs["gate"] = str(
+            region_config.get("cascade_gate", gcfg.get("cascade_gate", "mad"))
+        )
+        kwargs["gate_threshold"] = float(
+            region_config.get("cascade_gate_threshold",
+                              gcfg.get("cascade_gate_threshold", 0.001))
+        )
+        confirm = (region_config.get("cascade_confirm")
+                   or gcfg.get("cascade_confirm", "ssim"))
+        if confirm not in VALID_METHODS or confirm == "cascade":
+            confirm = "ssim"
+        # The confirm stage takes the region's own parameters for that method
+        _, confirm_kwargs = _build_detector_kwargs(
+            {**region_config, "detection_method": confirm}, gcfg,
+        )
+        confirm_kwargs.pop("analysis_scale", None)
+        kwargs["confirm"] = confirm
+        kwargs["confirm_kwargs"] = confirm_kwargs
     elif method == "background_subtraction":
         kwargs["history"] = int(
             region_config.get("bg_history", gcfg.get("bg_history", 500))
@@ -96,6 +144,19 @@ def _build_detector_kwargs(region_config: Dict, global_config: Optional[Dict] =
     return method, kwargs
 
 
+# Outcomes of RegionMonitor.analyze
+ANALYSIS_SKIP = "skip"            # nothing comparable this tick; state unchanged
+ANALYSIS_BASELINE = "baseline"    # first frame stored; state becomes OK
+ANALYSIS_DETECTED = "detected"    # detector ran (or pixels known unchanged)
+
+
+class RegionAnalysis(NamedTuple):
+    """Detection result of one region for one frame."""
+    kind: str
+    has_change: bool = False
+    prev_window_image: Optional[Image.Image] = None
+
+
 class RegionMonitor:
     """Monitors a specific region in a window for changes.
 
@@ -108,14 +169,26 @@ class RegionMonitor:
     """
 
     def __init__(self, region_id: str, thumbnail_id: str, region_config: Dict,
-                 global_config: Optional[Dict] = None):
+                 global_config: Optional[Dict] = None,
+                 state_dir: Optional[str] = BG_MODELS_DIR):
         self.region_id = region_id
         self.thumbnail_id = thumbnail_id
         self.config = region_config
-
-        self.previous_image: Optional[Image.Image] = None
+        # Where detector warmup state persists ("" / None = not persisted)
+        self.state_dir = state_dir
+
+        # Grayscale region view from the previous tick (detector input)
+        self.previous_image: Optional[np.ndarray] = None
+        # Full window frame the previous view was sliced from; kept by
+        # reference only so colour alert crops can be made on demand.
+        self._previous_window_image: Optional[Image.Image] = None
+        self._previous_rect: Optional[Tuple[int, ...]] = None
         self.last_alert_prev_image: Optional[Image.Image] = None
         self.last_alert_curr_image: Optional[Image.Image] = None
+        # Pyramid level used on the last update (resolves "auto")
+        self.effective_analysis_scale: float = 1.0
+        # Pyramid levels to drop under overload (set by MonitoringEngine)
+        self.scale_reduction = 0
         self.paused = False
         self.disabled = region_config.get("enabled", True) is False
 
@@ -123,6 +196,9 @@ class RegionMonitor:
         self._state: str = STATE_OK
         self._alert_start_time: float = 0.0
         self._warning_start_time: float = 0.0
+        # Since when the region has been OK with no detected change
+        # (state machine clock; None while alerting).  Drives adaptive polling.
+        self.stable_since: Optional[float] = None
 
         # Create detector from config
         method, kwargs = _build_detector_kwargs(region_config, global_config)
@@ -135,8 +211,10 @@ class RegionMonitor:
             self._detector.load_state(state_path)
 
     def _state_path(self) -> str:
-        """Return file path for persisted detector state."""
-        return os.path.join(BG_MODELS_DIR, f"{self.thumbnail_id}_{self.region_id}")
+        """Return file path for persisted detector state ("" when disabled)."""
+        if not self.state_dir:
+            return ""
+        return os.path.join(self.state_dir, f"{self.thumbnail_id}_{self.region_id}")
 
     @property
     def detector(self) -> ChangeDetector:
@@ -167,6 +245,7 @@ class RegionMonitor:
 
         # Reset baseline so the new detector starts fresh
         self.previous_image = None
+        self._previous_window_image = None
         self._state = STATE_OK
 
         # Load persisted state for new detector
@@ -182,6 +261,27 @@ class RegionMonitor:
         if state_path:
             self._detector.save_state(state_path)
 
+    @property
+    def priority(self) -> str:
+        priority = self.config.get("priority")
+        return priority if priority in REGION_PRIORITIES else PRIORITY_NORMAL
+
+    def resolve_analysis_scale(self, rect: Tuple[int, ...]) -> float:
+        """Return the pyramid level this region is analysed at for *rect*."""
+        scale = self._detector.analysis_scale
+        if scale == AUTO_SCALE:
+            scale = auto_analysis_scale(int(rect[2]), int(rect[3]),
+                                        self._detector.auto_scale_method)
+        scale = float(scale)
+        # Overload: analyse lower in the pyramid.  High-priority regions
+        # keep full quality and MOG2 is left alone (its background model
+        # would have to be relearned at the new size).
+        if (self.scale_reduction and self.priority != PRIORITY_HIGH
+                and self._detector.auto_scale_method != "background_subtraction"):
+            scale = reduce_analysis_scale(scale, self.scale_reduction,
+                                          int(rect[2]), int(rect[3]))
+        return scale
+
     # ── public properties ──────────────────────────────────────────
     @property
     def state(self) -> str:
@@ -215,11 +315,32 @@ class RegionMonitor:
     # ── core update ────────────────────────────────────────────────
     def update(self, window_image: Image.Image,
                alert_hold_seconds: float = 10.0,
+               gray_frame: Optional[np.ndarray] = None,
+               pixels_changed: bool = True,
+               pyramid: Optional[FramePyramid] = None,
+               now: Optional[float] = None,
                # Legacy params kept for back-compat but ignored when
                # the region has its own detector instance.
                **_kwargs) -> Tuple[str, bool]:
         """Update region state with new window image.
 
+        Equivalent to ``apply(analyze(...))``; MonitoringEngine calls the
+        two halves separately when detection runs on worker threads.
+
+        Args:
+            window_image: Full captured window frame.
+            alert_hold_seconds: Hold time for ALERT / WARNING states.
+            gray_frame: Optional grayscale array of *window_image*.  When
+                several regions share a frame the caller converts once
+                and each region analyses a zero-copy slice of it.
+            pixels_changed: False when the caller knows the region's
+                pixels are identical to the previous tick (dirty map);
+                the detector is skipped and a "no change" result recorded.
+            pyramid: Optional shared pyramid of *gray_frame*; regions
+                with an analysis scale below 1 crop from its levels.
+            now: Timestamp of the frame for the hold timers (default:
+                ``time.time()``); replays pass the recorded time.
+
         Returns:
             (state, should_play_sound)
         """
@@ -227,30 +348,67 @@ class RegionMonitor:
             return STATE_DISABLED, False
         if self.paused:
             return STATE_PAUSED, False
-
-        now = time.time()
-
-        # Crop region from window image
+        analysis = self.analyze(window_image, gray_frame, pixels_changed, pyramid)
+        return self.apply(analysis, window_image, alert_hold_seconds, now)
+
+    def analyze(self, window_image: Image.Image,
+                gray_frame: Optional[np.ndarray] = None,
+                pixels_changed: bool = True,
+                pyramid: Optional[FramePyramid] = None) -> RegionAnalysis:
+        """Run change detection for one frame without touching the state machine.
+
+        Only reads and writes this region's own baseline and detector, so
+        different regions may be analysed concurrently.  Arguments are as
+        for ``update``.
+        """
+        # Slice region view from the grayscale frame (or a pyramid level)
         try:
-            region_image = ImageProcessor.crop_region(
-                window_image,
-                self.config["rect"]
-            )
+            if gray_frame is None:
+                gray_frame = ImageProcessor.to_gray_array(window_image)
+            rect = tuple(self.config["rect"])
+            scale = self.resolve_analysis_scale(rect)
+            region_image = self._slice(gray_frame, rect, scale, pyramid)
+            previous_scale = self.effective_analysis_scale
+            self.effective_analysis_scale = scale
+            # Scale changed under the same detector (load governor): re-slice
+            # the baseline from the previous frame so this tick is still
+            # compared instead of only re-baselined.
+            if (scale != previous_scale and self.previous_image is not None
+                    and self._previous_window_image is not None
+                    and tuple(self._previous_rect or ()) == rect):
+                self.previous_image = self._slice(
+                    ImageProcessor.to_gray_array(self._previous_window_image), rect, scale)
+                self._detector.invalidate_cache()
         except Exception as e:
             logger.debug(f"Error cropping region {self.region_id}: {e}")
-            return self._state, False
+            return RegionAnalysis(ANALYSIS_SKIP)
+
+        if region_image.size == 0:
+            logger.debug(f"Region {self.region_id} rect lies outside the window")
+            return RegionAnalysis(ANALYSIS_SKIP)
+
+        prev_window_image = self._previous_window_image
+        self._previous_window_image = window_image
+        rect_moved = rect != self._previous_rect
+        self._previous_rect = rect
 
         # First frame – initialise baseline
         if self.previous_image is None:
             self.previous_image = region_image
-            self._state = STATE_OK
-            return STATE_OK, False
+            self._detector.invalidate_cache()
+            return RegionAnalysis(ANALYSIS_BASELINE)
 
-        # Size changed – reset baseline and detector
-        if self.previous_image.size != region_image.size:
+        # Size changed – reset baseline and detector (drops cached features)
+        if self.previous_image.shape != region_image.shape:
             self.previous_image = region_image
             self._detector.reset()
-            return self._state, False
+            return RegionAnalysis(ANALYSIS_SKIP)
+
+        # Unchanged pixels – skip detection, keep the previous view so the
+        # detector's feature cache still matches next tick.
+        if not pixels_changed and not rect_moved:
+            self._detector.observe_unchanged(region_image)
+            return RegionAnalysis(ANALYSIS_DETECTED, False, prev_window_image)
 
         # Detect change using the region's detector
         has_change = self._detector.detect(self.previous_image, region_image)
@@ -259,9 +417,42 @@ class RegionMonitor:
                 "Region %s change DETECTED (method=%s state=%s)",
                 self.region_id, self._detector_method, self._state,
             )
-        pre_update_image = self.previous_image
         self.previous_image = region_image
+        return RegionAnalysis(ANALYSIS_DETECTED, has_change, prev_window_image)
+
+    @staticmethod
+    def _slice(gray_frame: np.ndarray, rect: Tuple[int, ...], scale: float,
+               pyramid: Optional[FramePyramid] = None) -> np.ndarray:
+        """Region view of *gray_frame* at pyramid level *scale*."""
+        if scale == 1.0:
+            return ImageProcessor.crop_array(gray_frame, rect)
+        if pyramid is None:
+            pyramid = FramePyramid(gray_frame)
+        return ImageProcessor.crop_array(pyramid.level(scale), scale_rect(rect, scale))
+
+    def apply(self, analysis: RegionAnalysis, window_image: Image.Image,
+              alert_hold_seconds: float = 10.0,
+              now: Optional[float] = None) -> Tuple[str, bool]:
+        """Feed an ``analyze`` result to the state machine.
 
+        Returns:
+            (state, should_play_sound)
+        """
+        if analysis.kind == ANALYSIS_SKIP:
+            return self._state, False
+        if analysis.kind == ANALYSIS_BASELINE:
+            self._state = STATE_OK
+            return STATE_OK, False
+        if now is None:
+            now = time.time()
+        return self._advance_state(analysis.has_change, now, alert_hold_seconds,
+                                   window_image, analysis.prev_window_image)
+
+    def _advance_state(self, has_change: bool, now: float,
+                       alert_hold_seconds: float,
+                       window_image: Image.Image,
+                       prev_window_image: Optional[Image.Image]) -> Tuple[str, bool]:
+        """Apply one state machine step and return (state, should_play_sound)."""
         # ── state machine transitions ──────────────────────────────
         should_play_sound = False
         old_state = self._state
@@ -271,8 +462,13 @@ class RegionMonitor:
                 self._state = STATE_ALERT
                 self._alert_start_time = now
                 should_play_sound = True
-                self.last_alert_prev_image = pre_update_image
-                self.last_alert_curr_image = region_image
+                # Colour crops are only materialised when an alert fires
+                rect = self.config["rect"]
+                self.last_alert_prev_image = (
+                    ImageProcessor.crop_region(prev_window_image, rect)
+                    if prev_window_image is not None else None
+                )
+                self.last_alert_curr_image = ImageProcessor.crop_region(window_image, rect)
 
         elif self._state == STATE_ALERT:
             if has_change:
@@ -295,6 +491,11 @@ class RegionMonitor:
                 f"Region {self.region_id} state: {old_state} -> {self._state}"
             )
 
+        if has_change or self._state != STATE_OK:
+            self.stable_since = None
+        elif self.stable_since is None:
+            self.stable_since = now
+
         return self._state, should_play_sound
 
     # ── control methods ────────────────────────────────────────────
@@ -314,26 +515,83 @@ class RegionMonitor:
     def reset(self) -> None:
         """Reset region state to initial."""
         self.previous_image = None
+        self._previous_window_image = None
         self._state = STATE_OK
         self._alert_start_time = 0.0
         self._warning_start_time = 0.0
+        self.stable_since = None
         self._detector.reset()
 
 
 class MonitoringEngine:
     """Manages multiple region monitors"""
 
-    def __init__(self):
-        """Initialize monitoring engine"""
+    def __init__(self, use_dirty_map: bool = True,
+                 state_dir: Optional[str] = BG_MODELS_DIR,
+                 workers: int = 0):
+        """Initialize monitoring engine
+
+        Args:
+            use_dirty_map: Skip detectors for regions whose pixels did not
+                change since the previous tick (tile-hash dirty map).
+            state_dir: Directory for persisted detector state; empty or
+                None disables persistence (replays, tests).
+            workers: Detection thread pool size; 0 or 1 runs every
+                region on the calling thread (see ``set_workers``).
+        """
+        self.state_dir = state_dir
         self.monitors: Dict[str, RegionMonitor] = {}  # region_id -> RegionMonitor
         self.thumbnail_monitors: Dict[str, List[str]] = {}  # thumbnail_id -> [region_ids]
+        self.use_dirty_map = use_dirty_map
+        self._dirty_maps: Dict[str, TileDirtyMap] = {}  # thumbnail_id -> dirty map
+        # Regions left out of an update_regions() call while their pixels changed
+        self._dirty_while_skipped: Set[str] = set()
+        self._workers = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.set_workers(workers)
+        self._scale_reduction = 0
+
+    @property
+    def workers(self) -> int:
+        """Detection thread pool size (0 = sequential)."""
+        return self._workers
+
+    def set_workers(self, workers: int) -> None:
+        """Resize the region detection thread pool.
+
+        With more than one worker, ``update_regions`` runs each region's
+        detector (crop, filters, OpenCV work that releases the GIL) on the
+        pool and gathers the results back in region order; the state
+        machine and everything downstream of it still run on the calling
+        thread.  0 or 1 turns the pool off.
+        """
+        try:
+            workers = int(workers)
+        except (TypeError, ValueError):
+            workers = 0
+        workers = max(0, min(workers, MAX_DETECTION_WORKERS))
+        if workers <= 1:
+            workers = 0
+        if workers == self._workers:
+            return
+        old = self._executor
+        self._executor = (ThreadPoolExecutor(max_workers=workers, thread_name_prefix="region-detect")
+                          if workers else None)
+        self._workers = workers
+        if old is not None:
+            old.shutdown(wait=True)
+        logger.info("Region detection workers: %s", workers or "off (sequential)")
 
     def add_region(self, region_id: str, thumbnail_id: str,
                   region_config: Dict,
                   global_config: Optional[Dict] = None) -> RegionMonitor:
-        """Register a new region monitor"""
+        """Register a new region monitor (replacing any with the same id)"""
+        if region_id in self.monitors:
+            self.remove_region(region_id)
         monitor = RegionMonitor(region_id, thumbnail_id, region_config,
-                                global_config=global_config)
+                                global_config=global_config,
+                                state_dir=self.state_dir)
+        monitor.scale_reduction = self._scale_reduction
         self.monitors[region_id] = monitor
 
         if thumbnail_id not in self.thumbnail_monitors:
@@ -343,6 +601,20 @@ class MonitoringEngine:
         logger.info(f"Added monitor for region {region_id}")
         return monitor
 
+    @property
+    def scale_reduction(self) -> int:
+        """Pyramid levels every region (but high-priority ones) drops."""
+        return self._scale_reduction
+
+    def set_scale_reduction(self, steps: int) -> None:
+        """Analyse regions *steps* pyramid levels lower (0 = configured scale)."""
+        steps = max(0, int(steps))
+        if steps == self._scale_reduction:
+            return
+        self._scale_reduction = steps
+        for monitor in self.monitors.values():
+            monitor.scale_reduction = steps
+
     def remove_region(self, region_id: str) -> bool:
         """Remove region monitor"""
         if region_id not in self.monitors:
@@ -354,9 +626,12 @@ class MonitoringEngine:
         thumbnail_id = monitor.thumbnail_id
 
         del self.monitors[region_id]
+        self._dirty_while_skipped.discard(region_id)
         if thumbnail_id in self.thumbnail_monitors:
             if region_id in self.thumbnail_monitors[thumbnail_id]:
                 self.thumbnail_monitors[thumbnail_id].remove(region_id)
+            if not self.thumbnail_monitors[thumbnail_id]:
+                self._dirty_maps.pop(thumbnail_id, None)
 
         logger.info(f"Removed monitor for region {region_id}")
         return True
@@ -372,26 +647,139 @@ class MonitoringEngine:
 
     def update_regions(self, thumbnail_id: str, window_image: Image.Image,
                       alert_hold_seconds: float = 10.0,
+                      now: Optional[float] = None,
+                      timings: Optional[Dict[str, float]] = None,
+                      region_ids: Optional[Collection[str]] = None,
                       **kwargs) -> List[Tuple[str, str, bool]]:
         """Update all regions for a thumbnail.
 
         Detection params are now held per-region on each monitor's detector
         instance, so only alert_hold_seconds is passed through.
 
+        The window image is converted to grayscale once here and every
+        region receives a zero-copy slice of that array, or of a shared
+        downsampled pyramid level when its analysis scale is below 1
+        (each level is built at most once per frame).  When the dirty
+        map is enabled, regions whose rect touches no changed tile skip
+        their detector and record a "no change" result.
+
+        With a detection pool (``set_workers``) the regions' ``analyze``
+        steps run concurrently; results are applied to each region's state
+        machine on this thread, in region order, so transitions and the
+        returned list are the same as in sequential mode.
+
+        *now* overrides the state machine clock (replays).  When a
+        *timings* dict is given, each region's detection time in ms is
+        stored in it under the region id.  *region_ids* limits the update
+        to those regions (per-region polling); the others keep their
+        state, and pixel changes they miss (as do paused and disabled
+        regions) are remembered for their next update so the dirty map
+        never hides a change from them.
+
         Returns:
             List of (region_id, state, should_play_sound) tuples.
         """
         results = []
         monitors = self.get_thumbnail_monitors(thumbnail_id)
+        skipped: List[RegionMonitor] = []
+        if region_ids is not None:
+            wanted = set(region_ids)
+            skipped = [m for m in monitors if m.region_id not in wanted]
+            monitors = [m for m in monitors if m.region_id in wanted]
+
+        gray_frame: Optional[np.ndarray] = None
+        pyramid: Optional[FramePyramid] = None
+        if any(not (m.disabled or m.paused) for m in monitors):
+            gray_frame = ImageProcessor.to_gray_array(window_image)
+            pyramid = FramePyramid(gray_frame)
+
+        dirty_map: Optional[TileDirtyMap] = None
+        if gray_frame is not None and self.use_dirty_map:
+            dirty_map = self._dirty_maps.get(thumbnail_id)
+            if dirty_map is None:
+                dirty_map = self._dirty_maps[thumbnail_id] = TileDirtyMap()
+            dirty_map.update(gray_frame)
+            # Paused/disabled regions miss changes too; keep them for resume
+            idle = skipped + [m for m in monitors if m.disabled or m.paused]
+            for monitor in idle:
+                if monitor.region_id not in self._dirty_while_skipped and self._rect_dirty(dirty_map, monitor):
+                    self._dirty_while_skipped.add(monitor.region_id)
+
+        active: List[Tuple[RegionMonitor, bool]] = []
+        for monitor in monitors:
+            if monitor.disabled or monitor.paused:
+                continue
+            pixels_changed = True
+            if dirty_map is not None:
+                pixels_changed = self._rect_dirty(dirty_map, monitor)
+                if monitor.region_id in self._dirty_while_skipped:
+                    self._dirty_while_skipped.discard(monitor.region_id)
+                    pixels_changed = True
+            active.append((monitor, pixels_changed))
+
+        analyses = self._analyze_all(active, window_image, gray_frame, pyramid, timings)
 
         for monitor in monitors:
-            state, should_play_sound = monitor.update(
-                window_image, alert_hold_seconds,
-            )
+            analysis = analyses.get(monitor.region_id)
+            if analysis is None:  # disabled / paused
+                state, should_play_sound = monitor.update(window_image, alert_hold_seconds)
+            else:
+                state, should_play_sound = monitor.apply(
+                    analysis, window_image, alert_hold_seconds, now,
+                )
             results.append((monitor.region_id, state, should_play_sound))
 
         return results
 
+    @staticmethod
+    def _rect_dirty(dirty_map: TileDirtyMap, monitor: RegionMonitor) -> bool:
+        try:
+            return dirty_map.is_rect_dirty(monitor.config["rect"])
+        except Exception:
+            return True
+
+    @staticmethod
+    def _timed_analyze(monitor: RegionMonitor, window_image: Image.Image,
+                       gray_frame: np.ndarray, pixels_changed: bool,
+                       pyramid: FramePyramid) -> Tuple[RegionAnalysis, float]:
+        start = time.perf_counter()
+        analysis = monitor.analyze(window_image, gray_frame, pixels_changed, pyramid)
+        return analysis, (time.perf_counter() - start) * 1000.0
+
+    def _analyze_all(self, active: List[Tuple[RegionMonitor, bool]],
+                     window_image: Image.Image, gray_frame: Optional[np.ndarray],
+                     pyramid: Optional[FramePyramid],
+                     timings: Optional[Dict[str, float]]) -> Dict[str, RegionAnalysis]:
+        """Analyse *active* regions, on the pool when enabled; keyed by region id."""
+        executor = self._executor
+        if executor is not None and len(active) > 1:
+            # Build the shared pyramid levels up front so workers only read them
+            for monitor, _ in active:
+                try:
+                    scale = monitor.resolve_analysis_scale(tuple(monitor.config["rect"]))
+                    if scale != 1.0:
+                        pyramid.level(scale)
+                except Exception:
+                    pass
+            futures = [
+                executor.submit(self._timed_analyze, monitor, window_image,
+                                gray_frame, pixels_changed, pyramid)
+                for monitor, pixels_changed in active
+            ]
+            outcomes = [future.result() for future in futures]
+        else:
+            outcomes = [
+                self._timed_analyze(monitor, window_image, gray_frame, pixels_changed, pyramid)
+                for monitor, pixels_changed in active
+            ]
+
+        analyses: Dict[str, RegionAnalysis] = {}
+        for (monitor, _), (analysis, elapsed_ms) in zip(active, outcomes):
+            analyses[monitor.region_id] = analysis
+            if timings is not None:
+                timings[monitor.region_id] = elapsed_ms
+        return analyses
+
     def save_all_detector_states(self) -> None:
         """Persist all detector states (call on shutdown)."""
         for monitor in self.monitors.values():
@@ -402,5 +790,5 @@ class MonitoringEngine:
                                monitor.region_id, exc)
 
     def shutdown(self) -> None:
-        """Cleanup (no-op, reserved for future use)."""
-        pass
+        """Stop the detection thread pool, if any."""
+        self.set_workers(0)
@@ -0,0 +1,278 @@
+"""Replay a recorded session through MonitoringEngine as fast as possible.
+
+Every recorded frame is pushed, in timestamp order across windows, through
+a fresh ``MonitoringEngine`` and the ``RegionMonitor`` state machine.  The
+state machine runs on the recorded timestamps, so hold timers behave as
+they did live even though the replay runs much faster than real time.
+
+The report covers throughput (frames/second overall and for detection
+alone), per-region detector latency, the state/alert timeline and, when
+the session has ground-truth ``change`` events, how the alerts line up
+with them.  Detector, threshold and scale overrides make it easy to
+compare configurations on the same recording:
+
+    python -m screenalert_core.monitoring.session_replay SESSION_DIR \\
+        --method cascade --scale auto --json report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+from PIL import Image
+
+from screenalert_core.core.session_recording import EVENT_ALERT, EVENT_CHANGE, RecordedSession
+from screenalert_core.monitoring.region_monitor import MonitoringEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MATCH_TOLERANCE = 2.0  # seconds between a ground-truth change and its alert
+
+
+@dataclass
+class ReplayReport:
+    """Result of one session replay."""
+    session: str
+    windows: int
+    regions: int
+    frames: int
+    elapsed_s: float
+    detect_s: float
+    fps: float
+    detect_fps: float
+    region_latency_ms: Dict[str, Dict] = field(default_factory=dict)
+    timeline: List[Dict] = field(default_factory=list)
+    alerts: List[Dict] = field(default_factory=list)
+    accuracy: Optional[Dict] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _latency_stats(samples: List[float]) -> Dict:
+    arr = np.asarray(samples, dtype=np.float64)
+    return {
+        "count": int(arr.size),
+        "mean": round(float(arr.mean()), 4),
+        "p50": round(float(np.percentile(arr, 50)), 4),
+        "p95": round(float(np.percentile(arr, 95)), 4),
+        "max": round(float(arr.max()), 4),
+    }
+
+
+def score_alerts(alerts: List[Dict], truth: List[Dict],
+                 tolerance: float = DEFAULT_MATCH_TOLERANCE) -> Dict:
+    """Match alerts to ground-truth events of the same region.
+
+    An alert matches the earliest unmatched truth event of its region
+    within *tolerance* seconds; each event matches at most one alert.
+
+    Returns:
+        Dict with true/false positives, misses, precision, recall and the
+        mean alert delay (alert time minus truth time) of the matches.
+    """
+    pending: Dict[str, List[float]] = {}
+    for event in truth:
+        pending.setdefault(event.get("region_id"), []).append(float(event["t"]))
+    truth_total = sum(len(v) for v in pending.values())
+
+    matched = 0
+    delays: List[float] = []
+    for alert in alerts:
+        times = pending.get(alert["region_id"], [])
+        hit = next((t for t in times if abs(alert["t"] - t) <= tolerance), None)
+        if hit is None:
+            continue
+        times.remove(hit)
+        matched += 1
+        delays.append(alert["t"] - hit)
+
+    false_positives = len(alerts) - matched
+    return {
+        "truth_events": truth_total,
+        "true_positives": matched,
+        "false_positives": false_positives,
+        "missed": truth_total - matched,
+        "precision": round(matched / len(alerts), 4) if alerts else None,
+        "recall": round(matched / truth_total, 4) if truth_total else None,
+        "mean_delay_s": round(float(np.mean(delays)), 4) if delays else None,
+        "tolerance_s": tolerance,
+    }
+
+
+def replay_session(session: Union[str, Path, RecordedSession],
+                   global_overrides: Optional[Dict] = None,
+                   region_overrides: Optional[Dict] = None,
+                   alert_hold_seconds: Optional[float] = None,
+                   truth_kind: str = EVENT_CHANGE,
+                   tolerance: float = DEFAULT_MATCH_TOLERANCE,
+                   use_dirty_map: bool = True,
+                   max_frames: Optional[int] = None) -> ReplayReport:
+    """Push a recorded session through the monitoring pipeline.
+
+    Args:
+        session: Session directory or an opened RecordedSession
+        global_overrides: Merged over the recorded global detection config
+        region_overrides: Merged over every recorded region config
+            (e.g. ``{"detection_method": "phash", "alert_threshold": 0.9}``)
+        alert_hold_seconds: Hold time (default: as recorded, else 10s)
+        truth_kind: Event kind scored as ground truth (``"change"``, or
+            ``"alert"`` to compare with the live detector)
+        tolerance: Seconds allowed between a truth event and its alert
+        use_dirty_map: Passed to MonitoringEngine
+        max_frames: Stop after this many frames
+
+    Returns:
+        ReplayReport
+    """
+    if not isinstance(session, RecordedSession):
+        session = RecordedSession(session)
+
+    global_config = {**session.global_config, **(global_overrides or {})}
+    if alert_hold_seconds is None:
+        alert_hold_seconds = session.alert_hold_seconds
+    if alert_hold_seconds is None:
+        alert_hold_seconds = 10.0
+
+    # Replays never read or write the live detector warmup state
+    monitoring = MonitoringEngine(use_dirty_map=use_dirty_map, state_dir="")
+    region_names: Dict[str, str] = {}
+    for window_id, window in session.windows.items():
+        for region in window.get("regions", []):
+            region_id = region.get("id")
+            if not region_id or region.get("enabled", True) is False:
+                continue
+            config = {**region, **(region_overrides or {})}
+            monitoring.add_region(region_id, window_id, config, global_config=global_config)
+            region_names[region_id] = config.get("name", region_id)
+
+    latencies: Dict[str, List[float]] = {rid: [] for rid in region_names}
+    last_state: Dict[str, str] = {}
+    timeline: List[Dict] = []
+    alerts: List[Dict] = []
+    timings: Dict[str, float] = {}
+    images: Dict[str, tuple] = {}  # window_id -> (array, PIL image) of last frame
+
+    frames = 0
+    detect_s = 0.0
+    started = time.perf_counter()
+    for t, window_id, frame in session.iter_all_frames():
+        if max_frames is not None and frames >= max_frames:
+            break
+        cached = images.get(window_id)
+        if cached is not None and cached[0] is frame:
+            image = cached[1]  # repeated frame: reuse the decoded image
+        else:
+            image = Image.fromarray(frame)
+            images[window_id] = (frame, image)
+
+        detect_start = time.perf_counter()
+        timings.clear()
+        results = monitoring.update_regions(window_id, image, alert_hold_seconds,
+                                            now=t, timings=timings)
+        detect_s += time.perf_counter() - detect_start
+        frames += 1
+
+        for region_id, elapsed_ms in timings.items():
+            latencies[region_id].append(elapsed_ms)
+        for region_id, state, should_alert in results:
+            previous = last_state.get(region_id)
+            if state != previous:
+                last_state[region_id] = state
+                if previous is not None:
+                    timeline.append({"t": round(t, 4), "window_id": window_id,
+                                     "region_id": region_id, "from": previous, "to": state})
+            if should_alert:
+                alerts.append({"t": round(t, 4), "window_id": window_id,
+                               "region_id": region_id, "region_name": region_names[region_id]})
+    elapsed = time.perf_counter() - started
+
+    truth = session.events_of(truth_kind)
+    report = ReplayReport(
+        session=str(session.path),
+        windows=len(session.windows),
+        regions=len(region_names),
+        frames=frames,
+        elapsed_s=round(elapsed, 4),
+        detect_s=round(detect_s, 4),
+        fps=round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+        detect_fps=round(frames / detect_s, 2) if detect_s > 0 else 0.0,
+        region_latency_ms={
+            rid: {"name": region_names[rid], **_latency_stats(samples)}
+            for rid, samples in latencies.items() if samples
+        },
+        timeline=timeline,
+        alerts=alerts,
+        accuracy=score_alerts(alerts, truth, tolerance) if truth else None,
+    )
+    logger.info("Replayed %s: %d frame(s) in %.2fs (%.1f fps), %d alert(s)",
+                session.path, frames, elapsed, report.fps, len(alerts))
+    return report
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────
+
+def _format_report(report: ReplayReport) -> str:
+    lines = [
+        f"Session {report.session}: {report.windows} window(s), {report.regions} region(s)",
+        f"  {report.frames} frames in {report.elapsed_s:.3f}s  "
+        f"({report.fps:.1f} fps, detection {report.detect_fps:.1f} fps)",
+        "  Region latency (ms):",
+    ]
+    for rid, stats in report.region_latency_ms.items():
+        lines.append(f"    {stats['name'][:24]:<24} mean={stats['mean']:.3f} "
+                     f"p50={stats['p50']:.3f} p95={stats['p95']:.3f} max={stats['max']:.3f}")
+    lines.append(f"  Alerts: {len(report.alerts)}")
+    for alert in report.alerts:
+        lines.append(f"    t={alert['t']:>9.3f}s  {alert['region_name']}")
+    if report.accuracy:
+        acc = report.accuracy
+        lines.append(f"  Accuracy vs {acc['truth_events']} truth event(s): "
+                     f"tp={acc['true_positives']} fp={acc['false_positives']} "
+                     f"missed={acc['missed']} precision={acc['precision']} "
+                     f"recall={acc['recall']} mean_delay={acc['mean_delay_s']}s")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded ScreenAlert session")
+    parser.add_argument("session", help="Session directory")
+    parser.add_argument("--method", help="Detection method for every region")
+    parser.add_argument("--threshold", type=float, help="Alert threshold for every region")
+    parser.add_argument("--scale", help="Analysis scale for every region (1.0/0.5/0.25/0.125/auto)")
+    parser.add_argument("--hold", type=float, help="Alert hold seconds (default: as recorded)")
+    parser.add_argument("--truth", default=EVENT_CHANGE, choices=[EVENT_CHANGE, EVENT_ALERT],
+                        help="Event kind scored as ground truth (default: change)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_MATCH_TOLERANCE,
+                        help="Seconds allowed between a truth event and its alert")
+    parser.add_argument("--no-dirty-map", action="store_true", help="Disable the tile dirty map")
+    parser.add_argument("--json", dest="json_out", help="Also write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    overrides: Dict = {}
+    if args.method:
+        overrides["detection_method"] = args.method
+    if args.threshold is not None:
+        overrides["alert_threshold"] = args.threshold
+    if args.scale:
+        overrides["analysis_scale"] = args.scale
+
+    report = replay_session(args.session, region_overrides=overrides,
+                            alert_hold_seconds=args.hold, truth_kind=args.truth,
+                            tolerance=args.tolerance, use_dirty_map=not args.no_dirty_map)
+    print(_format_report(report))
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
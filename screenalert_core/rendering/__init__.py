@@ -1,5 +1,11 @@
 """Rendering package for ScreenAlert"""
 
-from screenalert_core.rendering.dwm_backend import ThumbnailBackend, DwmThumbnailBackend
-from screenalert_core.rendering.overlay_window import OverlayWindow
-from screenalert_core.rendering.overlay_manager import OverlayManager
+import os
+
+from screenalert_core.rendering.headless_renderer import HeadlessRenderer
+
+# DWM overlays load user32/dwmapi at import time
+if os.name == "nt":
+    from screenalert_core.rendering.dwm_backend import ThumbnailBackend, DwmThumbnailBackend
+    from screenalert_core.rendering.overlay_window import OverlayWindow
+    from screenalert_core.rendering.overlay_manager import OverlayManager
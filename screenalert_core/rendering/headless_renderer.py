@@ -0,0 +1,103 @@
+"""Headless renderer - OverlayManager API without any windows.
+
+Used when the engine runs without a Windows desktop (Linux, CI, replay
+and load tests).  Every call is accepted and the per-thumbnail state the
+engine sets is kept so callers and tests can inspect it.
+"""
+
+import logging
+from typing import Callable, Dict, Optional
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class HeadlessRenderer:
+    """No-op stand-in for OverlayManager."""
+
+    def __init__(self, manager_callback: Callable = None, parent_root=None):
+        self.manager_callback = manager_callback
+        self.parent_root = parent_root
+        self.running = False
+        self.source_hwnds: Dict[str, int] = {}
+        self.availability: Dict[str, bool] = {}
+        self.user_visibility: Dict[str, bool] = {}
+        self.active_thumbnail: Optional[str] = None
+
+    def start(self) -> None:
+        self.running = True
+        logger.debug("Headless renderer started")
+
+    def stop(self) -> None:
+        self.running = False
+
+    def is_running(self) -> bool:
+        return self.running
+
+    def add_thumbnail(self, thumbnail_id: str, config: Dict) -> bool:
+        self.availability.setdefault(thumbnail_id, False)
+        return True
+
+    def remove_thumbnail(self, thumbnail_id: str) -> bool:
+        for state in (self.source_hwnds, self.availability, self.user_visibility):
+            state.pop(thumbnail_id, None)
+        return True
+
+    def set_source_hwnd(self, thumbnail_id: str, hwnd: int) -> None:
+        self.source_hwnds[thumbnail_id] = hwnd
+
+    def update_thumbnail_image(self, thumbnail_id: str, image: Image.Image) -> bool:
+        return True
+
+    def set_thumbnail_availability(self, thumbnail_id: str, available: bool,
+                                   show_when_unavailable: bool = False) -> bool:
+        self.availability[thumbnail_id] = bool(available)
+        return True
+
+    def set_thumbnail_user_visibility(self, thumbnail_id: str, visible: bool) -> bool:
+        self.user_visibility[thumbnail_id] = bool(visible)
+        return True
+
+    def set_all_thumbnail_user_visibility(self, visible: bool) -> None:
+        for thumbnail_id in self.user_visibility:
+            self.user_visibility[thumbnail_id] = bool(visible)
+
+    def set_thumbnail_opacity(self, thumbnail_id: str, opacity: float) -> None:
+        pass
+
+    def refresh_unavailable_thumbnails(self, show_when_unavailable: bool) -> None:
+        pass
+
+    def set_all_thumbnail_opacity(self, opacity: float) -> None:
+        pass
+
+    def set_all_thumbnail_topmost(self, on_top: bool) -> None:
+        pass
+
+    def set_all_thumbnail_borders(self, show_borders: bool) -> None:
+        pass
+
+    def set_all_thumbnail_scaling_mode(self, mode: str) -> None:
+        pass
+
+    def set_active_thumbnail(self, thumbnail_id: str, bring_to_front: bool = True) -> None:
+        self.active_thumbnail = thumbnail_id
+
+    def clear_active_thumbnail(self) -> None:
+        self.active_thumbnail = None
+
+    def refresh_thumbnail_titles(self) -> None:
+        pass
+
+    def get_all_thumbnail_geometries(self) -> Dict[str, Dict[str, int]]:
+        return {}
+
+    def is_thumbnail_visible(self, thumbnail_id: str) -> Optional[bool]:
+        return self.user_visibility.get(thumbnail_id)
+
+    def get_thumbnail(self, thumbnail_id: str):
+        return None
+
+    def set_update_rate(self, hz: int) -> None:
+        pass
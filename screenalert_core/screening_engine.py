@@ -7,43 +7,155 @@ import os
 import re
 import string
 import ctypes
+import collections
+import uuid
 import tkinter as tk
 from datetime import datetime
-from typing import Dict, Optional, List, Callable, Tuple
+from typing import Deque, Dict, NamedTuple, Optional, List, Callable, Set, Tuple
 from PIL import Image
 
 from screenalert_core.core.config_manager import ConfigManager
 from screenalert_core.core.window_manager import WindowManager
 from screenalert_core.core.cache_manager import CacheManager
 from screenalert_core.core.image_processor import ImageProcessor
-from screenalert_core.monitoring.region_monitor import MonitoringEngine
+from screenalert_core.monitoring.region_monitor import (
+    MonitoringEngine, PRIORITY_LOW, PRIORITY_NORMAL, STATE_ALERT, STATE_WARNING,
+)
 from screenalert_core.monitoring.alert_system import AlertSystem
-from screenalert_core.rendering.overlay_manager import OverlayManager
+from screenalert_core.monitoring.alert_dispatcher import AlertDispatcher, AlertRecord
+from screenalert_core.monitoring.alert_rollup import ROLLUP_FILENAME, AlertRollup
+from screenalert_core.core.capture_scheduler import CaptureJob, CaptureScheduler
+from screenalert_core.core.capture_sources import CaptureSource, Win32CaptureSource
+from screenalert_core.core.poll_scheduler import PollScheduler, adaptive_interval
+from screenalert_core.core.load_governor import (
+    LEVEL_DEFER_DIAGNOSTICS, LEVEL_NAMES, LEVEL_REDUCED_SCALE, LEVEL_SHED_LOW_PRIORITY,
+    GovernorStep, LoadGovernor,
+)
+from screenalert_core.core.pipeline import POLICY_COALESCE, PipelineStage
+from screenalert_core.core.artifact_writer import ArtifactWriter, save_png
+from screenalert_core.core.capture_store import KIND_SNAPSHOT, STORE_DIRNAME, CaptureStore
+from screenalert_core.core.retention import RetentionManager, RetentionPolicy
+from screenalert_core.core.session_recording import SessionRecorder
+from screenalert_core.rendering.headless_renderer import HeadlessRenderer
 from screenalert_core.utils.plugin_hooks import PluginHooks
-from screenalert_core.utils.constants import DEFAULT_REFRESH_RATE_MS, TEMP_DIR
+from screenalert_core.utils.constants import CONFIG_DIR, DEFAULT_REFRESH_RATE_MS, TEMP_DIR
 from screenalert_core.utils.diagnostics import save_alert_diagnostics
 
+if os.name == "nt":
+    from screenalert_core.rendering.overlay_manager import OverlayManager
+
 logger = logging.getLogger(__name__)
 
+# Longest the loop sleeps before re-syncing the poll schedule with the config
+_SCHEDULE_RESYNC_S = 0.5
+# Alert diagnostics held back while the load governor defers them
+_MAX_DEFERRED_DIAGNOSTICS = 50
+
+
+# Pipeline queue bounds (see core.pipeline)
+_DETECT_QUEUE_SIZE = 32
+_DISPATCH_QUEUE_SIZE = 256
+
+
+class _FrameWork(NamedTuple):
+    """A captured frame waiting for detection (detect stage item)."""
+    thumbnail_config: Dict
+    hwnd: int
+    image: Image.Image
+    region_ids: Optional[Set[str]]   # None = all regions
+
+
+def _merge_frames(queued: _FrameWork, new: _FrameWork) -> _FrameWork:
+    """Coalesce frames of one window: keep the newest, run every region either wanted."""
+    if queued.region_ids is None or new.region_ids is None:
+        region_ids = None
+    else:
+        region_ids = queued.region_ids | new.region_ids
+    return new._replace(region_ids=region_ids)
+
+
+class _RegionEvent(NamedTuple):
+    """A region state change to dispatch (dispatch stage item).
+
+    Queued changes of one region coalesce to the latest state; alerts go
+    to the AlertDispatcher instead and are never coalesced.
+    """
+    thumbnail_id: str
+    region_id: str
+    state: str
+
+
+class _AlertImages(NamedTuple):
+    """Alert crops of a region, snapshotted for a diagnostics write."""
+    last_alert_prev_image: Optional[Image.Image]
+    last_alert_curr_image: Optional[Image.Image]
+
 
 class ScreenAlertEngine:
     """Main engine coordinating all ScreenAlert components"""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None,
+                 capture_source: Optional[CaptureSource] = None,
+                 renderer=None):
         """Initialize ScreenAlert engine
         
         Args:
             config_path: Path to configuration file
+            capture_source: Where frames and window identity come from
+                (default: live Win32 windows).  With a replay source the
+                config is read-only: reconnecting to recorded windows and
+                rescaling regions to their size happen in memory only, and
+                alert rollups and detector states are not persisted.
+            renderer: Overlay renderer (default: DWM overlays on Windows,
+                HeadlessRenderer elsewhere)
         """
         # Initialize components
         self.config = ConfigManager(config_path)
+        # A replay must not rewrite the live setup it was started against
+        self._replay = capture_source is not None and capture_source.replay
+        self.config.read_only = self._replay
         self.window_manager = WindowManager()
+        self.capture_source = capture_source or Win32CaptureSource(self.window_manager)
         self.cache_manager = CacheManager(lifetime_seconds=1.0)
-        self.monitoring_engine = MonitoringEngine()
+        self.monitoring_engine = MonitoringEngine(workers=self.config.get_detection_workers())
+        self.capture_scheduler = CaptureScheduler(self.capture_source.capture,
+                                                  workers=self.config.get_capture_workers())
+        self.poll_scheduler = PollScheduler()
+        self.load_governor = LoadGovernor()
+        # capture (loop thread) -> detect -> dispatch; inline until start()
+        self._detect_stage = PipelineStage(
+            "detect", self._detect_frame, _DETECT_QUEUE_SIZE, POLICY_COALESCE,
+            key=lambda work: work.thumbnail_config["id"], merge=_merge_frames,
+        )
+        self._dispatch_stage = PipelineStage(
+            "dispatch", self._dispatch_region_event, _DISPATCH_QUEUE_SIZE, POLICY_COALESCE,
+            key=lambda event: event.region_id,
+        )
+        self._wake_event = threading.Event()  # interrupts the loop's wait for the next deadline
         self.alert_system = AlertSystem()
+        # Alerts: ordered queue, suppression/mute/playback on its own worker
+        self.alert_dispatcher = AlertDispatcher(
+            self.config, self.alert_system,
+            lambda: self.capture_source.is_foreground_fullscreen(),
+            self._deliver_alert,
+        )
+        # Snapshots and diagnostics images are written here, off the alert path
+        self.artifact_writer = ArtifactWriter()
+        self._capture_store: Optional[CaptureStore] = None  # see capture_store
+        self._capture_store_lock = threading.Lock()
+        # Deletes the oldest stored captures beyond the configured quotas
+        self.retention = RetentionManager(lambda: self.capture_store, self._retention_policy)
+        # Alert counts, durations and detector metrics in time buckets (MCP analytics)
+        self.alert_rollup = AlertRollup(None if self._replay else os.path.join(
+            os.path.dirname(self.config.config_path) or CONFIG_DIR, ROLLUP_FILENAME))
         self.plugin_hooks = PluginHooks()
         self.tkinter_root: Optional[tk.Tk] = None  # Will be set by main_window
-        self.renderer = OverlayManager(manager_callback=self._on_thumbnail_interaction, parent_root=None)
+        if renderer is not None:
+            self.renderer = renderer
+        elif os.name == "nt":
+            self.renderer = OverlayManager(manager_callback=self._on_thumbnail_interaction, parent_root=None)
+        else:
+            self.renderer = HeadlessRenderer(manager_callback=self._on_thumbnail_interaction)
         
         # State
         self.running = False
@@ -69,6 +181,8 @@ class ScreenAlertEngine:
         self._config_initialized = False
         self.last_pause_reminder_ts = 0
         self._diag_last_report_ts = time.time()
+        # The detect and dispatch workers bump these while the loop reports
+        self._diag_lock = threading.Lock()
         self._diag_loop_count = 0
         self._diag_capture_ms = 0.0
         self._diag_render_ms = 0.0
@@ -80,7 +194,17 @@ class ScreenAlertEngine:
         self._window_lost_notified: set[str] = set()
         self._thumbnail_connected: Dict[str, bool] = {}
         self._prev_window_images: Dict[str, Image.Image] = {}
-        logger.info("ScreenAlert engine initialized")
+        # Last reported state per region, so callbacks fire only on transitions
+        self._prev_region_state: Dict[str, str] = {}
+        self._last_refresh_rate_ms: Optional[int] = None
+        # Active session recording (see start_recording)
+        self._recorder: Optional[SessionRecorder] = None
+        # Load shedding: low-priority regions skipped on their last due
+        # run, and diagnostics writes waiting for headroom
+        self._shed_skipped: Set[str] = set()
+        self._deferred_diagnostics: Deque[tuple] = collections.deque(maxlen=_MAX_DEFERRED_DIAGNOSTICS)
+        self._diagnostics_dropped = 0
+        logger.info("ScreenAlert engine initialized (capture source: %s)", self.capture_source.name)
         logger.debug(f"Config path: {config_path}")
         logger.debug("WindowManager, CacheManager, MonitoringEngine, AlertSystem, OverlayManager initialized")
 
@@ -124,6 +248,8 @@ class ScreenAlertEngine:
         return {
             "detection_method": self.config.get_change_detection_method(),
             "alert_threshold": self.config.get_default_alert_threshold(),
+            "ssim_window": self.config.get_ssim_window(),
+            "analysis_scale": self.config.get_analysis_scale(),
             "min_edge_fraction": self.config.get_min_edge_fraction(),
             "canny_low": self.config.get_canny_low(),
             "canny_high": self.config.get_canny_high(),
@@ -133,6 +259,9 @@ class ScreenAlertEngine:
             "bg_learning_rate": self.config.get_bg_learning_rate(),
             "bg_min_fg_fraction": self.config.get_bg_min_fg_fraction(),
             "bg_warmup_frames": self.config.get_bg_warmup_frames(),
+            "cascade_gate": self.config.get_cascade_gate(),
+            "cascade_gate_threshold": self.config.get_cascade_gate_threshold(),
+            "cascade_confirm": self.config.get_cascade_confirm(),
         }
     
     def set_tkinter_root(self, root: 'tk.Tk') -> None:
@@ -168,7 +297,7 @@ class ScreenAlertEngine:
         """Return True if *hwnd* matches the identity stored in thumbnail config *tc*."""
         title, cls, size, monitor = self._extract_window_identity(tc)
         try:
-            return self.window_manager.validate_window_identity(
+            return self.capture_source.validate_window_identity(
                 hwnd,
                 expected_title=title,
                 expected_class=cls,
@@ -298,7 +427,7 @@ class ScreenAlertEngine:
         try:
             # Capture window metadata for identity validation on reconnect.
             # Prefer explicit values from selector, fill any missing values from live metadata.
-            metadata = self.window_manager.get_window_metadata(window_hwnd)
+            metadata = self.capture_source.get_window_metadata(window_hwnd)
             resolved_window_class = window_class or (metadata.get('class', '') if metadata else '')
             resolved_window_size = window_size or (metadata.get('size') if metadata else None)
             resolved_monitor_id = monitor_id if monitor_id is not None else (metadata.get('monitor_id') if metadata else None)
@@ -331,7 +460,7 @@ class ScreenAlertEngine:
             
             # Link DWM thumbnail to source window immediately
             self.renderer.set_source_hwnd(thumbnail_id, window_hwnd)
-            if self.window_manager.is_window_valid(window_hwnd):
+            if self.capture_source.is_window_valid(window_hwnd):
                 self.renderer.set_thumbnail_availability(thumbnail_id, True)
                 logger.info(f"[{thumbnail_id}] DWM thumbnail linked: hwnd={window_hwnd}")
             else:
@@ -344,6 +473,7 @@ class ScreenAlertEngine:
             
             self.config.save()
             logger.info(f"Added thumbnail: {thumbnail_id}")
+            self._wake_event.set()
             self.plugin_hooks.emit("thumbnail.added", thumbnail_id=thumbnail_id, hwnd=window_hwnd, title=window_title)
             return thumbnail_id
         
@@ -395,6 +525,7 @@ class ScreenAlertEngine:
                 "alert_threshold": alert_threshold if alert_threshold is not None else self.config.get_default_alert_threshold(),
                 "change_detection_method": self.config.get_change_detection_method(),
                 "enabled": True,
+                "priority": PRIORITY_NORMAL,
                 "sound_file": self.config.get_default_sound_file(),
                 "tts_message": "Alert {window} {region_name}"
             }
@@ -407,6 +538,7 @@ class ScreenAlertEngine:
                 )
                 self.config.save()
                 logger.info(f"Added region: {region_id}")
+                self._wake_event.set()
                 self.plugin_hooks.emit("region.added", thumbnail_id=thumbnail_id, region_id=region_id, name=name)
             
             return region_id
@@ -448,9 +580,18 @@ class ScreenAlertEngine:
             return False
         
         try:
+            # Headless runs never call set_tkinter_root()
+            if not self._config_initialized:
+                self._initialize_from_config()
+                self._config_initialized = True
+
             self.running = True
             self.renderer.set_all_thumbnail_scaling_mode(self.config.get_overlay_scaling_mode())
             self.renderer.start()
+            self.artifact_writer.start()
+            self.alert_dispatcher.start()
+            self._dispatch_stage.start()
+            self._detect_stage.start()
             
             # Start main loop thread
             self.loop_thread = threading.Thread(target=self._main_loop, daemon=True)
@@ -462,6 +603,8 @@ class ScreenAlertEngine:
             # Start auto-discovery thread for finding disconnected windows
             self._start_auto_discovery()
 
+            self.retention.start()
+
             logger.info("ScreenAlert engine started")
             self.plugin_hooks.emit("engine.started")
             return True
@@ -474,8 +617,10 @@ class ScreenAlertEngine:
     def stop(self) -> None:
         """Stop the engine"""
         self.running = False
+        self._wake_event.set()
 
         self._stop_auto_discovery()
+        self.retention.stop()
 
         try:
             self.renderer.stop()
@@ -490,8 +635,22 @@ class ScreenAlertEngine:
 
         self._stop_foreground_event_hook()
 
+        # Finish queued frames and alerts before tearing anything down
+        for name, stage in (("detect", self._detect_stage), ("dispatch", self._dispatch_stage),
+                            ("alerts", self.alert_dispatcher), ("artifacts", self.artifact_writer)):
+            try:
+                stage.stop(drain=True)
+            except Exception as error:
+                logger.error(f"Error stopping {name} stage: {error}")
+
+        try:
+            self.alert_rollup.flush()
+        except Exception as error:
+            logger.error(f"Error writing alert rollup: {error}")
+
         try:
-            self.monitoring_engine.save_all_detector_states()
+            if not self._replay:
+                self.monitoring_engine.save_all_detector_states()
         except Exception as error:
             logger.error(f"Error saving detector states: {error}")
 
@@ -500,6 +659,11 @@ class ScreenAlertEngine:
         except Exception as error:
             logger.error(f"Error shutting down monitoring thread pool: {error}")
 
+        try:
+            self.capture_scheduler.shutdown()
+        except Exception as error:
+            logger.error(f"Error shutting down capture scheduler: {error}")
+
         try:
             self.config.save()
         except Exception as error:
@@ -510,6 +674,16 @@ class ScreenAlertEngine:
         except Exception as error:
             logger.error(f"Error cleaning alert system: {error}")
 
+        self.stop_recording()
+
+        if self._capture_store is not None:
+            self._capture_store.close()
+
+        try:
+            self.capture_source.close()
+        except Exception as error:
+            logger.error(f"Error closing capture source: {error}")
+
         try:
             self.cache_manager.invalidate_all()
             self.cache_manager.cleanup_temp_files(TEMP_DIR, max_age_seconds=0)
@@ -641,6 +815,73 @@ class ScreenAlertEngine:
             logger.error("reconnect_window [%s]: %s", thumbnail_id, exc, exc_info=True)
             return "failed"
     
+    # ── Session recording ─────────────────────────────────────────────
+
+    def start_recording(self, path: str, grayscale: bool = True) -> bool:
+        """Record captured frames and live alerts to a session directory.
+
+        The session can be replayed offline with
+        ``screenalert_core.monitoring.session_replay``.
+
+        Returns:
+            True if recording started
+        """
+        if self._recorder is not None:
+            logger.warning("Session recording already active: %s", self._recorder.path)
+            return False
+        try:
+            self._recorder = SessionRecorder(
+                path,
+                grayscale=grayscale,
+                global_config=self._get_global_detection_config(),
+                alert_hold_seconds=self.config.get_alert_hold_seconds(),
+            )
+        except Exception as error:
+            logger.error("Unable to start session recording at %s: %s", path, error)
+            return False
+        logger.info("Session recording started: %s", path)
+        return True
+
+    def stop_recording(self) -> Optional[str]:
+        """Finish the active recording; returns its directory, or None."""
+        recorder, self._recorder = self._recorder, None
+        if recorder is None:
+            return None
+        try:
+            return str(recorder.close())
+        except Exception as error:
+            logger.error("Error finishing session recording: %s", error)
+            return None
+
+    def is_recording(self) -> bool:
+        return self._recorder is not None
+
+    def _record_frame(self, thumbnail_config: Dict, image: Image.Image) -> None:
+        recorder = self._recorder
+        if recorder is None:
+            return
+        try:
+            thumbnail_id = thumbnail_config["id"]
+            if not recorder.has_window(thumbnail_id):
+                recorder.add_window(
+                    thumbnail_id,
+                    thumbnail_config.get("window_title", ""),
+                    thumbnail_config.get("monitored_regions", []),
+                )
+            recorder.add_frame(thumbnail_id, image)
+        except Exception as error:
+            logger.error("Session recording failed, stopping: %s", error)
+            self.stop_recording()
+
+    def _record_event(self, kind: str, thumbnail_id: str, region_id: str) -> None:
+        recorder = self._recorder
+        if recorder is None:
+            return
+        try:
+            recorder.add_event(kind, thumbnail_id, region_id)
+        except Exception as error:
+            logger.debug("Unable to record %s event: %s", kind, error)
+
     # ── Auto-discovery ────────────────────────────────────────────────
 
     def _start_auto_discovery(self) -> None:
@@ -693,7 +934,7 @@ class ScreenAlertEngine:
                           Set False when the caller already updated config (e.g. _try_reconnect).
         """
         if update_config:
-            metadata = self.window_manager.get_window_metadata(hwnd)
+            metadata = self.capture_source.get_window_metadata(hwnd)
             updates = {"window_hwnd": hwnd}
             if metadata:
                 updates["window_class"] = metadata.get('class', '')
@@ -742,7 +983,7 @@ class ScreenAlertEngine:
             _, expected_class, expected_size, expected_monitor = self._extract_window_identity(tc)
 
             # Quick check: maybe the stored hwnd became valid again (app restarted with same hwnd)
-            if window_hwnd and self.window_manager.is_window_valid(window_hwnd):
+            if window_hwnd and self.capture_source.is_window_valid(window_hwnd):
                 if self._validate_thumbnail_window(tc, window_hwnd):
                     self._mark_connected(thumbnail_id, window_hwnd)
                     reconnected += 1
@@ -832,7 +1073,7 @@ class ScreenAlertEngine:
         # Size is NOT used as a filter — windows may have been resized or
         # restarted at a different resolution.  The stored size is updated
         # after a successful reconnect so future validation cycles pass.
-        new_window = self.window_manager.find_window_by_title(
+        new_window = self.capture_source.find_window_by_title(
             window_title, exact=True,
             expected_size=None,
             expected_monitor_id=expected_monitor_id,
@@ -854,7 +1095,7 @@ class ScreenAlertEngine:
                         f"new hwnd={new_hwnd}, size={new_size}")
 
             # Update config with new handle and refreshed metadata
-            metadata = self.window_manager.get_window_metadata(new_hwnd)
+            metadata = self.capture_source.get_window_metadata(new_hwnd)
             updates = {"window_hwnd": new_hwnd}
             if metadata:
                 updates["window_class"] = metadata.get('class', '')
@@ -877,275 +1118,733 @@ class ScreenAlertEngine:
         return None
     
     def _main_loop(self) -> None:
-        """Main unified capture and processing loop"""
-        # Track previous state per region to fire callbacks only on transitions
-        _prev_region_state: dict[str, str] = {}
-        last_refresh_rate_ms: Optional[int] = None
+        """Main unified capture and processing loop.
 
+        Live sources are polled by deadline: every window and region is a
+        job in ``poll_scheduler`` with its own interval, and the loop sleeps
+        until the earliest one is due.  Free-running sources (synthetic,
+        replay) are stepped as fast as they produce frames.
+        """
         while self.running:
             try:
+                refresh_rate_ms = self._apply_refresh_rate()
+                free_running = self.capture_source.free_running
                 start_time = time.time()
-                refresh_rate_ms = self.config.get_refresh_rate()
-
-                if refresh_rate_ms != last_refresh_rate_ms:
-                    self.cache_manager.lifetime = max(0.01, (refresh_rate_ms - 10) / 1000.0)
-                    self.cache_manager.invalidate_all()
-                    last_refresh_rate_ms = refresh_rate_ms
-                    logger.info(
-                        "Updated refresh rate to %sms (cache lifetime=%.3fs)",
-                        refresh_rate_ms,
-                        self.cache_manager.lifetime,
-                    )
-                
-                # Get snapshot of all thumbnails (copy to avoid mutation during iteration)
-                with self.lock:
-                    thumbnails = list(self.config.get_all_thumbnails())
-
-                # Fallback foreground sync (event hooks can occasionally miss transitions).
-                now = time.time()
-                if (now - self._last_foreground_sync_ts) >= 0.25:
-                    foreground_hwnd = self.window_manager.get_foreground_window()
-                    if foreground_hwnd:
-                        self._update_overlay_active_by_foreground_source(thumbnails, foreground_hwnd)
-                    self._last_foreground_sync_ts = now
-
-                # Process each thumbnail
-                for thumbnail_config in thumbnails:
-                    if not thumbnail_config.get("enabled", True):
-                        continue
-
-                    thumbnail_id = thumbnail_config["id"]
-                    window_hwnd = thumbnail_config.get("window_hwnd")
-                    window_title, expected_class, expected_size, expected_monitor = \
-                        self._extract_window_identity(thumbnail_config)
-
-                    # Validate window: both existence AND identity
-                    window_ok = self._validate_thumbnail_window(thumbnail_config, window_hwnd)
-
-                    if window_ok:
-                        was_disconnected = not self._thumbnail_connected.get(thumbnail_id, False)
-                        self._reconnect_attempted_once.discard(thumbnail_id)
-                        self._window_lost_notified.discard(thumbnail_id)
-                        self._thumbnail_connected[thumbnail_id] = True
-                        # If just transitioned from disconnected, show the overlay
-                        if was_disconnected:
-                            self.renderer.set_thumbnail_availability(thumbnail_id, True)
-                            if self.config.get_show_overlay_on_connect():
-                                self.renderer.set_thumbnail_user_visibility(thumbnail_id, True)
-
-                    if not window_ok:
-                        self._thumbnail_connected[thumbnail_id] = False
-                        if thumbnail_id in self._reconnect_attempted_once:
-                            self.renderer.set_thumbnail_availability(
-                                thumbnail_id,
-                                False,
-                                self.config.get_show_overlay_when_unavailable(),
-                            )
-                            if thumbnail_id not in self._window_lost_notified:
-                                self.plugin_hooks.emit("window.lost", thumbnail_id=thumbnail_id, title=window_title)
-                                self.on_window_lost(thumbnail_id, window_title)
-                                self._window_lost_notified.add(thumbnail_id)
-                                if self.event_logger:
-                                    self.event_logger.log("window", "window_lost", "engine",
-                                                          window_id=thumbnail_id,
-                                                          window_name=window_title)
-                            continue
-
-                        # Try to reconnect to the correct window
-                        new_window = self._try_reconnect(
-                            thumbnail_id, window_title,
-                            expected_class, expected_size, expected_monitor
-                        )
-                        if new_window:
-                            window_hwnd = new_window['hwnd']
-                            self._mark_connected(thumbnail_id, window_hwnd, update_config=False)
-                        else:
-                            self._reconnect_attempted_once.add(thumbnail_id)
-                            self.renderer.set_thumbnail_availability(
-                                thumbnail_id,
-                                False,
-                                self.config.get_show_overlay_when_unavailable(),
-                            )
-                            if thumbnail_id not in self._window_lost_notified:
-                                self.plugin_hooks.emit("window.lost", thumbnail_id=thumbnail_id, title=window_title)
-                                self.on_window_lost(thumbnail_id, window_title)
-                                self._window_lost_notified.add(thumbnail_id)
-                                if self.event_logger:
-                                    self.event_logger.log("window", "window_lost", "engine",
-                                                          window_id=thumbnail_id,
-                                                          window_name=window_title)
-                            continue
-                    
-                    # UNIFIED CAPTURE
-                    capture_start = time.perf_counter()
-                    cached_image = self.cache_manager.get(window_hwnd)
-                    if cached_image is None:
-                        window_image = self.window_manager.capture_window(window_hwnd)
-                        if window_image:
-                            self.cache_manager.set(window_hwnd, window_image)
-                            logger.debug(f"[{thumbnail_id}] CAPTURED: size {window_image.size}")
-                        else:
-                            # Capture failed but DWM overlay is independent — don't
-                            # hide the overlay, just skip region monitoring this cycle.
-                            logger.debug(f"[{thumbnail_id}] CAPTURE FAILED (skipping regions): hwnd={window_hwnd}")
-                            continue
-                    else:
-                        window_image = cached_image
-                        logger.debug(f"[{thumbnail_id}] Using cached image: {window_image.size}")
-                    self._diag_capture_ms += (time.perf_counter() - capture_start) * 1000.0
-
-                    # DWM handles thumbnail display; no image sent to renderer.
-                    # Ensure DWM link is established for this hwnd.
-                    self.renderer.set_source_hwnd(thumbnail_id, window_hwnd)
-
-                    # Process monitoring regions (uses captured image for analysis)
-                    if not self.paused:
-                        monitor_start = time.perf_counter()
-                        alert_hold_seconds = self.config.get_alert_hold_seconds()
-                        region_results = self.monitoring_engine.update_regions(
-                            thumbnail_id, window_image, alert_hold_seconds,
-                        )
-                        self._diag_monitor_ms += (time.perf_counter() - monitor_start) * 1000.0
-                        # Store window image for next iteration's diagnostics
-                        self._prev_window_images[thumbnail_id] = window_image
-                        
-                        for region_id, state, should_play_sound in region_results:
-                            # Fire state-change callback when state transitions
-                            prev = _prev_region_state.get(region_id)
-                            if state != prev:
-                                _prev_region_state[region_id] = state
-
-                                self._diag_change_count += 1
-                                self.plugin_hooks.emit("region.changed", thumbnail_id=thumbnail_id, region_id=region_id)
-                                self.on_region_change(thumbnail_id, region_id, state)
-                            
-                            if should_play_sound:
-                                # Play alert sound
-                                region = self.monitoring_engine.get_monitor(region_id)
-                                if region:
-                                    config = region.config
-                                    sound_file = config.get("sound_file", "")
-                                    tts_template = config.get("tts_message", "") or self.config.get_default_tts_message()
-                                    tts_message = self._render_tts_message(
-                                        tts_template,
-                                        thumbnail_config.get("window_title", "Unknown"),
-                                        config.get("name", "Region"),
-                                    )
-
-                                    # Optional: suppress alerts during fullscreen apps
-                                    if self.config.get_suppress_fullscreen() and self.window_manager.is_foreground_fullscreen():
-                                        logger.info("Suppressing alert due to fullscreen foreground application")
-                                        continue
-
-                                    # Optional: global mute timer
-                                    mute_until = self.config.get_mute_until_ts()
-                                    if mute_until > int(time.time()):
-                                        logger.info("Alert muted by countdown timer")
-                                    else:
-                                        play_sound = sound_file if self.config.get_enable_sound() else ""
-                                        play_tts = tts_message if self.config.get_enable_tts() else ""
-                                        logger.info(
-                                            "Dispatching alert media: sound=%s tts=%s message=%s",
-                                            bool(play_sound),
-                                            bool(play_tts),
-                                            play_tts if play_tts else ""
-                                        )
-                                        self.alert_system.play_alert(play_sound, play_tts)
-
-                                    # Optional: capture screenshot on alert
-                                    _capture_path = None
-                                    if self.config.get_capture_on_alert():
-                                        _capture_path = self._capture_region_snapshot(thumbnail_config, config, window_image, status="alert")
-
-                                    # Optional: save diagnostic images (background thread to avoid blocking loop)
-                                    if self.config.get_save_alert_diagnostics():
-                                        threading.Thread(
-                                            target=save_alert_diagnostics,
-                                            args=(
-                                                self.config.get_capture_dir(),
-                                                thumbnail_config.copy(),
-                                                config.copy(),
-                                                window_image.copy(),
-                                                region,
-                                                self._prev_window_images.get(thumbnail_id),
-                                                self.config.get_canny_low(),
-                                                self.config.get_canny_high(),
-                                                self.config.get_edge_binarize(),
-                                            ),
-                                            daemon=True,
-                                        ).start()
-
-                                    # Alert history
-                                    self.config.add_alert_history({
-                                        "timestamp": datetime.now().isoformat(),
-                                        "thumbnail_id": thumbnail_id,
-                                        "region_id": region_id,
-                                        "window_title": thumbnail_config.get("window_title", "Unknown"),
-                                        "region_name": config.get("name", "Region"),
-                                        "status": "alert"
-                                    })
-
-                                    # Event log
-                                    if self.event_logger:
-                                        self.event_logger.log(
-                                            "alert", "region_alert", "engine",
-                                            window_id=thumbnail_id,
-                                            window_name=thumbnail_config.get("window_title", ""),
-                                            region_id=region_id,
-                                            region_name=config.get("name", ""),
-                                            previous_state="ok",
-                                            new_state="alert",
-                                            capture_file=_capture_path,
-                                        )
-
-                                    self.plugin_hooks.emit(
-                                        "alert",
-                                        thumbnail_id=thumbnail_id,
-                                        region_id=region_id,
-                                        region_name=config.get("name", "")
-                                    )
-                                    self._diag_alert_count += 1
-                                    self.on_alert(thumbnail_id, region_id, config.get("name", ""))
-
-                # Sleep to maintain refresh rate
+                thumbnails = self.run_cycle(scheduled=not free_running)
                 elapsed = (time.time() - start_time) * 1000  # Convert to ms
-                sleep_time = max(1, refresh_rate_ms - elapsed) / 1000  # Convert to seconds
+                # Detection runs on its own stage now; it is still part of a tick's work
+                self._govern_load(elapsed + self._detect_stage.take_busy_ms(), refresh_rate_ms)
 
                 if self.config.get_diagnostics_enabled():
-                    self._diag_loop_count += 1
-                    now = time.time()
-                    if (now - self._diag_last_report_ts) >= 10.0:
-                        logger.info(
-                            "[ENGINE DIAG] loops=%s elapsed_ms=%.2f capture_ms=%.2f render_ms=%.2f monitor_ms=%.2f changes=%s alerts=%s thumbnails=%s",
-                            self._diag_loop_count,
-                            elapsed,
-                            self._diag_capture_ms,
-                            self._diag_render_ms,
-                            self._diag_monitor_ms,
-                            self._diag_change_count,
-                            self._diag_alert_count,
-                            len(thumbnails),
-                        )
-                        if elapsed > (refresh_rate_ms * 1.5):
-                            logger.warning(
-                                "[ENGINE DIAG] loop overrun: elapsed_ms=%.2f refresh_rate_ms=%s",
-                                elapsed,
-                                refresh_rate_ms,
-                            )
-                        self._diag_last_report_ts = now
-                        self._diag_loop_count = 0
-                        self._diag_capture_ms = 0.0
-                        self._diag_render_ms = 0.0
-                        self._diag_monitor_ms = 0.0
-                        self._diag_alert_count = 0
-                        self._diag_change_count = 0
-
-                time.sleep(sleep_time)
-            
+                    self._report_loop_diagnostics(elapsed, refresh_rate_ms, thumbnails)
+
+                if free_running:
+                    time.sleep(0)  # yield only: run as fast as frames can be produced
+                else:
+                    self._wait_for_next_due()
+
             except Exception as e:
                 logger.error("Error in main loop: %s", e, exc_info=True)
                 time.sleep(0.1)
 
+    def _wait_for_next_due(self) -> None:
+        """Sleep until the next poll deadline (or a wake-up from add/stop).
+
+        The wait is capped so configuration edits made elsewhere (settings
+        dialog, MCP) are picked up by the next schedule sync.
+        """
+        next_due = self.poll_scheduler.next_due()
+        timeout = _SCHEDULE_RESYNC_S
+        if next_due is not None:
+            timeout = min(timeout, max(0.0, next_due - time.monotonic()))
+        if self._wake_event.wait(timeout):
+            self._wake_event.clear()
+
+    def _report_loop_diagnostics(self, elapsed: float, refresh_rate_ms: int,
+                                 thumbnails: List[Dict]) -> None:
+        """Accumulate loop counters and log an [ENGINE DIAG] line every 10s."""
+        if thumbnails:
+            with self._diag_lock:
+                self._diag_loop_count += 1
+        now = time.time()
+        if (now - self._diag_last_report_ts) < 10.0:
+            return
+        with self._diag_lock:
+            counters = (self._diag_loop_count, self._diag_capture_ms, self._diag_render_ms,
+                        self._diag_monitor_ms, self._diag_change_count, self._diag_alert_count)
+            self._diag_loop_count = 0
+            self._diag_capture_ms = 0.0
+            self._diag_render_ms = 0.0
+            self._diag_monitor_ms = 0.0
+            self._diag_alert_count = 0
+            self._diag_change_count = 0
+        loops, capture_ms, render_ms, monitor_ms, changes, alert_count = counters
+        self._diag_last_report_ts = now
+        poll = self.poll_scheduler.stats()
+        detect, dispatch = self._detect_stage.stats(), self._dispatch_stage.stats()
+        alerts = self.alert_dispatcher.stats()
+        artifacts = self.artifact_writer.stats()
+        logger.info(
+            "[ENGINE DIAG] loops=%s elapsed_ms=%.2f capture_ms=%.2f render_ms=%.2f monitor_ms=%.2f "
+            "changes=%s alerts=%s thumbnails=%s late_mean_ms=%.2f late_max_ms=%.2f skipped=%s "
+            "detect_q=%s/%s dispatch_q=%s/%s alert_q=%s/%s alert_lag_max_ms=%.2f "
+            "coalesced=%s dropped=%s artifacts_q=%s/%s artifacts_written=%s artifacts_dropped=%s",
+            loops,
+            elapsed,
+            capture_ms,
+            render_ms,
+            monitor_ms,
+            changes,
+            alert_count,
+            len(thumbnails),
+            poll["late_mean_ms"],
+            poll["late_max_ms"],
+            poll["skipped"],
+            detect["depth"], detect["max_depth"],
+            dispatch["depth"], dispatch["max_depth"],
+            alerts["depth"], alerts["max_depth"], alerts["lag_max_ms"],
+            detect["coalesced"] + dispatch["coalesced"],
+            detect["dropped"] + dispatch["dropped"] + alerts["dropped"],
+            artifacts["depth"], artifacts["max_depth"], artifacts["written"],
+            artifacts["dropped"] + artifacts["merged"],
+        )
+        if elapsed > (refresh_rate_ms * 1.5):
+            logger.warning(
+                "[ENGINE DIAG] loop overrun: elapsed_ms=%.2f refresh_rate_ms=%s load_level=%s",
+                elapsed,
+                refresh_rate_ms,
+                self.load_governor.level_name,
+            )
+
+    # ── load governor ────────────────────────────────────────────────
+
+    def _govern_load(self, elapsed_ms: float, budget_ms: float) -> Optional[GovernorStep]:
+        """Feed one tick to the load governor and apply any level change."""
+        if self.config.get_load_governor():
+            step = self.load_governor.observe(elapsed_ms, budget_ms)
+        else:
+            step = self.load_governor.reset()
+        if step is not None:
+            self._apply_load_level(step)
+        return step
+
+    def _apply_load_level(self, step: GovernorStep) -> None:
+        """Switch degradations on/off for the governor's new level and log the step."""
+        level = step.new_level
+        self.monitoring_engine.set_scale_reduction(1 if level >= LEVEL_REDUCED_SCALE else 0)
+        if level < LEVEL_SHED_LOW_PRIORITY:
+            self._shed_skipped.clear()
+        if level < LEVEL_DEFER_DIAGNOSTICS:
+            self._flush_deferred_diagnostics()
+
+        name = LEVEL_NAMES[level]
+        if step.degraded:
+            logger.warning("Load governor: degrading to %s (tick %.1fms, budget %.0fms)",
+                           name, step.tick_ms, step.budget_ms)
+        else:
+            logger.info("Load governor: restoring to %s", name)
+        if self.event_logger:
+            self.event_logger.log(
+                "monitoring", "load_degraded" if step.degraded else "load_restored", "engine",
+                level=level, level_name=name, previous_level=LEVEL_NAMES[step.old_level],
+                tick_ms=round(step.tick_ms, 2), budget_ms=round(step.budget_ms, 2),
+            )
+
+    def load_status(self) -> Dict:
+        """Load governor level, counters and recent steps (MCP, diagnostics)."""
+        return {
+            **self.load_governor.stats(),
+            "enabled": self.config.get_load_governor(),
+            "deferred_diagnostics": len(self._deferred_diagnostics),
+            "dropped_diagnostics": self._diagnostics_dropped,
+        }
+
+    def _shed_low_priority(self, thumbnail_config: Dict,
+                           region_ids: Optional[Set[str]]) -> Optional[Set[str]]:
+        """Skip every other due run of low-priority regions while shedding load."""
+        if self.load_governor.level < LEVEL_SHED_LOW_PRIORITY:
+            return region_ids
+        all_ids = {r["id"] for r in thumbnail_config.get("monitored_regions", []) if r.get("id")}
+        run_ids = all_ids if region_ids is None else set(region_ids)
+        skip = set()
+        for region in thumbnail_config.get("monitored_regions", []):
+            region_id = region.get("id")
+            if region.get("priority") != PRIORITY_LOW or region_id not in run_ids:
+                continue
+            if region_id in self._shed_skipped:
+                self._shed_skipped.discard(region_id)  # skipped last time: runs now
+            else:
+                self._shed_skipped.add(region_id)
+                skip.add(region_id)
+        return run_ids - skip if skip else region_ids
+
+    def _save_diagnostics(self, thumbnail_config: Dict, region_config: Dict,
+                          window_image: Image.Image, region,
+                          prev_window_image: Optional[Image.Image] = None) -> None:
+        """Write alert diagnostics on a background thread, or queue them under load."""
+        self._write_diagnostics(self._diagnostics_args(
+            thumbnail_config, region_config, window_image, region, prev_window_image))
+
+    def _diagnostics_args(self, thumbnail_config: Dict, region_config: Dict,
+                          window_image: Image.Image, region,
+                          prev_window_image: Optional[Image.Image] = None,
+                          event_id: Optional[str] = None) -> tuple:
+        """Snapshot everything ``save_alert_diagnostics`` needs for one alert.
+
+        With an *event_id* and the capture store on, the images go into
+        the store under that id.
+        """
+        store = self.capture_store if event_id else None
+        return (
+            self.config.get_capture_dir(),
+            thumbnail_config.copy(),
+            region_config.copy(),
+            window_image.copy(),
+            _AlertImages(region.last_alert_prev_image, region.last_alert_curr_image),
+            prev_window_image,
+            self.config.get_canny_low(),
+            self.config.get_canny_high(),
+            self.config.get_edge_binarize(),
+            self.config.get_capture_png_compress_level(),
+            store,
+            event_id if store is not None else None,
+        )
+
+    def _write_diagnostics(self, args: tuple) -> None:
+        """Hand diagnostics to the artifact writer, or hold them back under load."""
+        if self.load_governor.level >= LEVEL_DEFER_DIAGNOSTICS:
+            if len(self._deferred_diagnostics) == self._deferred_diagnostics.maxlen:
+                self._diagnostics_dropped += 1
+            self._deferred_diagnostics.append(args)
+            return
+        # One pending diagnostics set per region: a newer alert replaces it
+        self.artifact_writer.submit("diagnostics", lambda: save_alert_diagnostics(*args),
+                                    key=args[2].get("id"))
+
+    def _flush_deferred_diagnostics(self) -> None:
+        """Hand diagnostics held back under load to the artifact writer."""
+        if not self._deferred_diagnostics:
+            return
+        logger.info("Writing %d deferred alert diagnostics", len(self._deferred_diagnostics))
+        while self._deferred_diagnostics:
+            self._write_diagnostics(self._deferred_diagnostics.popleft())
+
+    def _apply_refresh_rate(self) -> int:
+        """Return the configured refresh rate, resizing the frame cache when it changes."""
+        refresh_rate_ms = self.config.get_refresh_rate()
+        if refresh_rate_ms != self._last_refresh_rate_ms:
+            self.cache_manager.lifetime = max(0.01, (refresh_rate_ms - 10) / 1000.0)
+            self.cache_manager.invalidate_all()
+            self._last_refresh_rate_ms = refresh_rate_ms
+            logger.info(
+                "Updated refresh rate to %sms (cache lifetime=%.3fs)",
+                refresh_rate_ms,
+                self.cache_manager.lifetime,
+            )
+        return refresh_rate_ms
+
+    def run_cycle(self, scheduled: bool = False) -> List[Dict]:
+        """Run one capture → detect → alert pass.
+
+        Headless tools and tests call it directly to step the engine
+        deterministically over every thumbnail and region.  The engine loop
+        passes ``scheduled=True``: only windows and regions whose poll
+        deadline has passed are processed, and frames are always fresh.
+
+        Returns:
+            The thumbnail configs processed this cycle
+        """
+        tick_start = time.monotonic()
+        # Get snapshot of all thumbnails (copy to avoid mutation during iteration)
+        with self.lock:
+            thumbnails = list(self.config.get_all_thumbnails())
+
+        # Pick up pool size changes from settings (no-op when unchanged);
+        # the detection pool is resized by the detect stage itself
+        self.capture_scheduler.set_workers(self.config.get_capture_workers())
+
+        # Fallback foreground sync (event hooks can occasionally miss transitions).
+        now = time.time()
+        if (now - self._last_foreground_sync_ts) >= 0.25:
+            foreground_hwnd = self.capture_source.get_foreground_window()
+            if foreground_hwnd:
+                self._update_overlay_active_by_foreground_source(thumbnails, foreground_hwnd)
+            self._last_foreground_sync_ts = now
+
+        all_thumbnails = thumbnails
+        self.capture_scheduler.retain({t["id"]: t.get("window_hwnd") for t in thumbnails
+                                       if t.get("enabled", True)})
+        due_regions: Optional[Dict[str, Set[str]]] = None
+        if scheduled:
+            thumbnails, due_regions = self._pop_due_work(thumbnails, tick_start)
+
+        targets = []
+        for thumbnail_config in thumbnails:
+            window_hwnd = self._prepare_thumbnail(thumbnail_config)
+            if not window_hwnd:
+                continue
+            if due_regions is not None and not due_regions.get(thumbnail_config["id"]) \
+                    and self._recorder is None:
+                continue  # only the window check was due; no region needs a frame
+            targets.append((thumbnail_config, window_hwnd))
+
+        captured = self._capture_thumbnails(targets, tick_start, use_cache=not scheduled)
+        for thumbnail_config, window_hwnd, window_image in captured:
+            region_ids = None
+            if due_regions is not None:
+                region_ids = self._regions_to_run(thumbnail_config,
+                                                  due_regions.get(thumbnail_config["id"], set()))
+            region_ids = self._shed_low_priority(thumbnail_config, region_ids)
+            self._monitor_thumbnail(thumbnail_config, window_hwnd, window_image, region_ids)
+
+        if scheduled and captured:
+            # Apply state-driven interval changes now, so a region that just
+            # changed is back at full rate for its very next deadline.
+            self.poll_scheduler.sync(self._poll_jobs(all_thumbnails))
+        return thumbnails
+
+    # ── poll scheduling ──────────────────────────────────────────────
+
+    def _window_poll_interval_ms(self, thumbnail_config: Dict) -> int:
+        """Poll interval of a window (default: the global refresh rate)."""
+        return int(thumbnail_config.get("poll_interval_ms") or self.config.get_refresh_rate())
+
+    def _poll_jobs(self, thumbnails: List[Dict]) -> Dict[tuple, Tuple[float, float]]:
+        """Scheduler jobs (key → (interval_s, min_interval_s)) for the thumbnails.
+
+        Keys are ``("window", thumbnail_id)`` and
+        ``("region", thumbnail_id, region_id)``.  A region without its own
+        interval polls with its window; a region's minimum interval
+        defaults to its window's.
+
+        With adaptive polling (global setting, or ``adaptive_polling`` on
+        the region) intervals follow the region's state: an OK region
+        that has seen no change for ``adaptive_stable_seconds`` doubles its
+        interval for every such period, up to ``adaptive_max_interval_ms``;
+        an ALERT/WARNING region polls at its minimum interval (or its
+        normal one); any detected change restores the normal interval.
+        """
+        jobs: Dict[tuple, Tuple[float, float]] = {}
+        adaptive = self.config.get_adaptive_polling()
+        now = time.time()  # state machine clock
+        for thumbnail_config in thumbnails:
+            if not thumbnail_config.get("enabled", True):
+                continue
+            thumbnail_id = thumbnail_config["id"]
+            window_ms = self._window_poll_interval_ms(thumbnail_config)
+            window_min_ms = thumbnail_config.get("min_interval_ms") or 0
+            jobs[("window", thumbnail_id)] = (window_ms / 1000.0, 0.0)
+            for region in thumbnail_config.get("monitored_regions", []):
+                region_id = region.get("id")
+                if not region_id:
+                    continue
+                interval_ms = region.get("poll_interval_ms") or window_ms
+                min_ms = region.get("min_interval_ms") or window_min_ms
+                region_adaptive = region.get("adaptive_polling")
+                if adaptive if region_adaptive is None else region_adaptive:
+                    interval_ms = self._adaptive_interval_ms(region_id, interval_ms, min_ms, now)
+                jobs[("region", thumbnail_id, region_id)] = (interval_ms / 1000.0, min_ms / 1000.0)
+        return jobs
+
+    def _adaptive_interval_ms(self, region_id: str, interval_ms: float,
+                              min_ms: float, now: float) -> float:
+        monitor = self.monitoring_engine.get_monitor(region_id)
+        if monitor is None:
+            return interval_ms
+        if monitor.state in (STATE_ALERT, STATE_WARNING):
+            return min_ms or interval_ms
+        if monitor.stable_since is None:
+            return interval_ms
+        return adaptive_interval(
+            interval_ms,
+            (now - monitor.stable_since) * 1000.0,
+            self.config.get_adaptive_stable_seconds() * 1000.0,
+            self.config.get_adaptive_max_interval_ms(),
+        )
+
+    def _pop_due_work(self, thumbnails: List[Dict],
+                      now: float) -> Tuple[List[Dict], Dict[str, Set[str]]]:
+        """Sync the poll schedule with the config and pop everything due at *now*.
+
+        Returns:
+            (thumbnails with a due window or region,
+             thumbnail_id → ids of its due regions)
+        """
+        self.poll_scheduler.sync(self._poll_jobs(thumbnails), now=now)
+        due_windows: Set[str] = set()
+        due_regions: Dict[str, Set[str]] = {}
+        for job in self.poll_scheduler.pop_due(now):
+            thumbnail_id = job.key[1]
+            due_windows.add(thumbnail_id)
+            if job.key[0] == "region":
+                due_regions.setdefault(thumbnail_id, set()).add(job.key[2])
+        return [t for t in thumbnails if t["id"] in due_windows], due_regions
+
+    def _regions_to_run(self, thumbnail_config: Dict, due_ids: Set[str]) -> Set[str]:
+        """Due regions plus those allowed to run early on this frame (min interval)."""
+        region_ids = set(due_ids)
+        if not region_ids:
+            return region_ids
+        thumbnail_id = thumbnail_config["id"]
+        now = time.monotonic()
+        for region in thumbnail_config.get("monitored_regions", []):
+            region_id = region.get("id")
+            if region_id and region_id not in region_ids \
+                    and self.poll_scheduler.run_early(("region", thumbnail_id, region_id), now):
+                region_ids.add(region_id)
+        return region_ids
+
+    def poll_lateness(self) -> Dict[str, Dict]:
+        """Per-window/region poll statistics keyed ``window:<id>`` / ``region:<id>``."""
+        return {f"{key[0]}:{key[-1]}": stats for key, stats in self.poll_scheduler.lateness().items()}
+
+    # ── capture ──────────────────────────────────────────────────────
+
+    def _capture_deadline_s(self, thumbnail_config: Dict) -> float:
+        """Seconds after the tick start by which a window's frame is wanted."""
+        deadline_ms = thumbnail_config.get("capture_deadline_ms") or self.config.get_capture_deadline_ms()
+        if not deadline_ms:
+            deadline_ms = self._window_poll_interval_ms(thumbnail_config) * 0.8
+        return max(1, int(deadline_ms)) / 1000.0
+
+    def _capture_thumbnails(self, targets: List[Tuple[Dict, int]], tick_start: float,
+                            use_cache: bool = True) -> List[Tuple[Dict, int, Image.Image]]:
+        """Capture the given (thumbnail config, hwnd) pairs for this tick.
+
+        Cached frames are used as is; the rest are captured concurrently by
+        the capture scheduler.  Windows whose capture misses its deadline
+        are left out and picked up by a later tick.
+
+        Returns:
+            (thumbnail_config, hwnd, image) for each window with a frame, in
+            *targets* order
+        """
+        capture_start = time.perf_counter()
+        # Simulated sources advance a frame per capture, so never serve them from cache
+        free_running = self.capture_source.free_running
+        frames: Dict[str, Image.Image] = {}
+        jobs = []
+        for thumbnail_config, window_hwnd in targets:
+            thumbnail_id = thumbnail_config["id"]
+            cached_image = None
+            if use_cache and not free_running:
+                cached_image = self.cache_manager.get(window_hwnd)
+            if cached_image is not None:
+                logger.debug(f"[{thumbnail_id}] Using cached image: {cached_image.size}")
+                frames[thumbnail_id] = cached_image
+            else:
+                jobs.append(CaptureJob(thumbnail_id, window_hwnd,
+                                       tick_start + self._capture_deadline_s(thumbnail_config)))
+
+        configs = {thumbnail_config["id"]: thumbnail_config for thumbnail_config, _ in targets}
+        for result in self.capture_scheduler.collect(jobs):
+            if result.image is None:
+                # Capture failed but DWM overlay is independent — don't
+                # hide the overlay, just skip region monitoring this cycle.
+                logger.debug(f"[{result.key}] CAPTURE FAILED (skipping regions): hwnd={result.hwnd}")
+                continue
+            if not free_running:
+                self.cache_manager.set(result.hwnd, result.image)
+            logger.debug(f"[{result.key}] CAPTURED: size {result.image.size} "
+                         f"in {result.latency_ms:.1f}ms{' (carried over)' if result.carried_over else ''}")
+            if self._recorder is not None:
+                self._record_frame(configs[result.key], result.image)
+            frames[result.key] = result.image
+        with self._diag_lock:
+            self._diag_capture_ms += (time.perf_counter() - capture_start) * 1000.0
+
+        return [(thumbnail_config, window_hwnd, frames[thumbnail_config["id"]])
+                for thumbnail_config, window_hwnd in targets
+                if thumbnail_config["id"] in frames]
+
+    def _prepare_thumbnail(self, thumbnail_config: Dict) -> Optional[int]:
+        """Validate (or reconnect) one thumbnail's window.
+
+        Returns:
+            The window handle to capture, or None to skip the thumbnail
+        """
+        if not thumbnail_config.get("enabled", True):
+            return None
+
+        thumbnail_id = thumbnail_config["id"]
+        window_hwnd = thumbnail_config.get("window_hwnd")
+        window_title, expected_class, expected_size, expected_monitor = \
+            self._extract_window_identity(thumbnail_config)
+
+        # Validate window: both existence AND identity
+        window_ok = self._validate_thumbnail_window(thumbnail_config, window_hwnd)
+
+        if window_ok:
+            was_disconnected = not self._thumbnail_connected.get(thumbnail_id, False)
+            self._reconnect_attempted_once.discard(thumbnail_id)
+            self._window_lost_notified.discard(thumbnail_id)
+            self._thumbnail_connected[thumbnail_id] = True
+            # If just transitioned from disconnected, show the overlay
+            if was_disconnected:
+                self.renderer.set_thumbnail_availability(thumbnail_id, True)
+                if self.config.get_show_overlay_on_connect():
+                    self.renderer.set_thumbnail_user_visibility(thumbnail_id, True)
+
+        if not window_ok:
+            self._thumbnail_connected[thumbnail_id] = False
+            if thumbnail_id in self._reconnect_attempted_once:
+                self.renderer.set_thumbnail_availability(
+                    thumbnail_id,
+                    False,
+                    self.config.get_show_overlay_when_unavailable(),
+                )
+                if thumbnail_id not in self._window_lost_notified:
+                    self.plugin_hooks.emit("window.lost", thumbnail_id=thumbnail_id, title=window_title)
+                    self.on_window_lost(thumbnail_id, window_title)
+                    self._window_lost_notified.add(thumbnail_id)
+                    if self.event_logger:
+                        self.event_logger.log("window", "window_lost", "engine",
+                                              window_id=thumbnail_id,
+                                              window_name=window_title)
+                return None
+
+            # Try to reconnect to the correct window
+            new_window = self._try_reconnect(
+                thumbnail_id, window_title,
+                expected_class, expected_size, expected_monitor
+            )
+            if new_window:
+                window_hwnd = new_window['hwnd']
+                self._mark_connected(thumbnail_id, window_hwnd, update_config=False)
+            else:
+                self._reconnect_attempted_once.add(thumbnail_id)
+                self.renderer.set_thumbnail_availability(
+                    thumbnail_id,
+                    False,
+                    self.config.get_show_overlay_when_unavailable(),
+                )
+                if thumbnail_id not in self._window_lost_notified:
+                    self.plugin_hooks.emit("window.lost", thumbnail_id=thumbnail_id, title=window_title)
+                    self.on_window_lost(thumbnail_id, window_title)
+                    self._window_lost_notified.add(thumbnail_id)
+                    if self.event_logger:
+                        self.event_logger.log("window", "window_lost", "engine",
+                                              window_id=thumbnail_id,
+                                              window_name=window_title)
+                return None
+
+        return window_hwnd
+
+    def _monitor_thumbnail(self, thumbnail_config: Dict, window_hwnd: int,
+                           window_image: Image.Image,
+                           region_ids: Optional[Set[str]] = None) -> None:
+        """Hand a captured frame to the detect stage.
+
+        *region_ids* limits monitoring to those regions (None = all).
+        Frames of free-running sources (synthetic, replay) are not real
+        time, so they are detected inline rather than risk being coalesced.
+        """
+        # DWM handles thumbnail display; no image sent to renderer.
+        # Ensure DWM link is established for this hwnd.
+        self.renderer.set_source_hwnd(thumbnail_config["id"], window_hwnd)
+        work = _FrameWork(thumbnail_config, window_hwnd, window_image, region_ids)
+        if self.capture_source.free_running:
+            self._detect_frame(work)
+        else:
+            self._detect_stage.submit(work)
+
+    # ── pipeline stages ──────────────────────────────────────────────
+
+    def _detect_frame(self, work: "_FrameWork") -> None:
+        """Detect stage: run region monitoring on a frame, queue the outcomes."""
+        if self.paused:
+            return
+        thumbnail_config = work.thumbnail_config
+        thumbnail_id = thumbnail_config["id"]
+        # Pick up pool size changes from settings (no-op when unchanged)
+        self.monitoring_engine.set_workers(self.config.get_detection_workers())
+        monitor_start = time.perf_counter()
+        region_results = self.monitoring_engine.update_regions(
+            thumbnail_id, work.image, self.config.get_alert_hold_seconds(),
+            region_ids=work.region_ids,
+        )
+        with self._diag_lock:
+            self._diag_monitor_ms += (time.perf_counter() - monitor_start) * 1000.0
+        prev_window_image = self._prev_window_images.get(thumbnail_id)
+        self._prev_window_images[thumbnail_id] = work.image
+
+        now = time.time()
+        for region_id, state, should_play_sound in region_results:
+            if state != self._prev_region_state.get(region_id):
+                self._prev_region_state[region_id] = state
+                self.alert_rollup.record_state(thumbnail_id, region_id, state, now)
+                self._dispatch_stage.submit(_RegionEvent(thumbnail_id, region_id, state))
+            if should_play_sound:
+                self._rollup_alert(thumbnail_config, region_id, now)
+                record = self._alert_record(thumbnail_config, region_id, work.image, prev_window_image)
+                if record is not None:
+                    self.alert_dispatcher.submit(record)
+
+    def _dispatch_region_event(self, event: "_RegionEvent") -> None:
+        """Dispatch stage: state change callbacks."""
+        with self._diag_lock:
+            self._diag_change_count += 1
+        self.plugin_hooks.emit("region.changed", thumbnail_id=event.thumbnail_id,
+                               region_id=event.region_id)
+        self.on_region_change(event.thumbnail_id, event.region_id, event.state)
+
+    def _rollup_alert(self, thumbnail_config: Dict, region_id: str, now: float) -> None:
+        """Count an alert in the rollup with the detector metrics behind it."""
+        region = self.monitoring_engine.get_monitor(region_id)
+        if not region:
+            return
+        self.alert_rollup.record_alert(
+            thumbnail_config["id"], region_id, now,
+            window_name=thumbnail_config.get("window_title", ""),
+            region_name=region.config.get("name", ""),
+            detect_info=region.detector.last_detect_info,
+        )
+
+    def _alert_record(self, thumbnail_config: Dict, region_id: str,
+                      window_image: Image.Image,
+                      prev_window_image: Optional[Image.Image]) -> Optional[AlertRecord]:
+        """Build the compact record of an alert raised by detection."""
+        region = self.monitoring_engine.get_monitor(region_id)
+        if not region:
+            return None
+        thumbnail_id = thumbnail_config["id"]
+        if self._recorder is not None:
+            self._record_event("alert", thumbnail_id, region_id)
+        config = region.config
+        window_title = thumbnail_config.get("window_title", "Unknown")
+        region_name = config.get("name", "Region")
+        tts_template = config.get("tts_message", "") or self.config.get_default_tts_message()
+
+        # Only what delivery needs travels with the record: the region crop,
+        # not the whole window, unless diagnostics are on
+        region_image = None
+        if self.config.get_capture_on_alert():
+            try:
+                region_image = ImageProcessor.crop_region(window_image, tuple(config.get("rect", (0, 0, 0, 0))))
+            except Exception as error:
+                logger.warning(f"Failed to crop alert snapshot: {error}")
+        event_id = str(uuid.uuid4())
+        diagnostics = None
+        if self.config.get_save_alert_diagnostics():
+            diagnostics = self._diagnostics_args(thumbnail_config, config, window_image,
+                                                 region, prev_window_image, event_id)
+
+        return AlertRecord(
+            seq=self.alert_dispatcher.next_seq(),
+            event_id=event_id,
+            timestamp=time.time(),
+            thumbnail_id=thumbnail_id,
+            window_title=window_title,
+            region_id=region_id,
+            region_name=region_name,
+            sound_file=config.get("sound_file", ""),
+            tts_message=self._render_tts_message(tts_template, window_title, region_name),
+            region_image=region_image,
+            diagnostics=diagnostics,
+        )
+
+    def _deliver_alert(self, record: AlertRecord) -> None:
+        """Alert dispatcher callback: everything an alert triggers after playback."""
+        # Optional: capture screenshot on alert
+        _capture_path = None
+        if record.region_image is not None:
+            store = self.capture_store
+            if store is not None:
+                _capture_path = store.put(
+                    record.event_id, KIND_SNAPSHOT, record.region_image,
+                    window_id=record.thumbnail_id, region_id=record.region_id,
+                    compress_level=self.config.get_capture_png_compress_level(),
+                    timestamp=record.timestamp,
+                )
+            else:
+                _capture_path = self._capture_region_snapshot(
+                    record.window_title, record.region_name, record.region_image,
+                    status="alert", timestamp=record.timestamp,
+                )
+
+        # Optional: save diagnostic images (background thread to avoid blocking loop)
+        if record.diagnostics is not None:
+            self._write_diagnostics(record.diagnostics)
+
+        # Alert history
+        self.config.add_alert_history({
+            "timestamp": datetime.fromtimestamp(record.timestamp).isoformat(),
+            "thumbnail_id": record.thumbnail_id,
+            "region_id": record.region_id,
+            "window_title": record.window_title,
+            "region_name": record.region_name,
+            "status": "alert"
+        })
+
+        # Event log
+        if self.event_logger:
+            # Shed under an alert backlog: no sound, TTS, snapshot or diagnostics
+            shed = {"media_shed": True} if record.media_shed else {}
+            self.event_logger.log(
+                "alert", "region_alert", "engine",
+                event_id=record.event_id,
+                window_id=record.thumbnail_id,
+                window_name=record.window_title,
+                region_id=record.region_id,
+                region_name=record.region_name,
+                previous_state="ok",
+                new_state="alert",
+                capture_file=_capture_path,
+                **shed,
+            )
+
+        self.plugin_hooks.emit(
+            "alert",
+            thumbnail_id=record.thumbnail_id,
+            region_id=record.region_id,
+            region_name=record.region_name
+        )
+        with self._diag_lock:
+            self._diag_alert_count += 1
+        self.on_alert(record.thumbnail_id, record.region_id, record.region_name)
+
+    @property
+    def capture_store(self) -> Optional[CaptureStore]:
+        """Capture store under the current capture directory (None when off).
+
+        Reopened when the capture directory setting changes.
+        """
+        if not self.config.get_capture_store():
+            return None
+        root = os.path.join(self.config.get_capture_dir(), STORE_DIRNAME)
+        with self._capture_store_lock:
+            store = self._capture_store
+            if store is None or store.root != root:
+                if store is not None:
+                    store.close()
+                store = self._capture_store = CaptureStore(root, writer=self.artifact_writer)
+            return store
+
+    def _retention_policy(self) -> RetentionPolicy:
+        return RetentionPolicy(
+            max_bytes=self.config.get_capture_max_mb() * 1024 * 1024,
+            max_age_s=self.config.get_capture_max_age_days() * 86400.0,
+            max_per_region=self.config.get_capture_max_per_region(),
+        )
+
+    def capture_usage(self) -> Dict:
+        """Capture store usage against the retention quotas (MCP)."""
+        store = self.capture_store
+        return {
+            "store_enabled": store is not None,
+            "usage": store.usage() if store is not None else None,
+            "quotas": self._retention_policy().as_dict(),
+            "quotas_enforced": store is not None,
+            "retention": self.retention.stats(),
+        }
+
+    def pipeline_stats(self) -> Dict[str, Dict]:
+        """Queue depth and counters of each pipeline stage."""
+        stats = {stage.name: stage.stats() for stage in (self._detect_stage, self._dispatch_stage)}
+        stats["alerts"] = self.alert_dispatcher.stats()
+        stats["artifacts"] = self.artifact_writer.stats()
+        return stats
+
     def _update_overlay_active_by_foreground_source(self, thumbnails: List[Dict], foreground_hwnd: int) -> None:
         """Highlight overlay whose monitored source window is currently foreground."""
         try:
@@ -1282,24 +1981,26 @@ class ScreenAlertEngine:
             except Exception:
                 pass
 
-    def _capture_region_snapshot(self, thumbnail_config: Dict, region_config: Dict,
-                                 window_image: Image.Image, status: str = "alert") -> Optional[str]:
-        """Capture and persist region snapshot image. Returns the saved path or None."""
+    def _capture_region_snapshot(self, window_title: str, region_name: str,
+                                 region_img: Image.Image, status: str = "alert",
+                                 timestamp: Optional[float] = None) -> Optional[str]:
+        """Queue a region snapshot with the artifact writer.
+
+        Returns:
+            The path the snapshot is written to, or None
+        """
         try:
             capture_dir = self.config.get_capture_dir()
             os.makedirs(capture_dir, exist_ok=True)
 
-            window_title = thumbnail_config.get("window_title", "window")
-            region_name = region_config.get("name", "region")
-
             def safe(text: str) -> str:
                 text = re.sub(r'[^a-zA-Z0-9._-]+', '_', text or "")
                 return text[:64] or "item"
 
             pattern = self.config.get_capture_filename_format()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            when = datetime.now() if timestamp is None else datetime.fromtimestamp(timestamp)
             filename = pattern.format(
-                timestamp=timestamp,
+                timestamp=when.strftime("%Y%m%d_%H%M%S"),
                 window=safe(window_title),
                 region=safe(region_name),
                 status=safe(status),
@@ -1308,10 +2009,13 @@ class ScreenAlertEngine:
                 filename += ".png"
             output_path = os.path.join(capture_dir, filename)
 
-            rect = region_config.get("rect", (0, 0, 0, 0))
-            region_img = ImageProcessor.crop_region(window_image, tuple(rect))
-            region_img.save(output_path, format="PNG")
-            logger.info(f"Saved snapshot: {output_path}")
+            compress_level = self.config.get_capture_png_compress_level()
+
+            def _write() -> None:
+                save_png(region_img, output_path, compress_level)
+                logger.info(f"Saved snapshot: {output_path}")
+
+            self.artifact_writer.submit("snapshot", _write)
             return output_path
         except Exception as e:
             logger.warning(f"Failed to save snapshot: {e}")
@@ -2505,6 +2505,8 @@ class ScreenAlertMainWindow(WindowSlotMixin, EngineEventMixin, SettingsMixin):
         global_cfg = {
             "change_detection_method": self.config.get_change_detection_method(),
             "default_alert_threshold": self.config.get_default_alert_threshold(),
+            "ssim_window": self.config.get_ssim_window(),
+            "analysis_scale": self.config.get_analysis_scale(),
             "min_edge_fraction": self.config.get_min_edge_fraction(),
             "canny_low": self.config.get_canny_low(),
             "canny_high": self.config.get_canny_high(),
@@ -2513,6 +2515,9 @@ class ScreenAlertMainWindow(WindowSlotMixin, EngineEventMixin, SettingsMixin):
             "bg_var_threshold": self.config.get_bg_var_threshold(),
             "bg_min_fg_fraction": self.config.get_bg_min_fg_fraction(),
             "bg_warmup_frames": self.config.get_bg_warmup_frames(),
+            "cascade_gate": self.config.get_cascade_gate(),
+            "cascade_gate_threshold": self.config.get_cascade_gate_threshold(),
+            "cascade_confirm": self.config.get_cascade_confirm(),
         }
 
         def on_apply(updates: Dict) -> None:
@@ -2640,7 +2645,18 @@ class ScreenAlertMainWindow(WindowSlotMixin, EngineEventMixin, SettingsMixin):
         info = monitor.detector.last_detect_info
         if not info:
             return ""
-        method = monitor.detector_method
+        return self._format_detector_metrics(monitor.detector_method, info)
+
+    def _format_detector_metrics(self, method: str, info: Dict) -> str:
+        """Format one detector's last_detect_info for the region detail pane."""
+        if method == "cascade":
+            if info.get("stage") == "confirm":
+                confirm = self._format_detector_metrics(info.get("confirm_method", ""),
+                                                        info.get("confirm", {}))
+                return f"Confirm: {confirm}"
+            score = info.get("gate_score", 0)
+            thr = info.get("gate_threshold", 0)
+            return f"Gate ({info.get('gate', '')}): {score:.4f}  (opens above {thr})"
         if method in ("ssim", "phash"):
             sim = info.get("similarity", 0)
             thr = info.get("threshold", 0)
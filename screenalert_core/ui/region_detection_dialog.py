@@ -10,6 +10,9 @@ import logging
 from typing import Dict, Optional, Callable
 
 from screenalert_core.core.change_detectors import VALID_METHODS
+from screenalert_core.core.pyramid import AUTO_SCALE, normalize_analysis_scale
+from screenalert_core.core.ssim import SSIM_WINDOWS
+from screenalert_core.monitoring.region_monitor import PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +26,7 @@ _DROPDOWN_VALUES = [
     "pHash (Perceptual Hash)",
     "Edge Detection (Canny)",
     "Background Subtraction (MOG2)",
+    "Cascade (Gate + Confirm)",
 ]
 
 # Map display label -> config value
@@ -32,11 +36,31 @@ _LABEL_TO_METHOD = {
     "pHash (Perceptual Hash)": "phash",
     "Edge Detection (Canny)": "edge_only",
     "Background Subtraction (MOG2)": "background_subtraction",
+    "Cascade (Gate + Confirm)": "cascade",
 }
 
 # Reverse map
 _METHOD_TO_LABEL = {v: k for k, v in _LABEL_TO_METHOD.items()}
 
+# Analysis scale dropdown: label -> config value ("" clears the override)
+_SCALE_LABEL_TO_VALUE = {
+    "Default (Global Setting)": "",
+    "Full resolution": 1.0,
+    "1/2": 0.5,
+    "1/4": 0.25,
+    "1/8": 0.125,
+    "Auto (by region size)": AUTO_SCALE,
+}
+_SCALE_VALUE_TO_LABEL = {v: k for k, v in _SCALE_LABEL_TO_VALUE.items()}
+
+# Region priority dropdown: label -> config value
+_PRIORITY_LABEL_TO_VALUE = {
+    "Normal": PRIORITY_NORMAL,
+    "High (keep full quality under load)": PRIORITY_HIGH,
+    "Low (shed first under load)": PRIORITY_LOW,
+}
+_PRIORITY_VALUE_TO_LABEL = {v: k for k, v in _PRIORITY_LABEL_TO_VALUE.items()}
+
 
 class RegionDetectionDialog:
     """Dialog for editing detection method and parameters on a single region."""
@@ -51,7 +75,7 @@ class RegionDetectionDialog:
 
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(f"Detection Settings — {region_config.get('name', 'Region')}")
-        self.dialog.geometry("540x520")
+        self.dialog.geometry("540x580")
         self.dialog.transient(parent)
         self.dialog.grab_set()
 
@@ -79,6 +103,25 @@ class RegionDetectionDialog:
         combo.grid(row=0, column=1, sticky="w", padx=10)
         combo.bind("<<ComboboxSelected>>", lambda _: self._on_method_changed())
 
+        ttk.Label(method_frame, text="Analysis Scale:").grid(row=1, column=0, sticky="w", pady=(6, 0))
+        self.scale_var = tk.StringVar()
+        ttk.Combobox(
+            method_frame, textvariable=self.scale_var,
+            values=list(_SCALE_LABEL_TO_VALUE), state="readonly", width=32,
+            style="App.TCombobox",
+        ).grid(row=1, column=1, sticky="w", padx=10, pady=(6, 0))
+        ttk.Label(method_frame,
+                  text="Large regions can be analysed downscaled for speed with little loss of sensitivity.",
+                  foreground="gray", wraplength=460, justify="left").grid(row=2, column=0, columnspan=2, sticky="w", pady=(4, 0))
+
+        ttk.Label(method_frame, text="Priority:").grid(row=3, column=0, sticky="w", pady=(6, 0))
+        self.priority_var = tk.StringVar()
+        ttk.Combobox(
+            method_frame, textvariable=self.priority_var,
+            values=list(_PRIORITY_LABEL_TO_VALUE), state="readonly", width=32,
+            style="App.TCombobox",
+        ).grid(row=3, column=1, sticky="w", padx=10, pady=(6, 0))
+
         # SSIM / pHash params
         self.ssim_frame = ttk.LabelFrame(main, text="SSIM / pHash Parameters", padding=10)
         self.ssim_frame.pack(fill=tk.X, pady=(0, 8))
@@ -93,6 +136,14 @@ class RegionDetectionDialog:
                        "0.99 = very sensitive (tiny changes trigger). 0.90 = only major changes trigger.",
                   foreground="gray", wraplength=460, justify="left").grid(row=1, column=0, columnspan=3, sticky="w", pady=(4, 0))
 
+        ttk.Label(self.ssim_frame, text="SSIM Window:").grid(row=2, column=0, sticky="w", pady=(6, 0))
+        self.ssim_window_var = tk.StringVar(value="box")
+        ttk.Combobox(self.ssim_frame, textvariable=self.ssim_window_var,
+                     values=list(SSIM_WINDOWS), state="readonly", width=10,
+                     style="App.TCombobox").grid(row=2, column=1, sticky="w", padx=10, pady=(6, 0))
+        ttk.Label(self.ssim_frame, text="(SSIM only; gaussian = smoother, box = faster)",
+                  foreground="gray").grid(row=2, column=2, sticky="w", pady=(6, 0))
+
         # Edge params
         self.edge_frame = ttk.LabelFrame(main, text="Edge Detection Parameters", padding=10)
         self.edge_frame.pack(fill=tk.X, pady=(0, 8))
@@ -164,6 +215,36 @@ class RegionDetectionDialog:
                        "Best for scenes with a stable background where you want to detect new objects or movement.",
                   foreground="gray", wraplength=460, justify="left").grid(row=4, column=0, columnspan=3, sticky="w", pady=(4, 0))
 
+        # Cascade params
+        self.cascade_frame = ttk.LabelFrame(main, text="Cascade Parameters", padding=10)
+        self.cascade_frame.pack(fill=tk.X, pady=(0, 8))
+
+        ttk.Label(self.cascade_frame, text="Gate:").grid(row=0, column=0, sticky="w")
+        self.cascade_gate_var = tk.StringVar(value="mad")
+        ttk.Combobox(self.cascade_frame, textvariable=self.cascade_gate_var,
+                     values=["mad", "ahash", "dhash"], state="readonly", width=10,
+                     style="App.TCombobox").grid(row=0, column=1, sticky="w", padx=10)
+        ttk.Label(self.cascade_frame, text="(cheap check run every tick)",
+                  foreground="gray").grid(row=0, column=2, sticky="w")
+
+        ttk.Label(self.cascade_frame, text="Gate Threshold:").grid(row=1, column=0, sticky="w")
+        self.cascade_threshold_var = tk.DoubleVar(value=0.001)
+        ttk.Spinbox(self.cascade_frame, from_=0.0, to=0.5, increment=0.001, format="%.3f",
+                    textvariable=self.cascade_threshold_var, width=8).grid(row=1, column=1, sticky="w", padx=10)
+        ttk.Label(self.cascade_frame, text="(higher = confirm runs less often)",
+                  foreground="gray").grid(row=1, column=2, sticky="w")
+
+        ttk.Label(self.cascade_frame, text="Confirm With:").grid(row=2, column=0, sticky="w")
+        self.cascade_confirm_var = tk.StringVar(value="ssim")
+        ttk.Combobox(self.cascade_frame, textvariable=self.cascade_confirm_var,
+                     values=["ssim", "phash", "edge_only", "background_subtraction"],
+                     state="readonly", width=22,
+                     style="App.TCombobox").grid(row=2, column=1, columnspan=2, sticky="w", padx=10)
+        ttk.Label(self.cascade_frame,
+                  text="Runs a cheap hash / mean-difference check every tick and only runs the\n"
+                       "confirm detector (with this region's settings for it) when the gate fires.",
+                  foreground="gray", wraplength=460, justify="left").grid(row=3, column=0, columnspan=3, sticky="w", pady=(4, 0))
+
         # Buttons
         btn_frame = ttk.Frame(main)
         btn_frame.pack(fill=tk.X, pady=(8, 0))
@@ -194,9 +275,15 @@ class RegionDetectionDialog:
         label = _METHOD_TO_LABEL.get(method, _DROPDOWN_VALUES[0])
         self.method_var.set(label)
 
+        scale = rcfg.get("analysis_scale")
+        scale = normalize_analysis_scale(scale) if scale not in (None, "") else ""
+        self.scale_var.set(_SCALE_VALUE_TO_LABEL.get(scale, "Default (Global Setting)"))
+        self.priority_var.set(_PRIORITY_VALUE_TO_LABEL.get(rcfg.get("priority"), "Normal"))
+
         # SSIM / pHash
         self.threshold_var.set(rcfg.get("alert_threshold",
                                         gcfg.get("default_alert_threshold", 0.99)))
+        self.ssim_window_var.set(rcfg.get("ssim_window", gcfg.get("ssim_window", "box")))
 
         # Edge
         self.edge_fraction_var.set(round(
@@ -214,11 +301,21 @@ class RegionDetectionDialog:
         ))
         self.bg_warmup_var.set(rcfg.get("bg_warmup_frames", gcfg.get("bg_warmup_frames", 30)))
 
+        # Cascade
+        self.cascade_gate_var.set(rcfg.get("cascade_gate", gcfg.get("cascade_gate", "mad")))
+        self.cascade_threshold_var.set(rcfg.get("cascade_gate_threshold",
+                                                gcfg.get("cascade_gate_threshold", 0.001)))
+        self.cascade_confirm_var.set(rcfg.get("cascade_confirm", gcfg.get("cascade_confirm", "ssim")))
+
     def _collect_updates(self) -> Dict:
         """Gather detection settings from UI into a dict suitable for region config update."""
         updates: Dict = {}
         method = self._selected_method()
 
+        # Analysis scale is independent of the method override
+        updates["analysis_scale"] = _SCALE_LABEL_TO_VALUE.get(self.scale_var.get(), "")
+        updates["priority"] = _PRIORITY_LABEL_TO_VALUE.get(self.priority_var.get(), PRIORITY_NORMAL)
+
         if method == _USE_GLOBAL:
             # Clear region override — detector will fall back to global
             updates["detection_method"] = ""
@@ -227,6 +324,8 @@ class RegionDetectionDialog:
 
             if method in ("ssim", "phash"):
                 updates["alert_threshold"] = self.threshold_var.get()
+                if method == "ssim":
+                    updates["ssim_window"] = self.ssim_window_var.get()
             elif method == "edge_only":
                 updates["min_edge_fraction"] = self.edge_fraction_var.get() / 100.0
                 updates["canny_low"] = self.canny_low_var.get()
@@ -237,6 +336,10 @@ class RegionDetectionDialog:
                 updates["bg_var_threshold"] = self.bg_var_var.get()
                 updates["bg_min_fg_fraction"] = self.bg_fg_var.get() / 100.0
                 updates["bg_warmup_frames"] = self.bg_warmup_var.get()
+            elif method == "cascade":
+                updates["cascade_gate"] = self.cascade_gate_var.get()
+                updates["cascade_gate_threshold"] = self.cascade_threshold_var.get()
+                updates["cascade_confirm"] = self.cascade_confirm_var.get()
 
         return updates
 
@@ -249,10 +352,12 @@ class RegionDetectionDialog:
         # Disable param fields when using global default
         is_global = (method == _USE_GLOBAL)
         state = "disabled" if is_global else "normal"
-        for frame in (self.ssim_frame, self.edge_frame, self.bg_frame):
+        for frame in (self.ssim_frame, self.edge_frame, self.bg_frame, self.cascade_frame):
             for w in frame.winfo_children():
                 try:
-                    if isinstance(w, (ttk.Spinbox, ttk.Checkbutton)):
+                    if isinstance(w, ttk.Combobox):
+                        w.configure(state="disabled" if is_global else "readonly")
+                    elif isinstance(w, (ttk.Spinbox, ttk.Checkbutton)):
                         w.configure(state=state)
                 except tk.TclError:
                     pass
@@ -265,6 +370,7 @@ class RegionDetectionDialog:
         self.ssim_frame.pack_forget()
         self.edge_frame.pack_forget()
         self.bg_frame.pack_forget()
+        self.cascade_frame.pack_forget()
 
         # When global is selected, show the frame matching the global method
         # (disabled) so the user can see what they'll get.
@@ -278,6 +384,8 @@ class RegionDetectionDialog:
             self.edge_frame.pack(fill=tk.X, pady=(0, 8))
         elif method == "background_subtraction":
             self.bg_frame.pack(fill=tk.X, pady=(0, 8))
+        elif method == "cascade":
+            self.cascade_frame.pack(fill=tk.X, pady=(0, 8))
 
     # ── Actions ───────────────────────────────────────────────────────
 
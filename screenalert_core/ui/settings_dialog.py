@@ -40,6 +40,45 @@ _CATEGORIES: List[Tuple[str, str, Optional[str], List[dict]]] = [
                     "so you don't forget to unpause.",
             "min": 10, "max": 3600, "increment": 10,
         },
+        {
+            "key": "detection_workers", "name": "Detection Workers", "type": "int",
+            "desc": "Threads used to check regions in parallel. 0 checks every region "
+                    "one after another; with many regions, 4-8 can keep up with a faster refresh rate.",
+            "min": 0, "max": 32, "increment": 1,
+        },
+        {
+            "key": "capture_workers", "name": "Capture Workers", "type": "int",
+            "desc": "Windows captured at the same time. A window that stops responding "
+                    "then only delays itself instead of every other window. 0 captures one at a time.",
+            "min": 0, "max": 16, "increment": 1,
+        },
+        {
+            "key": "capture_deadline_ms", "name": "Capture Deadline (ms)", "type": "int",
+            "desc": "How long each refresh waits for window captures. Slower windows are "
+                    "checked on a later refresh. 0 = 80% of the refresh rate.",
+            "min": 0, "max": 5000, "increment": 50,
+        },
+        {
+            "key": "adaptive_polling", "name": "Adaptive Polling", "type": "bool",
+            "desc": "Check regions that have been quiet for a while less and less often. "
+                    "Alerting regions stay at full rate, and any change brings a region back to full rate.",
+        },
+        {
+            "key": "adaptive_max_interval_ms", "name": "Adaptive Max Interval (ms)", "type": "int",
+            "desc": "Longest gap between checks of a quiet region when adaptive polling is on.",
+            "min": 1000, "max": 600000, "increment": 1000,
+        },
+        {
+            "key": "adaptive_stable_seconds", "name": "Adaptive Quiet Time (sec)", "type": "int",
+            "desc": "A quiet region's check interval doubles after each period this long without a change.",
+            "min": 5, "max": 3600, "increment": 5,
+        },
+        {
+            "key": "load_governor", "name": "Load Governor", "type": "bool",
+            "desc": "When checks keep taking longer than the refresh rate, temporarily lower analysis "
+                    "resolution, check low-priority regions every other time and postpone diagnostics "
+                    "images. Full quality returns once there is headroom again.",
+        },
     ]),
     ("detection", "Detection", None, [
         {
@@ -49,8 +88,9 @@ _CATEGORIES: List[Tuple[str, str, Optional[str], List[dict]]] = [
                     "ssim = Structural Similarity (accurate, compares luminance/contrast/structure)\n"
                     "phash = Perceptual Hash (faster, compares visual fingerprints)\n"
                     "edge_only = Canny Edge diff (compares outlines; ignores color/gradient shifts)\n"
-                    "background_subtraction = MOG2 (learns background over time; detects new foreground)",
-            "choices": ["ssim", "phash", "edge_only", "background_subtraction"],
+                    "background_subtraction = MOG2 (learns background over time; detects new foreground)\n"
+                    "cascade = cheap gate every tick; runs a confirm method only when the gate fires",
+            "choices": ["ssim", "phash", "edge_only", "background_subtraction", "cascade"],
         },
         {
             "key": "alert_threshold", "name": "Alert Threshold (SSIM/pHash)", "type": "float",
@@ -59,6 +99,22 @@ _CATEGORIES: List[Tuple[str, str, Optional[str], List[dict]]] = [
                     "0.90 = only significant visual changes trigger.",
             "min": 0.10, "max": 1.0, "increment": 0.01, "format": "%.2f",
         },
+        {
+            "key": "ssim_window", "name": "SSIM Window", "type": "choice",
+            "desc": "Filter window used by the SSIM method.\n\n"
+                    "box = 7x7 uniform window (fastest; the classic default)\n"
+                    "gaussian = 11x11 Gaussian window, sigma 1.5 (smoother; less sensitive to single-pixel noise)",
+            "choices": ["box", "gaussian"],
+        },
+        {
+            "key": "analysis_scale", "name": "Analysis Scale", "type": "choice",
+            "desc": "Resolution regions are analysed at. Large regions rarely need full resolution; "
+                    "0.5 analyses at half width and height (a quarter of the pixels). "
+                    "Individual regions can override this via their Detect button.\n\n"
+                    "1.0 / 0.5 / 0.25 / 0.125 = fixed downscale\n"
+                    "auto = pick per region from its size and detection method",
+            "choices": ["1.0", "0.5", "0.25", "0.125", "auto"],
+        },
     ]),
     ("detection_edge", "Edge", "detection", [
         {
@@ -120,6 +176,29 @@ _CATEGORIES: List[Tuple[str, str, Optional[str], List[dict]]] = [
             "min": 0, "max": 500, "increment": 5,
         },
     ]),
+    ("detection_cascade", "Cascade", "detection", [
+        {
+            "key": "cascade_gate", "name": "Gate", "type": "choice",
+            "desc": "Cheap check run every tick before the confirm detector.\n\n"
+                    "mad = mean absolute difference of a small downscaled view\n"
+                    "ahash = average hash (8x8 bits)\n"
+                    "dhash = difference hash (8x8 bits)",
+            "choices": ["mad", "ahash", "dhash"],
+        },
+        {
+            "key": "cascade_gate_threshold", "name": "Gate Threshold", "type": "float",
+            "desc": "Gate score (0-1) above which the confirm detector runs. Keep it loose: "
+                    "the confirm detector still decides. 0.001 = about a quarter grey level of "
+                    "mean change for mad, or any differing bit for the hashes.",
+            "min": 0.0, "max": 0.5, "increment": 0.001, "format": "%.3f",
+        },
+        {
+            "key": "cascade_confirm", "name": "Confirm Method", "type": "choice",
+            "desc": "Detector that confirms a change once the gate fires. "
+                    "It uses its own settings from the tabs above.",
+            "choices": ["ssim", "phash", "edge_only", "background_subtraction"],
+        },
+    ]),
     ("appearance", "Appearance", None, [
         {
             "key": "theme_preset", "name": "Theme", "type": "choice",
@@ -235,6 +314,37 @@ _CATEGORIES: List[Tuple[str, str, Optional[str], List[dict]]] = [
             "desc": "Filename template for captures. Variables: {timestamp}, {window}, "
                     "{region}, {status}.",
         },
+        {
+            "key": "capture_png_compress_level", "name": "PNG Compression", "type": "int",
+            "desc": "Compression level for saved captures and diagnostics images. "
+                    "0 writes fastest (largest files), 9 writes smallest (slowest). "
+                    "Images are lossless at every level.",
+            "min": 0, "max": 9, "increment": 1,
+        },
+        {
+            "key": "capture_store", "name": "Deduplicate Captures", "type": "bool",
+            "desc": "Keep captures and diagnostics images in a content-addressed store "
+                    "(capture directory/store): identical images are saved once and an "
+                    "index maps each alert to its images. When off, captures are loose "
+                    "files named by the Capture Filename template.",
+        },
+        {
+            "key": "capture_max_mb", "name": "Capture Quota (MB)", "type": "int",
+            "desc": "Largest size of the capture store. The oldest alert captures are "
+                    "deleted in small batches once it is exceeded. 0 = unlimited.",
+            "min": 0, "max": 1048576, "increment": 100,
+        },
+        {
+            "key": "capture_max_age_days", "name": "Keep Captures (days)", "type": "int",
+            "desc": "Alert captures older than this are deleted. 0 = keep forever.",
+            "min": 0, "max": 3650, "increment": 1,
+        },
+        {
+            "key": "capture_max_per_region", "name": "Captures per Region", "type": "int",
+            "desc": "Most alert captures kept for each region; older ones are deleted. "
+                    "0 = unlimited.",
+            "min": 0, "max": 100000, "increment": 10,
+        },
     ]),
     ("advanced", "Advanced", None, [
         {
@@ -295,6 +405,14 @@ _CATEGORIES: List[Tuple[str, str, Optional[str], List[dict]]] = [
                     "5000 is a good default; increase if you need longer history.",
             "min": 100, "max": 100000, "increment": 1000,
         },
+        {
+            "key": "event_log_backend", "name": "Storage", "type": "choice",
+            "desc": "jsonl = plain JSON-lines file (default).\n"
+                    "sqlite = indexed SQLite database; event log queries and summaries "
+                    "stay fast with large logs. The existing JSONL log is imported on "
+                    "first use. Requires app restart to take effect.",
+            "choices": ["jsonl", "sqlite"],
+        },
     ]),
     ("mcp", "MCP Server", None, [
         {
@@ -338,8 +456,17 @@ _CATEGORIES: List[Tuple[str, str, Optional[str], List[dict]]] = [
 _CONFIG_MAP = {
     "refresh_rate": ("get_refresh_rate", "set_refresh_rate"),
     "pause_reminder_interval_sec": ("get_pause_reminder_interval_sec", "set_pause_reminder_interval_sec"),
+    "detection_workers": ("get_detection_workers", "set_detection_workers"),
+    "capture_workers": ("get_capture_workers", "set_capture_workers"),
+    "capture_deadline_ms": ("get_capture_deadline_ms", "set_capture_deadline_ms"),
+    "adaptive_polling": ("get_adaptive_polling", "set_adaptive_polling"),
+    "adaptive_max_interval_ms": ("get_adaptive_max_interval_ms", "set_adaptive_max_interval_ms"),
+    "adaptive_stable_seconds": ("get_adaptive_stable_seconds", "set_adaptive_stable_seconds"),
+    "load_governor": ("get_load_governor", "set_load_governor"),
     "change_detection_method": ("get_change_detection_method", "set_change_detection_method"),
     "alert_threshold": ("get_default_alert_threshold", "set_default_alert_threshold"),
+    "ssim_window": ("get_ssim_window", "set_ssim_window"),
+    "analysis_scale": ("get_analysis_scale", "set_analysis_scale"),
     "min_edge_fraction": ("get_min_edge_fraction", "set_min_edge_fraction"),
     "canny_low": ("get_canny_low", "set_canny_low"),
     "canny_high": ("get_canny_high", "set_canny_high"),
@@ -348,6 +475,9 @@ _CONFIG_MAP = {
     "bg_var_threshold": ("get_bg_var_threshold", "set_bg_var_threshold"),
     "bg_min_fg_fraction": ("get_bg_min_fg_fraction", "set_bg_min_fg_fraction"),
     "bg_warmup_frames": ("get_bg_warmup_frames", "set_bg_warmup_frames"),
+    "cascade_gate": ("get_cascade_gate", "set_cascade_gate"),
+    "cascade_gate_threshold": ("get_cascade_gate_threshold", "set_cascade_gate_threshold"),
+    "cascade_confirm": ("get_cascade_confirm", "set_cascade_confirm"),
     "theme_preset": ("get_theme_preset", "set_theme_preset"),
     "opacity": ("get_opacity", "set_opacity"),
     "always_on_top": ("get_always_on_top", "set_always_on_top"),
@@ -363,6 +493,11 @@ _CONFIG_MAP = {
     "capture_on_green": ("get_capture_on_green", "set_capture_on_green"),
     "capture_dir": ("get_capture_dir", "set_capture_dir"),
     "capture_filename_format": ("get_capture_filename_format", "set_capture_filename_format"),
+    "capture_png_compress_level": ("get_capture_png_compress_level", "set_capture_png_compress_level"),
+    "capture_store": ("get_capture_store", "set_capture_store"),
+    "capture_max_mb": ("get_capture_max_mb", "set_capture_max_mb"),
+    "capture_max_age_days": ("get_capture_max_age_days", "set_capture_max_age_days"),
+    "capture_max_per_region": ("get_capture_max_per_region", "set_capture_max_per_region"),
     "log_level": ("get_log_level", "set_log_level"),
     "anonymize_logs": ("get_anonymize_logs", "set_anonymize_logs"),
     "suppress_fullscreen": ("get_suppress_fullscreen", "set_suppress_fullscreen"),
@@ -377,6 +512,7 @@ _CONFIG_MAP = {
     "show_overlay_on_connect": ("get_show_overlay_on_connect", "set_show_overlay_on_connect"),
     "event_log_enabled": ("get_event_log_enabled", "set_event_log_enabled"),
     "event_log_max_rows": ("get_event_log_max_rows", "set_event_log_max_rows"),
+    "event_log_backend": ("get_event_log_backend", "set_event_log_backend"),
     "mcp_enabled": ("get_mcp_enabled", "set_mcp_enabled"),
     "mcp_listen_host": ("get_mcp_listen_host", "set_mcp_listen_host"),
     "mcp_port": ("get_mcp_port", "set_mcp_port"),
@@ -7,10 +7,12 @@ import logging
 import os
 import re
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from PIL import Image
 
+from screenalert_core.core.artifact_writer import save_png
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +22,55 @@ def _safe_filename(text: str, max_len: int = 64) -> str:
     return (text[:max_len] or "item")
 
 
+def alert_diagnostic_images(
+    window_image: Image.Image,
+    region_monitor,
+    prev_window_image: Optional[Image.Image],
+    canny_low: int,
+    canny_high: int,
+    edge_binarize: bool,
+) -> List[Tuple[str, Image.Image]]:
+    """Build the diagnostic images of an alert.
+
+    Returns:
+        ``(kind, image)`` pairs in the order listed by
+        ``save_alert_diagnostics``; images that cannot be built (no
+        previous frame) are left out.
+    """
+    import numpy as np
+    from screenalert_core.core.image_processor import ImageProcessor
+
+    images: List[Tuple[str, Image.Image]] = []
+
+    # Previous and current full-window frames
+    if prev_window_image is not None:
+        images.append(("window_prev", prev_window_image))
+    images.append(("window_curr", window_image))
+
+    # Region crops from monitor's stored alert images
+    prev_region = getattr(region_monitor, "last_alert_prev_image", None)
+    curr_region = getattr(region_monitor, "last_alert_curr_image", None)
+    if prev_region is not None:
+        images.append(("region_prev", prev_region))
+    if curr_region is not None:
+        images.append(("region_curr", curr_region))
+
+    # Edge detection maps and diff
+    if prev_region is not None and curr_region is not None:
+        g1 = np.array(prev_region.convert("L"), dtype=np.uint8)
+        g2 = np.array(curr_region.convert("L"), dtype=np.uint8)
+        edges1 = ImageProcessor._canny_edges(g1, canny_low, canny_high, binarize=edge_binarize)
+        edges2 = ImageProcessor._canny_edges(g2, canny_low, canny_high, binarize=edge_binarize)
+        edge_diff = np.abs(
+            edges1.astype(np.int16) - edges2.astype(np.int16)
+        ).astype(np.uint8)
+        images.append(("edges_prev", Image.fromarray(edges1)))
+        images.append(("edges_curr", Image.fromarray(edges2)))
+        images.append(("edges_diff", Image.fromarray(edge_diff)))
+
+    return images
+
+
 def save_alert_diagnostics(
     capture_dir: str,
     thumbnail_config: Dict,
@@ -30,6 +81,9 @@ def save_alert_diagnostics(
     canny_low: int,
     canny_high: int,
     edge_binarize: bool,
+    compress_level: int = 6,
+    store=None,
+    event_id: Optional[str] = None,
 ) -> None:
     """Save diagnostic images when an alert fires.
 
@@ -42,6 +96,10 @@ def save_alert_diagnostics(
       - ``*_edges_curr.png``    Canny edge map of current region
       - ``*_edges_diff.png``    absolute difference of edge maps
 
+    With a *store* the same images go into the capture store under
+    *event_id* instead (kinds ``window_prev`` … ``edges_diff``), so
+    unchanged frames are stored once.
+
     Args:
         capture_dir:       Base capture directory from config.
         thumbnail_config:  Thumbnail config dict (used for window_title, id).
@@ -52,10 +110,24 @@ def save_alert_diagnostics(
         canny_low:         Lower threshold for Canny edge detection.
         canny_high:        Upper threshold for Canny edge detection.
         edge_binarize:     Whether to binarize the edge map.
+        compress_level:    PNG zlib level, 0 (fastest) to 9 (smallest).
+        store:             CaptureStore to write into, or None for loose files.
+        event_id:          Alert event id the images belong to (with *store*).
     """
     try:
-        import numpy as np
-        from screenalert_core.core.image_processor import ImageProcessor
+        images = alert_diagnostic_images(
+            window_image, region_monitor, prev_window_image,
+            canny_low, canny_high, edge_binarize,
+        )
+
+        if store is not None and event_id:
+            for kind, image in images:
+                store.put(event_id, kind, image,
+                          window_id=thumbnail_config.get("id", ""),
+                          region_id=region_config.get("id", ""),
+                          compress_level=compress_level)
+            logger.info("Stored %d alert diagnostics images for event %s", len(images), event_id)
+            return
 
         diag_dir = os.path.join(capture_dir, "diagnostics")
         os.makedirs(diag_dir, exist_ok=True)
@@ -65,50 +137,8 @@ def save_alert_diagnostics(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         prefix = f"{timestamp}_{_safe_filename(window_title)}_{_safe_filename(region_name)}_alert"
 
-        # Previous full-window frame
-        if prev_window_image is not None:
-            prev_window_image.save(
-                os.path.join(diag_dir, f"{prefix}_window_prev.png"), format="PNG"
-            )
-
-        # Current full-window frame
-        window_image.save(
-            os.path.join(diag_dir, f"{prefix}_window_curr.png"), format="PNG"
-        )
-
-        # Region crops from monitor's stored alert images
-        prev_region = getattr(region_monitor, "last_alert_prev_image", None)
-        curr_region = getattr(region_monitor, "last_alert_curr_image", None)
-
-        if prev_region is not None:
-            prev_region.save(
-                os.path.join(diag_dir, f"{prefix}_region_prev.png"), format="PNG"
-            )
-        if curr_region is not None:
-            curr_region.save(
-                os.path.join(diag_dir, f"{prefix}_region_curr.png"), format="PNG"
-            )
-
-        # Edge detection maps and diff
-        if prev_region is not None and curr_region is not None:
-            g1 = np.array(prev_region.convert("L"), dtype=np.uint8)
-            g2 = np.array(curr_region.convert("L"), dtype=np.uint8)
-            edges1 = ImageProcessor._canny_edges(g1, canny_low, canny_high, binarize=edge_binarize)
-            edges2 = ImageProcessor._canny_edges(g2, canny_low, canny_high, binarize=edge_binarize)
-
-            Image.fromarray(edges1).save(
-                os.path.join(diag_dir, f"{prefix}_edges_prev.png"), format="PNG"
-            )
-            Image.fromarray(edges2).save(
-                os.path.join(diag_dir, f"{prefix}_edges_curr.png"), format="PNG"
-            )
-
-            edge_diff = np.abs(
-                edges1.astype(np.int16) - edges2.astype(np.int16)
-            ).astype(np.uint8)
-            Image.fromarray(edge_diff).save(
-                os.path.join(diag_dir, f"{prefix}_edges_diff.png"), format="PNG"
-            )
+        for kind, image in images:
+            save_png(image, os.path.join(diag_dir, f"{prefix}_{kind}.png"), compress_level)
 
         logger.info("Saved alert diagnostics to %s/%s_*", diag_dir, prefix)
 
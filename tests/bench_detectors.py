@@ -0,0 +1,325 @@
+"""
+Change detector micro-benchmarks.
+
+Runs every detector over synthetic frame sequences for a grid of region
+sizes and change patterns and reports ms/frame, throughput and peak
+Python-side allocations.  Results are written as JSON so runs on
+different commits can be compared.
+
+Peak allocations are measured with ``tracemalloc`` in a separate pass,
+so they include NumPy buffers but not OpenCV's internal allocator.
+
+Run with:
+    pytest tests/bench_detectors.py                  # smoke run only
+    pytest tests/bench_detectors.py --bench          # full grid -> bench_detectors.json
+    pytest tests/bench_detectors.py --bench --bench-out out.json
+
+Or as a CLI:
+    python tests/bench_detectors.py --out before.json
+    python tests/bench_detectors.py --sizes 320x240,1280x800 --methods ssim,edge
+    python tests/bench_detectors.py --out after.json --compare before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.core.change_detectors import create_detector  # noqa: E402
+
+# ── Grid ──────────────────────────────────────────────────────────────────────
+
+SIZES: Tuple[Tuple[int, int], ...] = ((64, 48), (320, 240), (640, 480), (1280, 800))
+
+PATTERNS: Tuple[str, ...] = ("static", "noise", "block", "text", "scroll")
+
+# name -> (registry method, detector kwargs)
+CASES: Dict[str, Tuple[str, dict]] = {
+    "ssim": ("ssim", {}),
+    "ssim-gaussian": ("ssim", {"window": "gaussian"}),
+    "phash": ("phash", {}),
+    "edge": ("edge_only", {"binarize": False}),
+    "edge-binarize": ("edge_only", {"binarize": True}),
+    "mog2": ("background_subtraction", {"warmup_frames": 0}),
+    "cascade": ("cascade", {}),
+}
+
+DEFAULT_FRAMES = 30
+DEFAULT_OUT = "bench_detectors.json"
+
+
+# ── Synthetic frames ──────────────────────────────────────────────────────────
+
+def _base_frame(rng: np.random.Generator, w: int, h: int) -> np.ndarray:
+    """UI-like frame: flat panel, a few coloured boxes and text rows."""
+    arr = np.full((h, w), 35, dtype=np.uint8)
+    for _ in range(max(2, (w * h) // 20000)):
+        bw, bh = int(rng.integers(4, max(5, w // 3))), int(rng.integers(4, max(5, h // 3)))
+        x, y = int(rng.integers(0, max(1, w - bw))), int(rng.integers(0, max(1, h - bh)))
+        arr[y:y + bh, x:x + bw] = rng.integers(60, 230)
+    for row in range(6, h - 3, 14):
+        arr[row:row + 2, 4:w - 4:3] = 210
+    return arr
+
+
+def make_frames(pattern: str, size: Tuple[int, int], count: int,
+                seed: int = 0) -> List[np.ndarray]:
+    """Return *count* grayscale frames of *size* following *pattern*.
+
+    Patterns:
+        static  – identical content every frame (distinct arrays)
+        noise   – ±2 grey-level sensor/compression noise
+        block   – a solid block toggles on and off
+        text    – short glyph strokes appear one after another
+        scroll  – content scrolls up 4 px per frame
+    """
+    if pattern not in PATTERNS:
+        raise ValueError(f"Unknown pattern: {pattern}")
+    w, h = size
+    rng = np.random.default_rng(seed)
+    base = _base_frame(rng, w, h)
+    frames: List[np.ndarray] = []
+    for i in range(count):
+        if pattern == "static":
+            frame = base.copy()
+        elif pattern == "noise":
+            jitter = rng.integers(-2, 3, size=base.shape)
+            frame = np.clip(base.astype(np.int16) + jitter, 0, 255).astype(np.uint8)
+        elif pattern == "block":
+            frame = base.copy()
+            if i % 2:
+                frame[h // 4:h // 2, w // 4:w // 2] = 250
+        elif pattern == "text":
+            frame = frames[-1].copy() if frames else base.copy()
+            gx = 4 + (i * 7) % max(1, w - 12)
+            gy = 4 + ((i * 7) // max(1, w - 12) * 12) % max(1, h - 12)
+            frame[gy:gy + 8, gx:gx + 2] = 255
+            frame[gy:gy + 2, gx:gx + 5] = 255
+        else:  # scroll
+            frame = np.roll(base, -4 * i, axis=0)
+        frames.append(frame)
+    return frames
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+
+def _run(detector, frames: Sequence[np.ndarray]) -> Tuple[List[float], int]:
+    """Feed consecutive pairs like the monitoring loop; return (ms list, changes)."""
+    times: List[float] = []
+    changes = 0
+    for prev, curr in zip(frames, frames[1:]):
+        t0 = time.perf_counter_ns()
+        changed = detector.detect(prev, curr)
+        times.append((time.perf_counter_ns() - t0) / 1e6)
+        changes += bool(changed)
+    return times, changes
+
+
+def bench_case(case: str, size: Tuple[int, int], pattern: str,
+               frames: int = DEFAULT_FRAMES, measure_memory: bool = True) -> dict:
+    """Benchmark one (detector case, size, pattern) cell of the grid."""
+    method, kwargs = CASES[case]
+    seq = make_frames(pattern, size, frames + 1)
+
+    detector = create_detector(method, **kwargs)
+    _run(detector, seq[:3])  # warm caches / lazy imports
+    detector.reset()
+    times, changes = _run(detector, seq)
+
+    peak_kib: Optional[float] = None
+    if measure_memory:
+        detector = create_detector(method, **kwargs)
+        tracemalloc.start()
+        try:
+            _run(detector, seq[:min(len(seq), 6)])
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_kib = round(peak / 1024, 1)
+
+    mean_ms = statistics.fmean(times)
+    ordered = sorted(times)
+    w, h = size
+    return {
+        "case": case,
+        "method": method,
+        "params": kwargs,
+        "size": f"{w}x{h}",
+        "pattern": pattern,
+        "frames": len(times),
+        "changes": changes,
+        "ms_per_frame": round(mean_ms, 4),
+        "ms_median": round(statistics.median(ordered), 4),
+        "ms_p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        "frames_per_sec": round(1000.0 / mean_ms, 1) if mean_ms > 0 else None,
+        "megapixels_per_sec": round(w * h / 1e6 * 1000.0 / mean_ms, 2) if mean_ms > 0 else None,
+        "peak_alloc_kib": peak_kib,
+    }
+
+
+def run_grid(cases: Iterable[str] = CASES, sizes: Iterable[Tuple[int, int]] = SIZES,
+             patterns: Iterable[str] = PATTERNS, frames: int = DEFAULT_FRAMES,
+             measure_memory: bool = True, progress=None) -> dict:
+    """Run the benchmark grid and return the JSON-ready report."""
+    results = []
+    for case in cases:
+        for size in sizes:
+            for pattern in patterns:
+                row = bench_case(case, size, pattern, frames, measure_memory)
+                results.append(row)
+                if progress:
+                    progress(row)
+    return {"meta": _meta(frames), "results": results}
+
+
+def _meta(frames: int) -> dict:
+    commit = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except Exception:
+        pass
+    return {
+        "timestamp": _dt.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "frames": frames,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "cv2_threads": cv2.getNumThreads(),
+    }
+
+
+def _key(row: dict) -> Tuple[str, str, str]:
+    return row["case"], row["size"], row["pattern"]
+
+
+def compare(current: dict, baseline: dict) -> List[dict]:
+    """Return per-cell ms/frame ratios (current / baseline) for shared cells."""
+    base = {_key(r): r for r in baseline.get("results", [])}
+    rows = []
+    for row in current.get("results", []):
+        old = base.get(_key(row))
+        if not old or not old.get("ms_per_frame"):
+            continue
+        rows.append({
+            "case": row["case"], "size": row["size"], "pattern": row["pattern"],
+            "baseline_ms": old["ms_per_frame"], "ms": row["ms_per_frame"],
+            "ratio": round(row["ms_per_frame"] / old["ms_per_frame"], 3),
+        })
+    return rows
+
+
+# ── pytest entry points ───────────────────────────────────────────────────────
+
+def test_smoke_every_case():
+    """Tiny grid: every case runs and produces a well-formed row."""
+    report = run_grid(sizes=[(48, 32)], patterns=["static", "block"], frames=3)
+    assert len(report["results"]) == len(CASES) * 2
+    for row in report["results"]:
+        assert row["frames"] == 3
+        assert row["ms_per_frame"] >= 0
+        assert row["peak_alloc_kib"] is not None
+    json.dumps(report)
+
+
+def test_patterns_behave():
+    """Static frames never change; a toggling block changes every frame."""
+    for case in ("ssim", "phash", "edge"):
+        static = bench_case(case, (160, 120), "static", frames=4, measure_memory=False)
+        block = bench_case(case, (160, 120), "block", frames=4, measure_memory=False)
+        assert static["changes"] == 0
+        assert block["changes"] == 4
+
+
+def test_compare_ratios():
+    old = {"results": [{"case": "ssim", "size": "1x1", "pattern": "static", "ms_per_frame": 2.0}]}
+    new = {"results": [{"case": "ssim", "size": "1x1", "pattern": "static", "ms_per_frame": 1.0}]}
+    assert compare(new, old)[0]["ratio"] == 0.5
+
+
+def test_full_grid(request):
+    """Full benchmark grid; opt in with ``--bench``."""
+    if not request.config.getoption("--bench"):
+        pytest.skip("benchmark grid runs only with --bench")
+    report = run_grid()
+    out = Path(request.config.getoption("--bench-out"))
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\nwrote {len(report['results'])} results to {out}")
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def _parse_sizes(text: str) -> List[Tuple[int, int]]:
+    sizes = []
+    for part in text.split(","):
+        w, h = part.lower().split("x")
+        sizes.append((int(w), int(h)))
+    return sizes
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ScreenAlert change detector micro-benchmarks")
+    parser.add_argument("--methods", default=",".join(CASES),
+                        help=f"Comma-separated cases (default: all of {', '.join(CASES)})")
+    parser.add_argument("--sizes", default=",".join(f"{w}x{h}" for w, h in SIZES),
+                        help="Comma-separated WxH region sizes")
+    parser.add_argument("--patterns", default=",".join(PATTERNS),
+                        help="Comma-separated change patterns")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES,
+                        help="Timed frames per cell")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the tracemalloc peak allocation pass")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="JSON output path")
+    parser.add_argument("--compare", metavar="BASELINE_JSON",
+                        help="Print ms/frame ratios against a previous run")
+    args = parser.parse_args(argv)
+
+    cases = [c.strip() for c in args.methods.split(",") if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"unknown method(s): {', '.join(unknown)}")
+    patterns = [p.strip() for p in args.patterns.split(",") if p.strip()]
+    unknown = [p for p in patterns if p not in PATTERNS]
+    if unknown:
+        parser.error(f"unknown pattern(s): {', '.join(unknown)}")
+
+    def progress(row: dict) -> None:
+        mem = f"{row['peak_alloc_kib']:>9.1f} KiB" if row["peak_alloc_kib"] is not None else ""
+        print(f"{row['case']:<14} {row['size']:>9} {row['pattern']:<7} "
+              f"{row['ms_per_frame']:>9.3f} ms  {row['frames_per_sec']:>9.1f} fps  {mem}")
+
+    report = run_grid(cases, _parse_sizes(args.sizes), patterns, args.frames,
+                      measure_memory=not args.no_memory, progress=progress)
+    Path(args.out).write_text(json.dumps(report, indent=2))
+    print(f"wrote {len(report['results'])} results to {args.out}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        for row in compare(report, baseline):
+            print(f"{row['case']:<14} {row['size']:>9} {row['pattern']:<7} "
+                  f"{row['baseline_ms']:>9.3f} -> {row['ms']:>9.3f} ms  x{row['ratio']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,8 +8,31 @@ Usage:
     pytest                        # mock server (default)
     pytest --live                 # live ScreenAlert on default port 8765
     pytest --live --live-port 8765 --live-key <key>  # explicit overrides
+
+Adds --bench for the full detector benchmark grid (tests/bench_detectors.py).
+
+Provides the ``make_engine`` fixture: a headless engine watching one
+synthetic window, with its worker threads stopped on teardown.
 """
 
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.core.capture_sources import SyntheticCaptureSource  # noqa: E402
+from screenalert_core.screening_engine import ScreenAlertEngine  # noqa: E402
+
+ENGINE_REGION = (40, 40, 200, 150)
+# Two quiet frames, then text appears in the region: one alert
+ENGINE_SCRIPT = (("static", 2), ("text", 0, ENGINE_REGION))
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -33,3 +56,82 @@ def pytest_addoption(parser):
             "If omitted, read from %APPDATA%\\ScreenAlert\\screenalert_config.json"
         ),
     )
+    parser.addoption(
+        "--bench",
+        action="store_true",
+        default=False,
+        help="Run the full detector benchmark grid in tests/bench_detectors.py",
+    )
+    parser.addoption(
+        "--bench-out",
+        type=str,
+        default="bench_detectors.json",
+        help="JSON output path for --bench (default: bench_detectors.json)",
+    )
+
+
+class EngineRig:
+    """An engine built by ``make_engine`` and the window it watches."""
+
+    def __init__(self, engine: ScreenAlertEngine, src: SyntheticCaptureSource, hwnd: int,
+                 thumbnail_id: str, region_ids: List[str]):
+        self.engine = engine
+        self.src = src
+        self.hwnd = hwnd
+        self.thumbnail_id = thumbnail_id
+        self.region_ids = region_ids
+
+    @property
+    def region_id(self) -> Optional[str]:
+        return self.region_ids[0] if self.region_ids else None
+
+    def run(self, cycles: int = 4) -> None:
+        """Run *cycles* unscheduled engine cycles."""
+        for _ in range(cycles):
+            self.engine.run_cycle()
+
+
+def _stop_engine_threads(engine: ScreenAlertEngine) -> None:
+    for stage in (engine._detect_stage, engine._dispatch_stage,
+                  engine.alert_dispatcher, engine.artifact_writer):
+        stage.stop(drain=False)
+    engine.capture_scheduler.shutdown()
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    """Factory for a silent engine on a synthetic "Game" window.
+
+    ``make_engine(**settings)`` applies each setting through the matching
+    ``config.set_<name>()`` before the window and its regions are added.
+
+    Args (of the factory):
+        script, size, loop: Synthetic window (default: one alert in
+            ``ENGINE_REGION`` on the third frame)
+        regions: ``{name: rect}`` regions to add (default: "Region")
+        source: Capture source to add the window to (default: a new
+            ``SyntheticCaptureSource``)
+    """
+    engines: List[ScreenAlertEngine] = []
+
+    def factory(script: Sequence = ENGINE_SCRIPT, size: Tuple[int, int] = (320, 240),
+                regions: Optional[Dict[str, Tuple[int, int, int, int]]] = None,
+                source: Optional[SyntheticCaptureSource] = None, loop: bool = False,
+                **settings) -> EngineRig:
+        src = source if source is not None else SyntheticCaptureSource()
+        hwnd = src.add_window("Game", size, list(script), loop=loop)
+        engine = ScreenAlertEngine(str(tmp_path / "config.json"), capture_source=src)
+        engines.append(engine)
+        engine.config.set_enable_sound(False)
+        engine.config.set_enable_tts(False)
+        for name, value in settings.items():
+            getattr(engine.config, f"set_{name}")(value)
+        thumbnail_id = engine.add_thumbnail("Game", hwnd)
+        if regions is None:
+            regions = {"Region": ENGINE_REGION}
+        region_ids = [engine.add_region(thumbnail_id, name, rect) for name, rect in regions.items()]
+        return EngineRig(engine, src, hwnd, thumbnail_id, region_ids)
+
+    yield factory
+    for engine in engines:
+        _stop_engine_threads(engine)
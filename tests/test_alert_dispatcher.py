@@ -0,0 +1,181 @@
+"""
+Tests for the alert dispatcher (ordered alert delivery off the detect path).
+
+Run with:
+    pytest tests/test_alert_dispatcher.py -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.monitoring.alert_dispatcher import (  # noqa: E402
+    AlertDispatcher, AlertRecord,
+)
+
+
+class _Config:
+    def __init__(self, suppress=False, mute_until=0):
+        self.suppress = suppress
+        self.mute_until = mute_until
+
+    def get_suppress_fullscreen(self):
+        return self.suppress
+
+    def get_mute_until_ts(self):
+        return self.mute_until
+
+    def get_enable_sound(self):
+        return True
+
+    def get_enable_tts(self):
+        return True
+
+
+class _AlertSystem:
+    def __init__(self):
+        self.played = []
+
+    def play_alert(self, sound, tts):
+        self.played.append((sound, tts))
+
+
+def _record(dispatcher, region_id="r1"):
+    return AlertRecord(dispatcher.next_seq(), "e1", time.time(), "t1", "Game", region_id,
+                       "Region", "beep.wav", "Alert", None, None)
+
+
+def _dispatcher(config=None, fullscreen=False, deliver=None, **kwargs):
+    alerts = _AlertSystem()
+    delivered = []
+    dispatcher = AlertDispatcher(config or _Config(), alerts, lambda: fullscreen,
+                                 deliver or delivered.append, **kwargs)
+    return dispatcher, alerts, delivered
+
+
+class TestAlertDispatcher:
+
+    def test_worker_keeps_raise_order(self):
+        dispatcher, alerts, delivered = _dispatcher()
+        dispatcher.start()
+        try:
+            for i in range(20):
+                dispatcher.submit(_record(dispatcher, f"r{i % 3}"))
+            assert dispatcher.wait_idle(2.0)
+        finally:
+            dispatcher.stop()
+        assert [r.seq for r in delivered] == list(range(1, 21))
+        assert len(alerts.played) == 20
+        assert dispatcher.stats()["dispatched"] == 20
+
+    def test_fullscreen_suppresses_whole_alert(self):
+        dispatcher, alerts, delivered = _dispatcher(_Config(suppress=True), fullscreen=True)
+        dispatcher.submit(_record(dispatcher))
+        assert (alerts.played, delivered) == ([], [])
+        assert dispatcher.stats()["suppressed_fullscreen"] == 1
+
+    def test_mute_skips_media_only(self):
+        config = _Config(mute_until=int(time.time()) + 60)
+        dispatcher, alerts, delivered = _dispatcher(config)
+        dispatcher.submit(_record(dispatcher))
+        assert alerts.played == [] and len(delivered) == 1
+        assert dispatcher.stats()["muted"] == 1
+
+    def test_submit_does_not_wait_for_delivery(self):
+        release = threading.Event()
+        delivered = []
+
+        def slow(record):
+            release.wait(5.0)  # stuck sound device / disk
+            delivered.append(record.seq)
+
+        dispatcher, _, _ = _dispatcher(deliver=slow)
+        dispatcher.start()
+        try:
+            start = time.perf_counter()
+            for _ in range(5):
+                dispatcher.submit(_record(dispatcher))
+            assert time.perf_counter() - start < 0.5
+        finally:
+            release.set()
+            dispatcher.stop(drain=True)
+        assert delivered == [1, 2, 3, 4, 5]
+
+    def test_backlog_sheds_media_but_delivers_every_alert(self):
+        release = threading.Event()
+        delivered = []
+
+        def slow(record):
+            release.wait(5.0)
+            delivered.append(record)
+
+        dispatcher, alerts, _ = _dispatcher(deliver=slow, shed_depth=3)
+        dispatcher.start()
+        try:
+            for _ in range(20):
+                dispatcher.submit(_record(dispatcher)._replace(region_image=object()))
+        finally:
+            release.set()
+            dispatcher.stop(drain=True)
+        assert [r.seq for r in delivered] == list(range(1, 21))
+        shed = [r for r in delivered if r.media_shed]
+        assert shed and all(r.region_image is None for r in shed)
+        assert len(alerts.played) == 20 - len(shed)
+        stats = dispatcher.stats()
+        assert (stats["dispatched"], stats["shed"], stats["dropped"]) == (20, len(shed), 0)
+
+
+class _EventLog:
+    def __init__(self):
+        self.events = []
+
+    def log(self, category, event, source, **fields):
+        self.events.append((category, event, fields))
+
+
+def test_engine_alert_is_delivered_with_snapshot(tmp_path, make_engine):
+    rig = make_engine(capture_on_alert=True, capture_dir=str(tmp_path / "captures"))
+    engine = rig.engine
+    engine.event_logger = _EventLog()
+    alerts = []
+    engine.on_alert = lambda tid, rid, name: alerts.append((tid, rid, name))
+
+    rig.run()
+
+    assert alerts == [(rig.thumbnail_id, rig.region_id, "Region")]
+    (_, event, fields), = [e for e in engine.event_logger.events if e[0] == "alert"]
+    assert event == "region_alert"
+    assert fields["capture_file"] and os.path.exists(fields["capture_file"])
+    assert engine.pipeline_stats()["alerts"]["dispatched"] == 1
+
+
+def test_engine_alert_storm_reaches_history_and_event_log(make_engine):
+    rig = make_engine()
+    engine = rig.engine
+    engine.event_logger = _EventLog()
+    engine.alert_dispatcher = AlertDispatcher(engine.config, engine.alert_system,
+                                              lambda: False, engine._deliver_alert, shed_depth=2)
+    release = threading.Event()
+    engine.on_alert = lambda tid, rid, name: release.wait(5.0)
+
+    engine.alert_dispatcher.start()
+    try:
+        for i in range(30):
+            engine.alert_dispatcher.submit(AlertRecord(
+                engine.alert_dispatcher.next_seq(), f"e{i}", time.time(), rig.thumbnail_id,
+                "Game", rig.region_id, "Region", "", "", None, None))
+    finally:
+        release.set()
+        engine.alert_dispatcher.stop(drain=True)
+
+    assert len(engine.config.get_alert_history()) == 30
+    events = [e[2] for e in engine.event_logger.events if e[1] == "region_alert"]
+    assert [e["event_id"] for e in events] == [f"e{i}" for i in range(30)]
+    assert any(e.get("media_shed") for e in events)
@@ -0,0 +1,153 @@
+"""
+Tests for the alert rollup (bucketed alert counts, durations and metrics).
+
+Run with:
+    pytest tests/test_alert_rollup.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.monitoring.alert_rollup import (  # noqa: E402
+    BASE_BUCKET_S, ROLLUP_FILENAME, AlertRollup, detector_metric, parse_timestamp,
+)
+from screenalert_core.monitoring.region_monitor import (  # noqa: E402
+    STATE_ALERT, STATE_OK, STATE_WARNING,
+)
+
+T0 = 1_800_000_000.0  # a multiple of BASE_BUCKET_S
+
+
+def _episode(rollup, window_id, region_id, start, alert_s, warning_s, similarity=0.5):
+    rollup.record_state(window_id, region_id, STATE_ALERT, start)
+    rollup.record_alert(window_id, region_id, start, "Game", "HP",
+                        detect_info={"similarity": similarity, "threshold": 0.99})
+    rollup.record_state(window_id, region_id, STATE_WARNING, start + alert_s)
+    rollup.record_state(window_id, region_id, STATE_OK, start + alert_s + warning_s)
+
+
+class TestAlertRollup:
+
+    def test_counts_durations_and_metrics_per_bucket(self):
+        rollup = AlertRollup(None)
+        _episode(rollup, "w1", "r1", T0 + 10, 4.0, 6.0, similarity=0.42)
+        _episode(rollup, "w1", "r1", T0 + 100, 2.0, 2.0, similarity=0.91)
+        _episode(rollup, "w1", "r2", T0 + BASE_BUCKET_S + 5, 1.0, 1.0)
+
+        result = rollup.query(T0, T0 + 3600, bucket_s=BASE_BUCKET_S)
+        assert [row["alerts"] for row in result["series"]] == [2, 1]
+        assert result["series"][0]["alerts_by_region"] == {"r1": 2}
+        assert result["series"][0]["alert_seconds"] == 6.0
+        assert result["windows"][0]["alerts"] == 3
+
+        r1 = result["regions"][0]
+        assert (r1["region_id"], r1["region_name"], r1["episodes"]) == ("r1", "HP", 2)
+        assert r1["mean_alert_seconds"] == 3.0
+        assert r1["max_episode_seconds"] == 10.0
+        similarity = r1["metrics"]["similarity"]
+        assert (similarity["count"], similarity["min"], similarity["max"]) == (2, 0.42, 0.91)
+        assert similarity["histogram"]["counts"][4] == 1
+        assert similarity["histogram"]["counts"][9] == 1
+
+    def test_query_rebuckets_and_filters(self):
+        rollup = AlertRollup(None)
+        for i in range(6):
+            _episode(rollup, "w1" if i % 2 else "w2", f"r{i % 2}", T0 + i * BASE_BUCKET_S, 1.0, 1.0)
+
+        hourly = rollup.query(T0, T0 + 3600, bucket_s=3600)
+        assert hourly["bucket_seconds"] == 3600
+        assert [row["alerts"] for row in hourly["series"]] == [6]
+        assert hourly["series"][0]["alerts_by_window"] == {"w1": 3, "w2": 3}
+        # Rounded up to a multiple of the base bucket
+        assert rollup.query(T0, T0 + 3600, bucket_s=400)["bucket_seconds"] == 2 * BASE_BUCKET_S
+        only_w1 = rollup.query(T0, T0 + 3600, bucket_s=3600, window_id="w1")
+        assert [row["window_id"] for row in only_w1["windows"]] == ["w1"]
+        assert rollup.query(T0 + 3600, T0 + 7200)["series"] == []
+        with pytest.raises(ValueError):
+            rollup.query(T0, T0 + 86400 * 30, bucket_s=BASE_BUCKET_S)
+
+    def test_open_episode_is_not_counted(self):
+        rollup = AlertRollup(None)
+        rollup.record_state("w1", "r1", STATE_ALERT, T0)
+        rollup.record_state("w1", "r1", STATE_WARNING, T0 + 3)
+        rollup.record_state("w1", "r1", STATE_ALERT, T0 + 5)  # changed again
+        assert rollup.query(T0, T0 + 60)["series"] == []
+        rollup.record_state("w1", "r1", STATE_OK, T0 + 9)
+        row = rollup.query(T0, T0 + 60)["series"][0]
+        assert (row["episodes"], row["alert_seconds"], row["warning_seconds"]) == (1, 7.0, 2.0)
+
+    def test_times_are_utc_like_the_event_log(self):
+        rollup = AlertRollup(None)
+        _episode(rollup, "w1", "r1", T0 + 10, 1.0, 1.0)
+        # A naive since/until is UTC, as event log timestamps are
+        assert parse_timestamp("2027-01-15T08:00:00") == T0
+        assert parse_timestamp("2027-01-15T10:00:00+02:00") == T0
+        with pytest.raises(ValueError):
+            parse_timestamp("yesterday")
+
+        result = rollup.query(T0, T0 + 3600, bucket_s=3600)
+        assert result["start"] == "2027-01-15T08:00:00+00:00"
+        assert result["series"][0]["start"] == "2027-01-15T08:00:00+00:00"
+
+    def test_detector_metric_prefers_confirm_stage(self):
+        assert detector_metric({"edge_change_pct": 3.5}) == ("edge_change_pct", 3.5)
+        cascade = {"stage": "confirm", "gate_score": 0.2, "confirm": {"similarity": 0.8}}
+        assert detector_metric(cascade) == ("similarity", 0.8)
+        assert detector_metric({"stage": "gate", "gate_score": 0.01}) == ("gate_score", 0.01)
+        assert detector_metric({}) is None
+
+    def test_closed_buckets_are_written_and_merged_on_load(self, tmp_path):
+        path = str(tmp_path / ROLLUP_FILENAME)
+        rollup = AlertRollup(path, retention_days=0)
+        _episode(rollup, "w1", "r1", T0, 1.0, 1.0)
+        # Closing the bucket writes it; the open one waits for flush
+        _episode(rollup, "w1", "r1", T0 + BASE_BUCKET_S, 1.0, 1.0)
+        with open(path, encoding="utf-8") as f:
+            assert [json.loads(line).get("t") for line in f] == [None, T0]  # names, then the bucket
+        rollup.flush()
+        _episode(rollup, "w1", "r1", T0 + BASE_BUCKET_S + 60, 1.0, 1.0)
+        rollup.flush()
+
+        with open(path, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        assert sum(1 for line in lines if "t" in line) == 3  # the open bucket twice
+        reloaded = AlertRollup(path, retention_days=0)
+        assert reloaded.query(T0, T0 + 3600, bucket_s=3600) == rollup.query(T0, T0 + 3600, bucket_s=3600)
+        assert reloaded.query(T0, T0 + 3600)["regions"][0]["window_name"] == "Game"
+
+    def test_old_buckets_are_dropped_on_load(self, tmp_path):
+        path = str(tmp_path / ROLLUP_FILENAME)
+        recent = time.time() // BASE_BUCKET_S * BASE_BUCKET_S - BASE_BUCKET_S
+        rollup = AlertRollup(path, retention_days=0)
+        _episode(rollup, "w1", "r1", recent - 400 * 86400, 1.0, 1.0)
+        _episode(rollup, "w1", "r1", recent, 1.0, 1.0)
+        rollup.flush()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"t": 12')  # torn tail
+
+        AlertRollup(path, retention_days=90)
+        with open(path, encoding="utf-8") as f:
+            buckets = [json.loads(line)["t"] for line in f if '"t"' in line]
+        assert buckets == [recent]
+
+
+def test_engine_rolls_up_alerts(tmp_path, make_engine):
+    rig = make_engine()
+    rig.run()
+    rig.engine.alert_rollup.flush()
+
+    reloaded = AlertRollup(str(tmp_path / ROLLUP_FILENAME))
+    result = reloaded.query(0, 4_000_000_000, bucket_s=86400 * 30)
+    region = result["regions"][0]
+    assert (region["window_id"], region["region_id"], region["alerts"]) == (rig.thumbnail_id, rig.region_id, 1)
+    assert (region["window_name"], region["region_name"]) == ("Game", "Region")
+    assert region["metrics"]
@@ -0,0 +1,85 @@
+"""
+Tests for the artifact writer (snapshots and diagnostics images).
+
+Run with:
+    pytest tests/test_artifact_writer.py -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.core.artifact_writer import ArtifactWriter, save_png  # noqa: E402
+
+
+class TestArtifactWriter:
+
+    def test_inline_until_started(self):
+        writer = ArtifactWriter()
+        written = []
+        writer.submit("snapshot", lambda: written.append(1))
+        writer.submit("snapshot", lambda: 1 / 0)
+        assert written == [1]
+        stats = writer.stats()
+        assert (stats["queued"], stats["written"], stats["failed"]) == (2, 1, 1)
+
+    def test_busy_writer_merges_by_key_and_drops_oldest(self):
+        release = threading.Event()
+        written = []
+
+        def write(name):
+            def _write():
+                release.wait(2.0)
+                written.append(name)
+            return _write
+
+        writer = ArtifactWriter(workers=1, maxsize=3)
+        writer.start()
+        try:
+            writer.submit("snapshot", write("busy"))
+            time.sleep(0.05)  # the worker is now blocked on "busy"
+            for i in range(3):
+                writer.submit("diagnostics", write(f"diag{i}"), key="r1")
+            writer.submit("snapshot", write("snap1"))
+            writer.submit("snapshot", write("snap2"))
+            writer.submit("snapshot", write("snap3"))
+        finally:
+            release.set()
+            writer.stop(drain=True)
+        # diag0/diag1 merged into diag2, which then fell out as the oldest
+        assert written == ["busy", "snap1", "snap2", "snap3"]
+        stats = writer.stats()
+        assert (stats["merged"], stats["dropped"], stats["written"]) == (2, 1, 4)
+        assert stats["written_by_kind"] == {"snapshot": 4}
+
+
+def test_save_png_compress_level_is_lossless(tmp_path):
+    arr = np.tile(np.arange(256, dtype=np.uint8), (64, 1))
+    image = Image.fromarray(np.dstack([arr, arr[::-1], arr]))
+    fast, small = tmp_path / "fast.png", tmp_path / "small.png"
+    save_png(image, str(fast), 0)
+    save_png(image, str(small), 9)
+    assert fast.stat().st_size > small.stat().st_size
+    for path in (fast, small):
+        assert np.array_equal(np.asarray(Image.open(path)), np.asarray(image))
+
+
+def test_engine_writes_snapshot_and_diagnostics_through_writer(tmp_path, make_engine):
+    rig = make_engine(capture_on_alert=True, save_alert_diagnostics=True,
+                      capture_dir=str(tmp_path / "captures"),
+                      capture_store=False)  # loose files
+    rig.run()
+
+    stats = rig.engine.pipeline_stats()["artifacts"]
+    assert stats["written_by_kind"] == {"snapshot": 1, "diagnostics": 1}
+    assert len(os.listdir(tmp_path / "captures" / "diagnostics")) >= 2
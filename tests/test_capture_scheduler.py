@@ -0,0 +1,204 @@
+"""
+Tests for the concurrent capture scheduler.
+
+A stalled capture is simulated with a threading.Event the test releases,
+so no window capture is involved.
+
+Run with:
+    pytest tests/test_capture_scheduler.py -v
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.core.capture_scheduler import CaptureJob, CaptureScheduler  # noqa: E402
+from screenalert_core.core.capture_sources import SyntheticCaptureSource  # noqa: E402
+
+
+class _FakeCapture:
+    """Returns a 1x1 image per hwnd; hwnds in *stalled* block until released."""
+
+    def __init__(self, stalled=(), fail=()):
+        self.stalled = set(stalled)
+        self.fail = set(fail)
+        self.release = threading.Event()
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, hwnd):
+        with self._lock:
+            self.calls.append(hwnd)
+        if hwnd in self.stalled:
+            self.release.wait(5.0)
+        if hwnd in self.fail:
+            raise RuntimeError("capture failed")
+        return Image.new("L", (1, 1), hwnd % 256)
+
+
+def _jobs(hwnds, budget=0.2):
+    deadline = time.monotonic() + budget
+    return [CaptureJob(f"w{h}", h, deadline) for h in hwnds]
+
+
+class TestCaptureScheduler:
+
+    def test_results_in_job_order(self):
+        capture = _FakeCapture()
+        scheduler = CaptureScheduler(capture, workers=3)
+        try:
+            results = scheduler.collect(_jobs([3, 1, 2]))
+        finally:
+            scheduler.shutdown()
+        assert [r.key for r in results] == ["w3", "w1", "w2"]
+        assert all(r.image is not None and not r.carried_over for r in results)
+
+    def test_stalled_window_does_not_block_others(self):
+        capture = _FakeCapture(stalled={2})
+        scheduler = CaptureScheduler(capture, workers=4)
+        try:
+            start = time.monotonic()
+            results = scheduler.collect(_jobs([1, 2, 3], budget=0.1))
+            assert time.monotonic() - start < 1.0
+            assert [r.key for r in results] == ["w1", "w3"]
+            assert scheduler.pending() == ["w2"]
+            assert scheduler.stats()["late"] == 1
+
+            # Still stalled: not captured again, the others keep flowing
+            results = scheduler.collect(_jobs([1, 2, 3], budget=0.05))
+            assert [r.key for r in results] == ["w1", "w3"]
+            assert capture.calls.count(2) == 1
+            assert scheduler.stats()["skipped_in_flight"] == 1
+
+            # Released: the carried-over frame is delivered next tick
+            capture.release.set()
+            deadline = time.monotonic() + 2.0
+            while scheduler.pending() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            results = scheduler.collect(_jobs([1, 2, 3]))
+            by_key = {r.key: r for r in results}
+            assert list(by_key) == ["w1", "w2", "w3"]
+            assert by_key["w2"].carried_over and not by_key["w1"].carried_over
+            assert capture.calls.count(2) == 1
+        finally:
+            capture.release.set()
+            scheduler.shutdown()
+
+    def test_carry_over_discarded_when_window_changes(self):
+        capture = _FakeCapture(stalled={2})
+        scheduler = CaptureScheduler(capture, workers=2)
+        try:
+            scheduler.collect(_jobs([2], budget=0.02))
+            capture.release.set()
+            time.sleep(0.05)
+            # Thumbnail w2 reconnected to hwnd 7: the old frame is dropped
+            results = scheduler.collect([CaptureJob("w2", 7, time.monotonic() + 0.5)])
+        finally:
+            scheduler.shutdown()
+        assert [(r.key, r.hwnd, r.carried_over) for r in results] == [("w2", 7, False)]
+        assert scheduler.stats()["discarded"] == 1
+
+    def test_carry_over_kept_until_window_is_due(self):
+        capture = _FakeCapture(stalled={2})
+        scheduler = CaptureScheduler(capture, workers=2)
+        try:
+            scheduler.collect(_jobs([1, 2], budget=0.02))
+            capture.release.set()
+            time.sleep(0.05)
+            # w2 finished on a tick where only w1 is due: its frame waits
+            scheduler.retain({"w1": 1, "w2": 2})
+            assert [r.key for r in scheduler.collect(_jobs([1]))] == ["w1"]
+            results = scheduler.collect(_jobs([2]))
+            assert [(r.key, r.carried_over) for r in results] == [("w2", True)]
+            assert capture.calls.count(2) == 1
+            assert scheduler.stats()["discarded"] == 0
+        finally:
+            scheduler.shutdown()
+
+    def test_retain_discards_removed_windows(self):
+        capture = _FakeCapture(stalled={2, 3})
+        scheduler = CaptureScheduler(capture, workers=2)
+        try:
+            scheduler.collect(_jobs([2, 3], budget=0.02))
+            capture.release.set()
+            time.sleep(0.05)
+            # w2 was removed and w3 reconnected to hwnd 7
+            scheduler.retain({"w3": 7})
+            assert scheduler.stats()["discarded"] == 2
+            results = scheduler.collect([CaptureJob("w3", 7, time.monotonic() + 0.5)])
+        finally:
+            scheduler.shutdown()
+        assert [(r.key, r.hwnd, r.carried_over) for r in results] == [("w3", 7, False)]
+
+    def test_failed_capture_returns_none(self):
+        scheduler = CaptureScheduler(_FakeCapture(fail={1}), workers=2)
+        try:
+            results = scheduler.collect(_jobs([1, 2]))
+        finally:
+            scheduler.shutdown()
+        assert [r.image is None for r in results] == [True, False]
+        assert scheduler.stats()["failed"] == 1
+
+    @pytest.mark.parametrize("workers", [0, "bad", -1])
+    def test_inline_mode(self, workers):
+        capture = _FakeCapture(fail={2})
+        scheduler = CaptureScheduler(capture, workers=workers)
+        assert scheduler.workers == 0
+        # Inline captures ignore deadlines
+        results = scheduler.collect(_jobs([1, 2, 3], budget=-1.0))
+        assert [(r.key, r.image is None) for r in results] == [("w1", False), ("w2", True), ("w3", False)]
+        assert capture.calls == [1, 2, 3]
+
+    def test_set_workers_clamps(self):
+        scheduler = CaptureScheduler(_FakeCapture(), workers=999)
+        assert scheduler.workers == 16
+        scheduler.set_workers(2)
+        assert scheduler.stats()["workers"] == 2
+        scheduler.shutdown()
+        assert scheduler.workers == 0
+
+
+class _StallingSource(SyntheticCaptureSource):
+    """Synthetic source whose *stalled* windows block until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.stalled = set()
+        self.release = threading.Event()
+
+    def capture(self, hwnd):
+        if hwnd in self.stalled:
+            self.release.wait(5.0)
+        return super().capture(hwnd)
+
+
+def test_engine_keeps_monitoring_around_a_stalled_window(make_engine):
+    src = _StallingSource()
+    rig = make_engine([("static", 2), ("blobs", 2, (100, 80, 100, 80)), "static"],
+                      regions={"Region": (100, 80, 100, 80)}, source=src, capture_deadline_ms=50)
+    engine, live_id = rig.engine, rig.thumbnail_id
+    stuck = src.add_window("Stuck", (320, 240))
+    engine.add_thumbnail("Stuck", stuck)
+    alerts = []
+    engine.on_alert = lambda tid, rid, name: alerts.append(tid)
+
+    src.stalled.add(stuck)
+    try:
+        start = time.monotonic()
+        for _ in range(6):
+            engine.run_cycle()
+        assert time.monotonic() - start < 2.0
+        assert alerts == [live_id]
+        assert engine.capture_scheduler.stats()["late"] == 1
+    finally:
+        src.release.set()
+        engine.capture_scheduler.shutdown()
@@ -0,0 +1,274 @@
+"""
+Tests for the pluggable capture sources and the headless engine loop.
+
+The synthetic and replay sources stand in for live windows, so the full
+capture → detect → alert path runs here without a Windows desktop.
+
+Run with:
+    pytest tests/test_capture_sources.py -v
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.core.capture_sources import (  # noqa: E402
+    ReplayCaptureSource, SceneStep, SyntheticCaptureSource, Win32CaptureSource,
+    list_replay_frames,
+)
+from screenalert_core.rendering.headless_renderer import HeadlessRenderer  # noqa: E402
+from screenalert_core.screening_engine import ScreenAlertEngine  # noqa: E402
+from screenalert_core.monitoring.region_monitor import STATE_ALERT  # noqa: E402
+
+
+REGION = (100, 80, 200, 150)
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _arr(img: Image.Image) -> np.ndarray:
+    return np.asarray(img)
+
+
+def _region(img: Image.Image, rect=REGION) -> np.ndarray:
+    x, y, w, h = rect
+    return _arr(img)[y:y + h, x:x + w]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Synthetic source
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestSynthetic:
+
+    def test_static_frames_are_identical(self):
+        src = SyntheticCaptureSource()
+        hwnd = src.add_window("W", (320, 240))
+        first, second = src.capture(hwnd), src.capture(hwnd)
+        assert first.size == (320, 240) and first.mode == "RGB"
+        assert np.array_equal(_arr(first), _arr(second))
+
+    def test_blobs_move_only_inside_area(self):
+        src = SyntheticCaptureSource()
+        hwnd = src.add_window("W", (400, 300), [("blobs", 0, REGION)])
+        a, b = _arr(src.capture(hwnd)), _arr(src.capture(hwnd))
+        changed = np.argwhere(np.any(a != b, axis=2))
+        assert len(changed)
+        x, y, w, h = REGION
+        assert changed[:, 0].min() >= y and changed[:, 0].max() < y + h
+        assert changed[:, 1].min() >= x and changed[:, 1].max() < x + w
+
+    def test_text_changes_every_frame(self):
+        src = SyntheticCaptureSource()
+        hwnd = src.add_window("W", (400, 300), [SceneStep("text", area=REGION)])
+        a, b = src.capture(hwnd), src.capture(hwnd)
+        assert not np.array_equal(_region(a), _region(b))
+
+    def test_script_steps_and_hold(self):
+        src = SyntheticCaptureSource()
+        hwnd = src.add_window("W", (400, 300), [("static", 2), ("text", 1, REGION), "static"])
+        frames = [src.capture(hwnd) for _ in range(5)]
+        assert np.array_equal(_arr(frames[0]), _arr(frames[1]))
+        assert not np.array_equal(_arr(frames[1]), _arr(frames[2]))
+        assert np.array_equal(_arr(frames[3]), _arr(frames[4]))
+        assert np.array_equal(_arr(frames[0]), _arr(frames[4]))
+
+    def test_loop_repeats_script(self):
+        src = SyntheticCaptureSource()
+        hwnd = src.add_window("W", (200, 150), [("static", 1), ("blobs", 2)], loop=True)
+        frames = [_arr(src.capture(hwnd)) for _ in range(6)]
+        assert np.array_equal(frames[0], frames[3])
+        assert np.array_equal(frames[1], frames[4])
+
+    def test_same_seed_is_deterministic(self):
+        a = SyntheticCaptureSource(seed=7)
+        b = SyntheticCaptureSource(seed=7)
+        ha = a.add_window("W", (200, 150), ["blobs"])
+        hb = b.add_window("W", (200, 150), ["blobs"])
+        for _ in range(3):
+            assert np.array_equal(_arr(a.capture(ha)), _arr(b.capture(hb)))
+
+    def test_unknown_scene_rejected(self):
+        with pytest.raises(ValueError):
+            SyntheticCaptureSource().add_window("W", script=["fireworks"])
+
+    def test_fps_follows_wall_clock(self):
+        src = SyntheticCaptureSource(fps=1000)
+        hwnd = src.add_window("W", (64, 48))
+        assert not src.free_running
+        src.capture(hwnd)
+        time.sleep(0.05)
+        assert src.frame_index(hwnd) >= 20
+
+    def test_window_identity(self):
+        src = SyntheticCaptureSource()
+        hwnd = src.add_window("Game A", (320, 240), window_class="Cls", monitor_id=1)
+        assert src.validate_window_identity(hwnd, expected_title=" game a ",
+                                            expected_class="Cls", expected_size=(330, 235))
+        assert not src.validate_window_identity(hwnd, expected_title="Game B")
+        assert not src.validate_window_identity(hwnd, expected_monitor_id=0)
+        assert src.find_window_by_title("Game A", exact=True)["hwnd"] == hwnd
+        # class/monitor only rank candidates, as with live windows
+        assert src.find_window_by_title("Game A", exact=True, expected_class_name="Other")["hwnd"] == hwnd
+        assert src.remove_window(hwnd)
+        assert src.capture(hwnd) is None
+        assert not src.is_window_valid(hwnd)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Replay source
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _write_pngs(directory: Path, count: int, size=(160, 120)) -> list:
+    directory.mkdir(parents=True, exist_ok=True)
+    arrays = []
+    for i in range(count):
+        arr = np.full((size[1], size[0], 3), 20 * i, dtype=np.uint8)
+        Image.fromarray(arr).save(directory / f"frame_{i:04d}.png")
+        arrays.append(arr)
+    return arrays
+
+
+class TestReplay:
+
+    def test_png_sequence_in_name_order(self, tmp_path):
+        arrays = _write_pngs(tmp_path / "w", 3)
+        src = ReplayCaptureSource()
+        hwnd = src.add_window("W", tmp_path / "w")
+        assert src.get_window_metadata(hwnd)["size"] == (160, 120)
+        for expected in arrays:
+            assert np.array_equal(_arr(src.capture(hwnd)), expected)
+        assert src.finished
+        assert src.capture(hwnd) is None
+
+    def test_npz_stack_and_single_frames(self, tmp_path):
+        directory = tmp_path / "w"
+        directory.mkdir()
+        stack = np.stack([np.full((40, 50), v, dtype=np.uint8) for v in (10, 20, 30)])
+        np.savez(directory / "a.npz", frames=stack)
+        np.savez(directory / "b.npz", frame=np.full((40, 50, 4), 99, dtype=np.uint8))
+        assert len(list_replay_frames(directory)) == 4
+
+        src = ReplayCaptureSource()
+        hwnd = src.add_window("W", directory)
+        values = [int(_arr(src.capture(hwnd))[0, 0, 0]) for _ in range(4)]
+        assert values == [10, 20, 30, 99]
+
+    def test_loop_wraps(self, tmp_path):
+        _write_pngs(tmp_path / "w", 2)
+        src = ReplayCaptureSource()
+        hwnd = src.add_window("W", tmp_path / "w", loop=True)
+        values = [int(_arr(src.capture(hwnd))[0, 0, 0]) for _ in range(4)]
+        assert values == [0, 20, 0, 20]
+        assert not src.finished
+
+    def test_empty_or_missing_directory(self, tmp_path):
+        src = ReplayCaptureSource()
+        with pytest.raises(FileNotFoundError):
+            src.add_window("W", tmp_path / "missing")
+        (tmp_path / "empty").mkdir()
+        with pytest.raises(ValueError):
+            src.add_window("W", tmp_path / "empty")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Headless engine
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestHeadlessEngine:
+
+    def test_defaults_off_windows(self, tmp_path):
+        engine = ScreenAlertEngine(str(tmp_path / "config.json"))
+        assert isinstance(engine.capture_source, Win32CaptureSource)
+        if sys.platform != "win32":
+            assert isinstance(engine.renderer, HeadlessRenderer)
+
+    def test_scripted_change_raises_one_alert(self, make_engine):
+        rig = make_engine([("static", 10), ("blobs", 3, REGION), "static"], size=(640, 480),
+                          regions={"Region": REGION}, alert_hold_seconds=0)
+        engine, src, hwnd = rig.engine, rig.src, rig.hwnd
+        alerts = []
+        engine.on_alert = lambda tid, rid, name: alerts.append((src.frame_index(hwnd) - 1, tid, rid))
+
+        rig.run(30)
+
+        assert alerts == [(10, rig.thumbnail_id, rig.region_id)]
+        assert engine.renderer.availability[rig.thumbnail_id] is True
+
+    def test_removed_window_reports_lost(self, make_engine):
+        rig = make_engine(("static",))
+        engine, thumbnail_id = rig.engine, rig.thumbnail_id
+        lost = []
+        engine.on_window_lost = lambda tid, title: lost.append(tid)
+        engine.run_cycle()
+        rig.src.remove_window(rig.hwnd)
+        rig.run(2)
+        assert lost == [thumbnail_id]
+        assert not engine.is_thumbnail_connected(thumbnail_id)
+
+    def test_reconnects_to_replay_window_by_title(self, tmp_path):
+        _write_pngs(tmp_path / "frames", 3, size=(400, 300))
+        src = ReplayCaptureSource()
+        engine = ScreenAlertEngine(str(tmp_path / "config.json"), capture_source=src)
+        engine.config.set_enable_sound(False)
+        engine.config.set_enable_tts(False)
+        thumbnail_id = engine.add_thumbnail("Game A", 0x999)
+        hwnd = src.add_window("Game A", tmp_path / "frames")
+        engine.run_cycle()
+        assert engine.is_thumbnail_connected(thumbnail_id)
+        assert engine.renderer.source_hwnds[thumbnail_id] == hwnd
+
+    def test_replay_leaves_config_untouched(self, tmp_path, make_engine):
+        live = make_engine(("static",), regions={"Region": REGION})
+        live.engine.config.update_thumbnail(live.thumbnail_id, {"window_hwnd": 0x999})
+        live.engine.config.save()
+        saved = {path: path.read_bytes() for path in tmp_path.glob("*.json")}
+
+        _write_pngs(tmp_path / "frames", 3, size=(640, 480))
+        src = ReplayCaptureSource()
+        src.add_window("Game", tmp_path / "frames")
+        engine = ScreenAlertEngine(str(tmp_path / "config.json"), capture_source=src)
+        engine.config.set_headless(True)
+        engine.config.save()
+        assert engine.start()
+        deadline = time.time() + 5.0
+        while not src.finished and time.time() < deadline:
+            time.sleep(0.01)
+        engine.stop()
+
+        # Reconnected and rescaled in memory only
+        assert engine.renderer.source_hwnds[live.thumbnail_id] == src.get_window_list()[0]["hwnd"]
+        region = engine.config.get_region(live.thumbnail_id, live.region_id)
+        assert region["rect"] == [200, 160, 400, 300]
+        assert {path: path.read_bytes() for path in tmp_path.glob("*.json")} == saved
+        assert not list(tmp_path.glob("*.jsonl"))
+
+    def test_loop_thread_free_runs(self, make_engine):
+        rig = make_engine([("static", 5), ("text", 0, REGION)], regions={"Region": REGION},
+                          alert_hold_seconds=0, refresh_rate=1000)
+        engine, src, hwnd, region_id = rig.engine, rig.src, rig.hwnd, rig.region_id
+        assert engine.start()
+        try:
+            deadline = time.time() + 5.0
+            while src.frame_index(hwnd) < 50 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            engine.stop()
+        # At a 1s refresh rate a paced loop would have served ~1 frame
+        assert src.frame_index(hwnd) >= 50
+        assert engine.monitoring_engine.get_monitor(region_id).state == STATE_ALERT
+
+    def test_start_does_not_duplicate_regions(self, make_engine):
+        rig = make_engine(("static",))
+        assert rig.engine.start()
+        rig.engine.stop()
+        assert rig.engine.monitoring_engine.thumbnail_monitors[rig.thumbnail_id] == [rig.region_id]
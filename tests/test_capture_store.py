@@ -0,0 +1,202 @@
+"""
+Tests for the content-addressed capture store.
+
+Run with:
+    pytest tests/test_capture_store.py -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.core.artifact_writer import ArtifactWriter  # noqa: E402
+from screenalert_core.core import capture_store  # noqa: E402
+from screenalert_core.core.capture_store import CaptureStore, image_digest  # noqa: E402
+from screenalert_core.mcp.tools.images import (  # noqa: E402
+    _find_capture_for_event, _find_latest_capture,
+)
+
+
+def _image(value: int) -> Image.Image:
+    return Image.fromarray(np.full((20, 30, 3), value, dtype=np.uint8))
+
+
+def _blob_files(root) -> list:
+    return [f for _, _, files in os.walk(os.path.join(root, "blobs")) for f in files]
+
+
+class TestCaptureStore:
+
+    def test_identical_images_are_written_once(self, tmp_path):
+        store = CaptureStore(str(tmp_path))
+        a = store.put("e1", "window_prev", _image(10), "w1", "r1")
+        b = store.put("e2", "window_prev", _image(10), "w1", "r1")
+        c = store.put("e2", "snapshot", _image(99), "w1", "r1")
+        assert a == b != c
+        assert len(_blob_files(tmp_path)) == 2
+        stats = store.stats()
+        assert (stats["puts"], stats["deduplicated"], stats["blobs"], stats["events"]) == (3, 1, 2, 2)
+        assert np.array_equal(np.asarray(Image.open(a)), np.asarray(_image(10)))
+
+    def test_digest_covers_mode_and_size(self):
+        gray = Image.new("L", (4, 3))
+        assert image_digest(gray) != image_digest(Image.new("L", (3, 4)))
+        assert image_digest(gray) != image_digest(gray.convert("RGB"))
+
+    def test_manifest_rebuilds_indexes(self, tmp_path):
+        store = CaptureStore(str(tmp_path))
+        store.put("e1", "snapshot", _image(1), "w1", "r1")
+        store.put("e2", "snapshot", _image(2), "w1", "r2")
+        store.put("e3", "edges_diff", _image(3), "w1", "r1")
+        store.close()
+
+        reopened = CaptureStore(str(tmp_path))
+        assert reopened.events() == ["e1", "e2", "e3"]
+        assert reopened.events("w1", "r1") == ["e1", "e3"]
+        assert reopened.latest_event("w1") == "e3"
+        assert reopened.latest_event("w1", "r2") == "e2"
+        # Newest event of r1 has no snapshot: falls back to the one before
+        assert reopened.latest_capture("w1", "r1") == reopened.get_event("e1")["snapshot"]
+        assert reopened.get_event("missing") == {}
+        # Already stored blobs are not written again
+        reopened.put("e4", "snapshot", _image(2), "w1", "r2")
+        assert reopened.stats()["deduplicated"] == 1
+
+    def test_pending_writes_of_one_blob_merge(self, tmp_path):
+        writer = ArtifactWriter(workers=1)
+        store = CaptureStore(str(tmp_path), writer=writer)
+        writer.start()
+        try:
+            for i in range(5):
+                store.put(f"e{i}", "snapshot", _image(7), "w1", "r1")
+            assert writer.wait_idle(2.0)
+        finally:
+            writer.stop()
+        assert len(_blob_files(tmp_path)) == 1
+        # Every put was written, merged into a queued write, or deduplicated
+        stats = writer.stats()
+        assert stats["written_by_kind"]["blob"] + stats["merged"] + store.stats()["deduplicated"] == 5
+
+    def test_full_writer_never_drops_indexed_blobs(self, tmp_path):
+        release = threading.Event()
+        writer = ArtifactWriter(workers=1, maxsize=2)
+        store = CaptureStore(str(tmp_path), writer=writer)
+        writer.start()
+        try:
+            writer.submit("snapshot", lambda: release.wait(2.0))
+            time.sleep(0.05)  # the worker is now blocked
+            for i in range(6):
+                store.put(f"e{i}", "snapshot", _image(10 * i), "w1", "r1")
+            writer.submit("snapshot", lambda: None)
+            writer.submit("snapshot", lambda: None)
+        finally:
+            release.set()
+            writer.stop(drain=True)
+        assert all(os.path.isfile(store.get_event(f"e{i}")["snapshot"]) for i in range(6))
+        assert writer.stats()["dropped"] == 1  # a loose snapshot, never a blob
+
+    def test_blob_stored_again_while_its_file_is_removed_survives(self, tmp_path, monkeypatch):
+        class _ThreadWriter:
+            def __init__(self):
+                self.threads = []
+
+            def submit(self, kind, fn, key=None, keep=False):
+                thread = threading.Thread(target=fn)
+                thread.start()
+                self.threads.append(thread)
+
+        writer = _ThreadWriter()
+        store = CaptureStore(str(tmp_path), writer=writer)
+        path = store.put("e1", "snapshot", _image(10), "w1", "r1")
+        writer.threads[-1].join()
+        size = os.path.getsize(path)
+        remove = os.remove
+
+        def remove_after_put(target):
+            # The same image is stored again between unindexing and removal
+            store.put("e2", "snapshot", _image(10), "w1", "r1")
+            writer.threads[-1].join(0.2)
+            remove(target)
+
+        monkeypatch.setattr(capture_store.os, "remove", remove_after_put)
+        store.delete_event("e1")
+        monkeypatch.setattr(capture_store.os, "remove", remove)
+        writer.threads[-1].join()
+        assert os.path.isfile(store.get_event("e2")["snapshot"])
+        assert store.total_bytes == size
+
+    def test_replaced_kind_releases_its_blob(self, tmp_path):
+        store = CaptureStore(str(tmp_path))
+        store.put("e1", "snapshot", _image(1), "w1", "r1")
+        store.put("e1", "snapshot", _image(1), "w1", "r1")
+        new = store.put("e1", "snapshot", _image(2), "w1", "r1")
+        assert _blob_files(tmp_path) == [os.path.basename(new)]
+        assert store.total_bytes == os.path.getsize(new)
+        assert store.usage()["blobs"] == 1
+
+    def test_mcp_lookups_use_the_store(self, tmp_path):
+        store = CaptureStore(str(tmp_path))
+        path = store.put("e1", "snapshot", _image(5), "w1", "r1")
+        assert _find_capture_for_event(None, "e1", store) == path
+        assert _find_latest_capture(None, "w1", "r1", store) == path
+        assert _find_latest_capture(None, "w1", "r2", store) is None
+
+
+class _EventLog:
+    def __init__(self):
+        self.events = []
+
+    def log(self, category, event, source, **fields):
+        self.events.append((category, event, fields))
+
+
+def test_engine_stores_alert_images_under_event_id(tmp_path, make_engine):
+    rig = make_engine(capture_on_alert=True, save_alert_diagnostics=True,
+                      capture_dir=str(tmp_path / "captures"))
+    engine = rig.engine
+    engine.event_logger = _EventLog()
+
+    rig.run()
+
+    (_, _, fields), = [e for e in engine.event_logger.events if e[0] == "alert"]
+    store = engine.capture_store
+    images = store.get_event(fields["event_id"])
+    assert images["snapshot"] == fields["capture_file"]
+    assert {"window_curr", "region_curr"} <= set(images)
+    assert all(os.path.isfile(path) for path in images.values())
+    assert store.latest_capture(rig.thumbnail_id, rig.region_id) == fields["capture_file"]
+    # Nothing loose next to the store
+    assert os.listdir(tmp_path / "captures") == ["store"]
+
+
+def test_resource_browser_pages_and_escapes_store_events(tmp_path, monkeypatch):
+    from screenalert_core.mcp import server
+    from screenalert_core.mcp.server import MCPServer
+
+    monkeypatch.setattr(server, "RESOURCE_PAGE_EVENTS", 2)
+    store = CaptureStore(str(tmp_path / "store"))
+    for i in range(5):
+        store.put(f"e{i}", "snapshot", _image(i), "w1", "r1", timestamp=100.0 + i)
+    store.put("<script>x</script>", "snapshot", _image(9), "w&1", "r\"1", timestamp=200.0)
+    browser = MCPServer(SimpleNamespace(capture_store=store), None, None)
+
+    first = browser._build_resource_browser_html(str(tmp_path))
+    assert "<script>" not in first
+    assert "&lt;script&gt;x&lt;/script&gt;" in first and "w&amp;1" in first and "r&quot;1" in first
+    assert "<td>e4</td>" in first and "<td>e3</td>" not in first
+    assert 'href="/v1/resources?offset=2"' in first and "Newer" not in first
+
+    last = browser._build_resource_browser_html(str(tmp_path), offset=4)
+    assert "<td>e0</td>" in last and "<td>e1</td>" in last and "<td>e2</td>" not in last
+    assert 'href="/v1/resources?offset=2">Newer' in last and "Older" not in last
@@ -0,0 +1,376 @@
+"""
+Tests for the event log storage backends (JSONL and SQLite).
+
+Run with:
+    pytest tests/test_event_stores.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.mcp.event_aggregates import EventAggregates  # noqa: E402
+from screenalert_core.mcp.event_logger import EventLogger  # noqa: E402
+from screenalert_core.mcp.event_stores import (  # noqa: E402
+    EVENT_LOG_BACKENDS, JsonlEventStore, SqliteEventStore, segment_rows_for, segments_dir,
+)
+from screenalert_core.mcp.tools.images import (  # noqa: E402
+    _find_capture_for_event, _find_latest_capture,
+)
+
+
+def _events(count=12):
+    events = []
+    for i in range(count):
+        events.append({
+            "id": f"e{i}",
+            "timestamp": f"2026-01-01T00:{i:02d}:00+00:00",
+            "category": "alert" if i % 3 == 0 else "window",
+            "event": "region_alert" if i % 3 == 0 else "window_connected",
+            "source": "engine",
+            "window_id": "w1" if i % 2 else "w2",
+            "window_name": "EVE" if i % 2 else "Game",
+            "region_id": "r1" if i % 2 else None,
+            "capture_file": "/tmp/x.png" if i == 3 else None,
+        })
+    return events
+
+
+@pytest.fixture(params=EVENT_LOG_BACKENDS)
+def logger_(request, tmp_path):
+    el = EventLogger(str(tmp_path / "event_log.jsonl"), max_rows=100, backend=request.param)
+    yield el
+    el.stop()
+
+
+def _fill(el, events):
+    for entry in events:
+        entry = dict(entry)
+        el.log(entry.pop("category"), entry.pop("event"), entry.pop("source"),
+               event_id=entry.pop("id"), **entry)
+
+
+class TestEventStores:
+
+    def test_filters_cursor_and_pages(self, logger_):
+        _fill(logger_, _events())
+        alerts = logger_.query(category="alert")
+        assert [e["id"] for e in alerts["events"]] == ["e0", "e3", "e6", "e9"]
+        page = logger_.query(limit=2, offset=1, window_id="w1", region_id="r1")
+        assert [e["id"] for e in page["events"]] == ["e3", "e5"]
+        assert (page["total"], page["has_more"]) == (6, True)
+        after = logger_.query(after_id="e9")
+        assert [e["id"] for e in after["events"]] == ["e10", "e11"]
+        assert logger_.query(after_id="missing")["total"] == 12
+
+    def test_summary_since(self, logger_):
+        _fill(logger_, _events())
+        summary = logger_.summary(since="2026-01-01T00:06:00+00:00")
+        assert summary["total"] == 6
+        assert summary["counts_by_category"] == {"alert": 2, "window": 4}
+        assert summary["counts_by_window"] == {"EVE": 3, "Game": 3}
+        assert logger_.summary()["alerts_with_captures"] == 1
+
+    def test_clear_and_trim(self, logger_):
+        logger_.set_max_rows(100)
+        _fill(logger_, _events(120))
+        page = logger_.query(limit=1)
+        # JSONL drops whole segments (10 rows here), so keeps up to one more
+        assert 100 <= page["total"] < 100 + segment_rows_for(100)
+        assert page["events"][0]["id"] == f"e{120 - page['total']}"
+        alerts = logger_.query(category="alert")["total"]
+        assert logger_.clear(category="alert") == alerts
+        remaining = logger_.query(limit=1000)["events"]
+        assert all(e["category"] != "alert" for e in remaining)
+        assert remaining[-1]["event"] == "event_log_cleared"
+        assert remaining[-1]["entries_deleted"] == alerts
+
+    def test_cursor_pages_and_polling(self, logger_):
+        _fill(logger_, _events())
+        page = logger_.query(limit=5, category="window")
+        assert [e["id"] for e in page["events"]] == ["e1", "e2", "e4", "e5", "e7"]
+        ids = []
+        cursor = page["cursor"]
+        while True:
+            page = logger_.query(limit=2, category="window", cursor=cursor)
+            assert page["total"] is None
+            ids += [e["id"] for e in page["events"]]
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                break
+        assert ids == ["e8", "e10", "e11"]
+        # Polling from the last cursor sees only new events
+        logger_.log("window", "window_lost", "engine", event_id="new")
+        assert [e["id"] for e in logger_.query(cursor=cursor)["events"]] == ["new"]
+        with pytest.raises(ValueError):
+            logger_.query(cursor="not-a-cursor")
+
+    def test_iter_events_resumes_from_cursor(self, logger_):
+        _fill(logger_, _events())
+        stream = logger_.iter_events(region_id="r1")
+        cursor, first = next(stream)
+        assert first["id"] == "e1"
+        rest = [e["id"] for _, e in logger_.iter_events(cursor, region_id="r1")]
+        assert rest == ["e3", "e5", "e7", "e9", "e11"]
+
+    def test_lookup_by_id_and_latest_capture(self, logger_, tmp_path):
+        capture = tmp_path / "snap.png"
+        capture.write_bytes(b"png")
+        _fill(logger_, _events())
+        logger_.log("alert", "region_alert", "engine", event_id="cap",
+                    window_id="w1", region_id="r1", capture_file=str(capture))
+        assert logger_.get_by_id("e7")["window_name"] == "EVE"
+        assert logger_.get_by_id("missing") is None
+        assert logger_.latest_capture("w1", "r1") == str(capture)
+        # Only w1 events carry a region
+        assert logger_.latest_capture("w2", "r1") is None
+        assert _find_capture_for_event(logger_, "cap") == str(capture)
+        assert _find_latest_capture(logger_, "w1", "r1") == str(capture)
+
+    def test_backends_agree(self, tmp_path):
+        jsonl = JsonlEventStore(str(tmp_path / "a.jsonl"))
+        sqlite = SqliteEventStore(str(tmp_path / "a.db"))
+        for store in (jsonl, sqlite):
+            store.append(_events(30))
+        for args in [(5, 0, None, None, None, None, None),
+                     (10, 3, "e4", "2026-01-01T00:02:00+00:00", "window", "w1", None)]:
+            a, b = jsonl.query(*args), sqlite.query(*args)
+            assert a.pop("cursor") and b.pop("cursor")
+            assert a == b
+        assert jsonl.summary() == sqlite.summary()
+        sqlite.close()
+
+
+class TestSummaryAggregates:
+
+    @staticmethod
+    def _recount(events, since=None):
+        aggregates = EventAggregates()
+        for entry in events:
+            if not since or entry["timestamp"] >= since:
+                aggregates.add(entry)
+        return aggregates.summary()
+
+    @staticmethod
+    def _exact(aggregates, events, since):
+        boundary = aggregates.boundary(since)
+        inside = [e for e in events if boundary and e["timestamp"].startswith(boundary)
+                  and e["timestamp"] >= since]
+        return aggregates.summary(since, boundary, inside)
+
+    def test_summary_reads_only_the_boundary_bucket(self, logger_, monkeypatch):
+        _fill(logger_, _events(40))
+        logger_.query(limit=1)  # flush
+        read = []
+        iter_events = type(logger_._store).iter_events
+
+        def counting(store, *args, **kwargs):
+            for item in iter_events(store, *args, **kwargs):
+                read.append(item)
+                yield item
+
+        monkeypatch.setattr(type(logger_._store), "iter_events", counting)
+        summary = logger_.summary(since="2026-01-01T00:35:00+00:00")
+        assert summary["total"] == 5
+        assert summary == self._recount(_events(40), "2026-01-01T00:35:00+00:00")
+        # The 00:35 minute, plus the row that shows it has ended
+        assert len(read) <= 2
+
+    def test_summary_since_mid_minute_is_exact(self, logger_):
+        events = _events(30)
+        for i, entry in enumerate(events):
+            entry["timestamp"] = f"2026-01-01T00:{i // 3:02d}:{i % 3 * 20:02d}+00:00"
+        _fill(logger_, events)
+        for since in ("2026-01-01T00:04:30+00:00", "2026-01-01T00:04:20+00:00",
+                      "2026-01-01T00:04", "2026-01-01T00:09:50+00:00"):
+            assert logger_.summary(since=since) == self._recount(events, since)
+
+    def test_trim_and_clear_decrement(self, logger_):
+        logger_.set_max_rows(100)
+        _fill(logger_, _events(60) * 3)
+        logger_.summary()  # flush + trim
+        kept = logger_.query(limit=1000)["events"]
+        assert logger_.summary() == self._recount(kept)
+        since = kept[0]["timestamp"]  # inside a bucket that lost rows to the trim
+        assert logger_.summary(since=since) == self._recount(kept, since)
+        logger_.clear(category="alert")
+        kept = logger_.query(limit=1000)["events"]
+        assert logger_.summary() == self._recount(kept)
+        assert "alert" not in logger_.summary()["counts_by_category"]
+
+    def test_minute_and_hour_buckets(self):
+        aggregates = EventAggregates(minute_bucket_hours=2)
+        events = [{"timestamp": f"2026-01-0{day}T{hour:02d}:{minute:02d}:00+00:00",
+                   "category": "alert", "event": "region_alert"}
+                  for day, hour, minute in [(1, 9, 0), (1, 9, 30), (1, 10, 5),
+                                            (2, 10, 0), (2, 10, 45), (2, 11, 59)]]
+        for entry in events:
+            aggregates.add(entry)
+        # Recent hours: the boundary is a minute
+        assert aggregates.boundary("2026-01-02T10:00:30+00:00") == "2026-01-02T10:00"
+        assert self._exact(aggregates, events, "2026-01-02T10:30:00+00:00")["total"] == 2
+        assert self._exact(aggregates, events, "2026-01-02T10:00:30+00:00")["total"] == 2
+        # Older than the minute window: the boundary is the hour
+        assert aggregates.boundary("2026-01-01T09:15:00+00:00") == "2026-01-01T09"
+        assert self._exact(aggregates, events, "2026-01-01T09:15:00+00:00")["total"] == 5
+        assert self._exact(aggregates, events, "2026-01-01T09:45:00+00:00")["total"] == 4
+        assert self._exact(aggregates, events, "2026-01-01T10:00:00+00:00")["total"] == 4
+        assert aggregates.boundary("2026-01-01T10") is None
+        aggregates.remove({"timestamp": "2026-01-02T11:59:00+00:00",
+                           "category": "alert", "event": "region_alert"})
+        assert aggregates.summary("2026-01-02T11")["total"] == 0
+        assert aggregates.summary()["counts_by_category"] == {"alert": 5}
+
+
+def _segment_files(path):
+    return sorted(os.listdir(segments_dir(path)))
+
+
+class TestJsonlSegments:
+
+    def test_segments_roll_over_and_trim_whole(self, tmp_path):
+        path = str(tmp_path / "event_log.jsonl")
+        store = JsonlEventStore(path, max_rows=100)
+        store.append(_events(35))
+        assert _segment_files(path) == ["000001.jsonl", "000002.jsonl", "000003.jsonl", "000004.jsonl"]
+        with open(os.path.join(segments_dir(path), "000002.jsonl"), encoding="utf-8") as f:
+            header = json.loads(f.readline())["segment"]
+        assert header["rows"] == 10
+        assert (header["first_ts"], header["last_ts"]) == (_events(35)[10]["timestamp"],
+                                                           _events(35)[19]["timestamp"])
+        assert store.trim(20) == 10
+        assert _segment_files(path)[0] == "000002.jsonl"
+        assert store.rows == 25
+        store.close()
+
+    def test_since_skips_older_segments(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "event_log.jsonl")
+        store = JsonlEventStore(path, max_rows=100)
+        store.append(_events(40))
+        read = []
+        original = JsonlEventStore._read_lines
+        monkeypatch.setattr(JsonlEventStore, "_read_lines",
+                            lambda self, seg, offset: read.append(seg.number) or original(self, seg, offset))
+        page = store.query(100, 0, None, "2026-01-01T00:35:00+00:00", None, None, None)
+        assert page["total"] == 5
+        assert set(read) == {4}
+        store.close()
+
+    def test_deep_cursor_page_reads_only_its_rows(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "event_log.jsonl")
+        store = JsonlEventStore(path, max_rows=5000)
+        store.append(_events(60) * 40)  # 2400 rows, 5 segments
+        cursor = store.query(5, 0, None, None, None, None, None)["cursor"]
+        for _ in range(200):
+            cursor = store.query(10, 0, None, None, None, None, None, cursor=cursor)["cursor"]
+        read = []
+        original = JsonlEventStore._read_lines
+        monkeypatch.setattr(JsonlEventStore, "_read_lines",
+                            lambda self, seg, offset: read.append(seg.number) or original(self, seg, offset))
+        page = store.query(10, 0, None, None, None, None, None, cursor=cursor)
+        assert len(page["events"]) == 10 and page["has_more"]
+        assert read == [5]  # one batch from the segment holding row 2005
+        store.close()
+
+    def test_indexes_survive_reopen_and_trim(self, tmp_path):
+        path = str(tmp_path / "event_log.jsonl")
+        store = JsonlEventStore(path, max_rows=100)
+        store.append(_events(35))
+        store.close()
+
+        store = JsonlEventStore(path, max_rows=100)
+        assert store.get_by_id("e34")["timestamp"] == _events(35)[34]["timestamp"]
+        assert store.latest_capture("w1", "r1") == "/tmp/x.png"
+        store.trim(20)
+        assert store.get_by_id("e5") is None and store.get_by_id("e15")["id"] == "e15"
+        # e3 carried the only capture and was trimmed with its segment
+        assert store.latest_capture("w1", "r1") is None
+        store.close()
+
+    def test_reopen_repairs_torn_tail_and_imports_legacy_file(self, tmp_path):
+        path = str(tmp_path / "event_log.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for entry in _events(15):
+                f.write(json.dumps(entry) + "\n")
+        store = JsonlEventStore(path, max_rows=100)
+        assert os.path.exists(path + ".migrated") and not os.path.exists(path)
+        store.close()
+        with open(os.path.join(segments_dir(path), "000002.jsonl"), "ab") as f:
+            f.write(b'{"id": "torn", "timest')
+
+        store = JsonlEventStore(path, max_rows=100)
+        assert store.rows == 15
+        store.append(_events(16)[15:])
+        assert [e["id"] for e in store.read_all()][-2:] == ["e14", "e15"]
+        store.close()
+
+
+def test_sqlite_migrates_existing_jsonl(tmp_path):
+    path = str(tmp_path / "event_log.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in _events(5):
+            f.write(json.dumps(entry) + "\n")
+
+    el = EventLogger(path, backend="sqlite")
+    assert el.backend == "sqlite"
+    assert [e["id"] for e in el.query()["events"]] == ["e0", "e1", "e2", "e3", "e4"]
+    el.stop()
+    assert not os.path.exists(path) and os.path.exists(path + ".migrated")
+    assert os.path.isdir(segments_dir(path) + ".migrated")
+    # Reopening does not import twice
+    el = EventLogger(path, backend="sqlite")
+    assert el.query()["total"] == 5
+    el.stop()
+
+
+def test_sqlite_ignores_duplicate_ids_and_dedupes_old_databases(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "event_log.db")
+    store = SqliteEventStore(path)
+    store.append(_events(6))
+    store.append(_events(8))  # a retried import
+    assert store.summary()["total"] == 8
+    assert store.query(100, 0, None, None, None, None, None)["total"] == 8
+    store.close()
+
+    # Databases from before the unique index may hold duplicates already
+    conn = sqlite3.connect(path)
+    conn.execute("DROP INDEX idx_events_unique_id")
+    conn.execute("CREATE INDEX idx_events_id ON events (id)")
+    conn.execute("INSERT INTO events (id, timestamp, data) SELECT id, timestamp, data FROM events")
+    conn.commit()
+    conn.close()
+    store = SqliteEventStore(path)
+    assert store.summary()["total"] == 8
+    store.append(_events(9))
+    result = store.query(100, 0, None, None, None, None, None)
+    assert sorted(e["id"] for e in result["events"]) == sorted(f"e{i}" for i in range(9))
+    store.close()
+
+
+def test_switching_backends_back_and_forth_imports_each_log_once(tmp_path):
+    path = str(tmp_path / "event_log.jsonl")
+    el = EventLogger(path)
+    el.log("test", "first", "test_suite")
+    el.stop()
+    EventLogger(path, backend="sqlite").stop()
+    el = EventLogger(path)
+    el.log("test", "second", "test_suite")
+    el.stop()
+
+    # The second segments directory is set aside next to the first one
+    for _ in range(3):
+        el = EventLogger(path, backend="sqlite")
+        assert [e["event"] for e in el.query(category="test")["events"]] == ["first", "second"]
+        el.stop()
+    assert os.path.isdir(segments_dir(path) + ".migrated.1")
+    assert not os.path.exists(segments_dir(path))
@@ -0,0 +1,196 @@
+"""
+Tests for the overload governor and the engine's load shedding.
+
+Tick durations are fed to the governor directly, so no real overload is
+needed.
+
+Run with:
+    pytest tests/test_load_governor.py -v
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core import screening_engine  # noqa: E402
+from screenalert_core.core.load_governor import (  # noqa: E402
+    LEVEL_DEFER_DIAGNOSTICS, LEVEL_FULL, LEVEL_REDUCED_SCALE, LEVEL_SHED_LOW_PRIORITY,
+    LoadGovernor,
+)
+from screenalert_core.core.pyramid import reduce_analysis_scale  # noqa: E402
+from screenalert_core.monitoring.region_monitor import (  # noqa: E402
+    STATE_ALERT, MonitoringEngine,
+)
+
+
+def _feed(governor, tick_ms, count, budget_ms=100.0):
+    return [step for step in (governor.observe(tick_ms, budget_ms, now=0.0) for _ in range(count))
+            if step is not None]
+
+
+class TestLoadGovernor:
+
+    def test_degrades_one_level_per_overrun_streak(self):
+        governor = LoadGovernor(overrun_ticks=3, headroom_ticks=4)
+        assert _feed(governor, 150, 2) == []
+        steps = _feed(governor, 150, 1)
+        assert [(s.old_level, s.new_level, s.degraded) for s in steps] == [(0, 1, True)]
+        _feed(governor, 150, 6)
+        assert governor.level == LEVEL_DEFER_DIAGNOSTICS
+        # Already at the last level
+        assert _feed(governor, 150, 10) == []
+
+    def test_interrupted_overrun_is_not_sustained(self):
+        governor = LoadGovernor(overrun_ticks=3)
+        for _ in range(5):
+            _feed(governor, 150, 2)
+            _feed(governor, 80, 1)
+        assert governor.level == LEVEL_FULL
+
+    def test_restores_one_level_per_headroom_streak(self):
+        governor = LoadGovernor(overrun_ticks=1, headroom_ticks=4)
+        _feed(governor, 150, 2)
+        assert governor.level == LEVEL_SHED_LOW_PRIORITY
+        # Ticks just under budget are not headroom
+        assert _feed(governor, 80, 20) == []
+        steps = _feed(governor, 20, 8)
+        assert [s.new_level for s in steps] == [LEVEL_REDUCED_SCALE, LEVEL_FULL]
+        assert not steps[0].degraded
+
+    def test_reset_and_stats(self):
+        governor = LoadGovernor(overrun_ticks=1)
+        _feed(governor, 150, 3)
+        step = governor.reset()
+        assert (step.old_level, step.new_level) == (LEVEL_DEFER_DIAGNOSTICS, LEVEL_FULL)
+        assert governor.reset() is None
+        stats = governor.stats()
+        assert stats["level_name"] == "full" and stats["overruns"] == 3
+        assert [s["to"] for s in stats["steps"]] == [
+            "reduced_scale", "shed_low_priority", "defer_diagnostics", "full"]
+
+
+def test_reduce_analysis_scale_keeps_min_side():
+    assert reduce_analysis_scale(1.0, 1, 400, 300) == 0.5
+    assert reduce_analysis_scale(0.5, 2, 400, 300) == 0.125
+    # 64 px side would drop below 32 at 1/4
+    assert reduce_analysis_scale(0.5, 1, 64, 400) == 0.5
+    assert reduce_analysis_scale(0.125, 1, 4000, 4000) == 0.125
+
+
+# ── Region monitor ────────────────────────────────────────────────────────────
+
+def _frame(value: int = 40, block=None) -> Image.Image:
+    arr = np.random.default_rng(0).integers(0, 60, (240, 320, 3), dtype=np.uint8) + value
+    if block:
+        x, y, w, h = block
+        arr[y:y + h, x:x + w] = 250
+    return Image.fromarray(arr)
+
+
+class TestScaleReduction:
+
+    def _engine(self, **region_cfg):
+        engine = MonitoringEngine(state_dir=None)
+        engine.add_region("r1", "t1", {"name": "R1", "rect": [20, 20, 160, 120], **region_cfg},
+                          global_config={"detection_method": "ssim"})
+        return engine
+
+    def test_change_at_the_switch_is_still_detected(self):
+        engine = self._engine()
+        engine.update_regions("t1", _frame())
+        engine.set_scale_reduction(1)
+        results = engine.update_regions("t1", _frame(block=(60, 50, 60, 50)))
+        monitor = engine.get_monitor("r1")
+        assert monitor.effective_analysis_scale == 0.5
+        assert results == [("r1", STATE_ALERT, True)]
+
+    def test_high_priority_and_mog2_keep_scale(self):
+        for cfg in ({"priority": "high"}, {"detection_method": "background_subtraction"}):
+            engine = self._engine(**cfg)
+            engine.set_scale_reduction(1)
+            engine.update_regions("t1", _frame())
+            assert engine.get_monitor("r1").effective_analysis_scale == 1.0
+
+    def test_new_regions_follow_current_reduction(self):
+        engine = self._engine()
+        engine.set_scale_reduction(1)
+        engine.add_region("r2", "t1", {"name": "R2", "rect": [0, 0, 200, 200]})
+        assert engine.get_monitor("r2").scale_reduction == 1
+        engine.set_scale_reduction(0)
+        assert engine.get_monitor("r2").scale_reduction == 0
+
+
+# ── Engine ────────────────────────────────────────────────────────────────────
+
+class _EventLog:
+    def __init__(self):
+        self.events = []
+
+    def log(self, category, event, source, **fields):
+        self.events.append((category, event, fields))
+
+
+def _engine(make_engine):
+    rig = make_engine(("static",), regions={})
+    rig.engine.event_logger = _EventLog()
+    rig.engine.load_governor = LoadGovernor(overrun_ticks=1, headroom_ticks=1)
+    return rig.engine, rig.thumbnail_id
+
+
+class TestEngineLoadShedding:
+
+    def test_steps_apply_degradations_and_log_events(self, make_engine):
+        engine, _ = _engine(make_engine)
+        engine._govern_load(200, 100)
+        assert engine.monitoring_engine.scale_reduction == 1
+        engine._govern_load(10, 100)
+        assert engine.monitoring_engine.scale_reduction == 0
+        events = [(e[1], e[2]["level_name"]) for e in engine.event_logger.events]
+        assert events == [("load_degraded", "reduced_scale"), ("load_restored", "full")]
+
+        engine._govern_load(200, 100)
+        engine.config.set_load_governor(False)
+        engine._govern_load(200, 100)
+        assert engine.load_status()["level_name"] == "full"
+
+    def test_low_priority_regions_run_every_other_time(self, make_engine):
+        engine, thumbnail_id = _engine(make_engine)
+        low = engine.add_region(thumbnail_id, "Low", (20, 20, 80, 60))
+        normal = engine.add_region(thumbnail_id, "Normal", (200, 20, 80, 60))
+        engine.config.update_region(thumbnail_id, low, {"priority": "low"})
+        thumbnail_config = engine.config.get_thumbnail(thumbnail_id)
+
+        assert engine._shed_low_priority(thumbnail_config, None) is None
+        for _ in range(2):
+            engine._govern_load(200, 100)
+        runs = [engine._shed_low_priority(thumbnail_config, None) for _ in range(4)]
+        assert runs == [{normal}, None, {normal}, None]
+        # Not due: nothing to alternate
+        assert engine._shed_low_priority(thumbnail_config, {normal}) == {normal}
+
+    def test_diagnostics_deferred_until_headroom(self, make_engine, monkeypatch):
+        written = []
+        monkeypatch.setattr(screening_engine, "save_alert_diagnostics",
+                            lambda *args: written.append(args[2]["name"]))
+        engine, thumbnail_id = _engine(make_engine)
+        region_id = engine.add_region(thumbnail_id, "Region", (20, 20, 80, 60))
+        thumbnail_config = engine.config.get_thumbnail(thumbnail_id)
+        region = engine.monitoring_engine.get_monitor(region_id)
+        for _ in range(3):
+            engine._govern_load(200, 100)
+
+        engine._save_diagnostics(thumbnail_config, region.config, _frame(), region)
+        assert written == [] and engine.load_status()["deferred_diagnostics"] == 1
+
+        engine._govern_load(10, 100)
+        for thread in [t for t in screening_engine.threading.enumerate() if t.name == "diagnostics-flush"]:
+            thread.join(2.0)
+        assert written == ["Region"]
+        assert engine.load_status()["deferred_diagnostics"] == 0
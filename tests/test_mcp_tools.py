@@ -819,6 +819,21 @@ class TestWindowTools:
                        {"window_id": TEST_WINDOW_ID, "key": "enabled", "value": False})
         assert result.get("ok") is True
 
+    def test_set_window_setting_poll_interval(self):
+        result = _call(_S.mcp, "set_window_setting",
+                       {"window_id": TEST_WINDOW_ID, "key": "poll_interval_ms", "value": 2000})
+        assert result.get("ok") is True
+        settings = _call(_S.mcp, "get_window_settings", {"window_id": TEST_WINDOW_ID})
+        assert settings["poll_interval_ms"]["effective_value"] == 2000
+        result = _call(_S.mcp, "set_window_setting",
+                       {"window_id": TEST_WINDOW_ID, "key": "poll_interval_ms", "value": None})
+        assert result.get("ok") is True
+
+    def test_set_window_setting_poll_interval_invalid(self):
+        result = _call(_S.mcp, "set_window_setting",
+                       {"window_id": TEST_WINDOW_ID, "key": "min_interval_ms", "value": "soon"})
+        assert result.get("code") == 422
+
     def test_set_window_setting_unknown_key(self):
         result = _call(_S.mcp, "set_window_setting",
                        {"window_id": TEST_WINDOW_ID, "key": "bogus_key", "value": 1})
@@ -982,6 +997,91 @@ class TestRegionTools:
         })
         assert result.get("code") == 422
 
+    def test_set_region_setting_ssim_window(self):
+        result = _call(_S.mcp, "set_region_setting", {
+            "region_id": TEST_REGION_ID,
+            "key": "ssim_window",
+            "value": "gaussian",
+        })
+        assert result.get("ok") is True
+
+    def test_set_region_setting_ssim_window_invalid(self):
+        result = _call(_S.mcp, "set_region_setting", {
+            "region_id": TEST_REGION_ID,
+            "key": "ssim_window",
+            "value": "triangle",
+        })
+        assert result.get("code") == 422
+        assert result.get("valid_values") == ["box", "gaussian"]
+
+    def test_set_region_setting_analysis_scale(self):
+        for value in (0.5, "auto", 1.0):
+            result = _call(_S.mcp, "set_region_setting", {
+                "region_id": TEST_REGION_ID,
+                "key": "analysis_scale",
+                "value": value,
+            })
+            assert result.get("ok") is True
+
+    def test_set_region_setting_analysis_scale_invalid(self):
+        result = _call(_S.mcp, "set_region_setting", {
+            "region_id": TEST_REGION_ID,
+            "key": "analysis_scale",
+            "value": 0.3,
+        })
+        assert result.get("code") == 422
+
+    def test_set_region_setting_cascade_gate_threshold(self):
+        result = _call(_S.mcp, "set_region_setting", {
+            "region_id": TEST_REGION_ID,
+            "key": "cascade_gate_threshold",
+            "value": 0.01,
+        })
+        assert result.get("ok") is True
+
+    def test_set_region_setting_cascade_gate_invalid(self):
+        result = _call(_S.mcp, "set_region_setting", {
+            "region_id": TEST_REGION_ID,
+            "key": "cascade_gate",
+            "value": "md5",
+        })
+        assert result.get("code") == 422
+
+    def test_set_region_setting_poll_intervals(self):
+        for key, value in (("poll_interval_ms", 250), ("min_interval_ms", 100), ("poll_interval_ms", None)):
+            result = _call(_S.mcp, "set_region_setting", {
+                "region_id": TEST_REGION_ID, "key": key, "value": value,
+            })
+            assert result.get("ok") is True
+
+    def test_set_region_setting_adaptive_polling(self):
+        for value in (True, None):
+            result = _call(_S.mcp, "set_region_setting", {
+                "region_id": TEST_REGION_ID, "key": "adaptive_polling", "value": value,
+            })
+            assert result.get("ok") is True
+
+    def test_set_region_setting_priority(self):
+        result = _call(_S.mcp, "set_region_setting", {
+            "region_id": TEST_REGION_ID, "key": "priority", "value": "high",
+        })
+        assert result.get("ok") is True
+        settings = _call(_S.mcp, "get_region_settings", {"region_id": TEST_REGION_ID})
+        assert settings["priority"]["value"] == "high"
+        result = _call(_S.mcp, "set_region_setting", {
+            "region_id": TEST_REGION_ID, "key": "priority", "value": "urgent",
+        })
+        assert result.get("code") == 422
+
+    def test_set_region_setting_poll_interval_invalid(self):
+        result = _call(_S.mcp, "set_region_setting", {
+            "region_id": TEST_REGION_ID,
+            "key": "poll_interval_ms",
+            "value": 10,
+        })
+        assert result.get("code") == 422
+        assert result.get("valid_range") == [50, 3600000]
+
     def test_set_region_setting_unknown_key(self):
         result = _call(_S.mcp, "set_region_setting", {
             "region_id": TEST_REGION_ID,
@@ -1175,6 +1275,29 @@ class TestEventLogTools:
             assert not any(e["id"] == pivot_id
                            for e in result.get("events", []))
 
+    def test_get_event_log_cursor(self):
+        """A returned cursor resumes after the page; a bad cursor is a 400."""
+        _skip_in_live("requires direct event_logger access to seed test events")
+        for name in ("page_a", "page_b", "page_c"):
+            _S.event_logger.log("paging", name, "test_suite")
+        first = _call(_S.mcp, "get_event_log", {"category": "paging", "limit": 1})
+        assert first["cursor"]
+        rest = _call(_S.mcp, "get_event_log",
+                     {"category": "paging", "cursor": first["cursor"]})
+        assert [e["event"] for e in rest["events"]] == ["page_b", "page_c"]
+        bad = _call(_S.mcp, "get_event_log", {"cursor": "garbage"})
+        assert bad.get("code") == 400
+
+    def test_get_alert_rollup(self):
+        """Rollup returns bucketed series (503 when the engine keeps none)."""
+        result = _call(_S.mcp, "get_alert_rollup", {"bucket_minutes": 60})
+        if result.get("code") == 503:
+            return
+        assert result["bucket_seconds"] == 3600
+        assert {"series", "windows", "regions"} <= set(result)
+        bad = _call(_S.mcp, "get_alert_rollup", {"since": "not a date"})
+        assert bad.get("code") == 400
+
 
 class TestImageTools:
 
@@ -0,0 +1,155 @@
+"""
+Tests for the staged engine pipeline (bounded queues and worker stages).
+
+Run with:
+    pytest tests/test_pipeline.py -v
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.core.capture_sources import SyntheticCaptureSource  # noqa: E402
+from screenalert_core.core.pipeline import (  # noqa: E402
+    POLICY_COALESCE, POLICY_DROP_OLDEST, BoundedQueue, PipelineStage,
+)
+from screenalert_core.monitoring.region_monitor import STATE_ALERT  # noqa: E402
+
+
+class TestBoundedQueue:
+
+    def test_drop_oldest(self):
+        q = BoundedQueue(2, POLICY_DROP_OLDEST)
+        assert [q.put(i) for i in range(4)] == [0, 0, 1, 1]
+        assert [q.get(0), q.get(0), q.get(0)] == [2, 3, None]
+        stats = q.stats()
+        assert (stats["dropped"], stats["max_depth"], stats["depth"]) == (2, 2, 0)
+
+    def test_coalesce_merges_in_place(self):
+        q = BoundedQueue(8, POLICY_COALESCE, key=lambda item: item[0],
+                         merge=lambda queued, new: (queued[0], queued[1] + new[1]))
+        for item in (("a", 1), ("b", 1), ("a", 2), ("a", 3)):
+            q.put(item)
+        assert [q.get(0), q.get(0)] == [("a", 6), ("b", 1)]
+        assert q.stats()["coalesced"] == 2
+
+    def test_coalesce_full_drops_oldest_key(self):
+        q = BoundedQueue(2, POLICY_COALESCE, key=lambda item: item)
+        for item in ("a", "b", "c"):
+            q.put(item)
+        assert [q.get(0), q.get(0)] == ["b", "c"]
+
+    def test_coalesce_needs_key(self):
+        with pytest.raises(ValueError):
+            BoundedQueue(2, POLICY_COALESCE)
+        with pytest.raises(ValueError):
+            BoundedQueue(2, "block")
+
+
+class TestPipelineStage:
+
+    def test_inline_until_started(self):
+        seen = []
+        stage = PipelineStage("t", lambda item: seen.append((item, threading.current_thread())), 4)
+        stage.submit(1)
+        assert seen == [(1, threading.current_thread())]
+        assert stage.stats()["workers"] == 0
+
+    def test_workers_drain_queue(self):
+        seen = []
+        stage = PipelineStage("t", seen.append, 16)
+        stage.start()
+        try:
+            for i in range(10):
+                stage.submit(i)
+            assert stage.wait_idle(2.0)
+            assert seen == list(range(10))
+            assert stage.stats()["processed"] == 10
+        finally:
+            stage.stop()
+
+    def test_slow_handler_coalesces_and_stop_drains(self):
+        release = threading.Event()
+        seen = []
+
+        def handler(item):
+            release.wait(2.0)
+            seen.append(item)
+
+        stage = PipelineStage("t", handler, 4, POLICY_COALESCE, key=lambda item: item[0])
+        stage.start()
+        stage.submit(("a", 0))
+        time.sleep(0.05)  # worker is now blocked on ("a", 0)
+        for i in range(1, 6):
+            stage.submit(("a", i))
+        stage.submit(("b", 0))
+        assert stage.stats()["depth"] == 2
+        release.set()
+        stage.stop(drain=True)
+        assert seen == [("a", 0), ("a", 5), ("b", 0)]
+        assert stage.stats()["coalesced"] == 4
+
+    def test_handler_errors_are_counted(self):
+        def handler(item):
+            raise RuntimeError("boom")
+
+        stage = PipelineStage("t", handler, 4)
+        stage.submit(1)
+        assert stage.stats()["errors"] == 1
+
+    def test_busy_time_is_not_lost_across_workers(self):
+        def handler(item):
+            end = time.perf_counter() + 0.0005
+            while time.perf_counter() < end:
+                pass
+
+        stage = PipelineStage("t", handler, 4096, workers=4)
+        stage.start()
+        taken = 0.0
+        try:
+            for i in range(400):
+                stage.submit(i)
+                taken += stage.take_busy_ms()
+            assert stage.wait_idle(5.0)
+        finally:
+            stage.stop()
+        taken += stage.take_busy_ms()
+        stats = stage.stats()
+        assert stats["processed"] == 400
+        assert taken == pytest.approx(stats["busy_ms"], abs=0.01)
+
+
+def test_slow_dispatch_does_not_delay_detection(make_engine):
+    rig = make_engine(source=SyntheticCaptureSource(fps=200), refresh_rate=50)
+    engine, region_id = rig.engine, rig.region_id
+
+    release = threading.Event()
+    alerts = []
+
+    def slow_alert(tid, rid, name):
+        release.wait(5.0)  # a stuck sound device / disk
+        alerts.append(rid)
+
+    engine.on_alert = slow_alert
+    assert engine.start()
+    try:
+        deadline = time.time() + 5.0
+        while engine.pipeline_stats()["detect"]["processed"] < 10 and time.time() < deadline:
+            time.sleep(0.02)
+        stats = engine.pipeline_stats()
+        assert stats["detect"]["processed"] >= 10
+        assert engine.monitoring_engine.get_monitor(region_id).state == STATE_ALERT
+        # One region: its outcomes coalesce into at most one queued event
+        assert stats["dispatch"]["depth"] <= 1
+    finally:
+        release.set()
+        engine.stop()
+    assert alerts and set(alerts) == {region_id}
@@ -0,0 +1,231 @@
+"""
+Tests for deadline-ordered window/region polling.
+
+The scheduler runs on a fake clock; the engine tests drive the scheduled
+loop path with the synthetic capture source.
+
+Run with:
+    pytest tests/test_poll_scheduler.py -v
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.core.poll_scheduler import (  # noqa: E402
+    MIN_POLL_INTERVAL_S, PollScheduler, adaptive_interval,
+)
+from screenalert_core.monitoring.region_monitor import STATE_ALERT  # noqa: E402
+
+
+class _Clock:
+    def __init__(self, t: float = 100.0):
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def _keys(jobs):
+    return [job.key for job in jobs]
+
+
+class TestPollScheduler:
+
+    def test_new_jobs_due_immediately_then_by_interval(self):
+        clock = _Clock()
+        sched = PollScheduler(clock)
+        sched.set_job("fast", 0.5)
+        sched.set_job("slow", 2.0)
+        assert sorted(_keys(sched.pop_due())) == ["fast", "slow"]
+        assert sched.next_due() == pytest.approx(100.5)
+
+        clock.t = 100.5
+        assert _keys(sched.pop_due()) == ["fast"]
+        assert sched.pop_due() == []
+
+    def test_deadlines_do_not_drift(self):
+        clock = _Clock()
+        sched = PollScheduler(clock)
+        sched.set_job("a", 1.0)
+        sched.pop_due()
+        # Run 0.3s late every time: deadlines stay on the 1s grid
+        for i in range(1, 6):
+            clock.t = 100.0 + i + 0.3
+            (job,) = sched.pop_due()
+            assert job.due == pytest.approx(100.0 + i)
+            assert job.late_ms == pytest.approx(300.0)
+        assert sched.next_due() == pytest.approx(106.0)
+        stats = sched.lateness()["a"]
+        assert stats["runs"] == 6 and stats["late_max_ms"] == pytest.approx(300.0)
+
+    def test_missed_slots_are_skipped_not_replayed(self):
+        clock = _Clock()
+        sched = PollScheduler(clock)
+        sched.set_job("a", 1.0)
+        sched.pop_due()
+        clock.t = 104.5
+        (job,) = sched.pop_due()
+        assert job.due == pytest.approx(101.0)
+        assert sched.next_due() == pytest.approx(105.0)
+        assert sched.lateness()["a"]["skipped"] == 3
+        assert sched.pop_due() == []
+
+    def test_pop_order_follows_deadlines(self):
+        clock = _Clock()
+        sched = PollScheduler(clock)
+        for key, interval in (("c", 0.3), ("a", 0.1), ("b", 0.2)):
+            sched.set_job(key, interval)
+        sched.pop_due()
+        clock.t = 100.35
+        assert _keys(sched.pop_due()) == ["a", "b", "c"]
+
+    def test_sync_adds_updates_and_removes(self):
+        clock = _Clock()
+        sched = PollScheduler(clock)
+        sched.sync({"a": (1.0, 0.0), "b": (1.0, 0.0)})
+        sched.pop_due()
+        sched.sync({"a": (3.0, 0.0), "c": (1.0, 0.0)})
+        assert set(sched.keys()) == {"a", "c"}
+        assert sched.next_due() == pytest.approx(100.0)  # c is new
+        sched.pop_due()
+        assert sched.next_due() == pytest.approx(101.0)  # c; a moved to 103
+        clock.t = 102.0
+        assert _keys(sched.pop_due()) == ["c"]
+        clock.t = 103.0
+        assert sorted(_keys(sched.pop_due())) == ["a", "c"]
+
+    def test_run_early_respects_min_interval(self):
+        clock = _Clock()
+        sched = PollScheduler(clock)
+        sched.set_job("r", 2.0, min_interval=0.5)
+        sched.set_job("plain", 2.0)
+        sched.pop_due()
+        clock.t = 100.3
+        assert not sched.run_early("r")
+        assert not sched.run_early("plain")
+        clock.t = 100.6
+        assert sched.run_early("r")
+        assert sched.next_due() == pytest.approx(102.0)  # plain
+        clock.t = 102.0
+        assert _keys(sched.pop_due()) == ["plain"]
+        clock.t = 102.6
+        assert _keys(sched.pop_due()) == ["r"]
+        assert sched.lateness()["r"]["early_runs"] == 1
+
+    def test_interval_clamped(self):
+        sched = PollScheduler(_Clock())
+        sched.set_job("a", 0.0)
+        assert sched.lateness()["a"]["interval_ms"] == MIN_POLL_INTERVAL_S * 1000.0
+
+    def test_stats(self):
+        clock = _Clock()
+        sched = PollScheduler(clock)
+        assert sched.stats()["next_due_in_ms"] is None
+        sched.set_job("a", 1.0)
+        clock.t = 100.2
+        sched.pop_due()
+        stats = sched.stats()
+        assert stats["jobs"] == 1 and stats["runs"] == 1
+        assert stats["late_max_ms"] == pytest.approx(200.0)
+        assert stats["next_due_in_ms"] == pytest.approx(800.0)
+
+
+def test_adaptive_interval_doubles_per_stable_period():
+    assert adaptive_interval(100, 0, 30, 1000) == 100
+    assert adaptive_interval(100, 29, 30, 1000) == 100
+    assert adaptive_interval(100, 30, 30, 1000) == 200
+    assert adaptive_interval(100, 95, 30, 1000) == 800
+    assert adaptive_interval(100, 10 ** 9, 30, 1000) == 1000
+    # A ceiling below the base never shortens the interval
+    assert adaptive_interval(2000, 300, 30, 1000) == 2000
+
+
+# ── Engine ────────────────────────────────────────────────────────────────────
+
+REGION_A = (20, 20, 80, 60)
+REGION_B = (200, 20, 80, 60)
+
+
+def _engine(make_engine, script=("static",)):
+    rig = make_engine(script, regions={"Fast": REGION_A, "Slow": REGION_B}, loop=True,
+                      refresh_rate=1000)
+    fast, slow = rig.region_ids
+    rig.engine.config.update_region(rig.thumbnail_id, fast, {"poll_interval_ms": 50})
+    return rig.engine, rig.src, rig.hwnd, rig.thumbnail_id, fast, slow
+
+
+def _run_for(engine, seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        engine.run_cycle(scheduled=True)
+        time.sleep(0.005)
+
+
+class TestScheduledEngine:
+
+    def test_regions_poll_at_their_own_interval(self, make_engine):
+        engine, src, hwnd, thumbnail_id, fast, slow = _engine(make_engine)
+        _run_for(engine, 0.5)
+        stats = engine.poll_lateness()
+        assert stats[f"region:{fast}"]["runs"] >= 6
+        assert stats[f"region:{slow}"]["runs"] == 1
+        assert stats[f"window:{thumbnail_id}"]["runs"] == 1
+        # One capture per fast-region deadline, not one per loop pass
+        assert src.frame_index(hwnd) == stats[f"region:{fast}"]["runs"]
+
+    def test_early_run_on_shared_frame(self, make_engine):
+        engine, _, _, thumbnail_id, fast, slow = _engine(make_engine)
+        engine.config.update_region(thumbnail_id, slow, {"min_interval_ms": 100})
+        _run_for(engine, 0.5)
+        stats = engine.poll_lateness()[f"region:{slow}"]
+        assert stats["runs"] >= 3 and stats["early_runs"] == stats["runs"] - 1
+
+    def test_unscheduled_cycle_runs_everything(self, make_engine):
+        engine, src, hwnd, *_ = _engine(make_engine)
+        engine.run_cycle()
+        engine.run_cycle()
+        assert src.frame_index(hwnd) == 2
+        assert len(engine.poll_scheduler) == 0
+
+    def test_adaptive_backoff_and_snap_back(self, make_engine):
+        engine, _, _, _, fast, _ = _engine(make_engine)
+        engine.config.set_adaptive_polling(True)
+        _run_for(engine, 0.2)
+        key = f"region:{fast}"
+        assert engine.poll_lateness()[key]["interval_ms"] == 50
+
+        # Quiet for two stable periods (30 s each): 4x the interval
+        monitor = engine.monitoring_engine.get_monitor(fast)
+        monitor.stable_since -= 60
+        _run_for(engine, 0.1)
+        assert engine.poll_lateness()[key]["interval_ms"] == 200
+
+        # A change resets the quiet time and the normal rate returns
+        monitor.stable_since = None
+        engine.run_cycle(scheduled=True)
+        assert engine.poll_lateness()[key]["interval_ms"] == 50
+
+    def test_adaptive_alerting_region_polls_at_min_interval(self, make_engine):
+        engine, _, _, thumbnail_id, _, slow = _engine(
+            make_engine, [("static", 2), ("text", 0, REGION_B)])
+        engine.config.set_adaptive_polling(True)
+        engine.config.update_region(thumbnail_id, slow, {"min_interval_ms": 100})
+        _run_for(engine, 1.5)
+        assert engine.monitoring_engine.get_monitor(slow).state == STATE_ALERT
+        assert engine.poll_lateness()[f"region:{slow}"]["interval_ms"] == 100
+
+    def test_adaptive_polling_per_region_override(self, make_engine):
+        engine, _, _, thumbnail_id, fast, _ = _engine(make_engine)
+        engine.config.update_region(thumbnail_id, fast, {"adaptive_polling": True})
+        _run_for(engine, 0.1)
+        engine.monitoring_engine.get_monitor(fast).stable_since -= 30
+        _run_for(engine, 0.15)
+        assert engine.poll_lateness()[f"region:{fast}"]["interval_ms"] == 100
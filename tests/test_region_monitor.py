@@ -0,0 +1,584 @@
+"""
+Unit tests for the region monitoring hot path and change detectors.
+
+These run on synthetic frames only — no window capture is involved.
+
+Run with:
+    pytest tests/test_region_monitor.py -v
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.core.change_detectors import (  # noqa: E402
+    DETECTOR_REGISTRY, CascadeDetector, EdgeDetector, MOG2Detector, PHashDetector,
+    SSIMDetector, as_gray, create_detector,
+)
+from screenalert_core.core.dirty_map import TileDirtyMap  # noqa: E402
+from screenalert_core.core.image_processor import ImageProcessor  # noqa: E402
+from screenalert_core.core import pyramid as pyramid_mod  # noqa: E402
+from screenalert_core.core.pyramid import (  # noqa: E402
+    FramePyramid, auto_analysis_scale, normalize_analysis_scale, scale_rect,
+)
+from screenalert_core.monitoring.region_monitor import (  # noqa: E402
+    MonitoringEngine, STATE_ALERT, STATE_OK, _build_detector_kwargs,
+)
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _frame(seed: int = 0, size=(320, 240)) -> Image.Image:
+    """Deterministic RGB window frame with some structure."""
+    rng = np.random.default_rng(seed)
+    w, h = size
+    arr = np.full((h, w, 3), 40, dtype=np.uint8)
+    for _ in range(12):
+        x, y = int(rng.integers(0, w - 40)), int(rng.integers(0, h - 30))
+        arr[y:y + 30, x:x + 40] = rng.integers(80, 255, size=3, dtype=np.uint8)
+    return Image.fromarray(arr)
+
+
+def _with_block(img: Image.Image, rect, value: int = 250) -> Image.Image:
+    arr = np.array(img)
+    x, y, w, h = rect
+    arr[y:y + h, x:x + w] = value
+    return Image.fromarray(arr)
+
+
+def _engine_with_region(rect, method: str = "ssim", **region_cfg) -> MonitoringEngine:
+    engine = MonitoringEngine()
+    engine.add_region(
+        "r1", "t1",
+        {"name": "R1", "rect": list(rect), "detection_method": method, **region_cfg},
+        global_config={"detection_method": method},
+    )
+    return engine
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Frame views
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestFrameViews:
+
+    def test_crop_array_is_view(self):
+        gray = ImageProcessor.to_gray_array(_frame())
+        view = ImageProcessor.crop_array(gray, (10, 20, 50, 40))
+        assert view.shape == (40, 50)
+        assert np.shares_memory(view, gray)
+
+    def test_crop_array_clips_to_bounds(self):
+        gray = ImageProcessor.to_gray_array(_frame(size=(100, 80)))
+        assert ImageProcessor.crop_array(gray, (90, 70, 50, 50)).shape == (10, 10)
+        assert ImageProcessor.crop_array(gray, (200, 200, 10, 10)).size == 0
+
+    def test_crop_array_matches_pil_crop(self):
+        img = _frame(3)
+        rect = (15, 25, 60, 45)
+        expected = np.asarray(ImageProcessor.crop_region(img, rect).convert("L"))
+        got = ImageProcessor.crop_array(ImageProcessor.to_gray_array(img), rect)
+        assert np.array_equal(expected, got)
+
+    def test_as_gray_passthrough_for_2d_uint8(self):
+        arr = np.zeros((10, 10), dtype=np.uint8)
+        assert as_gray(arr) is arr
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Detectors accept arrays and PIL images alike
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.parametrize("detector_cls", [SSIMDetector, PHashDetector, EdgeDetector])
+def test_detector_array_and_pil_agree(detector_cls):
+    prev = _frame(1)
+    curr = _with_block(prev, (100, 100, 80, 60))
+    det_pil = detector_cls()
+    det_arr = detector_cls()
+    r_pil = det_pil.detect(prev, curr)
+    r_arr = det_arr.detect(ImageProcessor.to_gray_array(prev),
+                           ImageProcessor.to_gray_array(curr))
+    assert r_pil == r_arr is True
+    assert det_pil.last_detect_info == det_arr.last_detect_info
+
+
+def test_mog2_accepts_views():
+    det = MOG2Detector(warmup_frames=2)
+    gray = ImageProcessor.to_gray_array(_frame())
+    view = ImageProcessor.crop_array(gray, (0, 0, 100, 100))
+    for _ in range(3):
+        det.detect(view, view)
+    assert det.last_detect_info["warmed_up"] is True
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MonitoringEngine.update_regions
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestUpdateRegions:
+
+    def test_static_frames_stay_ok(self):
+        engine = _engine_with_region((20, 20, 120, 100))
+        img = _frame()
+        for _ in range(3):
+            results = engine.update_regions("t1", img)
+        assert results == [("r1", STATE_OK, False)]
+
+    def test_change_raises_alert_with_colour_crops(self):
+        rect = (20, 20, 120, 100)
+        engine = _engine_with_region(rect)
+        prev = _frame()
+        engine.update_regions("t1", prev)
+        curr = _with_block(prev, (40, 40, 60, 50))
+        results = engine.update_regions("t1", curr)
+        assert results == [("r1", STATE_ALERT, True)]
+
+        monitor = engine.get_monitor("r1")
+        assert monitor.last_alert_curr_image.mode == "RGB"
+        assert monitor.last_alert_curr_image.size == (120, 100)
+        assert monitor.last_alert_prev_image.size == (120, 100)
+
+    def test_stable_since_tracks_quiet_ok_time(self):
+        engine = _engine_with_region((20, 20, 120, 100), alert_hold_seconds=0)
+        monitor = engine.get_monitor("r1")
+        prev = _frame()
+        engine.update_regions("t1", prev)
+        engine.update_regions("t1", prev)
+        quiet_from = monitor.stable_since
+        assert quiet_from is not None
+        engine.update_regions("t1", prev)
+        assert monitor.stable_since == quiet_from
+
+        engine.update_regions("t1", _with_block(prev, (40, 40, 60, 50)))
+        assert monitor.state == STATE_ALERT and monitor.stable_since is None
+        monitor.reset()
+        assert monitor.stable_since is None
+
+    def test_region_outside_window_is_skipped(self):
+        engine = _engine_with_region((1000, 1000, 50, 50))
+        assert engine.update_regions("t1", _frame()) == [("r1", STATE_OK, False)]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Per-detector feature cache
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestFeatureCache:
+
+    @pytest.mark.parametrize("detector_cls", [SSIMDetector, PHashDetector, EdgeDetector])
+    def test_previous_frame_not_reprocessed(self, detector_cls, monkeypatch):
+        det = detector_cls()
+        frames = [ImageProcessor.to_gray_array(_frame(i)) for i in range(4)]
+        calls = []
+        original = det._extract_features
+        monkeypatch.setattr(det, "_extract_features",
+                            lambda f: calls.append(f) or original(f))
+        for prev, curr in zip(frames, frames[1:]):
+            det.detect(prev, curr)
+        # First call extracts both frames, every later call only ``curr``
+        assert len(calls) == len(frames)
+
+    def test_ssim_matches_skimage(self):
+        from skimage.metrics import structural_similarity
+        g1 = ImageProcessor.to_gray_array(_frame(5))
+        g2 = ImageProcessor.to_gray_array(_with_block(_frame(5), (30, 30, 40, 40), 10))
+        det = SSIMDetector(threshold=0.0)
+        det.detect(g1, g2)
+        expected = structural_similarity(g1, g2)
+        assert det.last_detect_info["similarity"] == round(expected, 4)
+
+    def test_reset_invalidates_cache(self):
+        det = EdgeDetector()
+        g = ImageProcessor.to_gray_array(_frame())
+        det.detect(g, g)
+        assert det._cached_frame is g
+        det.reset()
+        assert det._cached_frame is None
+
+    def test_edge_size_change_reports_full_change(self):
+        det = EdgeDetector()
+        g = ImageProcessor.to_gray_array(_frame())
+        det.detect(g, g)
+        assert det.detect(g, g[:60, :60])
+        assert det.last_detect_info["edge_change_pct"] == 100.0
+        assert "min_edge_pct" in det.last_detect_info
+
+    def test_region_resize_invalidates_cache(self):
+        engine = _engine_with_region((10, 10, 100, 80), method="edge_only")
+        monitor = engine.get_monitor("r1")
+        engine.update_regions("t1", _frame(0))
+        engine.update_regions("t1", _frame(1))
+        assert monitor.detector._cached_frame is not None
+        monitor.config["rect"] = [10, 10, 60, 60]
+        engine.update_regions("t1", _frame())
+        assert monitor.detector._cached_frame is None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Tile-hash dirty map
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestDirtyMap:
+
+    def test_first_frame_is_all_dirty(self):
+        dm = TileDirtyMap(tile_size=32)
+        assert dm.update(ImageProcessor.to_gray_array(_frame())) is None
+        assert dm.is_rect_dirty((0, 0, 10, 10)) is True
+
+    def test_static_frame_fast_path(self):
+        dm = TileDirtyMap(tile_size=32)
+        gray = ImageProcessor.to_gray_array(_frame())
+        dm.update(gray)
+        dirty = dm.update(gray.copy())
+        assert not dirty.any()
+        assert dm.dirty_tiles() == set()
+
+    def test_single_pixel_change_marks_one_tile(self):
+        dm = TileDirtyMap(tile_size=32)
+        gray = ImageProcessor.to_gray_array(_frame(size=(300, 200)))
+        dm.update(gray)
+        changed = gray.copy()
+        changed[70, 100] ^= 1
+        dm.update(changed)
+        assert dm.dirty_tiles() == {(100 // 32, 70 // 32)}
+        assert dm.is_rect_dirty((90, 60, 20, 20))
+        assert not dm.is_rect_dirty((200, 150, 40, 40))
+
+    def test_ragged_edge_tiles(self):
+        dm = TileDirtyMap(tile_size=32)
+        gray = ImageProcessor.to_gray_array(_frame(size=(301, 199)))
+        dm.update(gray)
+        changed = gray.copy()
+        changed[198, 300] ^= 0xFF
+        dm.update(changed)
+        assert dm.is_rect_dirty((290, 190, 11, 9))
+
+    def test_static_region_skips_detector(self, monkeypatch):
+        engine = _engine_with_region((20, 20, 100, 80))
+        detector = engine.get_monitor("r1").detector
+        calls = []
+        monkeypatch.setattr(detector, "detect",
+                            lambda p, c: calls.append(1) or False)
+        img = _frame()
+        for _ in range(3):
+            engine.update_regions("t1", img)
+        assert calls == []
+        # A change elsewhere in the window still leaves this region idle
+        engine.update_regions("t1", _with_block(img, (250, 180, 30, 30)))
+        assert calls == []
+        engine.update_regions("t1", _with_block(img, (30, 30, 10, 10)))
+        assert calls == [1]
+
+    @pytest.mark.parametrize("method", ["ssim", "phash", "edge_only", "background_subtraction",
+                                        "cascade"])
+    def test_static_region_records_no_change(self, method):
+        engine = _engine_with_region((20, 20, 100, 80), method=method)
+        img = _frame()
+        for _ in range(3):
+            assert engine.update_regions("t1", img) == [("r1", STATE_OK, False)]
+
+    def test_dirty_map_preserves_alerts(self):
+        engine = _engine_with_region((20, 20, 120, 100))
+        prev = _frame()
+        engine.update_regions("t1", prev)
+        engine.update_regions("t1", prev)
+        results = engine.update_regions("t1", _with_block(prev, (40, 40, 60, 50)))
+        assert results == [("r1", STATE_ALERT, True)]
+
+    def test_region_subset_keeps_changes_for_skipped_regions(self):
+        engine = MonitoringEngine(state_dir="")
+        for rid, rect in (("fast", (10, 10, 60, 40)), ("slow", (150, 100, 80, 60))):
+            engine.add_region(rid, "t1", {"name": rid, "rect": list(rect), "detection_method": "ssim"},
+                              global_config={"detection_method": "ssim"})
+        base = _frame()
+        changed = _with_block(base, (160, 110, 40, 30))
+        engine.update_regions("t1", base)
+        # "slow" is not polled on the frame where its pixels change ...
+        assert [r[0] for r in engine.update_regions("t1", changed, region_ids={"fast"})] == ["fast"]
+        # ... and the next frame is identical, yet the change is not lost
+        results = engine.update_regions("t1", changed, region_ids={"slow"})
+        assert results == [("slow", STATE_ALERT, True)]
+
+    def test_paused_region_sees_changes_made_while_paused(self):
+        engine = MonitoringEngine(state_dir="")
+        for rid, rect in (("other", (10, 10, 60, 40)), ("paused", (150, 100, 80, 60))):
+            engine.add_region(rid, "t1", {"name": rid, "rect": list(rect), "detection_method": "ssim"},
+                              global_config={"detection_method": "ssim"})
+        base = _frame()
+        changed = _with_block(base, (160, 110, 40, 30))
+        engine.update_regions("t1", base)
+        engine.get_monitor("paused").toggle_pause()
+        # "other" keeps the dirty map current while "paused" misses the change
+        engine.update_regions("t1", changed)
+        engine.get_monitor("paused").toggle_pause()
+        results = dict((rid, state) for rid, state, _ in engine.update_regions("t1", changed))
+        assert results == {"other": STATE_OK, "paused": STATE_ALERT}
+
+    def test_mog2_keeps_warming_up_on_static_frames(self):
+        engine = _engine_with_region((20, 20, 100, 80), method="background_subtraction")
+        detector = engine.get_monitor("r1").detector
+        detector.warmup_frames = 3
+        img = _frame()
+        for _ in range(5):
+            engine.update_regions("t1", img)
+        assert detector._warmed_up is True
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Analysis scale / shared pyramid
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestAnalysisScale:
+
+    @pytest.mark.parametrize("value,expected", [
+        (1.0, 1.0), (0.5, 0.5), ("0.25", 0.25), (0.3, 0.25), ("AUTO", "auto"),
+        (0, 1.0), (None, 1.0), ("bogus", 1.0),
+    ])
+    def test_normalize(self, value, expected):
+        assert normalize_analysis_scale(value) == expected
+
+    def test_auto_scale_by_method_and_size(self):
+        assert auto_analysis_scale(1200, 800, "ssim") == 0.5
+        assert auto_analysis_scale(1200, 800, "phash") == 0.25
+        assert auto_analysis_scale(1200, 800, "edge_only") == 1.0
+        assert auto_analysis_scale(200, 100, "phash") == 1.0
+
+    def test_scale_rect_fits_level(self):
+        gray = ImageProcessor.to_gray_array(_frame(size=(321, 241)))
+        level = FramePyramid(gray).level(0.25)
+        assert level.shape == (241 // 4, 321 // 4)
+        x, y, w, h = scale_rect((300, 200, 21, 41), 0.25)
+        assert x + w <= level.shape[1] and y + h <= level.shape[0]
+
+    def test_build_kwargs_region_overrides_global(self):
+        _, kwargs = _build_detector_kwargs({"analysis_scale": 0.5}, {"analysis_scale": "auto"})
+        assert kwargs["analysis_scale"] == 0.5
+        _, kwargs = _build_detector_kwargs({"analysis_scale": ""}, {"analysis_scale": "auto"})
+        assert kwargs["analysis_scale"] == "auto"
+
+    def test_region_is_cropped_from_level(self, monkeypatch):
+        engine = _engine_with_region((20, 20, 160, 120), analysis_scale=0.5)
+        monitor = engine.get_monitor("r1")
+        shapes = []
+        original = monitor.detector.detect
+        monkeypatch.setattr(monitor.detector, "detect",
+                            lambda p, c: shapes.append(c.shape) or original(p, c))
+        img = _frame()
+        engine.update_regions("t1", img)
+        engine.update_regions("t1", _with_block(img, (40, 40, 60, 50)))
+        assert shapes == [(60, 80)]
+        assert monitor.effective_analysis_scale == 0.5
+
+    def test_scaled_region_still_alerts(self):
+        engine = _engine_with_region((20, 20, 160, 120), analysis_scale=0.25)
+        prev = _frame()
+        engine.update_regions("t1", prev)
+        results = engine.update_regions("t1", _with_block(prev, (40, 40, 60, 50)))
+        assert results == [("r1", STATE_ALERT, True)]
+        # Alert crops stay at full resolution
+        assert engine.get_monitor("r1").last_alert_curr_image.size == (160, 120)
+
+    def test_level_shared_between_regions(self, monkeypatch):
+        engine = MonitoringEngine()
+        for rid, rect in (("a", (0, 0, 100, 80)), ("b", (150, 100, 120, 90))):
+            engine.add_region(rid, "t1", {"name": rid, "rect": list(rect),
+                                          "analysis_scale": 0.5})
+        calls = []
+        real_resize = pyramid_mod.cv2.resize
+        monkeypatch.setattr(pyramid_mod.cv2, "resize",
+                            lambda *a, **k: calls.append(1) or real_resize(*a, **k))
+        engine.update_regions("t1", _frame())
+        assert len(calls) == 1
+
+    def test_changing_scale_resets_baseline(self):
+        engine = _engine_with_region((20, 20, 160, 120))
+        monitor = engine.get_monitor("r1")
+        engine.update_regions("t1", _frame())
+        monitor.set_detector("ssim", analysis_scale=0.5)
+        assert monitor.previous_image is None
+        assert engine.update_regions("t1", _frame(1)) == [("r1", STATE_OK, False)]
+        assert monitor.previous_image.shape == (60, 80)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Cascade detector
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _jitter(img: Image.Image, seed: int = 0) -> Image.Image:
+    """±1 grey-level noise: pixels differ but nothing meaningful changed."""
+    rng = np.random.default_rng(seed)
+    arr = np.array(img).astype(np.int16) + rng.integers(-1, 2, size=(img.height, img.width, 1))
+    return Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+
+
+class TestCascade:
+
+    def test_registered(self):
+        assert DETECTOR_REGISTRY["cascade"] is CascadeDetector
+        det = create_detector("cascade", confirm="edge_only")
+        assert det.confirm_method == "edge_only"
+
+    def test_nested_cascade_falls_back_to_ssim(self):
+        assert CascadeDetector(confirm="cascade").confirm_method == "ssim"
+
+    @pytest.mark.parametrize("gate", CascadeDetector.GATES)
+    def test_gate_rejects_noise_without_confirm(self, gate, monkeypatch):
+        det = CascadeDetector(gate=gate, gate_threshold=0.01)
+        calls = []
+        monkeypatch.setattr(det.confirm, "detect", lambda p, c: calls.append(1) or True)
+        prev = ImageProcessor.to_gray_array(_frame())
+        curr = ImageProcessor.to_gray_array(_jitter(_frame()))
+        assert det.detect(prev, curr) is False
+        assert calls == []
+        assert det.last_detect_info["stage"] == "gate"
+        assert det.last_detect_info["gate"] == gate
+
+    @pytest.mark.parametrize("gate", CascadeDetector.GATES)
+    def test_gate_opens_and_confirm_decides(self, gate):
+        det = CascadeDetector(gate=gate)
+        prev = ImageProcessor.to_gray_array(_frame())
+        curr = ImageProcessor.to_gray_array(_with_block(_frame(), (0, 0, 200, 150)))
+        assert det.detect(prev, curr) is True
+        info = det.last_detect_info
+        assert info["stage"] == "confirm"
+        assert info["gate_score"] > info["gate_threshold"]
+        assert "similarity" in info["confirm"]
+
+    def test_confirm_can_overrule_gate(self):
+        # Gate wide open, SSIM confirm with a lax threshold says "no change"
+        det = CascadeDetector(gate_threshold=0.0, confirm_kwargs={"threshold": 0.5})
+        prev = ImageProcessor.to_gray_array(_frame())
+        curr = ImageProcessor.to_gray_array(_jitter(_frame()))
+        assert det.detect(prev, curr) is False
+        assert det.last_detect_info["stage"] == "confirm"
+
+    def test_gated_ticks_keep_mog2_learning(self):
+        det = CascadeDetector(gate_threshold=0.5, confirm="background_subtraction",
+                              confirm_kwargs={"warmup_frames": 3})
+        frames = [ImageProcessor.to_gray_array(_jitter(_frame(), i)) for i in range(4)]
+        for prev, curr in zip(frames, frames[1:]):
+            det.detect(prev, curr)
+        assert det.confirm._warmed_up is True
+        assert det.last_detect_info["gate_rejects"] == 3
+
+    def test_build_kwargs_confirm_uses_region_params(self):
+        method, kwargs = _build_detector_kwargs(
+            {"detection_method": "cascade", "cascade_confirm": "edge_only",
+             "canny_low": 10, "cascade_gate": "dhash", "analysis_scale": 0.5},
+        )
+        assert method == "cascade"
+        assert kwargs["gate"] == "dhash"
+        assert kwargs["analysis_scale"] == 0.5
+        assert kwargs["confirm"] == "edge_only"
+        assert kwargs["confirm_kwargs"]["canny_low"] == 10
+        assert "analysis_scale" not in kwargs["confirm_kwargs"]
+
+    def test_auto_scale_follows_confirm_method(self):
+        det = CascadeDetector(confirm="edge_only")
+        assert det.auto_scale_method == "edge_only"
+
+    def test_region_alerts_through_cascade(self):
+        engine = _engine_with_region((20, 20, 160, 120), method="cascade")
+        prev = _frame()
+        engine.update_regions("t1", prev)
+        assert engine.update_regions("t1", _jitter(prev)) == [("r1", STATE_OK, False)]
+        results = engine.update_regions("t1", _with_block(prev, (40, 40, 60, 50)))
+        assert results == [("r1", STATE_ALERT, True)]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Parallel detection
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_GRID = [(x, y, 60, 50) for y in (10, 90, 170) for x in (10, 90, 170, 250)]
+
+
+def _grid_engine(workers: int, methods=("ssim", "edge_only", "phash")) -> MonitoringEngine:
+    engine = MonitoringEngine(state_dir="", workers=workers)
+    for i, rect in enumerate(_GRID):
+        method = methods[i % len(methods)]
+        engine.add_region(f"r{i:02d}", "t1",
+                          {"name": f"R{i}", "rect": list(rect), "detection_method": method},
+                          global_config={"detection_method": method})
+    return engine
+
+
+class TestParallelDetection:
+
+    def _run(self, engine):
+        base = _frame(3)
+        frames = [base, base, _with_block(base, (20, 20, 40, 30)),
+                  _with_block(base, (180, 100, 40, 30)), _jitter(base), base]
+        return [engine.update_regions("t1", f, now=float(i)) for i, f in enumerate(frames)]
+
+    def test_matches_sequential_in_region_order(self):
+        parallel = _grid_engine(workers=4)
+        try:
+            assert parallel.workers == 4
+            results = self._run(parallel)
+        finally:
+            parallel.shutdown()
+        assert results == self._run(_grid_engine(workers=0))
+        assert [rid for rid, _, _ in results[0]] == [f"r{i:02d}" for i in range(len(_GRID))]
+        assert any(alert for rid, _, alert in results[2])
+
+    def test_state_machine_runs_on_calling_thread(self, monkeypatch):
+        import threading
+        from screenalert_core.monitoring.region_monitor import RegionMonitor
+
+        analyze_threads, apply_threads = set(), set()
+        analyze, apply = RegionMonitor.analyze, RegionMonitor.apply
+
+        def spy_analyze(self, *args, **kwargs):
+            analyze_threads.add(threading.current_thread().name)
+            return analyze(self, *args, **kwargs)
+
+        def spy_apply(self, *args, **kwargs):
+            apply_threads.add(threading.current_thread().name)
+            return apply(self, *args, **kwargs)
+
+        monkeypatch.setattr(RegionMonitor, "analyze", spy_analyze)
+        monkeypatch.setattr(RegionMonitor, "apply", spy_apply)
+        engine = _grid_engine(workers=3)
+        try:
+            self._run(engine)
+        finally:
+            engine.shutdown()
+        assert apply_threads == {threading.current_thread().name}
+        assert analyze_threads and all(n.startswith("region-detect") for n in analyze_threads)
+
+    def test_paused_region_in_parallel_batch(self):
+        engine = _grid_engine(workers=4)
+        try:
+            engine.get_monitor("r01").toggle_pause()
+            results = dict((rid, state) for rid, state, _ in self._run(engine)[-1])
+        finally:
+            engine.shutdown()
+        assert results["r01"] == "paused"
+        assert len(results) == len(_GRID)
+
+    @pytest.mark.parametrize("value,expected", [(0, 0), (1, 0), (-3, 0), ("x", 0), (6, 6), (999, 32)])
+    def test_set_workers_clamps(self, value, expected):
+        engine = MonitoringEngine(state_dir="")
+        engine.set_workers(value)
+        assert engine.workers == expected
+        assert (engine._executor is None) == (expected == 0)
+        engine.shutdown()
+        assert engine.workers == 0 and engine._executor is None
+
+    def test_timings_recorded_per_region(self):
+        engine = _grid_engine(workers=2)
+        timings = {}
+        try:
+            engine.update_regions("t1", _frame(), timings=timings)
+        finally:
+            engine.shutdown()
+        assert sorted(timings) == [f"r{i:02d}" for i in range(len(_GRID))]
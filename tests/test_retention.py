@@ -0,0 +1,122 @@
+"""
+Tests for capture retention (quotas on the capture store).
+
+Run with:
+    pytest tests/test_retention.py -v
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.core import capture_store  # noqa: E402
+from screenalert_core.core.capture_store import CaptureStore  # noqa: E402
+from screenalert_core.core.retention import RetentionManager, RetentionPolicy  # noqa: E402
+from screenalert_core.screening_engine import ScreenAlertEngine  # noqa: E402
+
+DAY = 86400.0
+NOW = 1_000_000.0
+
+
+def _image(value: int) -> Image.Image:
+    rng = np.random.default_rng(value)
+    return Image.fromarray(rng.integers(0, 255, (24, 32, 3), dtype=np.uint8))
+
+
+def _store(tmp_path, count=6, region_of=lambda i: "r1") -> CaptureStore:
+    store = CaptureStore(str(tmp_path))
+    shared = _image(999)
+    for i in range(count):
+        event_id = f"e{i}"
+        store.put(event_id, "snapshot", _image(i), "w1", region_of(i), timestamp=NOW - (count - i) * DAY)
+        store.put(event_id, "window_prev", shared, "w1", region_of(i), timestamp=NOW - (count - i) * DAY)
+    return store
+
+
+def _manager(store, policy, batch_size=2):
+    return RetentionManager(lambda: store, lambda: policy, batch_size=batch_size, batch_pause_s=0)
+
+
+class TestRetention:
+
+    def test_max_age_deletes_old_events_in_batches(self, tmp_path):
+        store = _store(tmp_path)
+        manager = _manager(store, RetentionPolicy(max_age_s=2.5 * DAY))
+        assert manager.run_once(now=NOW) == 4
+        assert store.events() == ["e4", "e5"]
+        # The shared frame survives while an event still uses it
+        assert os.path.isfile(store.get_event("e5")["window_prev"])
+        assert manager.stats()["events_deleted"] == 4
+
+    def test_max_per_region_keeps_newest(self, tmp_path):
+        store = _store(tmp_path, region_of=lambda i: "r1" if i % 2 else "r2")
+        _manager(store, RetentionPolicy(max_per_region=1)).run_once(now=NOW)
+        assert store.events() == ["e4", "e5"]
+
+    def test_max_bytes_frees_oldest_until_under_quota(self, tmp_path):
+        store = _store(tmp_path)
+        per_event = os.path.getsize(store.get_event("e0")["snapshot"])
+        quota = store.total_bytes - 2 * per_event
+        _manager(store, RetentionPolicy(max_bytes=quota)).run_once(now=NOW)
+        assert store.events() == ["e2", "e3", "e4", "e5"]
+        assert store.total_bytes <= quota
+        blobs = [f for _, _, files in os.walk(tmp_path / "blobs") for f in files]
+        assert len(blobs) == 5  # four snapshots + the shared frame
+
+    def test_unlimited_policy_does_nothing(self, tmp_path):
+        store = _store(tmp_path)
+        assert _manager(store, RetentionPolicy()).run_once(now=NOW) == 0
+        assert len(store.events()) == 6
+
+    def test_quotas_with_store_off_warn_once(self, caplog):
+        policy = RetentionPolicy(max_age_s=DAY)
+        manager = RetentionManager(lambda: None, lambda: policy, batch_pause_s=0)
+        with caplog.at_level("WARNING", logger="screenalert_core.core.retention"):
+            assert manager.run_once(now=NOW) == 0
+            manager.run_once(now=NOW)
+        assert len([r for r in caplog.records if "not managed" in r.message]) == 1
+
+    def test_deletions_survive_reopen_and_compact(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(capture_store, "_COMPACT_MIN_TOMBSTONES", 100)
+        store = _store(tmp_path)
+        store.delete_event("e0")
+        usage = store.usage()
+        store.close()
+
+        reopened = CaptureStore(str(tmp_path))
+        assert reopened.events() == ["e1", "e2", "e3", "e4", "e5"]
+        assert reopened.usage() == usage
+
+        monkeypatch.setattr(capture_store, "_COMPACT_MIN_TOMBSTONES", 2)
+        for event_id in ("e1", "e2", "e3", "e4"):
+            reopened.delete_event(event_id)
+        reopened.close()
+        with open(tmp_path / "manifest.jsonl", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        # Compacted once tombstones outnumbered live events
+        assert len(lines) < 12
+        assert CaptureStore(str(tmp_path)).events() == ["e5"]
+
+
+def test_engine_reports_usage_and_enforces_per_region_quota(tmp_path):
+    engine = ScreenAlertEngine(str(tmp_path / "config.json"))
+    engine.config.set_capture_dir(str(tmp_path / "captures"))
+    engine.config.set_capture_max_per_region(2)
+    store = engine.capture_store
+    for i in range(5):
+        store.put(f"e{i}", "snapshot", _image(i), "w1", "r1", timestamp=NOW + i)
+
+    assert engine.retention.run_once(now=NOW + 10) == 3
+    usage = engine.capture_usage()
+    assert usage["store_enabled"] and usage["usage"]["events"] == 2
+    assert usage["quotas_enforced"]
+    assert usage["quotas"]["max_per_region"] == 2
+    assert usage["retention"]["events_deleted"] == 3
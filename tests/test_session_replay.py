@@ -0,0 +1,190 @@
+"""
+Tests for recorded sessions and the offline replay runner.
+
+Sessions are built from the synthetic capture source, whose scripts give
+exact ground truth for when a region changes.
+
+Run with:
+    pytest tests/test_session_replay.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.core.capture_sources import SyntheticCaptureSource  # noqa: E402
+from screenalert_core.core.session_recording import (  # noqa: E402
+    EVENT_ALERT, EVENT_CHANGE, MANIFEST_FILE, RecordedSession, SessionRecorder,
+)
+from screenalert_core.monitoring import session_replay  # noqa: E402
+from screenalert_core.monitoring.session_replay import replay_session, score_alerts  # noqa: E402
+
+
+REGION = (100, 80, 200, 150)
+FPS = 10.0
+
+
+def _region_cfg(region_id="r1", **extra):
+    return {"id": region_id, "name": region_id.upper(), "rect": list(REGION), **extra}
+
+
+def _record_script(path, script, frames, window_id="w1", regions=None, fps=FPS,
+                   changes=(), **recorder_kwargs):
+    """Record *frames* synthetic frames; *changes* are truth frame indices."""
+    src = SyntheticCaptureSource()
+    hwnd = src.add_window("Game", (400, 300), script)
+    rec = SessionRecorder(path, alert_hold_seconds=1.0, **recorder_kwargs)
+    rec.add_window(window_id, "Game", regions if regions is not None else [_region_cfg()])
+    for i in range(frames):
+        rec.add_frame(window_id, src.capture(hwnd), t=i / fps)
+    for index in changes:
+        rec.add_event(EVENT_CHANGE, window_id, "r1", t=index / fps)
+    return rec.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Session format
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestSessionFormat:
+
+    def test_round_trip_with_dedupe(self, tmp_path):
+        path = _record_script(tmp_path / "s", [("static", 5), ("blobs", 3, REGION), "static"],
+                              frames=12, chunk_frames=5)
+        session = RecordedSession(path)
+        window = session.windows["w1"]
+        assert window["frame_count"] == 12
+        assert window["stored_frames"] < 12
+        assert len(window["chunks"]) == 3
+        assert window["size"] == [400, 300]
+
+        frames = list(session.iter_frames("w1"))
+        assert [round(t, 3) for t, _ in frames] == [round(i / FPS, 3) for i in range(12)]
+        assert frames[0][1].ndim == 2  # grayscale by default
+        # Repeats inside a chunk come back as the same array
+        assert frames[0][1] is frames[1][1]
+        assert not np.array_equal(frames[5][1], frames[6][1])
+
+    def test_rgb_and_size_change(self, tmp_path):
+        rec = SessionRecorder(tmp_path / "s", grayscale=False)
+        rec.add_window("w1", "Game")
+        rec.add_frame("w1", np.zeros((20, 30, 3), np.uint8), t=0.0)
+        rec.add_frame("w1", np.zeros((40, 50, 3), np.uint8), t=0.1)
+        session = RecordedSession(rec.close())
+        shapes = [f.shape for _, f in session.iter_frames("w1")]
+        assert shapes == [(20, 30, 3), (40, 50, 3)]
+
+    def test_windows_merge_by_time(self, tmp_path):
+        rec = SessionRecorder(tmp_path / "s")
+        rec.add_window("a", "A")
+        rec.add_window("b", "B")
+        for i in range(3):
+            rec.add_frame("a", np.full((8, 8), i, np.uint8), t=i * 1.0)
+            rec.add_frame("b", np.full((8, 8), i, np.uint8), t=i * 1.0 + 0.5)
+        order = [(t, wid) for t, wid, _ in RecordedSession(rec.close()).iter_all_frames()]
+        assert order == [(0.0, "a"), (0.5, "b"), (1.0, "a"), (1.5, "b"), (2.0, "a"), (2.5, "b")]
+
+    def test_events_and_guards(self, tmp_path):
+        path = _record_script(tmp_path / "s", ["static"], frames=2, changes=[1])
+        session = RecordedSession(path)
+        assert session.events_of(EVENT_CHANGE) == [
+            {"t": 0.1, "kind": "change", "window_id": "w1", "region_id": "r1"}
+        ]
+        with pytest.raises(FileExistsError):
+            SessionRecorder(path)
+        (tmp_path / "bad").mkdir()
+        (tmp_path / "bad" / MANIFEST_FILE).write_text(json.dumps({"format": "other"}))
+        with pytest.raises(ValueError):
+            RecordedSession(tmp_path / "bad")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Replay runner
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestReplay:
+
+    def test_alerts_match_ground_truth(self, tmp_path):
+        script = [("static", 20), ("blobs", 2, REGION), ("static", 40), ("text", 1, REGION), "static"]
+        path = _record_script(tmp_path / "s", script, frames=80, changes=[20, 62])
+        report = replay_session(path)
+
+        assert report.frames == 80
+        assert report.fps > 0 and report.detect_fps >= report.fps
+        assert [a["t"] for a in report.alerts] == [2.0, 6.2]
+        assert report.accuracy["true_positives"] == 2
+        assert report.accuracy["precision"] == 1.0 and report.accuracy["recall"] == 1.0
+        assert report.region_latency_ms["r1"]["count"] == 80
+
+    def test_hold_timers_follow_recorded_time(self, tmp_path):
+        path = _record_script(tmp_path / "s", [("static", 10), ("blobs", 1, REGION), "static"],
+                              frames=60)
+        report = replay_session(path)
+        transitions = [(e["t"], e["to"]) for e in report.timeline]
+        # Change at 1.0s; hold 1.0s -> WARNING at 2.0s -> OK at 3.0s (10 fps)
+        assert transitions[0] == (1.0, "alert")
+        assert ("warning" in [to for _, to in transitions]) and transitions[-1][1] == "ok"
+        warning_t = next(t for t, to in transitions if to == "warning")
+        ok_t = transitions[-1][0]
+        assert 2.0 <= warning_t <= 2.2 and 3.0 <= ok_t <= 3.4
+
+    def test_overrides_and_max_frames(self, tmp_path):
+        path = _record_script(tmp_path / "s", [("static", 5), ("blobs", 1, REGION), "static"],
+                              frames=20)
+        report = replay_session(path, region_overrides={"detection_method": "phash"},
+                                max_frames=10)
+        assert report.frames == 10
+        assert len(report.alerts) == 1
+        assert report.accuracy is None  # no truth events recorded
+
+    def test_score_alerts(self):
+        truth = [{"t": 1.0, "region_id": "r1"}, {"t": 5.0, "region_id": "r1"},
+                 {"t": 2.0, "region_id": "r2"}]
+        alerts = [{"t": 1.2, "region_id": "r1"}, {"t": 9.0, "region_id": "r1"},
+                  {"t": 2.1, "region_id": "r2"}]
+        score = score_alerts(alerts, truth, tolerance=1.0)
+        assert score["true_positives"] == 2
+        assert score["false_positives"] == 1
+        assert score["missed"] == 1
+        assert score["mean_delay_s"] == pytest.approx(0.15)
+
+    def test_cli_writes_json(self, tmp_path, capsys):
+        path = _record_script(tmp_path / "s", [("static", 5), ("blobs", 1, REGION), "static"],
+                              frames=15, changes=[5])
+        out = tmp_path / "report.json"
+        assert session_replay.main([str(path), "--method", "ssim", "--json", str(out)]) == 0
+        assert "Alerts: 1" in capsys.readouterr().out
+        assert json.loads(out.read_text())["accuracy"]["recall"] == 1.0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Recording from the engine
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_engine_records_replayable_session(tmp_path, make_engine):
+    rig = make_engine([("static", 5), ("blobs", 2, REGION), "static"], size=(400, 300),
+                      regions={"Region": REGION})
+    engine, thumbnail_id, region_id = rig.engine, rig.thumbnail_id, rig.region_id
+
+    assert engine.start_recording(str(tmp_path / "session"))
+    rig.run(15)
+    path = engine.stop_recording()
+    assert not engine.is_recording()
+
+    session = RecordedSession(path)
+    assert session.frame_count(thumbnail_id) == 15
+    assert session.windows[thumbnail_id]["regions"][0]["id"] == region_id
+    assert [e["region_id"] for e in session.events_of(EVENT_ALERT)] == [region_id]
+
+    # Replaying with the live settings reproduces the live alert
+    report = replay_session(path, truth_kind=EVENT_ALERT, tolerance=0.5)
+    assert report.accuracy["true_positives"] == 1
+    assert report.accuracy["false_positives"] == 0
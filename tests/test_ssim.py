@@ -0,0 +1,159 @@
+"""
+Parity tests for the OpenCV SSIM kernel against scikit-image.
+
+The corpus is generated from fixed seeds, so every run compares the same
+frame pairs.  scikit-image is only needed here, not at runtime.
+
+Run with:
+    pytest tests/test_ssim.py -v
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from screenalert_core.core import ssim  # noqa: E402
+from screenalert_core.core.change_detectors import SSIMDetector  # noqa: E402
+from screenalert_core.monitoring.region_monitor import _build_detector_kwargs  # noqa: E402
+
+skimage_metrics = pytest.importorskip("skimage.metrics")
+
+# scikit-image arguments equivalent to each native window
+_SKIMAGE_ARGS = {
+    "box": {},
+    "gaussian": {"gaussian_weights": True, "sigma": 1.5, "use_sample_covariance": False},
+}
+
+
+# ── Corpus ────────────────────────────────────────────────────────────────────
+
+def _ui_frame(rng: np.random.Generator, shape) -> np.ndarray:
+    """Flat background with coloured blocks and thin 'text' lines."""
+    h, w = shape
+    arr = np.full(shape, 30, dtype=np.uint8)
+    for _ in range(8):
+        y, x = int(rng.integers(0, h - 8)), int(rng.integers(0, w - 8))
+        arr[y:y + int(rng.integers(4, 40)), x:x + int(rng.integers(4, 60))] = rng.integers(60, 255)
+    for row in range(4, h - 2, 9):
+        arr[row, 5:w - 5:2] = 220
+    return arr
+
+
+def _corpus():
+    rng = np.random.default_rng(20240601)
+    cases = []
+    for shape in [(120, 160), (97, 213), (240, 320)]:
+        base = _ui_frame(rng, shape)
+        noise = rng.integers(0, 256, shape, dtype=np.uint8)
+
+        block = base.copy()
+        block[10:50, 20:90] = 255
+        brighter = np.clip(base.astype(np.int16) + 12, 0, 255).astype(np.uint8)
+        jitter = np.clip(base.astype(np.int16) + rng.integers(-3, 4, shape), 0, 255).astype(np.uint8)
+        gradient = np.tile(np.linspace(0, 255, shape[1]).astype(np.uint8), (shape[0], 1))
+
+        cases += [
+            (f"identical-{shape}", base, base.copy()),
+            (f"block-{shape}", base, block),
+            (f"brightness-{shape}", base, brighter),
+            (f"jitter-{shape}", base, jitter),
+            (f"noise-{shape}", base, noise),
+            (f"gradient-{shape}", gradient, base),
+        ]
+    return cases
+
+
+_CORPUS = _corpus()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Parity with scikit-image
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.parametrize("window", ssim.SSIM_WINDOWS)
+@pytest.mark.parametrize("name,a,b", _CORPUS, ids=[c[0] for c in _CORPUS])
+def test_mean_matches_skimage(name, a, b, window):
+    expected = skimage_metrics.structural_similarity(a, b, **_SKIMAGE_ARGS[window])
+    got = ssim.structural_similarity(a, b, window=window)
+    assert got == pytest.approx(expected, abs=1e-5)
+
+
+@pytest.mark.parametrize("window", ssim.SSIM_WINDOWS)
+def test_map_matches_skimage(window):
+    _, a, b = _CORPUS[1]
+    _, expected = skimage_metrics.structural_similarity(a, b, full=True, **_SKIMAGE_ARGS[window])
+    score, got = ssim.structural_similarity(a, b, window=window, full=True)
+    assert got.shape == a.shape
+    assert got.dtype == np.float32
+    pad = (ssim.window_size(window) - 1) // 2
+    inner = (slice(pad, -pad), slice(pad, -pad))
+    np.testing.assert_allclose(got[inner], expected[inner], atol=1e-4)
+    assert score == pytest.approx(float(got[inner].mean()), abs=1e-6)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Kernel behaviour
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestKernel:
+
+    def test_stats_are_float32(self):
+        stats = ssim.compute_stats(_CORPUS[0][1])
+        assert stats.x.dtype == stats.mu.dtype == stats.sigma_sq.dtype == np.float32
+
+    def test_accepts_non_contiguous_views(self):
+        _, a, b = _CORPUS[1]
+        view_a, view_b = a[5:90, 7:140], b[5:90, 7:140]
+        assert not view_a.flags.c_contiguous
+        expected = skimage_metrics.structural_similarity(view_a, view_b)
+        assert ssim.structural_similarity(view_a, view_b) == pytest.approx(expected, abs=1e-5)
+
+    def test_smaller_than_window_compares_exactly(self):
+        a = np.zeros((5, 20), dtype=np.uint8)
+        assert ssim.structural_similarity(a, a.copy()) == 1.0
+        b = a.copy()
+        b[2, 3] = 1
+        assert ssim.structural_similarity(a, b) == 0.0
+
+    def test_window_mismatch_raises(self):
+        a = _CORPUS[0][1]
+        with pytest.raises(ValueError):
+            ssim.ssim_from_stats(ssim.compute_stats(a, "box"), ssim.compute_stats(a, "gaussian"))
+
+    def test_unknown_window_falls_back_to_box(self):
+        assert ssim.normalize_window("triangle") == "box"
+        assert ssim.compute_stats(_CORPUS[0][1], "triangle").window == "box"
+
+
+class TestDetectorWindow:
+
+    def test_detector_uses_selected_window(self):
+        _, a, b = _CORPUS[1]
+        det = SSIMDetector(threshold=0.0, window="gaussian")
+        det.detect(a, b)
+        expected = skimage_metrics.structural_similarity(a, b, **_SKIMAGE_ARGS["gaussian"])
+        assert det.last_detect_info["window"] == "gaussian"
+        assert det.last_detect_info["similarity"] == round(expected, 4)
+
+    def test_region_override_wins_over_global(self):
+        method, kwargs = _build_detector_kwargs(
+            {"detection_method": "ssim", "ssim_window": "gaussian"},
+            {"ssim_window": "box"},
+        )
+        assert method == "ssim"
+        assert kwargs["window"] == "gaussian"
+
+    def test_global_window_used_without_override(self):
+        _, kwargs = _build_detector_kwargs({}, {"detection_method": "ssim", "ssim_window": "gaussian"})
+        assert kwargs["window"] == "gaussian"
+
+    def test_window_not_passed_to_phash(self):
+        _, kwargs = _build_detector_kwargs({"detection_method": "phash", "ssim_window": "gaussian"})
+        assert "window" not in kwargs